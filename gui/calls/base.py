@@ -1,3 +1,5 @@
+import collections
+import math
 import sys
 import traceback
 
@@ -6,7 +8,7 @@ from PyQt5.QtGui import (QBrush, QDoubleValidator, QIntValidator, QPainter,
                          QRegExpValidator)
 from PyQt5.QtWidgets import (QComboBox, QItemDelegate, QLineEdit, QMessageBox,
                              QSizePolicy, QSpacerItem, QStyleOptionViewItem,
-                             QTextEdit, QWidget)
+                             QTableView, QTextEdit, QWidget)
 
 
 class DoubleEditorDelegate(QItemDelegate):
@@ -193,6 +195,95 @@ class CheckBoxDelegate(QItemDelegate):
                       else 0, Qt.EditRole)
 
 
+class CellTextCache:
+    """Display strings of a 2D float array used as backing block of a table
+    model. The strings of a row are formatted when one of its cells is first
+    displayed and kept until the row is invalidated, so repaints and scrolling
+    do not format the values again. Only the most recently displayed rows are
+    kept.
+
+    Parameters
+    ----------
+    fmt : str, optional
+        Format spec of the values. Default is '.7f'.
+    max_rows : int, optional
+        Maximum number of rows kept. Default is 2048.
+
+    Notes
+    -----
+    NaN values are displayed as None (empty cell).
+    """
+
+    def __init__(self, fmt: str = '.7f', max_rows: int = 2048):
+        self._fmt = fmt
+        self._max_rows = max_rows
+        self._rows = collections.OrderedDict()
+        self.values = None
+
+    def set_values(self, values) -> None:
+        """Sets a new backing array (no copy is made) and clears the cache.
+        """
+        self.values = values
+        self._rows.clear()
+
+    def text(self, row: int, col: int) -> str:
+        """Display string of the value at (`row`, `col`).
+        """
+        row_text = self._rows.get(row)
+
+        if row_text is None:
+            fmt = self._fmt
+            row_text = [None if math.isnan(val) else format(val, fmt)
+                        for val in self.values[row].tolist()]
+            self._rows[row] = row_text
+
+            if len(self._rows) > self._max_rows:
+                self._rows.popitem(last=False)
+        else:
+            self._rows.move_to_end(row)
+
+        return row_text[col]
+
+    def invalidate_rows(self, first: int, last: int = None) -> None:
+        """Drops the strings of the rows `first` to `last` (inclusive). If
+        `last` is None, only `first` is dropped.
+        """
+        last = first if last is None else last
+
+        if last - first + 1 >= len(self._rows):
+            for row in [r for r in self._rows if first <= r <= last]:
+                del self._rows[row]
+        else:
+            for row in range(first, last + 1):
+                self._rows.pop(row, None)
+
+
+class HeaderSpanTableView(QTableView):
+    """TableView subclassing overriding the setModel to properly set the spans
+    of the first row headers (e.g. groups of variables). Only the first row is
+    scanned for spans, so the cost does not grow with the number of data rows.
+    The spans are set again whenever the model is reset.
+    """
+
+    def setModel(self, model: QAbstractItemModel):
+        super().setModel(model)
+        model.modelReset.connect(self.update_header_spans)
+        model.layoutChanged.connect(self.update_header_spans)
+        self.update_header_spans()
+
+    def update_header_spans(self):
+        model = self.model()
+        self.clearSpans()
+
+        if model.rowCount() == 0:
+            return
+
+        for col in range(model.columnCount()):
+            span = model.span(model.index(0, col))
+            if span.height() > 1 or span.width() > 1:
+                self.setSpan(0, col, span.height(), span.width())
+
+
 class ErrorMessageBox(QMessageBox):
     def __init__(self, icon, title, text, buttons, parent, flags):
         super().__init__(icon, title, text, buttons, parent, flags)
@@ -1,3 +1,5 @@
+import time
+
 import pandas as pd
 from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
 from PyQt5.QtGui import QFont
@@ -166,7 +168,12 @@ class CholeskyDialog(QDialog):
         self.ui.setPushButton.clicked.connect(self.set_modified_as_original)
 
     def apply_cholmod(self):
+        start = time.perf_counter()
         mod_juu, _, indef, e = cholmod(self.juu.values)
+        elapsed = time.perf_counter() - start
+
+        self.ui.timingLabel.setText("Factorization time: {0:.3f} ms"
+                                    .format(elapsed * 1e3))
 
         mod_juu_df = pd.DataFrame(mod_juu, columns=self.juu.columns,
                                   index=self.juu.index)
@@ -5,10 +5,12 @@ import pandas as pd
 from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt, QObject
 from PyQt5.QtGui import QBrush, QPalette
 from PyQt5.QtWidgets import (QApplication, QDialog, QFileDialog, QHeaderView,
-                             QMessageBox)
+                             QMessageBox, QProgressDialog)
 
 from gui.calls.base import CheckBoxDelegate, ComboBoxDelegate, warn_the_user
 from gui.calls.dialogs.convergenceselector import ConvergenceSelectorDialog
+from gui.models.csv_import import (CsvReaderThread, read_csv_header,
+                                   read_csv_preview)
 from gui.models.data_storage import DataStorage
 from gui.views.py_files.csveditor import Ui_Dialog
 
@@ -234,8 +236,9 @@ class CsvEditorDialog(QDialog):
         display_view = self.ui.displayTableView
         csv_filepath = self.app_data.doe_csv_settings['filepath']
         if csv_filepath != '':
-            df = pd.read_csv(csv_filepath)
-            headers = list(df.columns)
+            # only the header and the first rows are read for the alias
+            # pairing, the checked columns are imported when done
+            headers = read_csv_header(csv_filepath)
 
             # ask the user which header is the convergence flag
             conv_dialog = ConvergenceSelectorDialog(headers, self.app_data,
@@ -269,7 +272,7 @@ class CsvEditorDialog(QDialog):
                 headers[status_index], headers[0] = (headers[0],
                                                      headers[status_index])
 
-                df = df.reindex(columns=headers)
+                df = read_csv_preview(csv_filepath).reindex(columns=headers)
                 # pair_info = self.app_data.doe_csv_settings['pair_info']
 
                 # create and set models and set row delegates
@@ -278,13 +281,9 @@ class CsvEditorDialog(QDialog):
                 display_view.setModel(table_model)
 
                 # grab defined aliases
-                inp_data = self.app_data.input_table_data
-                out_data = self.app_data.output_table_data
-                input_alias = inp_data.loc[
-                    inp_data['Type'] == self.app_data._INPUT_ALIAS_TYPES['mv'],
-                    'Alias'].tolist()
-                output_alias = out_data.loc[:, 'Alias'].tolist()
-                aliases = input_alias + output_alias
+                alias_index = self.app_data.alias_index
+                aliases = alias_index.aliases('input', 'mv') + \
+                    alias_index.aliases('output')
 
                 # create delegates with reference anchoring
                 self._check_delegate = CheckBoxDelegate()
@@ -322,13 +321,9 @@ class CsvEditorDialog(QDialog):
         else:
             # no duplicates or undefined found. Check if all the aliases from
             # app storage are defined
-            inp_data = self.app_data.input_table_data
-            out_data = self.app_data.output_table_data
-            input_alias = inp_data.loc[
-                inp_data['Type'] == self.app_data._INPUT_ALIAS_TYPES['mv'],
-                'Alias'].tolist()
-            output_alias = out_data.loc[:, 'Alias'].tolist()
-            aliases = input_alias + output_alias
+            alias_index = self.app_data.alias_index
+            aliases = alias_index.aliases('input', 'mv') + \
+                alias_index.aliases('output')
 
             all_defined = True \
                 if all(alias in checked_vars for alias in aliases) \
@@ -341,31 +336,79 @@ class CsvEditorDialog(QDialog):
 
                 warn_the_user(msg_txt, msg_title)
             else:
-                # everything is ok, store the data and close the dialog
-                # the renaming from comboboxes
-                raw_df = self.ui.displayTableView.model()._data
-
-                # checked columns mapping
+                # everything is ok, import the checked columns (renamed with
+                # the aliases from comboboxes), store them and close the dialog
                 rename = dict([(header, pair_info[header]['alias'])
                                for header in pair_info
                                if pair_info[header]['status']])
 
-                # extract checked columns, rename them and rearrange columns
-                # following the aliases order
-                df = raw_df[rename.keys()].rename(
-                    columns=rename).reindex(columns=aliases)
+                csv_settings = self.app_data.doe_csv_settings
+                self.import_csv_data(csv_settings['filepath'], rename, aliases,
+                                     csv_settings['convergence_index'])
+
+    def import_csv_data(self, csv_filepath: str, rename: dict, aliases: list,
+                        status_column: str):
+        """Reads the checked columns of the .csv file in a background thread
+        while displaying its progress. When done, the data is stored through
+        `store_csv_data` and the dialog is closed.
+
+        Parameters
+        ----------
+        csv_filepath : str
+            Full path of the .csv file.
+        rename : dict
+            Checked columns (keys) and their aliases (values).
+        aliases : list
+            Aliases in the order they are stored.
+        status_column : str
+            Column of the convergence flag.
+        """
+        self.ui.okPushButton.setEnabled(False)
+
+        self.progress_dialog = QProgressDialog("Importing .csv data...", None,
+                                               0, 100, self)
+        self.progress_dialog.setWindowModality(Qt.WindowModal)
+        self.progress_dialog.setValue(0)
+        self.progress_dialog.show()
+
+        self._csv_import = (rename, aliases, status_column)
+        self._csv_reader = CsvReaderThread(csv_filepath, list(rename),
+                                           status_column, parent=self)
+        self._csv_reader.progress_changed.connect(
+            self.progress_dialog.setValue)
+        self._csv_reader.data_loaded.connect(self.on_csv_data_loaded)
+        self._csv_reader.read_failed.connect(self.on_csv_read_failed)
+        self._csv_reader.start()
+
+    def on_csv_data_loaded(self, raw_df: pd.DataFrame):
+        rename, aliases, status_column = self._csv_import
 
-                # append case number and status columns
-                stat_idx = self.app_data.doe_csv_settings['convergence_index']
-                df.insert(loc=0, column='status', value=raw_df[stat_idx])
-                df.insert(loc=0, column='case',
-                          value=range(1, df.shape[0] + 1))
+        # rename the checked columns and rearrange them following the aliases
+        # order
+        df = raw_df.rename(columns=rename).reindex(columns=aliases)
 
-                # convert to dict and store in application data
-                self.app_data.doe_sampled_data = df
+        # append case number and status columns
+        df.insert(loc=0, column='status', value=raw_df[status_column])
+        df.insert(loc=0, column='case', value=range(1, df.shape[0] + 1))
 
-                # close the dialog
-                self.close()
+        self.progress_dialog.close()
+        self.store_csv_data(df)
+
+        # close the dialog
+        self.close()
+
+    def on_csv_read_failed(self, error_msg: str):
+        self.progress_dialog.close()
+        self.ui.okPushButton.setEnabled(True)
+
+        msg_txt = ("Couldn't import the checked columns. Make sure they only "
+                   "contain numeric values.\n\n" + error_msg)
+        warn_the_user(msg_txt, "Invalid .csv data!")
+
+    def store_csv_data(self, df: pd.DataFrame):
+        """Stores the imported DOE data in the application storage.
+        """
+        self.app_data.doe_sampled_data = df
 
 
 if __name__ == "__main__":
@@ -5,6 +5,14 @@ from PyQt5.QtWidgets import QApplication, QDialog
 from gui.models.data_storage import DataStorage
 from gui.views.py_files.lhssettings import Ui_Dialog
 
+# design methods in the order of the method combo box ('lhs' is the best of
+# `n_iter` random latin hypercubes of pydace, see `gui.models.space_filling`
+# for the others)
+DESIGN_METHODS = ['lhs', 'ese', 'maximin', 'sobol', 'halton']
+
+# adaptive sampling criteria in the order of the criterion combo box
+ADAPTIVE_CRITERIA = ['mse', 'imse']
+
 
 class SamplesNumberValidator(QIntValidator):
     def __init__(self, app_data: DataStorage, bottom: int, top: int,
@@ -45,6 +53,23 @@ class LhsSettingDialog(QDialog):
         self.ui.lineEditNSamples.setText(str(lhs_settings['n_samples']))
         self.ui.lineEditNIter.setText(str(lhs_settings['n_iter']))
         self.ui.checkBoxIncVertices.setChecked(lhs_settings['inc_vertices'])
+        self.ui.comboBoxMethod.setCurrentIndex(
+            DESIGN_METHODS.index(lhs_settings.get('method', 'lhs')))
+        self.on_method_changed()
+        self.ui.checkBoxOrderCases.setChecked(
+            bool(lhs_settings.get('order_cases', False)))
+
+        # adaptive sampling (older files don't have these settings)
+        self.ui.groupBoxAdaptive.setChecked(
+            bool(lhs_settings.get('adaptive', False)))
+        self.ui.spinBoxBatchSize.setValue(
+            int(lhs_settings.get('batch_size', 5)))
+        self.ui.spinBoxMaxSamples.setValue(
+            int(lhs_settings.get('max_samples', 100)))
+        self.ui.doubleSpinBoxTargetError.setValue(
+            100 * lhs_settings.get('target_error', 0.05))
+        self.ui.comboBoxCriterion.setCurrentIndex(
+            ADAPTIVE_CRITERIA.index(lhs_settings.get('criterion', 'mse')))
 
         # validators
         n_samples_validator = SamplesNumberValidator(
@@ -59,16 +84,33 @@ class LhsSettingDialog(QDialog):
 
         # --------------------------- Signals/Slots ---------------------------
         self.ui.buttonBox.accepted.connect(self.set_lhs_settings)
+        self.ui.comboBoxMethod.currentIndexChanged.connect(
+            self.on_method_changed)
 
         # ---------------------------------------------------------------------
 
     def set_lhs_settings(self):
         lhs_set = {'n_samples': int(self.ui.lineEditNSamples.text()),
                    'n_iter': int(self.ui.lineEditNIter.text()),
-                   'inc_vertices': self.ui.checkBoxIncVertices.isChecked()}
+                   'inc_vertices': self.ui.checkBoxIncVertices.isChecked(),
+                   'method': DESIGN_METHODS[
+                       self.ui.comboBoxMethod.currentIndex()],
+                   'order_cases': self.ui.checkBoxOrderCases.isChecked(),
+                   'adaptive': self.ui.groupBoxAdaptive.isChecked(),
+                   'batch_size': self.ui.spinBoxBatchSize.value(),
+                   'max_samples': self.ui.spinBoxMaxSamples.value(),
+                   'target_error':
+                       self.ui.doubleSpinBoxTargetError.value() / 100,
+                   'criterion': ADAPTIVE_CRITERIA[
+                       self.ui.comboBoxCriterion.currentIndex()]}
 
         self.app_data.doe_lhs_settings = pd.Series(lhs_set)
 
+    def on_method_changed(self):
+        # the low discrepancy sequences aren't iterated
+        method = DESIGN_METHODS[self.ui.comboBoxMethod.currentIndex()]
+        self.ui.lineEditNIter.setEnabled(method in ('lhs', 'ese', 'maximin'))
+
     def on_n_samples_edited(self):
         if self.ui.lineEditNSamples.text() == '':
             lhs_settings = self.app_data.doe_lhs_settings
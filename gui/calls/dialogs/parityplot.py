@@ -0,0 +1,126 @@
+import numpy as np
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QResizeEvent
+from PyQt5.QtWidgets import (QApplication, QDialog, QHBoxLayout, QLabel,
+                             QPushButton, QVBoxLayout)
+
+from gui.models.parity_plot import (MAX_SCATTER_POINTS, draw_parity_page,
+                                    plot_pages)
+
+# milliseconds without resize events before the layout is recomputed
+_RESIZE_DELAY = 200
+
+
+class ParityPlotDialog(QDialog):
+    """Parity plots (predicted against test values) of the metamodel
+    validation, `per_page` outputs at a time. A page is only drawn when it is
+    shown, dense scatter clouds are thinned (see `thin_scatter`) and the
+    subplot layout is recomputed once the window stops being resized.
+
+    Parameters
+    ----------
+    metamodel_data : dict
+        'Y_test' and 'Y_pred' (points x outputs) and output 'labels'.
+    per_page : int, optional
+        Number of outputs per page.
+    max_points : int, optional
+        Maximum number of markers per subplot.
+    """
+
+    def __init__(self, metamodel_data: dict, per_page: int = 8,
+                 max_points: int = MAX_SCATTER_POINTS, parent=None):
+        # matplotlib is only imported when the validation plot is requested
+        from matplotlib.backends.backend_qt5agg import (FigureCanvasQTAgg,
+                                                        NavigationToolbar2QT)
+        from matplotlib.figure import Figure
+
+        super().__init__(parent)
+        self.setWindowFlags(Qt.Window)
+        self.setWindowTitle("Validation results")
+
+        self.figure = Figure()
+        self.canvas = FigureCanvasQTAgg(self.figure)
+        self.plt_toolbar = NavigationToolbar2QT(self.canvas, self)
+
+        self.previous_button = QPushButton("Previous")
+        self.next_button = QPushButton("Next")
+        self.page_label = QLabel()
+        self.page_label.setAlignment(Qt.AlignCenter)
+
+        page_layout = QHBoxLayout()
+        page_layout.addWidget(self.previous_button)
+        page_layout.addWidget(self.page_label, 1)
+        page_layout.addWidget(self.next_button)
+
+        layout = QVBoxLayout()
+        layout.addWidget(self.canvas)
+        layout.addWidget(self.plt_toolbar)
+        layout.addLayout(page_layout)
+        self.setLayout(layout)
+
+        self.metamodel_data = metamodel_data
+        self.max_points = max_points
+        self.pages = plot_pages(np.asarray(metamodel_data['Y_test']).shape[1],
+                                per_page)
+        self.page = 0
+
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(_RESIZE_DELAY)
+        self._resize_timer.timeout.connect(self.update_layout)
+
+        self.previous_button.clicked.connect(
+            lambda: self.show_page(self.page - 1))
+        self.next_button.clicked.connect(
+            lambda: self.show_page(self.page + 1))
+
+        self.show_page(0)
+
+    def show_page(self, page: int):
+        if len(self.pages) == 0:
+            self.page_label.setText("No outputs to plot")
+            self.previous_button.setEnabled(False)
+            self.next_button.setEnabled(False)
+            return
+
+        self.page = min(max(page, 0), len(self.pages) - 1)
+        self.page_label.setText("Outputs {0}-{1} of {2} (page {3} of "
+                                "{4})".format(self.pages[self.page][0] + 1,
+                                              self.pages[self.page][-1] + 1,
+                                              self.pages[-1][-1] + 1,
+                                              self.page + 1, len(self.pages)))
+        self.previous_button.setEnabled(self.page > 0)
+        self.next_button.setEnabled(self.page < len(self.pages) - 1)
+
+        draw_parity_page(self.figure,
+                         np.asarray(self.metamodel_data['Y_test']),
+                         np.asarray(self.metamodel_data['Y_pred']),
+                         self.metamodel_data['labels'], self.pages[self.page],
+                         max_points=self.max_points)
+        self.update_layout()
+
+    def update_layout(self):
+        self.figure.tight_layout()
+        self.canvas.draw_idle()
+
+    def resizeEvent(self, e: QResizeEvent):
+        super().resizeEvent(e)
+        # restarted by every resize event, so it only fires on the last one
+        self._resize_timer.start()
+
+
+if __name__ == "__main__":
+    import sys
+    from gui.calls.base import my_exception_hook
+
+    app = QApplication(sys.argv)
+    rng = np.random.RandomState(0)
+    y_test = rng.rand(5000, 40)
+    data = {'Y_test': y_test,
+            'Y_pred': y_test + 0.05 * rng.randn(*y_test.shape),
+            'labels': ['y{0}'.format(i + 1) for i in range(40)]}
+    w = ParityPlotDialog(data)
+    w.show()
+
+    sys.excepthook = my_exception_hook
+    sys.exit(app.exec_())
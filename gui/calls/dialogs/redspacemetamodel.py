@@ -1,6 +1,5 @@
 import numpy as np
 import pandas as pd
-from pydace import Dace
 from PyQt5.QtCore import Qt, QModelIndex
 from PyQt5.QtWidgets import QApplication, QDialog, QHeaderView
 from sklearn.metrics import (explained_variance_score, mean_absolute_error,
@@ -9,10 +8,13 @@ from sklearn.model_selection import KFold, train_test_split
 
 from gui.calls.base import (CheckBoxDelegate, DoubleEditorDelegate,
                             warn_the_user)
+from gui.calls.dialogs.parityplot import ParityPlotDialog
 from gui.calls.tabs.metamodeltab import (CrossValidationMetricsTableModel,
-                                         PlotWindow, ThetaTableModel,
+                                         ThetaTableModel,
                                          VariableSelectionTableModel)
 from gui.models.data_storage import DataStorage
+from gui.models.local_kriging import kriging_model
+from gui.models.model_registry import SURROGATE_TYPES
 from gui.views.py_files.redspacemetamodeldialog import Ui_Dialog
 
 
@@ -166,6 +168,9 @@ class ReducedSpaceMetamodelDialog(QDialog):
         corr_idx = self.ui.corrComboBox.currentIndex()
         corr = 'corrgauss'
 
+        # surrogate type (dense or local kriging)
+        surrogate = SURROGATE_TYPES[self.ui.surrogateComboBox.currentIndex()]
+
         # theta and bounds values
         theta_data = \
             self.application_database.reduced_metamodel_theta_data.set_index(
@@ -212,7 +217,7 @@ class ReducedSpaceMetamodelDialog(QDialog):
 
                 for j in range(Y_dim):
                     # build the univariate models
-                    krmodel = Dace(regression=regr, correlation=corr)
+                    krmodel = kriging_model(surrogate, regr, corr)
                     krmodel.fit(S=X_train, Y=Y_train[:, j], theta0=theta0,
                                 lob=lob, upb=upb)
 
@@ -258,7 +263,7 @@ class ReducedSpaceMetamodelDialog(QDialog):
 
             for j in range(Y_dim):
                 # build the univariate models
-                krmodel = Dace(regression=regr, correlation=corr)
+                krmodel = kriging_model(surrogate, regr, corr)
                 krmodel.fit(S=X_train, Y=Y_train[:, j], theta0=theta0,
                             lob=lob, upb=upb)
 
@@ -293,11 +298,14 @@ class ReducedSpaceMetamodelDialog(QDialog):
         model_perf = np.empty(Y_dim)
         model_perf.fill(np.NaN)
 
+        # the full data models are kept in the registry, so the gradients and
+        # hessians evaluation reuses them instead of fitting them again
+        registry = self.application_database.model_registry
+
         for j in range(Y_dim):
             # build the univariate models
-            krmodel = Dace(regression=regr, correlation=corr)
-            krmodel.fit(S=X, Y=Y[:, j], theta0=theta0,
-                        lob=lob, upb=upb)
+            krmodel = registry.fit(Y_labels[j], X, Y[:, j], regr, corr,
+                                   theta0, lob, upb, surrogate)
 
             # get final viable perf value
             col_idx = np.flatnonzero(krmodel.perf['perf'][-1, :] > 0)[-1]
@@ -313,7 +321,7 @@ class ReducedSpaceMetamodelDialog(QDialog):
 
     def on_view_plots_pressed(self):
         if hasattr(self, 'metamodel_data'):
-            dialog = PlotWindow(self.metamodel_data)
+            dialog = ParityPlotDialog(self.metamodel_data)
             dialog.exec_()
 
     def on_confirm_pressed(self):
@@ -331,6 +339,9 @@ class ReducedSpaceMetamodelDialog(QDialog):
         else:
             raise NotImplementedError("Invalid correlation option!")
 
+        self.application_database.differential_surrogate_model = \
+            SURROGATE_TYPES[self.ui.surrogateComboBox.currentIndex()]
+
         self.close()
 
 
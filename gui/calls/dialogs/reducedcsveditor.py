@@ -7,6 +7,7 @@ from PyQt5.QtWidgets import QApplication, QDialog, QFileDialog, QHeaderView
 
 from gui.calls.dialogs.convergenceselector import ConvergenceSelectorDialog
 from gui.calls.dialogs.csveditor import CsvEditorDialog, pandasModel
+from gui.models.csv_import import read_csv_header, read_csv_preview
 from gui.models.data_storage import DataStorage
 from gui.views.py_files.csveditor import Ui_Dialog
 from gui.calls.base import ComboBoxDelegate, CheckBoxDelegate, warn_the_user
@@ -55,8 +56,7 @@ class ReducedCsvEditorDialog(CsvEditorDialog):
         display_view = self.ui.displayTableView
         csv_filepath = self.app_data.reduced_doe_csv_settings['filepath']
         if csv_filepath != '':
-            df = pd.read_csv(csv_filepath)
-            headers = list(df.columns)
+            headers = read_csv_header(csv_filepath)
 
             # ask the user which header is the convergence flag
             conv_dialog = ConvergenceSelectorDialog(headers, self.app_data,
@@ -90,7 +90,7 @@ class ReducedCsvEditorDialog(CsvEditorDialog):
                 headers[status_index], headers[0] = (headers[0],
                                                      headers[status_index])
 
-                df = df.reindex(columns=headers)
+                df = read_csv_preview(csv_filepath).reindex(columns=headers)
 
                 # create and set models and set row delegates
                 table_model = ReducedPandasModel(dataframe=df,
@@ -99,11 +99,8 @@ class ReducedCsvEditorDialog(CsvEditorDialog):
                 display_view.setModel(table_model)
 
                 # grab defined aliases
-                inp_data = self.app_data.input_table_data
-                out_data = self.app_data.output_table_data
-                input_alias = inp_data.loc[:, 'Alias'].tolist()
-                output_alias = out_data.loc[:, 'Alias'].tolist()
-                aliases = input_alias + output_alias
+                aliases = self.app_data.alias_index.aliases(['input',
+                                                             'output'])
 
                 # create delegates with reference anchoring
                 self._check_delegate = CheckBoxDelegate()
@@ -138,11 +135,7 @@ class ReducedCsvEditorDialog(CsvEditorDialog):
         else:
             # no duplicates or undefined found. Check if all the aliases from
             # app storage are defined
-            inp_data = self.app_data.input_table_data
-            out_data = self.app_data.output_table_data
-            input_alias = inp_data.loc[:, 'Alias'].tolist()
-            output_alias = out_data.loc[:, 'Alias'].tolist()
-            aliases = input_alias + output_alias
+            aliases = self.app_data.alias_index.aliases(['input', 'output'])
 
             all_defined = True \
                 if all(alias in checked_vars for alias in aliases) \
@@ -155,31 +148,19 @@ class ReducedCsvEditorDialog(CsvEditorDialog):
 
                 warn_the_user(msg_txt, msg_title)
             else:
-                # everything is ok, store the data and close the dialog
-                # the renaming from comboboxes
-                raw_df = self.ui.displayTableView.model()._data
-
-                # checked columns mapping
+                # everything is ok, import the checked columns (renamed with
+                # the aliases from comboboxes), store them and close the dialog
+                csv_settings = self.app_data.reduced_doe_csv_settings
                 rename = dict([(header, pair_info[header]['alias'])
                                for header in pair_info
                                if pair_info[header]['status']])
 
-                # extract checked columns, rename them and rearrange columns
-                # following the aliases order
-                df = raw_df[rename.keys()].rename(
-                    columns=rename).reindex(columns=aliases)
-
-                # append case number and status columns
-                stat_idx = self.app_data.reduced_doe_csv_settings['convergence_index']
-                df.insert(loc=0, column='status', value=raw_df[stat_idx])
-                df.insert(loc=0, column='case',
-                          value=range(1, df.shape[0] + 1))
-
-                # convert to dict and store in application data
-                self.app_data.reduced_doe_sampled_data = df
+                self.import_csv_data(csv_settings['filepath'], rename,
+                                     aliases,
+                                     csv_settings['convergence_index'])
 
-                # close the dialog
-                self.close()
+    def store_csv_data(self, df: pd.DataFrame):
+        self.app_data.reduced_doe_sampled_data = df
 
 
 if __name__ == "__main__":
@@ -2,6 +2,7 @@ import pandas as pd
 from PyQt5.QtGui import QIntValidator
 from PyQt5.QtWidgets import QApplication, QDialog
 
+from gui.calls.dialogs.lhssettings import DESIGN_METHODS
 from gui.models.data_storage import DataStorage
 from gui.views.py_files.lhssettings import Ui_Dialog
 
@@ -21,6 +22,13 @@ class LhsSettingDialog(QDialog):
         self.ui.lineEditNSamples.setText(str(lhs_settings['n_samples']))
         self.ui.lineEditNIter.setText(str(lhs_settings['n_iter']))
         self.ui.checkBoxIncVertices.setChecked(lhs_settings['inc_vertices'])
+        self.ui.comboBoxMethod.setCurrentIndex(
+            DESIGN_METHODS.index(lhs_settings.get('method', 'lhs')))
+        self.on_method_changed()
+
+        # adaptive sampling is only available in the original space
+        self.ui.groupBoxAdaptive.hide()
+        self.adjustSize()
 
         # validators
         n_samples_validator = QIntValidator(3, 1e4, self.ui.lineEditNSamples)
@@ -31,12 +39,21 @@ class LhsSettingDialog(QDialog):
 
         # --------------------------- Signals/Slots ---------------------------
         self.ui.buttonBox.accepted.connect(self.set_lhs_settings)
+        self.ui.comboBoxMethod.currentIndexChanged.connect(
+            self.on_method_changed)
 
         # ---------------------------------------------------------------------
 
     def set_lhs_settings(self):
         lhs_set = {'n_samples': int(self.ui.lineEditNSamples.text()),
                    'n_iter': int(self.ui.lineEditNIter.text()),
-                   'inc_vertices': self.ui.checkBoxIncVertices.isChecked()}
+                   'inc_vertices': self.ui.checkBoxIncVertices.isChecked(),
+                   'method': DESIGN_METHODS[
+                       self.ui.comboBoxMethod.currentIndex()]}
 
         self.app_data.reduced_doe_lhs_settings = pd.Series(lhs_set)
+
+    def on_method_changed(self):
+        # the low discrepancy sequences aren't iterated
+        method = DESIGN_METHODS[self.ui.comboBoxMethod.currentIndex()]
+        self.ui.lineEditNIter.setEnabled(method in ('lhs', 'ese', 'maximin'))
@@ -11,8 +11,9 @@ from PyQt5.QtWidgets import (
 
 from gui.calls.base import DoubleEditorDelegate, my_exception_hook
 from gui.calls.dialogs.reducedlhssettings import LhsSettingDialog
+from gui.calls.dialogs.samplingassistant import (SampledDataTableModel,
+                                                 SampledDataView)
 from gui.models.data_storage import DataStorage
-from gui.models.sampling import ReducedSamplerThread, lhs
 from gui.views.py_files.samplingassistant import Ui_Dialog
 
 
@@ -131,289 +132,42 @@ class RangeOfDisturbanceTableModel(QAbstractTableModel):
             return Qt.ItemIsEnabled | Qt.ItemIsSelectable | ~Qt.ItemIsEditable
 
 
-class SampledDataView(QTableView):
-    def setModel(self, model: QAbstractTableModel):
-        super().setModel(model)
-        for row in range(model.rowCount()):
-            for col in range(model.columnCount()):
-                span = model.span(model.index(row, col))
-                if span.height() > 1 or span.width() > 1:
-                    self.setSpan(row, col, span.height(), span.width())
+class ReducedSampledDataTableModel(SampledDataTableModel):
+    """Model of the input design (disturbances) and sampled data of the
+    reduced space sampling assistant. The manipulated variables not used as
+    design variables are sampled as outputs.
+    """
 
+    def lhs_settings(self) -> dict:
+        return self.app_data.reduced_doe_lhs_settings
 
-class SampledDataTableModel(QAbstractTableModel):
-
-    input_design_changed = pyqtSignal(bool)
-
-    # CONSTANTS
-    _INPUT_COL_OFFSET = 2
-    _HEADER_ROW_OFFSET = 2
-
-    def __init__(self, application_data: DataStorage, parent: QTableView):
-        QAbstractTableModel.__init__(self, parent)
-        self.app_data = application_data
-        self.load_data()
-
-    @property
-    def input_design(self):
-        """The input_design property."""
-        if not hasattr(self, '_input_design'):
-            # create empty input design and sample data dataframe on init
-            self._input_design = pd.DataFrame({})
-
-        self.is_input_design_generated = False
-
-        return self._input_design
-
-    @input_design.setter
-    def input_design(self, value: pd.DataFrame):
-        if not value.equals(self.input_design):
-            # if dataframe is diferent from the current one in display, warn
-            # the about layout changes, and reset case number and status cols
-            self.layoutAboutToBeChanged.emit()
-
-            self._input_design = value
-            self.dataChanged.emit(self.index(0, 0),
-                                  self.index(self.rowCount(),
-                                             self.columnCount()))
-            self.is_input_design_generated = False \
-                if value.isnull().all(axis=None) else True
-            self.input_design_changed.emit(self.is_input_design_generated)
-
-            self.layoutChanged.emit()
-
-            # number of experiments
-            n_samp = self.app_data.reduced_doe_lhs_settings['n_samples']
-            if self.app_data.reduced_doe_lhs_settings['inc_vertices']:
-                n_samp += 2 ** len(self._input_alias)  # include vertices
-
-            # create empty dataframes with NaN values
-            self._case_num = pd.DataFrame({'case': np.arange(1, n_samp + 1)})
-            self._status_sim = pd.DataFrame({'status': [''] * n_samp},
-                                            dtype=object)
-
-            # reset sampled data as well
-            self.samp_data = pd.DataFrame(np.nan, index=range(n_samp),
-                                          columns=self._output_alias,
-                                          dtype=float)
-
-    @property
-    def samp_data(self):
-        """The samp_data property."""
-        if not hasattr(self, '_samp_data'):
-            # create empty sample data dataframe on init
-            self._samp_data = pd.DataFrame({})
-
-        return self._samp_data
-
-    @samp_data.setter
-    def samp_data(self, value: pd.DataFrame):
-        if not value.equals(self._samp_data):
-            self._samp_data = value
-            self.dataChanged.emit(self.index(0, 0),
-                                  self.index(self.rowCount(),
-                                             self.columnCount()))
+    def design_bounds(self) -> pd.DataFrame:
+        return self.app_data.reduced_doe_d_bounds
 
     def load_data(self):
         # load internal headers names
-        inp_data = self.app_data.input_table_data
-        out_data = self.app_data.output_table_data
+        alias_index = self.app_data.alias_index
         self._input_alias = self.app_data.reduced_doe_d_bounds.loc[
             :, 'name'
         ].tolist()
 
-        output_mvs = inp_data.loc[~inp_data['Alias'].isin(
-            self._input_alias), 'Alias']
+        # inputs that are not sampled (consumed) are treated as outputs
+        output_mvs = [alias for alias in alias_index.aliases('input')
+                      if alias not in self._input_alias]
 
-        self._output_alias = pd.concat([out_data.loc[:, 'Alias'],
-                                        output_mvs], ignore_index=True,
-                                       axis='index', sort=False).tolist()
-
-        # self._output_alias = out_data.loc[:, 'Alias'].tolist()
+        self._output_alias = alias_index.aliases('output') + output_mvs
 
         # number of experiments
-        n_samp = self.app_data.reduced_doe_lhs_settings['n_samples']
+        n_samp = self.lhs_settings()['n_samples']
         self.input_design = pd.DataFrame(np.nan, index=range(n_samp),
                                          columns=self._input_alias,
                                          dtype=float)
 
-    def get_doe_data(self) -> pd.DataFrame:
-        """Returns the sampled DOE data as a pandas DataFrame
-        """
-        if self.samp_data.isnull().all(axis=None):
-            # if no sampling is done, return empty dataframe
-            return pd.DataFrame({})
-        else:
-            df = self._case_num.merge(self._status_sim, left_index=True,
-                                      right_index=True)
-            df = df.merge(self.input_design, left_index=True, right_index=True)
-            df = df.merge(self.samp_data, left_index=True, right_index=True)
-
-            return df
-
-    def generate_lhs(self):
-        """Generate LHS matrix and make it available to the GUI.
-        """
-        reply = QMessageBox.No
-        if self.is_input_design_generated:
-            # there is data already in display in the table, warn the user
-            msg_str = ("By clicking yes ALL data, including input and "
-                       "output already sampled will be deleted! Proceed at "
-                       "your own risk.")
-            reply = QMessageBox().question(self.parent(),
-                                           "Renew input design?",
-                                           msg_str, QMessageBox.Yes,
-                                           QMessageBox.No)
-
-        if reply == QMessageBox.Yes or not self.is_input_design_generated:
-            mv_bnds = self.app_data.reduced_doe_d_bounds
-            lhs_settings = self.app_data.reduced_doe_lhs_settings
-
-            names_list = mv_bnds['name'].tolist()
-            lb_list = mv_bnds['lb'].tolist()
-            ub_list = mv_bnds['ub'].tolist()
-
-            lhs_table = lhs(lhs_settings['n_samples'], lb_list, ub_list,
-                            lhs_settings['n_iter'],
-                            lhs_settings['inc_vertices'])
-
-            self.input_design = pd.DataFrame(lhs_table, columns=names_list)
-
-    def on_case_sampled(self, case_num: int, sampled_values: dict):
-        """Slot that performs the simulation and displays data in the table.
-
-        Parameters
-        ----------
-        case_num : int
-            Case number.
-        sampled_values : dict
-            Dictionary containing the sampled data
-        """
-        # place the convergence flag and case number
-        self._status_sim.iat[case_num - 1, 0] = sampled_values['success']
-        self._case_num.iat[case_num - 1, 0] = case_num
-
-        # delete the success key
-        del sampled_values['success']
-
-        # set output values
-        self.samp_data.iloc[case_num - 1] = sampled_values
-
-        # emit data changed signal
-        self.dataChanged.emit(
-            self.index(case_num - 1 + self._HEADER_ROW_OFFSET, 0),
-            self.index(case_num - 1 + self._HEADER_ROW_OFFSET,
-                       self.columnCount()))
-
     def on_sampling_done(self):
         """Stores the sampled data in the application storage.
         """
         self.app_data.reduced_doe_sampled_data = self.get_doe_data()
 
-    def rowCount(self, parent=None):
-        return self._HEADER_ROW_OFFSET + self.input_design.shape[0]
-
-    def columnCount(self, parent=None):
-        return self._INPUT_COL_OFFSET + self.input_design.shape[1] + \
-            self.samp_data.shape[1]
-
-    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
-        if not index.isValid():
-            return None
-
-        row = index.row()
-        col = index.column()
-
-        df_rows, inp_cols = self.input_design.shape
-        _, samp_cols = self.samp_data.shape
-        rowoffset = self._HEADER_ROW_OFFSET
-        coloffset = self._INPUT_COL_OFFSET
-
-        if role == Qt.DisplayRole:
-            if rowoffset - 1 < row < df_rows + rowoffset:
-                if coloffset - 1 < col < inp_cols + coloffset:
-                    # numeric data display of input design
-                    val = self.input_design.iat[row - rowoffset,
-                                                col - coloffset]
-                    return "{0:.7f}".format(val) if not np.isnan(val) else None
-
-                elif inp_cols + coloffset - 1 < col < inp_cols + samp_cols + \
-                        coloffset:
-                    # numeric data display of sampled data
-                    val = self.samp_data.iat[row - rowoffset,
-                                             col - (inp_cols + coloffset)]
-                    return "{0:.7f}".format(val) if not np.isnan(val) else None
-
-                elif col == 0:
-                    # case number
-                    return str(int(self._case_num.iat[row - rowoffset, 0]))
-
-                elif col == 1:
-                    # status
-                    status = self._status_sim.iat[row - rowoffset, 0]
-                    return str(status)
-
-                else:
-                    return None
-
-            elif row == 0:
-                # first row headers
-                if col == 0:
-                    return "Case Number"
-                elif col == 1:
-                    return "Status"
-                elif col == coloffset:
-                    return "Inputs"
-                elif col == coloffset + len(self._input_alias):
-                    return "Outputs"
-                else:
-                    return None
-
-            elif row == 1:
-                # second row headers
-                if coloffset - 1 < col < inp_cols + coloffset:
-                    return str(self.input_design.columns[col - coloffset])
-                elif inp_cols + coloffset - 1 < col < inp_cols + samp_cols + \
-                        coloffset:
-                    return str(self.samp_data.columns[col -
-                                                      inp_cols - coloffset])
-                else:
-                    return None
-
-        elif role == Qt.FontRole:
-            if row == 0 or row == 1:
-                df_font = QFont()
-                df_font.setBold(True)
-                return df_font
-        elif role == Qt.TextAlignmentRole:
-            return Qt.AlignCenter
-
-        else:
-            return None
-
-    def span(self, index: QModelIndex):
-        row = index.row()
-        col = index.column()
-
-        rowoffset = self._HEADER_ROW_OFFSET
-        coloffset = self._INPUT_COL_OFFSET
-
-        if row == 0:
-            if col == 0 or col == 1:
-                # case number and status column
-                return QSize(1, rowoffset)
-            elif col == coloffset:
-                # inputs
-                return QSize(len(self._input_alias), 1)
-            elif col == coloffset + len(self._input_alias):
-                # outputs
-                return QSize(len(self._output_alias), 1)
-
-            else:
-                return super().span(index)
-        else:
-            return super().span(index)
-
 
 class SamplingAssistantDialog(QDialog):
 
@@ -444,8 +198,8 @@ class SamplingAssistantDialog(QDialog):
         var_table.setItemDelegateForColumn(2, self._ub_delegate)
 
         results_table = SampledDataView(parent=self.ui.groupBox_3)
-        results_model = SampledDataTableModel(self.app_data,
-                                              parent=results_table)
+        results_model = ReducedSampledDataTableModel(self.app_data,
+                                                     parent=results_table)
         results_table.setModel(results_model)
 
         results_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
@@ -539,6 +293,8 @@ class SamplingAssistantDialog(QDialog):
     def sample_data(self):
         """View changes when the users starts the sampling.
         """
+        from gui.models.sampling import ReducedSamplerThread
+
         # disable the generate lhs, sample and export buttons
         self.ui.genLhsPushButton.setEnabled(False)
         self.ui.sampDataPushButton.setEnabled(False)
@@ -9,10 +9,10 @@ from PyQt5.QtWidgets import (
     QAbstractItemView, QApplication, QDialog, QFileDialog, QHeaderView,
     QMessageBox, QStatusBar, QTableView)
 
-from gui.calls.base import DoubleEditorDelegate, my_exception_hook
+from gui.calls.base import (CellTextCache, DoubleEditorDelegate,
+                            HeaderSpanTableView, my_exception_hook)
 from gui.calls.dialogs.lhssettings import LhsSettingDialog
 from gui.models.data_storage import DataStorage
-from gui.models.sampling import SamplerThread, lhs
 from gui.views.py_files.samplingassistant import Ui_Dialog
 
 
@@ -120,17 +120,18 @@ class InputBoundsModel(QAbstractTableModel):
             return Qt.ItemIsEnabled | Qt.ItemIsSelectable | ~Qt.ItemIsEditable
 
 
-class SampledDataView(QTableView):
-    def setModel(self, model: QAbstractTableModel):
-        super().setModel(model)
-        for row in range(model.rowCount()):
-            for col in range(model.columnCount()):
-                span = model.span(model.index(row, col))
-                if span.height() > 1 or span.width() > 1:
-                    self.setSpan(row, col, span.height(), span.width())
+class SampledDataView(HeaderSpanTableView):
+    """TableView of the sampling assistant data (see `HeaderSpanTableView`).
+    """
 
 
 class SampledDataTableModel(QAbstractTableModel):
+    """Model of the input design and sampled data of the sampling assistant.
+
+    The input design and the sampled outputs are kept side by side in a single
+    contiguous float64 block (inputs first) and their display strings are
+    cached per row (see `CellTextCache`).
+    """
 
     input_design_changed = pyqtSignal(bool)
 
@@ -141,81 +142,79 @@ class SampledDataTableModel(QAbstractTableModel):
     def __init__(self, application_data: DataStorage, parent: QTableView):
         QAbstractTableModel.__init__(self, parent)
         self.app_data = application_data
+
+        self._input_columns = []
+        self._output_alias = []
+        self._case_num = np.empty(0, dtype=int)
+        self._status_sim = np.empty(0, dtype=object)
+        self._text = CellTextCache()
+        self._text.set_values(np.empty((0, 0)))
+        self.is_input_design_generated = False
+
         self.load_data()
 
     @property
     def input_design(self):
         """The input_design property."""
-        if not hasattr(self, '_input_design'):
-            # create empty input design and sample data dataframe on init
-            self._input_design = pd.DataFrame({})
-
-        self.is_input_design_generated = False
-
-        return self._input_design
+        return pd.DataFrame(self._text.values[:, :len(self._input_columns)],
+                            columns=self._input_columns)
 
     @input_design.setter
     def input_design(self, value: pd.DataFrame):
         if not value.equals(self.input_design):
-            # if dataframe is diferent from the current one in display, warn
-            # the about layout changes, and reset case number and status cols
-            self.layoutAboutToBeChanged.emit()
+            # if dataframe is diferent from the current one in display, reset
+            # the case number, status and sampled data
+            self.beginResetModel()
 
-            self._input_design = value
-            self.dataChanged.emit(self.index(0, 0),
-                                  self.index(self.rowCount(),
-                                             self.columnCount()))
-            self.is_input_design_generated = False \
-                if value.isnull().all(axis=None) else True
-            self.input_design_changed.emit(self.is_input_design_generated)
-
-            self.layoutChanged.emit()
+            n_samp, n_inp = value.shape
+            values = np.full((n_samp, n_inp + len(self._output_alias)),
+                             np.nan)
+            values[:, :n_inp] = value.to_numpy(dtype=float)
 
-            # number of experiments
-            n_samp = self.app_data.doe_lhs_settings['n_samples']
-            if self.app_data.doe_lhs_settings['inc_vertices']:
-                n_samp += 2 ** len(self._input_alias)  # include vertices
+            self._input_columns = value.columns.tolist()
+            self._case_num = np.arange(1, n_samp + 1)
+            self._status_sim = np.full(n_samp, '', dtype=object)
+            self._text.set_values(values)
 
-            # create empty dataframes with NaN values
-            self._case_num = pd.DataFrame({'case': np.arange(1, n_samp + 1)})
-            self._status_sim = pd.DataFrame({'status': [''] * n_samp},
-                                            dtype=object)
+            self.endResetModel()
 
-            # reset sampled data as well
-            self.samp_data = pd.DataFrame(np.nan, index=range(n_samp),
-                                          columns=self._output_alias,
-                                          dtype=float)
+            self.is_input_design_generated = False \
+                if np.isnan(values[:, :n_inp]).all() else True
+            self.input_design_changed.emit(self.is_input_design_generated)
 
     @property
     def samp_data(self):
         """The samp_data property."""
-        if not hasattr(self, '_samp_data'):
-            # create empty sample data dataframe on init
-            self._samp_data = pd.DataFrame({})
-
-        return self._samp_data
+        return pd.DataFrame(self._text.values[:, len(self._input_columns):],
+                            columns=self._output_alias)
 
     @samp_data.setter
     def samp_data(self, value: pd.DataFrame):
-        if not value.equals(self._samp_data):
-            self._samp_data = value
+        if not value.equals(self.samp_data):
+            # written in place, the input design rows must match
+            self._text.values[:, len(self._input_columns):] = \
+                value.to_numpy(dtype=float)
+            self._text.invalidate_rows(0, self._text.values.shape[0] - 1)
             self.dataChanged.emit(self.index(0, 0),
-                                  self.index(self.rowCount(),
-                                             self.columnCount()))
+                                  self.index(self.rowCount() - 1,
+                                             self.columnCount() - 1))
+
+    def lhs_settings(self) -> dict:
+        """LHS settings of the input design."""
+        return self.app_data.doe_lhs_settings
+
+    def design_bounds(self) -> pd.DataFrame:
+        """Names and bounds of the input design variables."""
+        return self.app_data.doe_mv_bounds
 
     def load_data(self):
         # load internal headers names
-        inp_data = self.app_data.input_table_data
-        out_data = self.app_data.output_table_data
-        self._input_alias = inp_data.loc[
-            inp_data['Type'] == self.app_data._INPUT_ALIAS_TYPES['mv'],
-            'Alias'
-        ].tolist()
-
-        self._output_alias = out_data.loc[:, 'Alias'].tolist()
+        alias_index = self.app_data.alias_index
+        self._input_alias = alias_index.aliases('input', 'mv')
+        self._output_alias = alias_index.aliases('output')
 
         # number of experiments
-        n_samp = self.app_data.doe_lhs_settings['n_samples']
+        n_samp = self.lhs_settings()['n_samples']
         self.input_design = pd.DataFrame(np.nan, index=range(n_samp),
                                          columns=self._input_alias,
                                          dtype=float)
@@ -223,14 +222,16 @@ class SampledDataTableModel(QAbstractTableModel):
     def get_doe_data(self) -> pd.DataFrame:
         """Returns the sampled DOE data as a pandas DataFrame
         """
-        if self.samp_data.isnull().all(axis=None):
+        values = self._text.values
+        if np.isnan(values[:, len(self._input_columns):]).all():
             # if no sampling is done, return empty dataframe
             return pd.DataFrame({})
         else:
-            df = self._case_num.merge(self._status_sim, left_index=True,
-                                      right_index=True)
-            df = df.merge(self.input_design, left_index=True, right_index=True)
-            df = df.merge(self.samp_data, left_index=True, right_index=True)
+            df = pd.DataFrame(values.copy(),
+                              columns=self._input_columns +
+                              self._output_alias)
+            df.insert(0, 'status', self._status_sim.copy())
+            df.insert(0, 'case', self._case_num.copy())
 
             return df
 
@@ -249,19 +250,55 @@ class SampledDataTableModel(QAbstractTableModel):
                                            QMessageBox.No)
 
         if reply == QMessageBox.Yes or not self.is_input_design_generated:
-            mv_bnds = self.app_data.doe_mv_bounds
-            lhs_settings = self.app_data.doe_lhs_settings
+            # pydace/surropt stack is only needed once a design is generated
+            from gui.models.sampling import lhs
+
+            mv_bnds = self.design_bounds()
+            lhs_settings = self.lhs_settings()
 
             names_list = mv_bnds['name'].tolist()
             lb_list = mv_bnds['lb'].tolist()
             ub_list = mv_bnds['ub'].tolist()
 
-            lhs_table = lhs(lhs_settings['n_samples'], lb_list, ub_list,
-                            lhs_settings['n_iter'],
-                            lhs_settings['inc_vertices'])
+            try:
+                lhs_table = lhs(lhs_settings['n_samples'], lb_list, ub_list,
+                                lhs_settings['n_iter'],
+                                lhs_settings['inc_vertices'],
+                                method=lhs_settings.get('method', 'lhs'))
+            except ValueError as error:
+                # e.g. more dimensions than the Sobol sequence supports
+                QMessageBox.critical(self.parent(), "Invalid design method",
+                                     str(error), QMessageBox.Ok)
+                return
 
             self.input_design = pd.DataFrame(lhs_table, columns=names_list)
 
+    def append_input_design(self, value: pd.DataFrame):
+        """Appends points to the input design in display (e.g. the batches of
+        the adaptive sampling), with their outputs not sampled yet.
+
+        Parameters
+        ----------
+        value : pd.DataFrame
+            Points to append, with the input design columns.
+        """
+        n_rows = self._text.values.shape[0]
+        n_new = value.shape[0]
+        inp_cols = len(self._input_columns)
+
+        new_values = np.full((n_new, self._text.values.shape[1]), np.nan)
+        new_values[:, :inp_cols] = \
+            value[self._input_columns].to_numpy(dtype=float)
+
+        first = n_rows + self._HEADER_ROW_OFFSET
+        self.beginInsertRows(QModelIndex(), first, first + n_new - 1)
+        self._text.set_values(np.vstack((self._text.values, new_values)))
+        self._case_num = np.append(self._case_num,
+                                   np.arange(n_rows + 1, n_rows + n_new + 1))
+        self._status_sim = np.append(self._status_sim,
+                                     np.full(n_new, '', dtype=object))
+        self.endInsertRows()
+
     def on_case_sampled(self, case_num: int, sampled_values: dict):
         """Slot that performs the simulation and displays data in the table.
 
@@ -272,21 +309,30 @@ class SampledDataTableModel(QAbstractTableModel):
         sampled_values : dict
             Dictionary containing the sampled data
         """
+        row = case_num - 1
+        inp_cols = len(self._input_columns)
+
         # place the convergence flag and case number
-        self._status_sim.iat[case_num - 1, 0] = sampled_values['success']
-        self._case_num.iat[case_num - 1, 0] = case_num
+        self._status_sim[row] = sampled_values['success']
+        self._case_num[row] = case_num
 
         # delete the success key
         del sampled_values['success']
 
-        # set output values
-        self.samp_data.iloc[case_num - 1] = sampled_values
-
-        # emit data changed signal
+        # write the output values in place, in the preallocated row
+        out_values = self._text.values[row, inp_cols:]
+        for col, alias in enumerate(self._output_alias):
+            out_values[col] = sampled_values[alias]
+        self._text.invalidate_rows(row)
+
+        # emit data changed signal only for the cells written: case number,
+        # status and outputs of the row (the input design is unchanged)
+        table_row = row + self._HEADER_ROW_OFFSET
+        self.dataChanged.emit(self.index(table_row, 0),
+                              self.index(table_row, 1), [Qt.DisplayRole])
         self.dataChanged.emit(
-            self.index(case_num - 1 + self._HEADER_ROW_OFFSET, 0),
-            self.index(case_num - 1 + self._HEADER_ROW_OFFSET,
-                       self.columnCount()))
+            self.index(table_row, self._INPUT_COL_OFFSET + inp_cols),
+            self.index(table_row, self.columnCount() - 1), [Qt.DisplayRole])
 
     def on_sampling_done(self):
         """Stores the sampled data in the application storage.
@@ -294,11 +340,11 @@ class SampledDataTableModel(QAbstractTableModel):
         self.app_data.doe_sampled_data = self.get_doe_data()
 
     def rowCount(self, parent=None):
-        return self._HEADER_ROW_OFFSET + self.input_design.shape[0]
+        return self._HEADER_ROW_OFFSET + self._text.values.shape[0]
 
     def columnCount(self, parent=None):
-        return self._INPUT_COL_OFFSET + self.input_design.shape[1] + \
-            self.samp_data.shape[1]
+        return self._INPUT_COL_OFFSET + len(self._input_columns) + \
+            len(self._output_alias)
 
     def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
         if not index.isValid():
@@ -307,34 +353,24 @@ class SampledDataTableModel(QAbstractTableModel):
         row = index.row()
         col = index.column()
 
-        df_rows, inp_cols = self.input_design.shape
-        _, samp_cols = self.samp_data.shape
+        df_rows, df_cols = self._text.values.shape
+        inp_cols = len(self._input_columns)
         rowoffset = self._HEADER_ROW_OFFSET
         coloffset = self._INPUT_COL_OFFSET
 
         if role == Qt.DisplayRole:
             if rowoffset - 1 < row < df_rows + rowoffset:
-                if coloffset - 1 < col < inp_cols + coloffset:
-                    # numeric data display of input design
-                    val = self.input_design.iat[row - rowoffset,
-                                                col - coloffset]
-                    return "{0:.7f}".format(val) if not np.isnan(val) else None
-
-                elif inp_cols + coloffset - 1 < col < inp_cols + samp_cols + \
-                        coloffset:
-                    # numeric data display of sampled data
-                    val = self.samp_data.iat[row - rowoffset,
-                                             col - (inp_cols + coloffset)]
-                    return "{0:.7f}".format(val) if not np.isnan(val) else None
+                if coloffset - 1 < col < df_cols + coloffset:
+                    # numeric data display of input design and sampled data
+                    return self._text.text(row - rowoffset, col - coloffset)
 
                 elif col == 0:
                     # case number
-                    return str(int(self._case_num.iat[row - rowoffset, 0]))
+                    return str(int(self._case_num[row - rowoffset]))
 
                 elif col == 1:
                     # status
-                    status = self._status_sim.iat[row - rowoffset, 0]
-                    return str(status)
+                    return str(self._status_sim[row - rowoffset])
 
                 else:
                     return None
@@ -355,11 +391,9 @@ class SampledDataTableModel(QAbstractTableModel):
             elif row == 1:
                 # second row headers
                 if coloffset - 1 < col < inp_cols + coloffset:
-                    return str(self.input_design.columns[col - coloffset])
-                elif inp_cols + coloffset - 1 < col < inp_cols + samp_cols + \
-                        coloffset:
-                    return str(self.samp_data.columns[col -
-                                                      inp_cols - coloffset])
+                    return str(self._input_columns[col - coloffset])
+                elif inp_cols + coloffset - 1 < col < df_cols + coloffset:
+                    return str(self._output_alias[col - inp_cols - coloffset])
                 else:
                     return None
 
@@ -519,6 +553,8 @@ class SamplingAssistantDialog(QDialog):
     def sample_data(self):
         """View changes when the users starts the sampling.
         """
+        from gui.models.sampling import AdaptiveSamplerThread, SamplerThread
+
         # disable the generate lhs, sample and export buttons
         self.ui.genLhsPushButton.setEnabled(False)
         self.ui.sampDataPushButton.setEnabled(False)
@@ -539,7 +575,19 @@ class SamplingAssistantDialog(QDialog):
         model = self.results_table.model()
         inp_design = model.input_design
 
-        self.sampler = SamplerThread(inp_design, self.app_data)
+        lhs_settings = self.app_data.doe_lhs_settings
+        ordered = bool(lhs_settings.get('order_cases', False))
+        if lhs_settings.get('adaptive', False):
+            # the input design is the initial design, the batches are
+            # appended to the table as they are chosen
+            self.sampler = AdaptiveSamplerThread(inp_design, self.app_data,
+                                                 lhs_settings, ordered)
+            self.sampler.points_added.connect(self.on_points_added)
+            self.ui.displayProgressBar.setMaximum(
+                max(lhs_settings['max_samples'], inp_design.shape[0]))
+        else:
+            self.sampler = SamplerThread(inp_design, self.app_data, ordered)
+        self.sampler.report.connect(self.statBar.showMessage)
         self.sampler.case_sampled.connect(self.on_case_sampled)
         self.sampler.started.connect(self.statBar.clearMessage)
         self.sampler.finished.connect(self.on_sampling_finished)
@@ -557,7 +605,21 @@ class SamplingAssistantDialog(QDialog):
         """
         model = self.results_table.model()
         model.on_case_sampled(row, sampled_values)
-        self.ui.displayProgressBar.setValue(row)
+
+        # the cases may not be sampled in the design order
+        self.ui.displayProgressBar.setValue(
+            self.ui.displayProgressBar.value() + 1)
+
+    def on_points_added(self, points: pd.DataFrame):
+        """Slot that appends the points of an adaptive sampling batch to the
+        table.
+
+        Parameters
+        ----------
+        points : pd.DataFrame
+            Points of the batch.
+        """
+        self.results_table.model().append_input_design(points)
 
     def on_sampling_finished(self):
         """View changes when the sampling is finished.
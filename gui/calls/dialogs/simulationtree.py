@@ -1,76 +1,337 @@
 import pandas as pd
-import pythoncom
-from PyQt5.QtCore import (QAbstractTableModel, QEvent, QModelIndex, QObject,
-                          QPersistentModelIndex, Qt, QThread, pyqtSignal,
-                          pyqtSlot)
-from PyQt5.QtGui import QBrush, QPalette, QStandardItem, QStandardItemModel
+from PyQt5.QtCore import (QAbstractItemModel, QAbstractTableModel, QEvent,
+                          QModelIndex, QObject, QPersistentModelIndex, Qt,
+                          QThread, pyqtSignal, pyqtSlot)
+from PyQt5.QtGui import QBrush, QPalette
 from PyQt5.QtWidgets import (QApplication, QDialog, QHeaderView, QMessageBox,
                              QProgressDialog, QPushButton, QTableView,
                              QTableWidgetItem)
-from win32com.client import Dispatch
 
 from gui.calls.base import AliasEditorDelegate, ComboBoxDelegate, warn_the_user
 from gui.models.data_storage import DataStorage
-from gui.models.sim_connections import AspenConnection
+from gui.models.sim_connections import AspenConnection, shared_sessions
+from gui.models.tree_cache import (SimulationTreeCache, collapse_fetched,
+                                   leaf_paths, simulation_fingerprint)
 from gui.views.py_files.loadsimulationtree import Ui_Dialog
 
 #import ptvsd
 
 
+def _set_visible(engine, visible: bool) -> None:
+    # session job that shows or hides the simulator GUI
+    engine.Visible = 1 if visible else 0
+
+
 # TODO: Include units in table display.
 class ConnectionWorker(QObject):
+    """Worker that leases a simulation session from the application cache
+    (see `sim_connections.SimulationSessionCache`) in a background thread.
+    The connection calls run as jobs of the session, whose thread owns the
+    engine. Besides loading the variable trees, it serves the requests of
+    branches to be expanded in the lazy tree models (see `fetch_branch`). The
+    branches read are cached, so each one is read from the simulation engine
+    only once.
+
+    In 'revalidate' mode, the flowsheet, simulation data and variable paths of
+    a cached tree (`cached` entry, see `SimulationTreeCache`) are checked
+    against the simulation and the trees are loaded again if any differ.
+    """
     # signals
     connection_open = pyqtSignal()
     input_tree_loaded = pyqtSignal()
     output_tree_loaded = pyqtSignal()
-    connection_id_created = pyqtSignal(object)  # emits the server ID
-
-    def __init__(self, app_data: DataStorage, mode: str = 'tree', parent=None):
+    session_leased = pyqtSignal(object)  # emits the simulation session
+    branch_fetched = pyqtSignal(str, str, object)  # iotype, path, branch
+    simulation_info_read = pyqtSignal(object)  # flowsheet and sim. data
+    tree_validated = pyqtSignal()
+    tree_outdated = pyqtSignal()
+
+    def __init__(self, app_data: DataStorage, mode: str = 'tree',
+                 cached: dict = None, parent=None):
         super().__init__(parent)
         self.app_data = app_data
-        if mode in ['tree', 'open']:
+        if mode in ['tree', 'open', 'revalidate']:
             self.mode = mode
         else:
             raise ValueError("Invalid mode!")
 
+        self.cached = {} if cached is None else cached
+        self.flowsheet = self.cached.get('flowsheet', None)
+        self.session = None
+        self._branch_cache = {}
+
     @pyqtSlot()
     def open_connection(self):
         #ptvsd.debug_this_thread()
 
-        # open the connection
-        pythoncom.CoInitialize()
-        self.connection = AspenConnection(self.app_data.simulation_file)
+        # lease a session, warm if the file was already opened
+        sim_file = self.app_data.simulation_file
+        self.session = shared_sessions().lease(sim_file)
+        self.connection = self.session.run(
+            lambda engine: AspenConnection.from_engine(sim_file, engine))
         self.connection_open.emit()
 
         if self.mode == 'open':
-            self.create_connection_id()
+            self.share_session()
+
+    def _call(self, method: str, *args, **kwargs):
+        # connection method called in the session thread
+        return self.session.run(
+            lambda engine: getattr(self.connection, method)(*args, **kwargs))
 
     @pyqtSlot()
     def load_tree(self):
         self.open_connection()
+        self._read_trees()
+        self.share_session()
 
+    @pyqtSlot()
+    def revalidate_tree(self):
+        self.open_connection()
+
+        cached = self.cached
+        if self._call('get_flowsheet_nodes') == cached['flowsheet'] and \
+                self._call('get_simulation_data') == \
+                cached['simulation_data'] and \
+                len(self._call('find_missing_nodes', cached['paths'])) == 0:
+            # same flowsheet, data and variables, the cached trees are valid
+            self.tree_validated.emit()
+        else:
+            self.tree_outdated.emit()
+            self._read_trees()
+
+        self.share_session()
+
+    def _read_trees(self):
         # load and store simulation data dictionary
+        sim_data = self._call('get_simulation_data')
         self.app_data.simulation_data = self.app_data._uneven_array_to_frame(
-            self.connection.get_simulation_data())
+            sim_data)
 
-        # load the trees
-        input_tree = self.connection.get_simulation_partial_io_tree('input')
+        self.flowsheet = self._call('get_flowsheet_nodes')
+        self.simulation_info_read.emit({'flowsheet': self.flowsheet,
+                                        'simulation_data': sim_data})
+
+        # load the trees down to the catalogue variables only, their branches
+        # are fetched when expanded in the tree views
+        input_tree = self._call('get_simulation_partial_io_tree', 'input',
+                                max_depth=0)
         self.app_data.tree_model_input = input_tree
         self.input_tree_loaded.emit()
 
-        output_tree = self.connection.get_simulation_partial_io_tree('output')
+        output_tree = self._call('get_simulation_partial_io_tree', 'output',
+                                 max_depth=0)
         self.app_data.tree_model_output = output_tree
         self.output_tree_loaded.emit()
 
-        self.create_connection_id()
+    @pyqtSlot(str, str)
+    def fetch_branch(self, iotype: str, node_path: str):
+        key = (iotype, node_path)
+        if key not in self._branch_cache:
+            self._branch_cache[key] = self._call('get_simulation_branch',
+                                                 node_path, iotype)
+
+        self.branch_fetched.emit(iotype, node_path, self._branch_cache[key])
 
     @pyqtSlot()
-    def create_connection_id(self):
-        # create the COM server ID (this enables connection from form thread)
-        self.connection_id = pythoncom.CoMarshalInterThreadInterfaceInStream(
-            pythoncom.IID_IDispatch,
-            self.connection.get_connection_object())
-        self.connection_id_created.emit(self.connection_id)
+    def share_session(self):
+        # the dialog uses the session for the simulator GUI (visibility)
+        self.session_leased.emit(self.session)
+
+
+class _TreeItem:
+    """Wrapper of a JSON tree node (dict) used as internal pointer of the
+    `SimulationTreeModel` indexes. The children items are only created when
+    requested.
+    """
+
+    def __init__(self, node: dict, parent=None):
+        self.node = node
+        self.parent = parent
+        self.fetching = False
+        self._children = None
+
+    @property
+    def children(self) -> list:
+        if self._children is None:
+            self._children = [_TreeItem(child, self)
+                              for child in self.node.get('children', [])]
+        return self._children
+
+    @property
+    def name(self) -> str:
+        return self.node['node']
+
+    @property
+    def is_lazy(self) -> bool:
+        return self.node.get('lazy', False)
+
+    @property
+    def is_branch(self) -> bool:
+        # branches keep their 'children' list, even when empty
+        return self.is_lazy or 'children' in self.node
+
+    def row(self) -> int:
+        return self.parent.children.index(self) if self.parent else 0
+
+    def path(self) -> str:
+        branch_list = []
+        item = self
+        while item.parent is not None:
+            branch_list.append(item.name.lstrip())
+            item = item.parent
+
+        return '\\' + '\\'.join(reversed(branch_list))
+
+    def update(self, branch: dict) -> None:
+        # a fetched node was lazy, so it is a branch even with no children
+        self.node.pop('lazy', None)
+        self.node.update({k: v for k, v in branch.items() if k != 'node'})
+        self.node.setdefault('children', [])
+        self.node['fetched'] = True
+        self._children = None
+        self.fetching = False
+
+
+class SimulationTreeModel(QAbstractItemModel):
+    """Tree model of the simulation variables backed by the JSON tree
+    dictionaries (see `AspenConnection.get_simulation_partial_io_tree`).
+
+    Nodes flagged as 'lazy' have their children requested through the
+    `fetch_requested` signal when they are expanded. The fetched branches are
+    written back in the JSON tree, so they are kept in the application data.
+
+    Parameters
+    ----------
+    header : str
+        Header text of the tree view.
+    iotype : str ('input', 'output')
+        Type of variables of the tree.
+    parent : QObject, optional
+        Parent object.
+    """
+    fetch_requested = pyqtSignal(str, str)  # iotype, path
+
+    def __init__(self, header: str, iotype: str, parent=None):
+        QAbstractItemModel.__init__(self, parent)
+        self.header = header
+        self.iotype = iotype
+        self._root = _TreeItem({'node': '', 'children': []})
+
+    def set_tree(self, tree: dict) -> None:
+        self.beginResetModel()
+        self._root = _TreeItem({'node': '',
+                                'children': [tree] if len(tree) != 0 else []})
+        self.endResetModel()
+
+    def item(self, index: QModelIndex) -> _TreeItem:
+        return index.internalPointer() if index.isValid() else self._root
+
+    def is_leaf(self, index: QModelIndex) -> bool:
+        return not self.item(index).is_branch
+
+    def node_path(self, index: QModelIndex) -> str:
+        return self.item(index).path()
+
+    def index(self, row: int, column: int,
+              parent: QModelIndex = QModelIndex()):
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+
+        return self.createIndex(row, column, self.item(parent).children[row])
+
+    def parent(self, index: QModelIndex):
+        if not index.isValid():
+            return QModelIndex()
+
+        parent_item = index.internalPointer().parent
+        if parent_item is None or parent_item is self._root:
+            return QModelIndex()
+
+        return self.createIndex(parent_item.row(), 0, parent_item)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()):
+        if parent.column() > 0:
+            return 0
+
+        return len(self.item(parent).children)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()):
+        return 1
+
+    def hasChildren(self, parent: QModelIndex = QModelIndex()):
+        item = self.item(parent)
+        return item.is_lazy or len(item.children) != 0
+
+    def canFetchMore(self, parent: QModelIndex):
+        item = self.item(parent)
+        return item.is_lazy and not item.fetching
+
+    def fetchMore(self, parent: QModelIndex):
+        if not self.canFetchMore(parent):
+            return
+
+        item = self.item(parent)
+        item.fetching = True
+        self.fetch_requested.emit(self.iotype, item.path())
+
+    def insert_branch(self, node_path: str, branch: dict) -> None:
+        """Inserts a fetched branch in place of the lazy node at `node_path`.
+        (SLOT)
+        """
+        item = self._root
+        for name in node_path.lstrip('\\').split('\\'):
+            item = next((child for child in item.children
+                         if child.name.lstrip() == name), None)
+            if item is None:
+                # the tree was replaced while the branch was fetched
+                return
+
+        if not item.is_lazy:
+            return
+
+        index = self.createIndex(item.row(), 0, item)
+        n_children = len(branch.get('children', []))
+
+        if n_children != 0:
+            self.beginInsertRows(index, 0, n_children - 1)
+            item.update(branch)
+            self.endInsertRows()
+        else:
+            # empty branch, kept as a branch that can't be selected
+            item.update(branch)
+            self.dataChanged.emit(index, index)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        node = index.internalPointer().node
+
+        if role == Qt.DisplayRole:
+            return node['node']
+        elif role == Qt.ToolTipRole:
+            return node.get('description', None)
+        else:
+            return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation,
+                   role: int = Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.header
+        else:
+            return None
+
+    def flags(self, index: QModelIndex):
+        if not index.isValid():
+            return Qt.NoItemFlags
+
+        item = self.item(index)
+        if item.is_branch and not item.is_lazy and len(item.children) == 0:
+            # empty branch, nothing to select in it
+            return Qt.ItemIsEnabled
+
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
 
 
 class VariableTableModel(QAbstractTableModel):
@@ -142,12 +403,9 @@ class VariableTableModel(QAbstractTableModel):
         elif role == Qt.BackgroundRole:
             if self.variable_data.columns[col] == 'Alias':
                 # paints red if duplicates are found between input/output
-                aliases = pd.concat([self.app_data.input_table_data,
-                                     self.app_data.output_table_data],
-                                    axis='index', ignore_index=True,
-                                    sort=False)
+                alias_index = self.app_data.alias_index
 
-                if aliases['Alias'].value_counts()[value] > 1:
+                if alias_index.count(value, ['input', 'output']) > 1:
                     return QBrush(Qt.red)
                 else:
                     return QBrush(self.parent().palette().brush(
@@ -259,9 +517,16 @@ class VariableTableModel(QAbstractTableModel):
 
 
 class LoadSimulationTreeDialog(QDialog):
+    # requests a branch to the connection worker (iotype, path)
+    branch_requested = pyqtSignal(str, str)
+
     def __init__(self, application_database: DataStorage):
         # ------------------------ Internal Variables -------------------------
         self.app_data = application_database
+        self.tree_cache = SimulationTreeCache()
+        self._fingerprint = None
+        self._sim_info = {}
+        self.progress_dialog = None
 
         # ------------------------ Form Initialization ------------------------
         super().__init__()
@@ -317,25 +582,25 @@ class LoadSimulationTreeDialog(QDialog):
         # ---------------------------------------------------------------------
 
     def open_simulator_gui(self, checkstate: Qt.CheckState):
-        # check if there is a connection object and open if not
-        if not hasattr(self, 'aspen_com'):
-            # FIXME: set an apropriate logic that doesn't freeze the UI
-            self.aspen_com = AspenConnection(self.app_data.simulation_file)
-
-        con_obj = self.aspen_com.get_connection_object()
+        self._simulator_visible = checkstate == Qt.Checked
+        if getattr(self, 'session', None) is None:
+            # the visibility is set once the session is leased
+            if not hasattr(self, 'connection_worker'):
+                self.start_connection_worker(mode='open')
+            return
 
-        if checkstate == Qt.Checked:
-            con_obj.Visible = 1
-        else:
-            con_obj.Visible = 0
+        # the engine belongs to the session thread
+        self.session.submit(_set_visible, self._simulator_visible)
 
     def create_tree_models(self):
-        input_tree_dict_model = QStandardItemModel()
-        output_tree_model = QStandardItemModel()
+        input_tree_dict_model = SimulationTreeModel('Input variables',
+                                                    'input', parent=self)
+        output_tree_model = SimulationTreeModel('Output variables',
+                                                'output', parent=self)
 
-        # place the headers texts
-        input_tree_dict_model.setHorizontalHeaderLabels(['Input variables'])
-        output_tree_model.setHorizontalHeaderLabels(['Output variables'])
+        # lazy nodes are fetched by the connection worker
+        input_tree_dict_model.fetch_requested.connect(self.request_branch)
+        output_tree_model.fetch_requested.connect(self.request_branch)
 
         # set the models in the views
         self.ui.treeViewInput.setModel(input_tree_dict_model)
@@ -358,7 +623,38 @@ class LoadSimulationTreeDialog(QDialog):
     def load_tree(self):
         """Opens the connection with the simulation engine and loads the
         variable tree.
+
+        If the simulation file was already loaded (same content and variable
+        catalogue), the cached trees are shown without opening the simulation
+        engine. If only an outdated tree of the same file is cached, it is
+        shown (with its fetched branches collapsed) while it is checked in
+        background, and the trees are reloaded if the flowsheet, simulation
+        data or variable paths changed.
         """
+        sim_file = self.app_data.simulation_file
+        self._fingerprint = simulation_fingerprint(sim_file)
+
+        entry = self.tree_cache.get(self._fingerprint)
+        if len(entry) != 0:
+            self.apply_cached_trees(entry)
+            return
+
+        entry = self.tree_cache.get_latest(sim_file)
+        if len(entry) != 0 and 'paths' in entry:
+            # the fetched branches may have changed with the file
+            entry = dict(entry, input=collapse_fetched(entry['input']),
+                         output=collapse_fetched(entry['output']))
+            entry['paths'] = leaf_paths(entry['input']) + \
+                leaf_paths(entry['output'])
+            self.apply_cached_trees(entry)
+
+            # nothing is selected from the trees until they are validated
+            self.ui.pushButtonLoadTreeFromFile.setEnabled(False)
+            self.ui.pushButtonOK.setEnabled(False)
+            self.progress_dialog = None
+            self.start_connection_worker(mode='revalidate', cached=entry)
+            return
+
         # disable the load tree and ok buttons
         self.ui.pushButtonLoadTreeFromFile.setEnabled(False)
         self.ui.pushButtonOK.setEnabled(False)
@@ -374,8 +670,28 @@ class LoadSimulationTreeDialog(QDialog):
 
         self.progress_dialog = progress_dialog
 
+        self.start_connection_worker(mode='tree')
+
+    def start_connection_worker(self, mode: str, cached: dict = None):
+        """Starts the worker thread that owns the simulation connection.
+
+        Parameters
+        ----------
+        mode : str ('tree', 'open', 'revalidate')
+            Whether to load the variable trees, just open the connection or
+            check the cached trees against the simulation flowsheet.
+        cached : dict, optional
+            Cache entry of the trees checked ('revalidate' mode only).
+        """
+        # stop the previous worker (e.g. trees being reloaded)
+        self.stop_connection_worker()
+
+        # requests made before the connection is open are queued
+        self._pending_branches = []
+
         self.connection_worker = ConnectionWorker(app_data=self.app_data,
-                                                  mode='tree')
+                                                  mode=mode,
+                                                  cached=cached)
         self.connection_thread = QThread()
 
         # connect worker signals
@@ -388,26 +704,115 @@ class LoadSimulationTreeDialog(QDialog):
         self.connection_worker.output_tree_loaded.connect(
             self.on_output_tree_loaded
         )
-        self.connection_worker.connection_id_created.connect(
-            self.on_connection_id_created
+        self.connection_worker.session_leased.connect(
+            self.on_session_leased
+        )
+        self.connection_worker.branch_fetched.connect(self.on_branch_fetched)
+        self.connection_worker.simulation_info_read.connect(
+            self.on_simulation_info_read
         )
+        self.connection_worker.tree_validated.connect(self.on_tree_validated)
+        self.connection_worker.tree_outdated.connect(self.on_tree_outdated)
+        self.branch_requested.connect(self.connection_worker.fetch_branch)
 
         # move worker to thread
         self.connection_worker.moveToThread(self.connection_thread)
 
         # connect thread to load slot
-        self.connection_thread.started.connect(
-            self.connection_worker.load_tree
-        )
+        if mode == 'tree':
+            self.connection_thread.started.connect(
+                self.connection_worker.load_tree
+            )
+        elif mode == 'revalidate':
+            self.connection_thread.started.connect(
+                self.connection_worker.revalidate_tree
+            )
+        else:
+            self.connection_thread.started.connect(
+                self.connection_worker.open_connection
+            )
 
         # start the thread
         self.connection_thread.start()
 
+    def stop_connection_worker(self):
+        """Stops the connection worker thread and returns its session to the
+        application cache.
+        """
+        if not hasattr(self, 'connection_thread'):
+            return
+
+        self.connection_thread.quit()
+        self.connection_thread.wait()
+
+        if self.connection_worker.session is not None:
+            shared_sessions().release(self.connection_worker.session)
+            self.connection_worker.session = None
+
+        self.session = None
+
+    def request_branch(self, iotype: str, node_path: str):
+        """Forwards the request of a lazy node expansion to the connection
+        worker. Opens the connection if there is none (e.g. trees loaded from
+        a .mtc file).
+        """
+        if not hasattr(self, 'connection_worker'):
+            self.start_connection_worker(mode='open')
+
+        if getattr(self, 'session', None) is not None:
+            self.branch_requested.emit(iotype, node_path)
+        else:
+            # connection not opened yet
+            self._pending_branches.append((iotype, node_path))
+
+    def on_branch_fetched(self, iotype: str, node_path: str, branch: dict):
+        tree_view = self.ui.treeViewInput if iotype == 'input' \
+            else self.ui.treeViewOutput
+        tree_view.model().insert_branch(node_path, branch)
+
+    def apply_cached_trees(self, entry: dict):
+        """Shows the trees of a cache entry (see `SimulationTreeCache`).
+        """
+        self._sim_info = {'flowsheet': entry['flowsheet'],
+                          'simulation_data': entry['simulation_data']}
+
+        self.app_data.simulation_data = self.app_data._uneven_array_to_frame(
+            entry['simulation_data'])
+        self.app_data.tree_model_input = entry['input']
+        self.app_data.tree_model_output = entry['output']
+
+        self.populate_tree(self.ui.treeViewInput.model(),
+                           self.app_data.tree_model_input)
+        self.populate_tree(self.ui.treeViewOutput.model(),
+                           self.app_data.tree_model_output)
+
+    def store_trees_in_cache(self):
+        """Stores the current trees (including the branches fetched so far) in
+        the tree cache.
+        """
+        if self._fingerprint is None or len(self._sim_info) == 0:
+            return
+
+        entry = dict(self._sim_info,
+                     input=self.app_data.tree_model_input,
+                     output=self.app_data.tree_model_output,
+                     paths=leaf_paths(self.app_data.tree_model_input) +
+                     leaf_paths(self.app_data.tree_model_output))
+        self.tree_cache.put(self.app_data.simulation_file, self._fingerprint,
+                            entry)
+
     def on_connection_opened(self):
-        self.progress_dialog.setLabelText('Loading input tree variables...')
+        if self.progress_dialog is not None:
+            self.progress_dialog.setLabelText(
+                'Loading input tree variables...')
+
+    def on_simulation_info_read(self, sim_info: dict):
+        self._sim_info = sim_info
 
     def on_input_tree_loaded(self):
-        self.progress_dialog.setLabelText('Loading output tree variables...')
+        if self.progress_dialog is not None:
+            self.progress_dialog.setLabelText(
+                'Loading output tree variables...')
 
         self.populate_tree(self.ui.treeViewInput.model(),
                            self.app_data.tree_model_input)
@@ -416,80 +821,71 @@ class LoadSimulationTreeDialog(QDialog):
         self.populate_tree(self.ui.treeViewOutput.model(),
                            self.app_data.tree_model_output)
 
+        self.store_trees_in_cache()
+
         # close progress dialog
-        self.progress_dialog.setMaximum(1)
-        self.progress_dialog.setValue(1)
+        if self.progress_dialog is not None:
+            self.progress_dialog.setMaximum(1)
+            self.progress_dialog.setValue(1)
 
         # Enable the load tree and ok buttons
         self.ui.pushButtonLoadTreeFromFile.setEnabled(True)
         self.ui.pushButtonOK.setEnabled(True)
 
-    def on_connection_id_created(self, connection_id):
-        # make the server available to this thread
-        pythoncom.CoInitialize()
-        self.aspen_com = AspenConnection(self.app_data.simulation_file)
+    def on_tree_validated(self):
+        # the cached trees match the simulation, store them under the new
+        # fingerprint of the simulation file
+        self.store_trees_in_cache()
 
-        # populate internal connection variable of AspenConnection class
-        # this is a horrendous fix... it works though!
-        self.aspen_com._aspen = Dispatch(
-            pythoncom.CoGetInterfaceAndReleaseStream(connection_id,
-                                                     pythoncom.IID_IDispatch)
-        )
-
-        # quit the thread
-        if hasattr(self, 'connection_thread'):
-            self.connection_thread.quit()
+        self.ui.pushButtonLoadTreeFromFile.setEnabled(True)
+        self.ui.pushButtonOK.setEnabled(True)
 
-    def populate_tree(self, model: QStandardItemModel, tree_nodes: dict):
+    def on_tree_outdated(self):
+        # drop the cached trees and data while they are loaded again
+        self._sim_info = {}
+        self.app_data.tree_model_input = {}
+        self.app_data.tree_model_output = {}
+        self.populate_tree(self.ui.treeViewInput.model(), {})
+        self.populate_tree(self.ui.treeViewOutput.model(), {})
+
+    def on_session_leased(self, session):
+        if session is not self.connection_worker.session:
+            # session of a worker already stopped
+            return
+
+        self.session = session
+        if getattr(self, '_simulator_visible', False):
+            self.session.submit(_set_visible, True)
+
+        # the thread is kept alive to serve the branch requests of the lazy
+        # trees, send the ones queued while the connection was opening
+        for iotype, node_path in self._pending_branches:
+            self.branch_requested.emit(iotype, node_path)
+        self._pending_branches = []
+
+    def populate_tree(self, model: SimulationTreeModel, tree_nodes: dict):
         """Populates the model of a tree view.
 
         Parameters
         ----------
-        model : QStandardItemModel
+        model : SimulationTreeModel
             TreeView model.
         tree_nodes : dict
-            Dictionary containing the tree representation.
-        """
-        # clear all the current rows
-        model.removeRows(0, model.rowCount())
-
-        # append new rows
-        model.appendRow(self.traverse_json_tree(tree_nodes))
-
-    def traverse_json_tree(self, root_node: dict) -> QStandardItem:
-        """Traverses a JSON dictionary tree representation through recursion.
-
-        Parameters
-        ----------
-        root_node : dict
-            Dictionary which is the root of the tree. See notes for node
+            Dictionary containing the tree representation. See notes for node
             representation.
 
-        Returns
-        -------
-        QStandardItem
-            Root of the tree as a QStandardItem.
-
         Notes
         -----
-        The `root_node` and subsequent nodes has to be in the following format:
+        The `tree_nodes` and subsequent nodes has to be in the following
+        format:
             node = {'node': str_name_of_node,
                     'children': list_of_nodes,
-                    'description': str_tooltip_description_of_node}
+                    'description': str_tooltip_description_of_node,
+                    'lazy': True if the children were not read yet}
 
         Where list_of_nodes is, literally, a list of nodes. Duh.
-
         """
-        rn = QStandardItem(root_node['node'])
-        rn.setEditable(False)
-        if 'description' in root_node:
-            rn.setToolTip(root_node['description'])
-
-        if 'children' in root_node:
-            for child in root_node['children']:
-                rn.appendRow(self.traverse_json_tree(child))
-
-        return rn
+        model.set_tree(tree_nodes)
 
     def double_click_on_tree(self):
         """Slot (function) that handles double click event on a single leaf
@@ -507,28 +903,16 @@ class LoadSimulationTreeDialog(QDialog):
         # get the model index of the node clicked
         index_selected = tree_view.currentIndex()
 
-        if not tree_model.itemFromIndex(index_selected).hasChildren():
+        if tree_model.is_leaf(index_selected):
             # Only proceed if the selected node is a leaf
 
-            # intialize node construction
-            branch_list = [tree_model.data(index_selected).lstrip()]
-
-            # traverse the nodes upwards (stop on root node)
-            parent_node = tree_model.itemFromIndex(index_selected).parent()
-            while parent_node is not None:
-                parent_node_name = parent_node.text().lstrip()
-                branch_list.append(parent_node_name)
-                parent_node = parent_node.parent()
-
             # create the full path string
-            fullpath = '\\' + '\\'.join(list(reversed(branch_list)))
+            fullpath = tree_model.node_path(index_selected)
 
             # verify if full path is already in the table
-            current_paths = pd.concat([self.app_data.input_table_data,
-                                       self.app_data.output_table_data],
-                                      axis='index',
-                                      ignore_index=True,
-                                      sort=False)['Path'].tolist()
+            current_paths = [
+                var['Path'] for var in
+                self.app_data.alias_index.records(['input', 'output'])]
 
             if fullpath in current_paths:
                 # the variable is already in table, warn the user
@@ -632,9 +1016,12 @@ class LoadSimulationTreeDialog(QDialog):
                 widget.selectionModel().clearSelection()
 
     def closeEvent(self, event):
-        # clean up of the aspen connection if there is one
-        if hasattr(self, 'aspen_com'):
-            self.aspen_com.close_connection()
+        # keep the branches fetched during this session
+        self.store_trees_in_cache()
+
+        # stop the connection worker thread, its session is kept warm for
+        # the next stages
+        self.stop_connection_worker()
 
         super().closeEvent(event)
 
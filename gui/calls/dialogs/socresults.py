@@ -1,16 +1,19 @@
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-from matplotlib.backends.backend_agg import FigureCanvasAgg
-from PyQt5.QtCore import QAbstractTableModel, QModelIndex, QRect, Qt
-from PyQt5.QtGui import QFont, QImage, QPainter, QPixmap
+from PyQt5.QtCore import (QAbstractTableModel, QModelIndex, QRectF, Qt,
+                          pyqtSignal)
+from PyQt5.QtGui import QFont, QPainter, QPixmap
 from PyQt5.QtWidgets import (QApplication, QComboBox, QDialog, QHeaderView,
-                             QItemDelegate, QStyle, QStyleOptionViewItem,
+                             QItemDelegate, QStyleOptionViewItem,
                              QTableView)
 from pysoc.bnb import pb3wc
 from pysoc.soc import helm
 
 from gui.models.data_storage import DataStorage
+from gui.models.equation_cache import (DEFAULT_CACHE_FOLDER,
+                                       EquationImageCache,
+                                       EquationRenderThread,
+                                       combination_equation, render_equation)
 from gui.views.py_files.socresults import Ui_Dialog
 
 
@@ -80,71 +83,78 @@ class LossTableModel(QAbstractTableModel):
 
 
 def tex2pixmap(equation: str, font_size: int):
-    # matplotlib render
-    fig = plt.Figure()
-    fig.patch.set_facecolor('none')
-    fig.set_canvas(FigureCanvasAgg(fig))
-    renderer = fig.canvas.get_renderer()
-
-    # plot expression
-    ax = fig.add_axes([0, 0, 1, 1])
-    ax.axis('off')
-    ax.patch.set_facecolor('none')
-    t = ax.text(0, 0, r'${}$'.format(equation), ha='left', va='bottom',
-                fontsize=font_size)
-
-    # fit figure
-    fwidth, fheight = fig.get_size_inches()
-    fig_bbox = fig.get_window_extent(renderer)
-
-    text_bbox = t.get_window_extent(renderer)
-
-    tight_fwidth = text_bbox.width * fwidth / fig_bbox.width
-    tight_fheight = text_bbox.height * fheight / fig_bbox.height
-
-    fig.set_size_inches(tight_fwidth, tight_fheight)
-
-    # convert to pixmap
-    buf, size = fig.canvas.print_to_buffer()
-    qimage = QImage.rgbSwapped(QImage(buf, size[0], size[1],
-                                      QImage.Format_ARGB32))
-    qpixmap = QPixmap(qimage)
-
-    return qpixmap
+    return QPixmap.fromImage(render_equation(equation, font_size))
 
 
 class EquationDelegate(QItemDelegate):
-
-    def __init__(self, dataframe: pd.DataFrame, parent=None):
+    """Draws the rows of the H matrix as LaTeX equations. The equations are
+    rendered in the background when the matrix is set (`set_dataframe`) and
+    repainting just draws the cached images; rows not rendered yet show the
+    plain equation text meanwhile.
+    """
+    equations_rendered = pyqtSignal()
+
+    def __init__(self, dataframe: pd.DataFrame,
+                 cache: EquationImageCache = None, font_size: int = 8,
+                 parent=None):
         super().__init__(parent)
+        self.cache = cache if cache is not None else EquationImageCache()
+        self.font_size = font_size
+        self._thread = None
+        self.set_dataframe(dataframe)
+
+    def _pixel_ratio(self) -> float:
+        view = self.parent()
+        return view.devicePixelRatioF() if view is not None else 1.0
+
+    def set_dataframe(self, dataframe: pd.DataFrame):
         self.df = dataframe.copy()
+        self.equations = [combination_equation(self.df.iloc[row, :])
+                          for row in range(self.df.shape[0])]
+
+        self.stop_rendering()
+        if len(self.equations) > 0:
+            self._thread = EquationRenderThread(
+                self.cache, self.equations, self.font_size,
+                self._pixel_ratio(), parent=self)
+            self._thread.equation_rendered.connect(
+                lambda row: self.equations_rendered.emit())
+            self._thread.start()
+
+    def stop_rendering(self):
+        if self._thread is not None:
+            self._thread.requestInterruption()
+            self._thread.wait()
+            self._thread = None
 
     def paint(self, painter: QPainter, option: QStyleOptionViewItem,
               index: QModelIndex):
-        # load pix map
-        row = index.row()
-        col = index.column()
-
-        if not self.df.empty:
-
-            eq = ""
-            for col in range(self.df.shape[1]):
-                value = self.df.iat[row, col]
-                if not np.isnan(value):
-                    eq += " {0:+.5f} {1}".format(value,
-                                                 self.df.columns[col]).strip("+")
+        if self.df.empty:
+            super().paint(painter, option, index)
+            return
 
-            pixmap = tex2pixmap(eq, font_size=8)
+        eq = self.equations[index.row()]
+        ratio = painter.device().devicePixelRatioF()
+        image = self.cache.get(eq, self.font_size, ratio)
+        if image is None and (self._thread is None or
+                              self._thread.isFinished()):
+            # not queued for rendering (e.g. moved to another screen)
+            try:
+                image = self.cache.render(eq, self.font_size, ratio)
+            except (ValueError, RuntimeError):
+                image = None
 
-            # position pixmap
-            x = option.rect.center().x() - pixmap.rect().width() / 2
-            y = option.rect.center().y() - pixmap.rect().height() / 2
+        if image is None:
+            painter.drawText(option.rect, Qt.AlignCenter, eq)
+            return
 
-            painter.drawPixmap(QRect(x, y, pixmap.rect().width(),
-                                     pixmap.rect().height()), pixmap)
+        # position image (logical size)
+        width = image.width() / image.devicePixelRatio()
+        height = image.height() / image.devicePixelRatio()
+        x = option.rect.center().x() - width / 2
+        y = option.rect.center().y() - height / 2
 
-        else:
-            super().paint(painter, option, index)
+        painter.drawImage(QRectF(x, y, width, height), image)
 
 
 class HTableModel(QAbstractTableModel):
@@ -366,7 +376,12 @@ class SocResultsDialog(QDialog):
         h_table = self.ui.hMatrixTableView
         h_model = HTableModel(pd.DataFrame({}), parent=h_table)
         h_table.setModel(h_model)
-        self.eq_delegate = EquationDelegate(dataframe=pd.DataFrame({}))
+        self.eq_delegate = EquationDelegate(
+            dataframe=pd.DataFrame({}),
+            cache=EquationImageCache(cache_folder=str(DEFAULT_CACHE_FOLDER)),
+            parent=h_table)
+        self.eq_delegate.equations_rendered.connect(
+            h_table.viewport().update)
 
         h_table.setItemDelegateForColumn(0, self.eq_delegate)
 
@@ -390,6 +405,15 @@ class SocResultsDialog(QDialog):
         self.ui.closeDialogPushButton.clicked.connect(self.close)
         # ---------------------------------------------------------------------
 
+    def closeEvent(self, event):
+        self.eq_delegate.stop_rendering()
+        super().closeEvent(event)
+
+    def reject(self):
+        # dismissed with Esc doesn't go through closeEvent
+        self.eq_delegate.stop_rendering()
+        super().reject()
+
     def on_subset_size_changed(self, ss_size: str):
         # loads the loss and h table models based on subset size selected in
         # combobox
@@ -433,7 +457,7 @@ class SocResultsDialog(QDialog):
         h_model = self.ui.hMatrixTableView.model()
         h_model.set_dataframe(h_values)
 
-        self.eq_delegate.df = h_values
+        self.eq_delegate.set_dataframe(h_values)
 
     def on_combo_set_number_changed(self, set_number: str):
         ss_size = self.ui.subsetSizeComboBox.currentText()
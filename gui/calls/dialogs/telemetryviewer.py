@@ -0,0 +1,207 @@
+import traceback
+
+import numpy as np
+import pandas as pd
+from PyQt5.QtCore import (QAbstractTableModel, QModelIndex, Qt, QThread,
+                          pyqtSignal)
+from PyQt5.QtGui import QFont
+from PyQt5.QtWidgets import QApplication, QDialog, QHeaderView, QMessageBox
+
+from gui.models.telemetry import iteration_table, replay, run_summary
+from gui.views.py_files.telemetryviewer import Ui_Dialog
+
+
+class TelemetryTableModel(QAbstractTableModel):
+    def __init__(self, table: pd.DataFrame, parent=None):
+        super().__init__(parent)
+        self.df = table
+
+    def load_table(self, table: pd.DataFrame):
+        self.layoutAboutToBeChanged.emit()
+        self.df = table
+        self.layoutChanged.emit()
+
+    def rowCount(self, parent=None):
+        return self.df.shape[0]
+
+    def columnCount(self, parent=None):
+        return self.df.shape[1]
+
+    def headerData(self, section: int, orientation: Qt.Orientation,
+                   role: int = Qt.DisplayRole):
+        if self.df.empty:
+            return None
+
+        if role == Qt.DisplayRole:
+            if orientation == Qt.Horizontal:
+                return self.df.columns[section]
+            else:
+                return None
+
+        elif role == Qt.FontRole:
+            df_font = QFont()
+            df_font.setBold(True)
+            return df_font
+
+        elif role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+
+        else:
+            return None
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid() or self.df.empty:
+            return None
+
+        value = self.df.iat[index.row(), index.column()]
+
+        if role == Qt.DisplayRole:
+            if isinstance(value, (float, np.floating)):
+                return '-' if np.isnan(value) else '{:.6g}'.format(value)
+            return str(value)
+
+        elif role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+
+        else:
+            return None
+
+
+class ReplayThread(QThread):
+    """Runs `gui.models.telemetry.replay` so the dialog stays responsive."""
+    iteration_replayed = pyqtSignal(str)
+    replay_finished = pyqtSignal(object)
+    replay_failed = pyqtSignal(str)
+
+    def __init__(self, events: list, options: dict, parent=None):
+        QThread.__init__(self, parent)
+        self._events = events
+        self._options = options
+
+    def run(self):
+        try:
+            replayed = replay(self._events,
+                              report=self.iteration_replayed.emit,
+                              **self._options)
+        except (ValueError, IndexError, KeyError, np.linalg.LinAlgError):
+            self.replay_failed.emit(traceback.format_exc())
+        else:
+            self.replay_finished.emit(replayed)
+
+
+class TelemetryViewerDialog(QDialog):
+    def __init__(self, events: list, title: str = '', parent=None):
+        """Shows the iterations of an optimization telemetry log (see
+        `gui.models.telemetry.read_telemetry`) and replays its surrogate
+        steps with other options.
+        """
+        # ------------------------ Form Initialization ------------------------
+        super().__init__(parent)
+        self.ui = Ui_Dialog()
+        self.ui.setupUi(self)
+
+        # ------------------------ Internal Variables -------------------------
+        self.events = events
+        self._replay_thread = None
+
+        # ----------------------- Widget Initialization -----------------------
+        if title != '':
+            self.setWindowTitle("Optimization telemetry - " + title)
+
+        for view, table in [(self.ui.iterationsTableView,
+                             iteration_table(events)),
+                            (self.ui.replayTableView, pd.DataFrame({}))]:
+            view.setModel(TelemetryTableModel(table))
+            view.horizontalHeader().setSectionResizeMode(
+                QHeaderView.ResizeToContents)
+
+        self.ui.summaryLabel.setText(self._summary_text())
+
+        # replay options default to the ones of the logged run
+        options = next(event for event in events
+                       if event.get('event') == 'start')['options']
+        self.ui.regressionComboBox.setCurrentIndex(
+            ['poly0', 'poly1', 'poly2'].index(
+                options.get('regression', 'poly0')))
+        self.ui.nlpStartsSpinBox.setValue(options.get('n_starts', 1))
+        self.ui.startDesignComboBox.setCurrentIndex(
+            ['lhs', 'sobol'].index(options.get('start_design', 'lhs')))
+        self.ui.nlpWorkersSpinBox.setValue(options.get('n_workers', 1))
+
+        # --------------------------- Signals/Slots ---------------------------
+        self.ui.replayPushButton.clicked.connect(self.on_replay_pressed)
+
+        # ---------------------------------------------------------------------
+
+    def _summary_text(self) -> str:
+        summary = run_summary(self.events)
+        text = ("Procedure: {procedure}    Iterations: {iterations}    "
+                "Evaluations: {fun_evals}    Wall time: {wall_time:.3f} s\n"
+                "Simulations: {sim_time:.3f} s    Surrogate fits: "
+                "{fit_time:.3f} s    NLPs: {nlp_time:.3f} s    Surrogate "
+                "steps: {surrogate_time:.3f} s").format(**summary)
+        if not summary['finished']:
+            text += "\nThe run didn't finish."
+
+        return text
+
+    def replay_options(self) -> dict:
+        """Options of `gui.models.telemetry.replay` set in the dialog."""
+        return {
+            'regression': ['poly0', 'poly1', 'poly2'][
+                self.ui.regressionComboBox.currentIndex()],
+            'n_starts': self.ui.nlpStartsSpinBox.value(),
+            'start_design': ['lhs', 'sobol'][
+                self.ui.startDesignComboBox.currentIndex()],
+            'n_workers': self.ui.nlpWorkersSpinBox.value()
+        }
+
+    def on_replay_pressed(self):
+        self.ui.replayPushButton.setEnabled(False)
+        self.ui.replayGroupBox.setTitle("Replaying...")
+
+        self._replay_thread = ReplayThread(self.events, self.replay_options())
+        self._replay_thread.iteration_replayed.connect(
+            self.ui.replayGroupBox.setTitle)
+        self._replay_thread.replay_finished.connect(self.on_replay_finished)
+        self._replay_thread.replay_failed.connect(self.on_replay_failed)
+        self._replay_thread.start()
+
+    def on_replay_finished(self, replayed: list):
+        table = iteration_table(replayed)
+        self.ui.replayTableView.model().load_table(table)
+        self.ui.tabWidget.setCurrentWidget(self.ui.replayTab)
+
+        n_moved = int((table['Distance'] >= 1e-6).sum()) \
+            if 'Distance' in table else 0
+        self.ui.replayGroupBox.setTitle(
+            "Replay: fits {0:.3f} s, NLPs {1:.3f} s, {2} of {3} iterations "
+            "proposed other points".format(table['Fit (s)'].sum(),
+                                           table['NLP (s)'].sum(), n_moved,
+                                           table.shape[0]))
+        self.ui.replayPushButton.setEnabled(True)
+
+    def on_replay_failed(self, error_msg: str):
+        self.ui.replayGroupBox.setTitle("Replay failed.")
+        self.ui.replayPushButton.setEnabled(True)
+
+        fail_box = QMessageBox(QMessageBox.Critical, 'Replay failed!',
+                               error_msg, buttons=QMessageBox.Ok,
+                               parent=None)
+        fail_box.exec_()
+
+
+if __name__ == "__main__":
+    import sys
+
+    from gui.calls.base import my_exception_hook
+    from gui.models.telemetry import read_telemetry
+
+    app = QApplication(sys.argv)
+
+    w = TelemetryViewerDialog(read_telemetry(sys.argv[1]), sys.argv[1])
+    w.show()
+
+    sys.excepthook = my_exception_hook
+
+    sys.exit(app.exec_())
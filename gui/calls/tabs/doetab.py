@@ -6,7 +6,8 @@ from PyQt5.QtGui import QBrush, QFont, QPalette
 from PyQt5.QtWidgets import (QAbstractItemView, QApplication, QHeaderView,
                              QTableView, QTableWidgetItem, QWidget)
 
-from gui.calls.base import DoubleEditorDelegate
+from gui.calls.base import (CellTextCache, DoubleEditorDelegate,
+                            HeaderSpanTableView)
 from gui.calls.dialogs.csveditor import CsvEditorDialog
 from gui.calls.dialogs.samplingassistant import (InputBoundsModel,
                                                  SamplingAssistantDialog)
@@ -14,21 +15,17 @@ from gui.models.data_storage import DataStorage
 from gui.views.py_files.doetab import Ui_Form
 
 
-class DoeResultsView(QTableView):
-    """TableView subclassing overriding the setModel to properly set the first
-    and second row headers."""
-
-    def setModel(self, model: QAbstractItemModel):
-        super().setModel(model)
-        for row in range(model.rowCount()):
-            for col in range(model.columnCount()):
-                span = model.span(model.index(row, col))
-                if span.height() > 1 or span.width() > 1:
-                    self.setSpan(row, col, span.height(), span.width())
+class DoeResultsView(HeaderSpanTableView):
+    """TableView of the sampled data with the first and second row headers
+    (see `HeaderSpanTableView`)."""
 
 
 class DoeResultsModel(QAbstractTableModel):
-    """Model to be used as results display of sampled data"""
+    """Model to be used as results display of sampled data.
+
+    The numeric data is kept as a contiguous float64 block and its display
+    strings are cached per row (see `CellTextCache`).
+    """
     _HEADER_ROW_OFFSET = 2
     _INPUT_COL_OFFSET = 2
 
@@ -36,87 +33,77 @@ class DoeResultsModel(QAbstractTableModel):
         QAbstractTableModel.__init__(self, parent)
 
         self.app_data = application_data
+        self._text = CellTextCache()
         self.load_data()
         self.app_data.doe_sampled_data_changed.connect(self.load_data)
 
+    def sampled_data(self) -> pd.DataFrame:
+        """Sampled data displayed by the model.
+        """
+        return self.app_data.doe_sampled_data
+
     def load_data(self):
-        self.layoutAboutToBeChanged.emit()
-        doe_data = self.app_data.doe_sampled_data.copy(deep=True)
-        inp_data = self.app_data.input_table_data
-        out_data = self.app_data.output_table_data
-        expr_data = self.app_data.expression_table_data
-
-        self._input_alias = inp_data.loc[
-            inp_data['Type'] == self.app_data._INPUT_ALIAS_TYPES['mv'],
-            'Alias'
-        ].tolist()
-        cand_data = pd.concat([out_data, expr_data], axis='index',
-                              ignore_index=True, sort=False)
-        self._candidates_alias = cand_data.loc[
-            (cand_data['Type'] == self.app_data._OUTPUT_ALIAS_TYPES['cv']) |
-            (cand_data['Type'] == self.app_data._EXPR_ALIAS_TYPES['cv']),
-            'Alias'
-        ].tolist()
-        self._const_alias = expr_data.loc[
-            expr_data['Type'] == self.app_data._EXPR_ALIAS_TYPES['cst'],
-            'Alias'
-        ].tolist()
-        self._obj_alias = expr_data.loc[
-            expr_data['Type'] == self.app_data._EXPR_ALIAS_TYPES['obj'],
-            'Alias'
-        ].tolist()
-        self._aux_alias = out_data.loc[
-            out_data['Type'] == self.app_data._OUTPUT_ALIAS_TYPES['aux'],
-            'Alias'
-        ].tolist()
-
-        header_list = self._input_alias + self._candidates_alias + \
+        self.beginResetModel()
+        doe_data = self.sampled_data()
+        alias_index = self.app_data.alias_index
+
+        self._input_alias = alias_index.aliases('input', 'mv')
+        self._candidates_alias = alias_index.aliases(['output', 'expression'],
+                                                     'cv')
+        self._const_alias = alias_index.aliases('expression', 'cst')
+        self._obj_alias = alias_index.aliases('expression', 'obj')
+        self._aux_alias = alias_index.aliases('output', 'aux')
+
+        self._header_list = self._input_alias + self._candidates_alias + \
             self._const_alias + self._obj_alias + self._aux_alias
 
-        # extract the inputs, candidate outputs and expression data
+        # first row headers: first column of each group, its title and width
+        self._header_groups = {}
+        col = self._INPUT_COL_OFFSET
+        for title, aliases in [("Inputs - Manipulated", self._input_alias),
+                               ("Outputs - Candidates",
+                                self._candidates_alias),
+                               ("Outputs - Constraints", self._const_alias),
+                               ("Objective", self._obj_alias),
+                               ("Auxiliary data", self._aux_alias)]:
+            if len(aliases) != 0:
+                self._header_groups[col] = (title, len(aliases))
+                col += len(aliases)
+
+        # extract the case numbers, status and the inputs, candidate outputs
+        # and expression data (as a single float block) without copying the
+        # whole sampled data
         if not doe_data.empty:
-            self._case_data = doe_data.pop('case')
-            self._stat_data = doe_data.pop('status')
+            self._case_data = doe_data['case'].to_numpy()
+            self._stat_data = doe_data['status'].to_numpy()
+            values = doe_data.loc[:, self._header_list].to_numpy(dtype=float)
+        else:
+            self._case_data = np.empty(0, dtype=int)
+            self._stat_data = np.empty(0, dtype=object)
+            values = np.empty((0, len(self._header_list)))
 
-        self._doe_data = doe_data[header_list]
+        self._text.set_values(np.ascontiguousarray(values))
 
-        self.layoutChanged.emit()
+        self.endResetModel()
 
     def rowCount(self, parent=None):
-        return self._doe_data.shape[0] + self._HEADER_ROW_OFFSET
+        return self._text.values.shape[0] + self._HEADER_ROW_OFFSET
 
     def columnCount(self, parent=None):
-        return self._doe_data.shape[1] + self._INPUT_COL_OFFSET
+        return self._text.values.shape[1] + self._INPUT_COL_OFFSET
 
     def span(self, index: QModelIndex):
         row = index.row()
         col = index.column()
 
-        rowoffset = self._HEADER_ROW_OFFSET
-        coloffset = self._INPUT_COL_OFFSET
-
         if row == 0:
             if col == 0 or col == 1:
                 # case number and status column
-                return QSize(1, rowoffset)
-            elif col == coloffset:
-                # manipulated
-                return QSize(len(self._input_alias), 1)
-            elif col == coloffset + len(self._input_alias):
-                # outputs candidates
-                return QSize(len(self._candidates_alias), 1)
-            elif col == coloffset + len(self._input_alias) + \
-                    len(self._candidates_alias):
-                    # constraints
-                return QSize(len(self._const_alias), 1)
-            elif col == coloffset + len(self._input_alias) + \
-                    len(self._candidates_alias) + len(self._const_alias):
-                    # objectives
-                return QSize(len(self._obj_alias), 1)
-            elif col == coloffset + len(self._input_alias) + \
-                    len(self._candidates_alias) + len(self._const_alias) + \
-                    len(self._obj_alias):
-                return QSize(len(self._aux_alias), 1)
+                return QSize(1, self._HEADER_ROW_OFFSET)
+            elif col in self._header_groups:
+                # manipulated, candidates, constraints, objectives and
+                # auxiliary data
+                return QSize(self._header_groups[col][1], 1)
             else:
                 return super().span(index)
         else:
@@ -129,7 +116,7 @@ class DoeResultsModel(QAbstractTableModel):
         row = index.row()
         col = index.column()
 
-        df_rows, df_cols = self._doe_data.shape
+        df_rows, df_cols = self._text.values.shape
         rowoffset = self._HEADER_ROW_OFFSET
         coloffset = self._INPUT_COL_OFFSET
 
@@ -137,8 +124,7 @@ class DoeResultsModel(QAbstractTableModel):
             if rowoffset - 1 < row < df_rows + rowoffset:
                 if coloffset - 1 < col < df_cols + coloffset:
                     # numeric data display
-                    val = self._doe_data.iloc[row - rowoffset, col - coloffset]
-                    return "{0:.7f}".format(val)
+                    return self._text.text(row - rowoffset, col - coloffset)
 
                 elif col == 0:
                     # case number
@@ -154,24 +140,12 @@ class DoeResultsModel(QAbstractTableModel):
                     return "Case Number"
                 elif col == 1:
                     return "Status"
-                elif col == coloffset:
-                    return "Inputs - Manipulated"
-                elif col == coloffset + len(self._input_alias):
-                    return "Outputs - Candidates"
-                elif col == coloffset + len(self._input_alias) + \
-                        len(self._candidates_alias):
-                    return "Outputs - Constraints"
-                elif col == coloffset + len(self._input_alias) + \
-                        len(self._candidates_alias) + len(self._const_alias):
-                    return "Objective"
-                elif col == coloffset + len(self._input_alias) + \
-                        len(self._candidates_alias) + \
-                        len(self._const_alias) + len(self._obj_alias):
-                    return "Auxiliary data"
+                elif col in self._header_groups:
+                    return self._header_groups[col][0]
             elif row == 1:
                 # second row headers
                 if coloffset - 1 < col:
-                    return str(self._doe_data.columns[col - coloffset])
+                    return str(self._header_list[col - coloffset])
 
         elif role == Qt.FontRole:
             if row == 0 or row == 1:
@@ -237,6 +211,11 @@ class DoeTab(QWidget):
             self.on_doe_mv_bounds_changed
         )
 
+        # the tab is built on its first activation, sync with the bounds
+        # already stored
+        if not self.application_database.doe_mv_bounds.empty:
+            self.on_doe_mv_bounds_changed()
+
         # ---------------------------------------------------------------------
 
     def open_sampling_assistant(self):
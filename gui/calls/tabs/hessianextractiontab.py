@@ -1,6 +1,5 @@
 import numpy as np
 import pandas as pd
-from pydace import Dace
 from PyQt5.QtWidgets import QApplication, QWidget, QTableView, QHeaderView
 from PyQt5.QtCore import QAbstractTableModel, Qt, QModelIndex
 from PyQt5.QtGui import QFont
@@ -8,8 +7,6 @@ from PyQt5.QtGui import QFont
 from gui.models.data_storage import DataStorage
 from gui.views.py_files.hessianextractiontab import Ui_Form
 from gui.models.hessian_eval import hesscorrgauss
-from gui.calls.dialogs.redspacemetamodel import ReducedSpaceMetamodelDialog
-from gui.calls.dialogs.choleskymod import CholeskyDialog
 
 
 class DiffTableModel(QAbstractTableModel):
@@ -117,6 +114,12 @@ class HessianExtractionTab(QWidget):
 
         jud_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
 
+        # the tab is built on its first activation, display the differentials
+        # already stored
+        for diff, model in zip(['gy', 'gyd', 'juu', 'jud'],
+                               [gy_model, gyd_model, juu_model, jud_model]):
+            model.update_diff(diff)
+
         # --------------------------- Signals/Slots ---------------------------
         # differential data tables update
         # FIXME: this an ugly hack. Probably using a Signal Mapper is the right
@@ -151,10 +154,16 @@ class HessianExtractionTab(QWidget):
         # ---------------------------------------------------------------------
 
     def on_cholesky_mod_pressed(self):
+        from gui.calls.dialogs.choleskymod import CholeskyDialog
+
         dialog = CholeskyDialog(self.application_database)
         dialog.exec_()
 
     def on_reduced_space_metamodel_pressed(self):
+        # the dialog imports pydace and sklearn
+        from gui.calls.dialogs.redspacemetamodel import \
+            ReducedSpaceMetamodelDialog
+
         dialog = ReducedSpaceMetamodelDialog(self.application_database)
         dialog.exec_()
 
@@ -169,10 +178,7 @@ class HessianExtractionTab(QWidget):
         G = self.get_differentials(X_labels, sampled_data, difftype='gradient')
 
         # split G in Gy and Gyd
-        inps = self.application_database.input_table_data
-        d_labels = inps.loc[inps['Type'] ==
-                            self.application_database._INPUT_ALIAS_TYPES['d'],
-                            'Alias'].tolist()
+        d_labels = self.application_database.alias_index.aliases('input', 'd')
 
         u_labels = [label for label in X_labels if label not in d_labels]
 
@@ -194,7 +200,6 @@ class HessianExtractionTab(QWidget):
 
     def get_differentials(self, X_labels: list, sampled_data: pd.DataFrame,
                           difftype: str):
-
         app_data = self.application_database
         t_data = app_data.reduced_metamodel_selected_data
 
@@ -230,6 +235,9 @@ class HessianExtractionTab(QWidget):
         # correlation model
         corr = self.application_database.differential_correlation_model
 
+        # surrogate type (dense or local kriging)
+        surrogate = self.application_database.differential_surrogate_model
+
         # theta and bounds values
         theta_data = app_data.reduced_metamodel_theta_data.set_index('Alias')
 
@@ -247,14 +255,18 @@ class HessianExtractionTab(QWidget):
         values = doe_bnds.loc[:, 'nominal'].tolist()
         x_nom = np.array([values])
 
+        # models already fitted to the same data/settings (e.g. by the reduced
+        # space metamodel validation) are reused
+        registry = app_data.model_registry
+
         if difftype == 'gradient':
             # G dataFrame (Transposed because skogestad nomeclature)
             G = pd.DataFrame(columns=X_labels, index=Y_labels)
 
             # train the models
             for j in range(Y_dim):
-                ph = Dace(regression=regr, correlation=corr)
-                ph.fit(S=X, Y=Y[:, j], theta0=theta0, lob=lob, upb=upb)
+                ph = registry.fit(Y_labels[j], X, Y[:, j], regr, corr,
+                                  theta0, lob, upb, surrogate)
 
                 _, gy_ph, *_ = ph.predict(X=x_nom, compute_jacobian=True)
 
@@ -266,8 +278,13 @@ class HessianExtractionTab(QWidget):
         else:
             # J dataFrame
             J = pd.DataFrame(columns=X_labels, index=X_labels)
-            dmodel = Dace(regression=regr, correlation=corr)
-            dmodel.fit(S=X, Y=Y, theta0=theta0, lob=lob, upb=upb)
+            if Y_dim == 1:
+                # same univariate model as the metamodel validation
+                dmodel = registry.fit(Y_labels[0], X, Y[:, 0], regr, corr,
+                                      theta0, lob, upb, surrogate)
+            else:
+                dmodel = registry.fit(tuple(Y_labels), X, Y, regr, corr,
+                                      theta0, lob, upb, surrogate)
 
             j_np = hesscorrgauss(x_nom, dmodel)
             for i in range(len(X_labels)):
@@ -11,7 +11,6 @@ from PyQt5.QtWidgets import (QApplication, QCompleter, QFileDialog,
                              QPushButton, QTableView, QWidget)
 
 from gui.calls.base import AliasEditorDelegate, ComboBoxDelegate
-from gui.calls.dialogs.simulationtree import LoadSimulationTreeDialog
 from gui.models.data_storage import DataStorage
 from gui.models.math_check import ValidMathStr, is_expression_valid
 from gui.views.py_files.loadsimtab import Ui_Form
@@ -61,11 +60,8 @@ class ExpressionEditorDelegate(QItemDelegate):
         completer.setFilterMode(Qt.MatchContains)
 
         # get aliases in display and set them to the completer
-        aliases_in_display = pd.concat([self.app_data.input_table_data,
-                                        self.app_data.output_table_data],
-                                       axis='index', ignore_index=True)
-
-        model.setStringList(aliases_in_display['Alias'].tolist())
+        model.setStringList(
+            self.app_data.alias_index.aliases(['input', 'output']))
 
         # insert the math validator
         exp_validator = ValidMathStr(line_editor)
@@ -205,10 +201,7 @@ class ExpressionTableModel(QAbstractTableModel):
             value = None
 
         if role == Qt.BackgroundRole or role == Qt.ToolTipRole:
-            aliases = pd.concat([self.app_data.input_table_data,
-                                 self.app_data.output_table_data,
-                                 self.app_data.expression_table_data],
-                                axis='index', join='inner', ignore_index=True)
+            alias_index = self.app_data.alias_index
 
         if role == Qt.DisplayRole:
             if col == 0:
@@ -226,7 +219,7 @@ class ExpressionTableModel(QAbstractTableModel):
                 if self.expr_data.columns[col - 1] == 'Alias':
                     # paints red if the current expression name is already an
                     # variable alias
-                    if aliases['Alias'].value_counts()[value] > 1:
+                    if alias_index.count(value) > 1:
                         return QBrush(Qt.red)
                     else:
                         return QBrush(
@@ -235,7 +228,8 @@ class ExpressionTableModel(QAbstractTableModel):
 
                 elif self.expr_data.columns[col - 1] == 'Expression':
                     # paints red if the expression is invalid
-                    if is_expression_valid(value, aliases['Alias'].tolist()):
+                    if is_expression_valid(
+                            value, alias_index.aliases(alias_index.TABLES)):
                         return QBrush(
                             self.parent().palette().brush(QPalette.Base)
                         )
@@ -257,13 +251,14 @@ class ExpressionTableModel(QAbstractTableModel):
             # tooltip strings to display
             if col != 0:
                 if self.expr_data.columns[col - 1] == 'Alias':
-                    if aliases['Alias'].value_counts()[value] > 1:
+                    if alias_index.count(value) > 1:
                         return "Name already in use!"
                     else:
                         return ""
 
                 elif self.expr_data.columns[col - 1] == 'Expression':
-                    if is_expression_valid(value, aliases['Alias'].tolist()):
+                    if is_expression_valid(
+                            value, alias_index.aliases(alias_index.TABLES)):
                         return ""
                     else:
                         return ("Invalid mathematical expression! "
@@ -583,6 +578,12 @@ class LoadSimTab(QWidget):
         self.application_database.simulation_file_changed.connect(
             self.update_simfilepath_display)
 
+        # case timeout of the simulations (e.g. of a loaded .mtc file)
+        self.application_database.simulation_file_changed.connect(
+            self.update_case_timeout_display)
+        self.ui.caseTimeoutSpinBox.valueChanged.connect(
+            self.set_case_timeout)
+
         # inserts a new row into the expression table
         self.ui.buttonAddExpr.clicked.connect(self.insert_new_expression)
 
@@ -628,9 +629,21 @@ class LoadSimTab(QWidget):
         """Opens a new dialog where the user can select input/output variables
         from the simulation tree.
         """
+        # the dialog imports the COM (win32com) stack, only load it when used
+        from gui.calls.dialogs.simulationtree import LoadSimulationTreeDialog
+
         dialog = LoadSimulationTreeDialog(self.application_database)
         dialog.exec_()
 
+    def update_case_timeout_display(self):
+        """Displays the case timeout of the app_storage."""
+        self.ui.caseTimeoutSpinBox.setValue(
+            int(self.application_database.case_timeout))
+
+    def set_case_timeout(self, value: int):
+        """Stores the case timeout (s) in display, 0 is no timeout."""
+        self.application_database.case_timeout = value
+
     def update_simfilepath_display(self):
         """Grabs the simulation file path from app_storage and displays it on
         the text browser widget.
@@ -1,28 +1,17 @@
-from math import ceil
-
-import matplotlib
 import numpy as np
 import pandas as pd
-from matplotlib.backends.backend_qt5agg import (FigureCanvasQTAgg,
-                                                NavigationToolbar2QT)
-from matplotlib.figure import Figure
-from pydace import Dace
 # from pydace import dacefit, predictor
 from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
-from PyQt5.QtGui import QBrush, QFont, QPalette, QResizeEvent
-from PyQt5.QtWidgets import (QApplication, QDialog, QHeaderView, QTableView,
-                             QVBoxLayout, QWidget)
-from sklearn.metrics import (explained_variance_score, mean_absolute_error,
-                             mean_squared_error, r2_score)
-from sklearn.model_selection import KFold, train_test_split
+from PyQt5.QtGui import QBrush, QFont, QPalette
+from PyQt5.QtWidgets import QApplication, QHeaderView, QTableView, QWidget
 
 from gui.calls.base import (CheckBoxDelegate, DoubleEditorDelegate,
                             warn_the_user)
+from gui.calls.dialogs.parityplot import ParityPlotDialog
 from gui.models.data_storage import DataStorage
+from gui.models.model_registry import SURROGATE_TYPES
 from gui.views.py_files.metamodeltab import Ui_Form
 
-matplotlib.use('Qt5Agg')
-
 
 class ThetaTableModel(QAbstractTableModel):
     def __init__(self, application_data: DataStorage, parent: QTableView):
@@ -321,64 +310,6 @@ class CrossValidationMetricsTableModel(QAbstractTableModel):
             return None
 
 
-class PlotWindow(QDialog):
-    def __init__(self, metamodel_data: dict, parent=None):
-        super(PlotWindow, self).__init__(parent)
-        self.setWindowFlags(Qt.Window)
-        self.setWindowTitle("Validation results")
-
-        self.figure = Figure()
-
-        self.canvas = FigureCanvasQTAgg(self.figure)
-
-        self.plt_toolbar = NavigationToolbar2QT(self.canvas, self)
-
-        layout = QVBoxLayout()
-        layout.addWidget(self.canvas)
-        layout.addWidget(self.plt_toolbar)
-        self.setLayout(layout)
-
-        self.metamodel_data = metamodel_data
-        self.plot()
-
-    def plot(self):
-        test_data = self.metamodel_data['Y_test']
-        pred_data = self.metamodel_data['Y_pred']
-        fig_titles = self.metamodel_data['labels']
-
-        self.figure.clear()
-
-        # plot data
-        n_vars = test_data.shape[1]
-        is_even = True if (n_vars % 2) == 0 else False
-
-        n_cols = 2
-        nrows = ceil(n_vars / 2)
-
-        for i in range(n_vars):
-            ax = self.figure.add_subplot(nrows, n_cols, i + 1,
-                                         xlabel='Test values',
-                                         ylabel='Predicted values',
-                                         title=fig_titles[i])
-
-            # plot data
-            ax.plot(test_data[:, i], pred_data[:, i], 'b.')
-            ax.grid(True)
-
-            # 45 degree line
-            x = np.linspace(*ax.get_xlim())
-            ax.plot(x, x, 'k')
-
-            # refresh canvas
-            self.canvas.draw()
-
-        self.figure.tight_layout()
-
-    def resizeEvent(self, e: QResizeEvent):
-        super().resizeEvent(e)
-        self.figure.tight_layout()
-
-
 class MetamodelTab(QWidget):
     def __init__(self, application_database: DataStorage, parent_tab=None):
         # ------------------------ Form Initialization ------------------------
@@ -450,17 +381,21 @@ class MetamodelTab(QWidget):
             return
 
         else:
-            inp_data = self.application_database.input_table_data
-
-            X_labels = inp_data.loc[
-                inp_data['Type'] ==
-                self.application_database._INPUT_ALIAS_TYPES['mv'],
-                'Alias'].tolist()
+            X_labels = self.application_database.alias_index.aliases('input',
+                                                                     'mv')
 
             Y_labels = mtm_var_data.loc[
                 mtm_var_data['Checked'], 'Alias'
             ].tolist()
 
+        # kriging and validation stacks are only needed from here onwards
+        from sklearn.metrics import (explained_variance_score,
+                                     mean_absolute_error, mean_squared_error,
+                                     r2_score)
+        from sklearn.model_selection import KFold, train_test_split
+
+        from gui.models.local_kriging import kriging_model
+
         # sampled data
         sampled_data = self.application_database.doe_sampled_data
         # get converged cases index
@@ -488,6 +423,9 @@ class MetamodelTab(QWidget):
         corr_idx = self.ui.corrComboBox.currentIndex()
         corr = 'corrgauss'
 
+        # surrogate type (dense or local kriging)
+        surrogate = SURROGATE_TYPES[self.ui.surrogateComboBox.currentIndex()]
+
         # theta and bounds values
         theta_data = \
             self.application_database.metamodel_theta_data.set_index('Alias')
@@ -532,7 +470,7 @@ class MetamodelTab(QWidget):
 
                 for j in range(Y_dim):
                     # build the univariate models
-                    krmodel = Dace(regression=regr, correlation=corr)
+                    krmodel = kriging_model(surrogate, regr, corr)
                     krmodel.fit(S=X_train, Y=Y_train[:, j], theta0=theta0,
                                 lob=lob, upb=upb)
                     # test the model
@@ -580,7 +518,7 @@ class MetamodelTab(QWidget):
 
             for j in range(Y_dim):
                 # build the univariate models
-                krmodel = Dace(regression=regr, correlation=corr)
+                krmodel = kriging_model(surrogate, regr, corr)
                 krmodel.fit(S=X_train, Y=Y_train[:, j], theta0=theta0,
                             lob=lob, upb=upb)
                 # test the model
@@ -615,7 +553,7 @@ class MetamodelTab(QWidget):
 
     def on_view_graphics_pressed(self):
         if hasattr(self, 'metamodel_data'):
-            dialog = PlotWindow(self.metamodel_data)
+            dialog = ParityPlotDialog(self.metamodel_data)
             dialog.exec_()
 
 
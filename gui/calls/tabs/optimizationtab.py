@@ -1,15 +1,16 @@
+import datetime
+import pathlib
+
 import pandas as pd
 from PyQt5.QtCore import (QAbstractTableModel, QModelIndex, Qt, QThread,
                           pyqtSignal)
 from PyQt5.QtGui import (QBrush, QDoubleValidator, QFont, QIntValidator,
                          QPalette)
 from PyQt5.QtWidgets import (
-    QApplication, QHeaderView, QLineEdit, QMessageBox, QWidget)
-from surropt.core.options.nlp import DockerNLPOptions
-from win32com.client import Dispatch
+    QApplication, QFileDialog, QHeaderView, QLineEdit, QMessageBox, QWidget)
 
+from gui.models.batch_infill import uses_batch_procedure
 from gui.models.data_storage import DataStorage
-from gui.models.sampling import CaballeroWorker, ReportObject
 from gui.views.py_files.caballerotab import Ui_Form
 
 
@@ -83,6 +84,8 @@ class OptimizationTab(QWidget):
 
         # ------------------------ Internal Variables -------------------------
         self.application_database = application_database
+        self._local_nlp_server = None
+        self._running = False  # an optimization is in progress
 
         # ----------------------- Widget Initialization -----------------------
         self.load_opt_params()
@@ -98,7 +101,7 @@ class OptimizationTab(QWidget):
 
         # apply validators
         factor1_le, factor2_le, tol_contract_le, con_tol_le, penalty_le, \
-            tol1_le, tol2_le, maxfunevals_le, \
+            tol1_le, tol2_le, maxfunevals_le, infill_batch_le, \
             regrpoly_cb = self._get_lineedit_handles()
 
         std_val = QDoubleValidator()
@@ -116,6 +119,10 @@ class OptimizationTab(QWidget):
         self.ui.startOptPushButton.clicked.connect(self.on_start_pressed)
         self.ui.ipoptTestConnectionPushButton.clicked.connect(
             self.on_ipopt_test_connection_pressed)
+        self.ui.localNlpServerPushButton.clicked.connect(
+            self.on_local_nlp_server_pressed)
+        self.ui.viewTelemetryPushButton.clicked.connect(
+            self.on_view_telemetry_pressed)
 
         self.application_database.optimization_parameters_changed.connect(
             self.load_opt_params
@@ -130,6 +137,14 @@ class OptimizationTab(QWidget):
         tol1_le.editingFinished.connect(self.set_opt_params)
         tol2_le.editingFinished.connect(self.set_opt_params)
         maxfunevals_le.editingFinished.connect(self.set_opt_params)
+        infill_batch_le.editingFinished.connect(self.set_opt_params)
+        self.ui.nlpStartsLineEdit.editingFinished.connect(self.set_opt_params)
+        self.ui.startDesignComboBox.currentIndexChanged.connect(
+            self.set_opt_params)
+        self.ui.nlpWorkersLineEdit.editingFinished.connect(
+            self.set_opt_params)
+        self.ui.telemetryCheckBox.toggled.connect(self.set_opt_params)
+        self.ui.incrementalFitCheckBox.toggled.connect(self.set_opt_params)
         regrpoly_cb.currentIndexChanged.connect(self.set_opt_params)
         self.ui.ipoptLocalDualFeasLineEdit.editingFinished.connect(
             self.set_opt_params)
@@ -163,14 +178,16 @@ class OptimizationTab(QWidget):
         tol1_le = self.ui.tol1LineEdit
         tol2_le = self.ui.tol2LineEdit
         maxfunevals_le = self.ui.maxFunEvalsLineEdit
+        infill_batch_le = self.ui.infillBatchLineEdit
         regrpoly_cb = self.ui.regrpolyComboBox
 
         return factor1_le, factor2_le, tol_contract_le, con_tol_le, \
-            penalty_le, tol1_le, tol2_le, maxfunevals_le, regrpoly_cb
+            penalty_le, tol1_le, tol2_le, maxfunevals_le, infill_batch_le, \
+            regrpoly_cb
 
     def load_opt_params(self):
         factor1_le, factor2_le, tol_contract_le, con_tol_le, penalty_le, \
-            tol1_le, tol2_le, maxfunevals_le, \
+            tol1_le, tol2_le, maxfunevals_le, infill_batch_le, \
             regrpoly_cb = self._get_lineedit_handles()
 
         opt_params = self.application_database.optimization_parameters
@@ -184,6 +201,19 @@ class OptimizationTab(QWidget):
         tol1_le.setText(str(opt_params['tol1']))
         tol2_le.setText(str(opt_params['tol2']))
         maxfunevals_le.setText(str(opt_params['maxfunevals']))
+        # files saved before the batch infill option have no such key
+        infill_batch_le.setText(str(opt_params.get('infill_batch', 1)))
+        self.ui.nlpStartsLineEdit.setText(
+            str(opt_params.get('nlp_starts', 1)))
+        self.ui.startDesignComboBox.setCurrentIndex(
+            ['lhs', 'sobol'].index(opt_params.get('start_design', 'lhs')))
+        self.ui.nlpWorkersLineEdit.setText(
+            str(opt_params.get('nlp_workers', 1)))
+        self.ui.telemetryCheckBox.setChecked(
+            opt_params.get('telemetry', False))
+        self.ui.incrementalFitCheckBox.setChecked(
+            opt_params.get('incremental_fit', False))
+        self._update_local_server_button()
 
         if opt_params['regrpoly'] == 'poly0':
             regrpoly_cb.setCurrentIndex(0)
@@ -224,7 +254,7 @@ class OptimizationTab(QWidget):
 
     def set_opt_params(self):
         factor1_le, factor2_le, tol_contract_le, con_tol_le, penalty_le, \
-            tol1_le, tol2_le, maxfunevals_le, \
+            tol1_le, tol2_le, maxfunevals_le, infill_batch_le, \
             regrpoly_cb = self._get_lineedit_handles()
 
         le_name = self.sender().objectName()
@@ -264,6 +294,29 @@ class OptimizationTab(QWidget):
             self._set_value(maxfunevals_le, 'maxfunevals', val_type='int',
                             min_val=0, max_val=10000)
 
+        elif le_name == infill_batch_le.objectName():
+            self._set_value(infill_batch_le, 'infill_batch', val_type='int',
+                            min_val=0, max_val=65)
+
+        elif le_name == self.ui.nlpStartsLineEdit.objectName():
+            self._set_value(self.ui.nlpStartsLineEdit, 'nlp_starts',
+                            val_type='int', min_val=0, max_val=10001)
+
+        elif le_name == self.ui.startDesignComboBox.objectName():
+            opt_params['start_design'] = ['lhs', 'sobol'][
+                self.ui.startDesignComboBox.currentIndex()]
+
+        elif le_name == self.ui.nlpWorkersLineEdit.objectName():
+            self._set_value(self.ui.nlpWorkersLineEdit, 'nlp_workers',
+                            val_type='int', min_val=0, max_val=65)
+
+        elif le_name == self.ui.telemetryCheckBox.objectName():
+            opt_params['telemetry'] = self.ui.telemetryCheckBox.isChecked()
+
+        elif le_name == self.ui.incrementalFitCheckBox.objectName():
+            opt_params['incremental_fit'] = \
+                self.ui.incrementalFitCheckBox.isChecked()
+
         elif le_name == regrpoly_cb.objectName():
             if regrpoly_cb.currentIndex() == 0:
                 opt_params['regrpoly'] = 'poly0'
@@ -272,6 +325,8 @@ class OptimizationTab(QWidget):
             else:
                 opt_params['regrpoly'] = 'poly2'
 
+        self._update_local_server_button()
+
         tabw = self.ui.tabWidget
 
         if tabw.currentWidget().objectName() == 'ipOptLocalTab':
@@ -314,6 +369,13 @@ class OptimizationTab(QWidget):
             editor.setText(str(opt_params[opt_param_key]))
 
         else:
+            # parameters that can't be out of range are clamped
+            clamped = DataStorage.clamp_optimization_parameter(opt_param_key,
+                                                               value)
+            if clamped != value:
+                value = clamped
+                editor.setText(str(value))
+
             opt_params[opt_param_key] = value
             if not (min_val < value < max_val):
                 color = 'red'
@@ -355,6 +417,10 @@ class OptimizationTab(QWidget):
             editor.setStyleSheet("background: " + color)
 
     def on_start_pressed(self):
+        # the optimization stack (surropt, pydace, win32com) is only imported
+        # when the procedure is started
+        from gui.models.sampling import CaballeroWorker
+
         # get caballero parameters from storage
         opt_params = self.application_database.optimization_parameters
         solver_params = opt_params['nlp_params']
@@ -367,7 +433,14 @@ class OptimizationTab(QWidget):
         tol1 = opt_params['tol1']
         tol2 = opt_params['tol2']
         maxfunevals = opt_params['maxfunevals']
+        infill_batch = opt_params.get('infill_batch', 1)
+        nlp_starts = opt_params.get('nlp_starts', 1)
+        start_design = opt_params.get('start_design', 'lhs')
+        nlp_workers = opt_params.get('nlp_workers', 1)
+        incremental_fit = opt_params.get('incremental_fit', False)
         regrpoly = opt_params['regrpoly']
+        telemetry_path = self._telemetry_path() \
+            if opt_params.get('telemetry', False) else None
 
         nlp_dict = solver_params
 
@@ -380,14 +453,47 @@ class OptimizationTab(QWidget):
             'tol1': tol1,
             'tol2': tol2,
             'maxfunevals': maxfunevals,
+            'infill_batch': infill_batch,
+            'nlp_starts': nlp_starts,
+            'start_design': start_design,
+            'nlp_workers': nlp_workers,
+            'incremental_fit': incremental_fit,
             'regrpoly': regrpoly,
-            'nlp_dict': nlp_dict
+            'nlp_dict': nlp_dict,
+            'nlp_server_url': self._local_nlp_server.url
+            if self._local_nlp_server is not None else None,
+            'telemetry_path': telemetry_path
         }
 
+        if telemetry_path is not None:
+            self.on_iteration_printed(
+                "Telemetry log: {0}\n".format(telemetry_path))
+
+        if uses_batch_procedure(params):
+            self.on_iteration_printed(
+                "Batch infill/multistart procedure: the surrogate NLPs are "
+                "solved with SLSQP (tolerance and iteration limit of the "
+                "IpOpt settings) instead of the selected IpOpt solver.\n")
+
+            if params['nlp_server_url'] is not None:
+                self.on_iteration_printed(
+                    "Surrogate NLPs solved in the local NLP server at "
+                    "{0}.\n".format(params['nlp_server_url']))
+
         # disable ui elements
+        self._running = True
         self.ui.startOptPushButton.setEnabled(False)
         self.ui.regrpolyComboBox.setEnabled(False)
         self.ui.ipoptTestConnectionPushButton.setEnabled(False)
+        self.ui.telemetryCheckBox.setEnabled(False)
+        self.ui.incrementalFitCheckBox.setEnabled(False)
+        self.ui.infillBatchLineEdit.setEnabled(False)
+        self.ui.nlpStartsLineEdit.setEnabled(False)
+        self.ui.startDesignComboBox.setEnabled(False)
+        self.ui.nlpWorkersLineEdit.setEnabled(False)
+        self.ui.selectSolverComboBox.setEnabled(False)
+        self.ui.tabWidget.setEnabled(False)
+        self.ui.localNlpServerPushButton.setEnabled(False)
 
         # instantiate the optimization thread and worker
         self.opt_thread = QThread()
@@ -436,13 +542,25 @@ class OptimizationTab(QWidget):
 
     def on_optimization_finished(self):
         # enable ui elements
+        self._running = False
         self.ui.startOptPushButton.setEnabled(True)
         self.ui.regrpolyComboBox.setEnabled(True)
         self.ui.ipoptTestConnectionPushButton.setEnabled(True)
+        self.ui.telemetryCheckBox.setEnabled(True)
+        self.ui.incrementalFitCheckBox.setEnabled(True)
+        self.ui.infillBatchLineEdit.setEnabled(True)
+        self.ui.nlpStartsLineEdit.setEnabled(True)
+        self.ui.startDesignComboBox.setEnabled(True)
+        self.ui.nlpWorkersLineEdit.setEnabled(True)
+        self.ui.selectSolverComboBox.setEnabled(True)
+        self.ui.tabWidget.setEnabled(True)
+        self._update_local_server_button()
 
     def on_ipopt_test_connection_pressed(self):
         # tests the connection with the server specified in the UI
-        srv_url = self.ui.ipoptAddressLineEdit.text()
+        from surropt.core.options.nlp import DockerNLPOptions
+
+        srv_url = self.ui.ipoptServerAddressLineEdit.text()
         try:
             nlp_opts = DockerNLPOptions(name='test wsl', server_url=srv_url)
         except ValueError as con_err:
@@ -458,6 +576,74 @@ class OptimizationTab(QWidget):
                                   buttons=QMessageBox.Ok, parent=None)
             suc_box.exec_()
 
+    def _update_local_server_button(self):
+        # the local NLP server solves the NLPs of both procedures, it can't
+        # be started/stopped during a run
+        self.ui.localNlpServerPushButton.setEnabled(not self._running)
+
+    def on_local_nlp_server_pressed(self):
+        # starts/stops a NLP server subprocess used by the batch procedure
+        # and that speaks the protocol of the surropt IpOpt server (the IpOpt
+        # server settings are untouched, its url has to be set there)
+        from gui.models.nlp_server import LocalNlpServer
+
+        button = self.ui.localNlpServerPushButton
+        if self._local_nlp_server is not None:
+            self._local_nlp_server.close()
+            self._local_nlp_server = None
+            button.setText("Start local server")
+            self._update_local_server_button()
+            return
+
+        try:
+            self._local_nlp_server = LocalNlpServer()
+        except OSError as error:
+            fail_box = QMessageBox(QMessageBox.Critical, 'Server failed!',
+                                   str(error), buttons=QMessageBox.Ok,
+                                   parent=None)
+            fail_box.exec_()
+        else:
+            self.on_iteration_printed(
+                "Local NLP server listening on {0} (also usable as the "
+                "IpOpt server address).\n".format(self._local_nlp_server.url))
+            button.setText("Stop local server")
+
+    def _telemetry_path(self) -> str:
+        # a new log per run, next to the simulation file
+        sim_file = self.application_database.simulation_file
+        folder = pathlib.Path(sim_file).parent if sim_file != '' \
+            else pathlib.Path.cwd()
+        stem = pathlib.Path(sim_file).stem if sim_file != '' else 'run'
+        stamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+
+        return str(folder / '{0}_caballero_{1}.jsonl'.format(stem, stamp))
+
+    def on_view_telemetry_pressed(self):
+        from gui.calls.dialogs.telemetryviewer import TelemetryViewerDialog
+        from gui.models.telemetry import read_telemetry
+
+        sim_file = self.application_database.simulation_file
+        folder = pathlib.Path(sim_file).parent if sim_file != '' \
+            else pathlib.Path().home()
+        log_file, _ = QFileDialog.getOpenFileName(
+            self, "Select an optimization telemetry log.", str(folder),
+            "Telemetry logs (*.jsonl)")
+
+        if log_file == '':
+            return
+
+        try:
+            events = read_telemetry(log_file)
+        except (OSError, ValueError) as error:
+            fail_box = QMessageBox(QMessageBox.Critical, 'Invalid log!',
+                                   str(error), buttons=QMessageBox.Ok,
+                                   parent=None)
+            fail_box.exec_()
+        else:
+            dialog = TelemetryViewerDialog(events,
+                                           pathlib.Path(log_file).name)
+            dialog.exec_()
+
     def on_iteration_printed(self, iter_msg: str):
         self.ui.controlPanelTextBrowser.append(iter_msg)
 
@@ -7,8 +7,8 @@ from PyQt5.QtGui import QBrush, QFont, QPalette
 from PyQt5.QtWidgets import (QApplication, QFileDialog, QHeaderView,
                              QTableView, QWidget)
 
-from gui.calls.base import (CheckBoxDelegate, ComboBoxDelegate,
-                            DoubleEditorDelegate)
+from gui.calls.base import (CellTextCache, CheckBoxDelegate,
+                            ComboBoxDelegate, DoubleEditorDelegate)
 from gui.calls.dialogs.reducedcsveditor import ReducedCsvEditorDialog
 from gui.calls.dialogs.reducedspacesamplingassistant import (
     RangeOfDisturbanceTableModel, SamplingAssistantDialog)
@@ -248,52 +248,12 @@ class ReducedDoeResultsModel(DoeResultsModel):
         QAbstractTableModel.__init__(self, parent)
 
         self.app_data = application_data
+        self._text = CellTextCache()
         self.load_data()
         self.app_data.reduced_doe_sampled_data_changed.connect(self.load_data)
 
-    def load_data(self):
-        self.layoutAboutToBeChanged.emit()
-        doe_data = self.app_data.reduced_doe_sampled_data.copy(deep=True)
-
-        inp_data = self.app_data.input_table_data
-        out_data = self.app_data.output_table_data
-        expr_data = self.app_data.expression_table_data
-
-        self._input_alias = inp_data.loc[
-            inp_data['Type'] == self.app_data._INPUT_ALIAS_TYPES['mv'],
-            'Alias'
-        ].tolist()
-        cand_data = pd.concat([out_data, expr_data], axis='index',
-                              ignore_index=True, sort=False)
-        self._candidates_alias = cand_data.loc[
-            (cand_data['Type'] == self.app_data._OUTPUT_ALIAS_TYPES['cv']) |
-            (cand_data['Type'] == self.app_data._EXPR_ALIAS_TYPES['cv']),
-            'Alias'
-        ].tolist()
-        self._const_alias = expr_data.loc[
-            expr_data['Type'] == self.app_data._EXPR_ALIAS_TYPES['cst'],
-            'Alias'
-        ].tolist()
-        self._obj_alias = expr_data.loc[
-            expr_data['Type'] == self.app_data._EXPR_ALIAS_TYPES['obj'],
-            'Alias'
-        ].tolist()
-        self._aux_alias = out_data.loc[
-            out_data['Type'] == self.app_data._OUTPUT_ALIAS_TYPES['aux'],
-            'Alias'
-        ].tolist()
-
-        header_list = self._input_alias + self._candidates_alias + \
-            self._const_alias + self._obj_alias + self._aux_alias
-
-        # extract the inputs, candidate outputs and expression data
-        if not doe_data.empty:
-            self._case_data = doe_data.pop('case')
-            self._stat_data = doe_data.pop('status')
-
-        self._doe_data = doe_data[header_list]
-
-        self.layoutChanged.emit()
+    def sampled_data(self) -> pd.DataFrame:
+        return self.app_data.reduced_doe_sampled_data
 
 
 class ReducedSpaceTab(QWidget):
@@ -439,11 +399,7 @@ class ReducedSpaceTab(QWidget):
         dialog.exec_()
 
     def update_combobox_items(self):
-        inp_data = self.application_database.input_table_data
-        mv_list = inp_data.loc[
-            inp_data['Type'] ==
-            self.application_database._INPUT_ALIAS_TYPES['mv'],
-            'Alias'].tolist()
+        mv_list = self.application_database.alias_index.aliases('input', 'mv')
         self._pairing_delegate.item_list = mv_list
 
 
@@ -8,7 +8,6 @@ from scipy.special import comb
 from gui.calls.base import DoubleEditorDelegate, IntegerEditorDelegate
 from gui.models.data_storage import DataStorage
 from gui.views.py_files.soctab import Ui_Form
-from gui.calls.dialogs.socresults import SocResultsDialog
 
 
 class MagnitudeTableModel(QAbstractTableModel):
@@ -275,6 +274,9 @@ class SocTab(QWidget):
         # ---------------------------------------------------------------------
 
     def on_generate_results_pressed(self):
+        # pysoc and matplotlib are only needed by the results dialog
+        from gui.calls.dialogs.socresults import SocResultsDialog
+
         dialog = SocResultsDialog(self.application_database)
         dialog.exec_()
 
@@ -0,0 +1,366 @@
+import numpy as np
+from scipy.linalg import solve_triangular
+
+from gui.models.incremental_kriging import IncrementalKriging, _regpoly
+from gui.models.space_filling import design, random_lhs, scale_to_bounds
+
+# default hyperparameter bounds of the kriging models (same as the metamodel
+# tab defaults)
+_THETA0 = 1.0
+_THETA_LB = 1e-5
+_THETA_UB = 1e5
+
+# smallest variance of a candidate point (same order as pydace's nugget)
+_NUGGET = 1e-10
+
+CRITERIA = ('mse', 'imse')
+
+
+def _dace_factory(regression: str):
+    from pydace import Dace
+    return Dace(regression=regression, correlation='corrgauss')
+
+
+def _correlation(xs: np.ndarray, S: np.ndarray, theta: np.ndarray):
+    d = xs[:, None, :] - S[None, :, :]
+    return np.exp(-(theta * d ** 2).sum(axis=2))
+
+
+class _VarianceModel:
+    # gaussian correlation structure of a fitted kriging model: scaled sites,
+    # correlation parameters and the factorization terms of the fit (Cholesky
+    # factor C of the correlation matrix, Ft = C^-1 F and G of the QR of Ft),
+    # which aren't computed again
+
+    def __init__(self, model):
+        self.S = np.asarray(model.S, dtype=float)
+        self.Ssc = np.asarray(model._Ssc, dtype=float)
+        self.theta = np.asarray(model.theta, dtype=float).flatten()
+        self.C = model._fitpar['C']
+        self.Ft = model._fitpar['Ft']
+        self.G = model._fitpar['G']
+
+        # regression polynomial of the fit, from its number of terms
+        n = self.S.shape[1]
+        self.regression = {1: 'poly0', n + 1: 'poly1'}.get(
+            self.Ft.shape[1], 'poly2')
+
+    def scale(self, X: np.ndarray) -> np.ndarray:
+        return (X - self.Ssc[0]) / self.Ssc[1]
+
+    def terms(self, X: np.ndarray) -> tuple:
+        # C^-1 r and G'^-1 (Ft' C^-1 r - f) of each point (columns)
+        xs = self.scale(X)
+        rt = solve_triangular(self.C, _correlation(xs, self.S, self.theta).T,
+                              lower=True)
+        F = _regpoly(xs, self.regression)[0]
+        u = solve_triangular(self.G.T, self.Ft.T @ rt - F.T, lower=True)
+        return rt, u
+
+    def variance(self, X: np.ndarray) -> tuple:
+        # normalized variance at X and the terms of each point
+        rt, u = self.terms(X)
+        var = 1.0 + (u ** 2).sum(axis=0) - (rt ** 2).sum(axis=0)
+        return np.maximum(var, 0.0), rt, u
+
+
+def kriging_variance(model, X: np.ndarray) -> np.ndarray:
+    """Normalized prediction variance 1 + u'(G'G)^-1 u - r'R^-1 r of a
+    fitted kriging model with gaussian correlation (pydace `Dace` attributes
+    `S`, `_Ssc`, `theta` and the 'C', 'Ft' and 'G' entries of `_fitpar`) at
+    the points X (k x n): the kriging MSE divided by the process variance. 0
+    at the sampled points, 1 or more far from them.
+
+    The factorization of the fit is reused, so the cost is O(m^2) per point
+    (m samples) instead of a new O(m^3) factorization per call.
+    """
+    X = np.atleast_2d(np.asarray(X, dtype=float))
+    return _VarianceModel(model).variance(X)[0]
+
+
+def imse_reduction(model, candidates: np.ndarray,
+                   reference: np.ndarray = None) -> np.ndarray:
+    """Reduction of the integrated (mean over `reference`) normalized
+    prediction variance of a kriging model if each candidate point were
+    sampled: mean of cov(x, c)^2 / var(c) over the reference points x.
+
+    Parameters
+    ----------
+    model : Dace
+        Fitted model with gaussian correlation (see `kriging_variance`).
+    candidates : np.ndarray
+        Candidate points (k x n).
+    reference : np.ndarray, optional
+        Points where the variance is integrated. Default is the candidates.
+    """
+    candidates = np.atleast_2d(np.asarray(candidates, dtype=float))
+    reference = candidates if reference is None else \
+        np.atleast_2d(np.asarray(reference, dtype=float))
+
+    vm = _VarianceModel(model)
+    var_c, rt_c, u_c = vm.variance(candidates)
+    rt_x, u_x = vm.terms(reference)
+
+    # posterior covariance between the reference and the candidate points
+    cov = _correlation(vm.scale(reference), vm.scale(candidates), vm.theta) \
+        - rt_x.T @ rt_c + u_x.T @ u_c
+
+    return (cov ** 2).mean(axis=0) / np.maximum(var_c, _NUGGET)
+
+
+class AdaptiveSampler:
+    """Sequential design of experiments: starts from a small space filling
+    design, fits a kriging model to each output and adds batches of the
+    points where the models are the most uncertain until the models reach a
+    target validation error.
+
+    Each batch is taken from a random latin hypercube of `n_candidates`
+    points by the criterion (mean over the outputs of the normalized kriging
+    variance, 'mse', or of the reduction of the integrated variance, 'imse'),
+    multiplied by a distance penalty 1 - exp(-(d / penalty_radius)^2) to the
+    points already in the batch, so the batch points don't cluster.
+
+    Before a batch is simulated, the models predict it. These predictions
+    are the validation of the models: the error is the largest (over the
+    outputs) RMSE of the batch predictions divided by the range of the
+    output sampled. The sampling stops when the error is below
+    `target_error`, when `max_samples` points were simulated or when `stop`
+    returns True.
+
+    Parameters
+    ----------
+    lb, ub : list
+        Bounds of the inputs.
+    simulate : callable
+        Called with the points of a batch (k x n). Returns the output values
+        (k x p array) and whether each simulation converged (k booleans).
+    n_initial : int, optional
+        Number of points of the initial design.
+    batch_size : int, optional
+        Number of points added per iteration.
+    max_samples : int, optional
+        Maximum number of points simulated (initial design included).
+    target_error : float, optional
+        Validation error (relative to the output ranges) that stops the
+        sampling.
+    criterion : str, optional
+        'mse' or 'imse'.
+    n_candidates : int, optional
+        Number of candidate points per batch.
+    penalty_radius : float, optional
+        Distance (in the unit hypercube) of the batch diversity penalty.
+        Default is half the mean spacing of the points sampled.
+    initial_design : str, optional
+        'lhs' (random latin hypercube) or one of
+        `space_filling.DESIGN_METHODS`.
+    regression : str, optional
+        Kriging regression polynomial ('poly0', 'poly1' or 'poly2').
+    incremental : bool, optional
+        Whether the models are `IncrementalKriging` models extended with
+        each batch (refitted only when the data drifts) instead of refitted
+        to all the data.
+    report : callable, optional
+        Called with the text of each iteration report.
+    surrogate_factory : callable, optional
+        Called with `regression` to create a model with the `pydace.Dace`
+        interface and attributes. Default is a `Dace` model with gaussian
+        correlation.
+    stop : callable, optional
+        Checked before each batch. The sampling stops when it returns True.
+    random_state : int, optional
+        Seed of the initial design and of the candidates.
+    """
+
+    def __init__(self, lb: list, ub: list, simulate, n_initial: int = 10,
+                 batch_size: int = 5, max_samples: int = 100,
+                 target_error: float = 0.05, criterion: str = 'mse',
+                 n_candidates: int = 500, penalty_radius: float = None,
+                 initial_design: str = 'maximin', regression: str = 'poly1',
+                 incremental: bool = True, report=None,
+                 surrogate_factory=None, stop=None, random_state=None):
+        self.lb = np.asarray(lb, dtype=float)
+        self.ub = np.asarray(ub, dtype=float)
+        self.simulate = simulate
+        self.n_initial = int(n_initial)
+        self.batch_size = int(batch_size)
+        self.max_samples = int(max_samples)
+        self.target_error = target_error
+        self.criterion = criterion
+        self.n_candidates = int(n_candidates)
+        self.penalty_radius = penalty_radius
+        self.initial_design = initial_design
+        self.regression = regression
+        self.incremental = incremental
+        self.report = report
+        self.surrogate_factory = _dace_factory if surrogate_factory is None \
+            else surrogate_factory
+        self.stop = stop
+        self._rng = np.random.RandomState(random_state)
+
+        if criterion not in CRITERIA:
+            raise ValueError("Invalid adaptive sampling criterion.")
+
+        if self.batch_size < 1 or self.n_initial < 2:
+            raise ValueError("The batch size must be positive and the initial "
+                             "design must have at least 2 points.")
+
+        if self.max_samples < self.n_initial:
+            raise ValueError("The maximum number of samples must be at least "
+                             "the size of the initial design.")
+
+        dim = self.lb.size
+        self.x = np.empty((0, dim))
+        self.y = None
+        self.status = np.empty(0, dtype=bool)
+
+        # one dict per batch: 'samples' (total simulated), 'error' and
+        # 'output_errors' (NaN for the initial design)
+        self.history = []
+        self.converged = False
+        self._models = None
+
+    # --------------------------- PRIVATE FUNCTIONS --------------------------
+    def _print(self, text: str) -> None:
+        if self.report is not None:
+            self.report(text)
+
+    def _stopped(self) -> bool:
+        return self.stop is not None and self.stop()
+
+    def _unit(self, x: np.ndarray) -> np.ndarray:
+        span = np.where(self.ub > self.lb, self.ub - self.lb, 1.0)
+        return (x - self.lb) / span
+
+    def _add(self, x: np.ndarray) -> tuple:
+        y, status = self.simulate(x)
+        y = np.asarray(y, dtype=float).reshape(x.shape[0], -1)
+        status = np.asarray(status, dtype=bool).flatten()
+
+        self.x = np.vstack((self.x, x))
+        self.y = y if self.y is None else np.vstack((self.y, y))
+        self.status = np.append(self.status, status)
+
+        return y, status
+
+    def _fit(self) -> list:
+        x, y = self.x[self.status], self.y[self.status]
+        if self._models is not None:
+            # incremental models: only the new converged points are added
+            n_fit = self._models[0].n_samples
+            for j, model in enumerate(self._models):
+                model.append(x[n_fit:], y[n_fit:, j])
+
+            return self._models
+
+        dim = x.shape[1]
+        theta0 = np.full(dim, _THETA0)
+        lob = np.full(dim, _THETA_LB)
+        upb = np.full(dim, _THETA_UB)
+
+        models = []
+        for j in range(y.shape[1]):
+            if self.incremental:
+                model = IncrementalKriging(
+                    self.regression, model_factory=self.surrogate_factory)
+            else:
+                model = self.surrogate_factory(self.regression)
+            model.fit(S=x, Y=y[:, j], theta0=theta0, lob=lob, upb=upb)
+            models.append(model)
+
+        if self.incremental:
+            self._models = models
+
+        return models
+
+    def _scores(self, models: list, candidates: np.ndarray) -> np.ndarray:
+        if self.criterion == 'mse':
+            scores = [kriging_variance(model, candidates) for model in models]
+        else:
+            scores = [imse_reduction(model, candidates) for model in models]
+
+        return np.mean(scores, axis=0)
+
+    def _next_batch(self, models: list, n_points: int) -> np.ndarray:
+        dim = self.lb.size
+        candidates = scale_to_bounds(
+            random_lhs(self.n_candidates, dim, self._rng), self.lb, self.ub)
+        scores = self._scores(models, candidates)
+
+        radius = self.penalty_radius
+        if radius is None:
+            radius = 0.5 * self.x.shape[0] ** (-1.0 / dim)
+
+        unit = self._unit(candidates)
+        penalty = np.ones(candidates.shape[0])
+        batch = []
+        for _ in range(min(n_points, candidates.shape[0])):
+            best = int(np.argmax(scores * penalty))
+            batch.append(best)
+            d = np.sqrt(((unit - unit[best]) ** 2).sum(axis=1))
+            penalty *= 1.0 - np.exp(-(d / radius) ** 2)
+
+        return candidates[batch]
+
+    def _validation_error(self, pred: np.ndarray, y: np.ndarray,
+                          status: np.ndarray) -> np.ndarray:
+        ok = self.y[self.status]
+        span = ok.max(axis=0) - ok.min(axis=0)
+        span = np.where(span > 0, span, 1.0)
+        if not status.any():
+            return np.full(y.shape[1], np.nan)
+
+        err = pred[status] - y[status]
+        return np.sqrt((err ** 2).mean(axis=0)) / span
+
+    # --------------------------- PUBLIC FUNCTIONS ---------------------------
+    def run(self, initial: np.ndarray = None) -> None:
+        """Samples the initial design and the adaptive batches.
+
+        Parameters
+        ----------
+        initial : np.ndarray, optional
+            Points of the initial design (e.g. generated in the sampling
+            assistant). Default is `n_initial` points of `initial_design`.
+        """
+        dim = self.lb.size
+        if initial is not None:
+            x0 = np.atleast_2d(np.asarray(initial, dtype=float))
+        elif self.initial_design == 'lhs':
+            x0 = scale_to_bounds(random_lhs(self.n_initial, dim, self._rng),
+                                 self.lb, self.ub)
+        else:
+            x0 = design(self.n_initial, self.lb, self.ub,
+                        method=self.initial_design, random_state=self._rng)
+
+        _, status = self._add(x0)
+        self.history.append({'samples': self.x.shape[0], 'error': np.nan,
+                             'output_errors': None})
+        self._print("Initial design: {0} points, {1} converged".format(
+            x0.shape[0], int(status.sum())))
+
+        while self.x.shape[0] < self.max_samples and not self._stopped():
+            if self.status.sum() < 2:
+                self._print("Less than 2 converged points, the models can't "
+                            "be fitted.")
+                return
+
+            models = self._fit()
+            n_points = min(self.batch_size,
+                           self.max_samples - self.x.shape[0])
+            batch = self._next_batch(models, n_points)
+            pred = np.column_stack([np.asarray(model.predict(batch)[0])
+                                    .flatten() for model in models])
+
+            y, status = self._add(batch)
+            errors = self._validation_error(pred, y, status)
+            error = np.nanmax(errors) if not np.isnan(errors).all() \
+                else np.nan
+            self.history.append({'samples': self.x.shape[0], 'error': error,
+                                 'output_errors': errors})
+            self._print("{0:5d} samples  validation error {1:10.4g}".format(
+                self.x.shape[0], error))
+
+            if error <= self.target_error:
+                self.converged = True
+                self._print("Target validation error reached.")
+                return
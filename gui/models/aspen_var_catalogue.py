@@ -1,3 +1,7 @@
+# Version of the variable catalogues. Increase it whenever the catalogues below
+# change, so the simulation trees cached with an older catalogue are rebuilt.
+CATALOGUE_VERSION = 1
+
 # ----------------------------- INPUT SECTION -----------------------------
 BLOCKS_INPUT_CATALOGUE = {
     'Compr':
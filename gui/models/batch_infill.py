@@ -0,0 +1,643 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+from scipy.optimize import minimize
+
+from gui.models.incremental_kriging import IncrementalKriging
+from gui.models.space_filling import random_lhs, scale_to_bounds, sobol
+
+# default hyperparameter bounds of the kriging models (same as the metamodel
+# tab defaults)
+_THETA0 = 1.0
+_THETA_LB = 1e-5
+_THETA_UB = 1e5
+
+# options of the SLSQP solver of the surrogate NLPs (see `solve_surrogate_nlp`)
+NLP_OPTIONS = ('tol', 'max_iter')
+
+
+def _dace_factory(regression: str):
+    from pydace import Dace
+    return Dace(regression=regression, correlation='corrgauss')
+
+
+def _predict(model, x: np.ndarray) -> tuple:
+    y, dy, *_ = model.predict(X=x.reshape(1, -1), compute_jacobian=True)
+    return np.asarray(y).item(), np.asarray(dy, dtype=float).flatten()
+
+
+def uses_batch_procedure(params: dict) -> bool:
+    """Whether the optimization parameters ('infill_batch', 'nlp_starts' and
+    'incremental_fit' keys) run the `BatchCaballero` procedure instead of the
+    surropt one: more than one infill point per iteration or NLP start, or
+    incremental surrogates.
+    """
+    return params.get('infill_batch', 1) > 1 or \
+        params.get('nlp_starts', 1) > 1 or \
+        params.get('incremental_fit', False)
+
+
+def solve_surrogate_nlp(models: list, x0: np.ndarray, lb: np.ndarray,
+                        ub: np.ndarray, feasible_tol: float = 1e-6,
+                        nlp_options: dict = None) -> dict:
+    """Minimizes the objective surrogate subject to the constraint surrogates
+    inside the box [lb, ub], starting from `x0` (SLSQP in variables scaled to
+    [0, 1]).
+
+    Parameters
+    ----------
+    models : list
+        Fitted models of the objective followed by one model per constraint
+        (`pydace.Dace` interface).
+    x0 : np.ndarray
+        Starting point.
+    lb, ub : np.ndarray
+        Bounds of the box.
+    feasible_tol : float, optional
+        Constraint violation tolerance.
+    nlp_options : dict, optional
+        Stopping tolerance ('tol') and maximum number of iterations
+        ('max_iter') of SLSQP. Default is the scipy defaults.
+
+    Returns
+    -------
+    dict
+        Solution with the keys 'x', 'f' and 'g' (surrogate predictions at 'x')
+        and 'success' (solver converged).
+    """
+    nlp_options = {} if nlp_options is None else nlp_options
+    lb = np.asarray(lb, dtype=float)
+    scale = np.asarray(ub, dtype=float) - lb
+    fixed = scale == 0
+    scale[fixed] = 1.0
+
+    def to_x(u):
+        return lb + u * scale
+
+    def objective(u):
+        y, dy = _predict(models[0], to_x(u))
+        return y, dy * scale
+
+    constraints = []
+    for model in models[1:]:
+        constraints.append({
+            'type': 'ineq',
+            'fun': lambda u, m=model:
+            feasible_tol - _predict(m, to_x(u))[0],
+            'jac': lambda u, m=model:
+            -_predict(m, to_x(u))[1] * scale})
+
+    sol = minimize(objective, (np.asarray(x0) - lb) / scale, jac=True,
+                   method='SLSQP', tol=nlp_options.get('tol', None),
+                   bounds=[(0.0, 0.0 if fix else 1.0) for fix in fixed],
+                   constraints=constraints,
+                   options={'maxiter': nlp_options.get('max_iter', 100)})
+
+    x = to_x(np.clip(sol.x, 0.0, 1.0))
+    return {'x': x, 'f': _predict(models[0], x)[0],
+            'g': np.array([_predict(model, x)[0] for model in models[1:]]),
+            'success': bool(sol.success)}
+
+
+def _timed_solve(models: list, lb: np.ndarray, ub: np.ndarray,
+                 feasible_tol: float, nlp_options: dict,
+                 x0: np.ndarray) -> dict:
+    # top level function, so it can be sent to the worker processes
+    start = time.perf_counter()
+    sol = solve_surrogate_nlp(models, x0, lb, ub, feasible_tol, nlp_options)
+    sol['time'] = time.perf_counter() - start
+    return sol
+
+
+def start_points(n_starts: int, lb, ub, design: str = 'lhs',
+                 random_state=None) -> np.ndarray:
+    """Starting points of a multistart spread over the box [lb, ub].
+
+    Parameters
+    ----------
+    n_starts : int
+        Number of points.
+    lb, ub : list
+        Bounds of the box.
+    design : str, optional
+        'lhs' (random latin hypercube) or 'sobol' (Sobol sequence without the
+        origin). Default is 'lhs'.
+    random_state : int or np.random.RandomState, optional
+        Seed or generator of the latin hypercube.
+
+    Returns
+    -------
+    np.ndarray
+        Points (n_starts x len(lb)).
+    """
+    dim = len(lb)
+    if design == 'lhs':
+        points = random_lhs(n_starts, dim, random_state)
+    elif design == 'sobol':
+        points = sobol(n_starts, dim, skip=1)
+    else:
+        raise ValueError("Invalid start points design.")
+
+    return scale_to_bounds(points, lb, ub)
+
+
+def multistart_nlp(models: list, lb, ub, starts: np.ndarray,
+                   feasible_tol: float = 1e-6, penalty_factor: float = 1e3,
+                   dedup_tol: float = 1e-4, executor=None,
+                   nlp_options: dict = None) -> dict:
+    """Solves the surrogate NLP (see `solve_surrogate_nlp`) from each of the
+    `starts` and merges the solutions closer than `dedup_tol` (infinity norm
+    of the distance relative to the box size).
+
+    Parameters
+    ----------
+    models : list
+        Fitted models of the objective followed by one model per constraint.
+    lb, ub : list
+        Bounds of the box.
+    starts : np.ndarray
+        Starting points (n_starts x n).
+    feasible_tol : float, optional
+        Constraint violation tolerance.
+    penalty_factor : float, optional
+        Weight of the constraint violation in the merit function used to sort
+        the solutions.
+    dedup_tol : float, optional
+        Distance below which two solutions are the same.
+    executor : concurrent.futures.Executor, optional
+        Pool where the NLPs are solved (e.g. a `ProcessPoolExecutor`). Default
+        is to solve them in sequence in the calling thread.
+    nlp_options : dict, optional
+        Options of the solver (see `solve_surrogate_nlp`).
+
+    Returns
+    -------
+    dict
+        'solutions': distinct solutions (see `solve_surrogate_nlp`), best merit
+        first, with the number of starts that reached each one ('n_starts').
+        Solutions where the solver failed are only kept when all of them
+        failed.
+        'start_times': wall time (s) of each start.
+        'wall_time': wall time (s) of the whole multistart.
+    """
+    lb = np.asarray(lb, dtype=float)
+    ub = np.asarray(ub, dtype=float)
+    start = time.perf_counter()
+
+    solve = partial(_timed_solve, models, lb, ub, feasible_tol, nlp_options)
+    if executor is None:
+        sols = [solve(x0) for x0 in starts]
+    else:
+        workers = getattr(executor, '_max_workers', 1)
+        chunksize = max(1, len(starts) // (4 * workers))
+        sols = list(executor.map(solve, starts, chunksize=chunksize))
+
+    start_times = np.array([sol.pop('time') for sol in sols])
+
+    converged = [sol for sol in sols if sol['success']]
+    candidates = converged if len(converged) > 0 else sols
+
+    def merit(sol):
+        violation = np.maximum(sol['g'] - feasible_tol, 0.0).sum()
+        return sol['f'] + penalty_factor * violation
+
+    scale = ub - lb
+    scale[scale == 0] = 1.0
+    solutions = []
+    for sol in sorted(candidates, key=merit):
+        same = next((kept for kept in solutions
+                     if np.abs((kept['x'] - sol['x']) / scale).max() <
+                     dedup_tol), None)
+        if same is None:
+            solutions.append(dict(sol, n_starts=1))
+        else:
+            same['n_starts'] += 1
+
+    return {'solutions': solutions, 'start_times': start_times,
+            'wall_time': time.perf_counter() - start}
+
+
+class BatchCaballero:
+    """Trust region refinement of kriging surrogates (Caballero & Grossmann)
+    where each iteration proposes `batch_size` infill points at once. The
+    points are chosen sequentially with the "kriging believer" heuristic (the
+    surrogate prediction at a proposed point is taken as data before the next
+    point is proposed), evaluated in a single call of `model_function` (i.e.
+    concurrently, see `CaballeroWorker.model_function_batch`) and then all of
+    them are added to the surrogates. The surrogates are fitted once per
+    batch and the believed points are appended at fixed correlation
+    parameters (see `IncrementalKriging.append`).
+
+    The surrogate NLPs are solved with SLSQP (see `solve_surrogate_nlp`), not
+    with the IPOPT solvers of the surropt procedure.
+
+    The hypercube around the best point is kept while the best point keeps
+    moving more than `ref_tol` (refinement) and contracted by `second_factor`
+    otherwise (contraction). The procedure stops when the hypercube size is
+    below `contraction_tol`, when the merit function changes less than
+    `term_tol` between contractions or when `max_fun_evals` is reached.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        Sampled input data (m x n).
+    g : np.ndarray
+        Constraint values of the sampled data (m x p). Feasible when <= 0.
+    f : np.ndarray
+        Objective function values of the sampled data (m,).
+    model_function : callable
+        Called with an array of points (k x n). Returns a list of k
+        dictionaries with the keys 'status' (bool), 'f' (float) and 'g'
+        (list of p values), the same results as the model function of
+        `surropt`.
+    lb, ub : list
+        Bounds of the inputs.
+    regression : str, optional
+        Kriging regression polynomial ('poly0', 'poly1' or 'poly2').
+    batch_size : int, optional
+        Number of infill points evaluated per iteration.
+    max_fun_evals : int, optional
+        Maximum number of model function evaluations (points).
+    feasible_tol : float, optional
+        Constraint violation tolerance.
+    penalty_factor : float, optional
+        Weight of the constraint violation in the merit function used to
+        choose the best point.
+    ref_tol, term_tol, first_factor, second_factor, contraction_tol : float
+        Refinement tolerance, termination tolerance, initial hypercube size
+        (fraction of the bounds range), contraction factor and minimum
+        hypercube size.
+    n_starts : int, optional
+        Number of starting points of the surrogate NLP. When above 1, the
+        distinct optima of the multistart (see `multistart_nlp`) are taken as
+        infill points, best first, before the surrogates are refitted.
+    start_design : str, optional
+        Design of the starting points ('lhs' or 'sobol'). The center of the
+        hypercube is always the first start.
+    n_workers : int, optional
+        Number of processes that solve the multistart NLPs.
+    dedup_tol : float, optional
+        Distance (relative to the bounds range) below which two NLP solutions
+        are the same.
+    nlp_server_url : str, optional
+        Address of a `gui.models.nlp_server.NlpServer`. When given, the
+        surrogate NLPs are solved there instead of in this process.
+    nlp_options : dict, optional
+        Options of the SLSQP solver ('tol' and 'max_iter', see
+        `solve_surrogate_nlp`). Any other option raises a ValueError.
+    incremental : bool, optional
+        Whether the surrogates are kept between the iterations and extended
+        with the sampled points (block update at fixed correlation
+        parameters, refitted only when the data drifts) instead of refitted
+        at every iteration.
+    telemetry : gui.models.telemetry.TelemetryLog, optional
+        Log where the options, the initial data and the points, predictions,
+        results and timings of each iteration are written.
+    report : callable, optional
+        Called with the text of each iteration report.
+    surrogate_factory : callable, optional
+        Called with `regression` to create the model that optimizes the
+        correlation parameters of the surrogates (`fit(S, Y, theta0, lob,
+        upb)` and `theta` attribute, see `IncrementalKriging`). Default is a
+        `Dace` model with gaussian correlation.
+    random_state : int, optional
+        Seed of the starting points of the surrogate NLPs.
+    """
+
+    def __init__(self, x: np.ndarray, g: np.ndarray, f: np.ndarray,
+                 model_function, lb: list, ub: list,
+                 regression: str = 'poly0', batch_size: int = 2,
+                 max_fun_evals: int = 1000, feasible_tol: float = 1e-6,
+                 penalty_factor: float = 1e3, ref_tol: float = 1e-4,
+                 term_tol: float = 1e-5, first_factor: float = 0.8,
+                 second_factor: float = 0.4, contraction_tol: float = 1e-4,
+                 n_starts: int = 1, start_design: str = 'lhs',
+                 n_workers: int = 1, dedup_tol: float = 1e-4,
+                 nlp_server_url: str = None, nlp_options: dict = None,
+                 incremental: bool = False,
+                 telemetry=None, report=None, surrogate_factory=None,
+                 random_state=None):
+        self.x = np.asarray(x, dtype=float)
+        self.f = np.asarray(f, dtype=float).flatten()
+        self.g = np.asarray(g, dtype=float).reshape(self.x.shape[0], -1)
+        self.model_function = model_function
+        self.lb = np.asarray(lb, dtype=float)
+        self.ub = np.asarray(ub, dtype=float)
+        self.regression = regression
+        self.batch_size = int(batch_size)
+        self.max_fun_evals = max_fun_evals
+        self.feasible_tol = feasible_tol
+        self.penalty_factor = penalty_factor
+        self.ref_tol = ref_tol
+        self.term_tol = term_tol
+        self.first_factor = first_factor
+        self.second_factor = second_factor
+        self.contraction_tol = contraction_tol
+        self.n_starts = int(n_starts)
+        self.start_design = start_design
+        self.n_workers = int(n_workers)
+        self.dedup_tol = dedup_tol
+        self.nlp_server_url = nlp_server_url
+        self.nlp_options = {} if nlp_options is None else dict(nlp_options)
+        self.incremental = incremental
+        self.telemetry = telemetry
+        self.report = report
+        self.surrogate_factory = _dace_factory if surrogate_factory is None \
+            else surrogate_factory
+        self.random_state = random_state
+        self._rng = np.random.RandomState(random_state)
+
+        if self.batch_size < 1:
+            raise ValueError("The batch size must be a positive integer.")
+
+        if self.n_starts < 1:
+            raise ValueError("The number of NLP starts must be a positive "
+                             "integer.")
+
+        unknown = sorted(set(self.nlp_options) - set(NLP_OPTIONS))
+        if len(unknown) != 0:
+            raise ValueError("NLP options not supported by the batch "
+                             "procedure: {0}.".format(', '.join(unknown)))
+
+        self.fun_evals = 0
+        self.start_times = []
+        self.xopt = self.gopt = self.fopt = None
+        self._executor = None
+        self._models = None
+
+        # wall times of the surrogate fits and NLPs of the current iteration
+        self._stats = {'fit_time': 0.0, 'nlp_time': 0.0}
+
+    # --------------------------- PRIVATE FUNCTIONS --------------------------
+    def _merit(self, f: np.ndarray, g: np.ndarray) -> np.ndarray:
+        violation = np.maximum(g - self.feasible_tol, 0.0).sum(axis=1)
+        return f + self.penalty_factor * violation
+
+    def _best_index(self) -> int:
+        return int(np.argmin(self._merit(self.f, self.g)))
+
+    def _outputs(self, f: np.ndarray, g: np.ndarray) -> list:
+        # data of the objective model followed by one for each constraint
+        return [f] + [g[:, j] for j in range(g.shape[1])]
+
+    def _fit(self) -> list:
+        # surrogates of the sampled data
+        outputs = self._outputs(self.f, self.g)
+        if self._models is not None:
+            # incremental models: only the points after their data are added
+            n_fit = self._models[0].n_samples
+            for model, y in zip(self._models, outputs):
+                model.append(self.x[n_fit:], y[n_fit:])
+
+            return self._models
+
+        n = self.x.shape[1]
+        theta0 = np.full(n, _THETA0)
+        lob = np.full(n, _THETA_LB)
+        upb = np.full(n, _THETA_UB)
+
+        models = []
+        for y in outputs:
+            model = IncrementalKriging(self.regression,
+                                       model_factory=self.surrogate_factory)
+            model.fit(S=self.x, Y=y, theta0=theta0, lob=lob, upb=upb)
+            models.append(model)
+
+        if self.incremental:
+            self._models = models
+
+        return models
+
+    def _surrogate_optima(self, models: list, lb: np.ndarray,
+                          ub: np.ndarray, start: np.ndarray) -> list:
+        if start is None:
+            start = lb + self._rng.rand(lb.size) * (ub - lb)
+
+        if self.n_starts == 1 and self.nlp_server_url is None:
+            return [solve_surrogate_nlp(models, start, lb, ub,
+                                        self.feasible_tol,
+                                        self.nlp_options)['x']]
+
+        starts = np.vstack((start, start_points(
+            self.n_starts - 1, lb, ub, self.start_design, self._rng)))
+        if self.nlp_server_url is None:
+            if self._executor is not None:
+                # the worker processes get the fitted parameters, not the
+                # models (and their data and factorizations)
+                from gui.models.nlp_server import (KrigingPredictor,
+                                                   kriging_to_dict)
+                models = [KrigingPredictor(kriging_to_dict(model,
+                                                           self.regression))
+                          for model in models]
+
+            res = multistart_nlp(models, lb, ub, starts, self.feasible_tol,
+                                 self.penalty_factor, self.dedup_tol,
+                                 self._executor, self.nlp_options)
+        else:
+            from gui.models.nlp_server import kriging_to_dict, solve_remote
+            res = solve_remote(self.nlp_server_url,
+                               [kriging_to_dict(model, self.regression)
+                                for model in models],
+                               starts, lb, ub, self.feasible_tol,
+                               self.penalty_factor, self.dedup_tol,
+                               nlp_options=self.nlp_options)
+
+        times = res['start_times']
+        self.start_times.extend(times.tolist())
+        if self.report is not None:
+            self.report("{0:>6} NLP starts, {1} distinct optima in {2:.3f} s "
+                        "({3:.1f} ms per start, slowest {4:.1f} ms)".format(
+                            times.size, len(res['solutions']),
+                            res['wall_time'], times.mean() * 1e3,
+                            times.max() * 1e3))
+
+        return [sol['x'] for sol in res['solutions']]
+
+    def _infill_batch(self, lb: np.ndarray, ub: np.ndarray, n_points: int,
+                      start: np.ndarray) -> np.ndarray:
+        x = self.x
+        scale = self.ub - self.lb
+        scale[scale == 0] = 1.0
+
+        # hyperparameters are optimized once per batch at most
+        fit_start = time.perf_counter()
+        models = self._fit()
+        self._stats['fit_time'] += time.perf_counter() - fit_start
+
+        batch, f_pred, g_pred = [], [], []
+        while len(batch) < n_points:
+            nlp_start = time.perf_counter()
+            optima = self._surrogate_optima(models, lb, ub,
+                                            start if len(batch) == 0 else None)
+            self._stats['nlp_time'] += time.perf_counter() - nlp_start
+
+            # the believed data makes the next NLPs avoid the points taken,
+            # but an optimum that is already a sample is not taken
+            new_points = []
+            for xk in optima[:n_points - len(batch)]:
+                taken = np.vstack([x] + new_points)
+                if np.abs((taken - xk) / scale).max(axis=1).min() >= 1e-6:
+                    new_points.append(xk)
+
+            if len(new_points) == 0:
+                new_points.append(lb + self._rng.rand(lb.size) * (ub - lb))
+
+            f_new = [_predict(models[0], xk)[0] for xk in new_points]
+            g_new = np.array([[_predict(model, xk)[0] for model in models[1:]]
+                              for xk in new_points]).reshape(
+                                  len(new_points), -1)
+            batch.extend(new_points)
+            f_pred.extend(f_new)
+            g_pred.extend(g_new.tolist())
+            x = np.vstack([x] + new_points)
+
+            # the believed points are appended to the surrogates with their
+            # correlation parameters fixed
+            if len(batch) < n_points:
+                fit_start = time.perf_counter()
+                for model, y in zip(models, self._outputs(np.array(f_new),
+                                                          g_new)):
+                    model.append(np.array(new_points), y, refit=False)
+                self._stats['fit_time'] += time.perf_counter() - fit_start
+
+        if self._models is not None:
+            # the believed points are dropped from the incremental models
+            for model in self._models:
+                model.truncate(self.x.shape[0])
+
+        return np.array(batch), np.array(f_pred), \
+            np.reshape(g_pred, (len(batch), -1))
+
+    def _print(self, *fields, header=False) -> None:
+        if self.report is None:
+            return
+
+        if header:
+            msg = "{0:>6}{1:>14}{2:>8}{3:>14}{4:>14}{5:>12}".format(
+                'Iter', 'Movement', 'Evals', 'f', 'max(g)', 'Size')
+        else:
+            msg = "{0:>6}{1:>14}{2:>8}{3:>14.6g}{4:>14.6g}{5:>12.4g}".format(
+                *fields)
+
+        self.report(msg)
+
+    def _refine(self) -> int:
+        scale = self.ub - self.lb
+        size = self.first_factor
+        best = self._best_index()
+        last_merit = self._merit(self.f[[best]], self.g[[best]]).item()
+        iteration = 0
+
+        self._print(header=True)
+        while self.fun_evals < self.max_fun_evals:
+            iteration += 1
+            center = self.x[best]
+            lb = np.maximum(self.lb, center - size * scale / 2)
+            ub = np.minimum(self.ub, center + size * scale / 2)
+
+            n_points = min(self.batch_size,
+                           self.max_fun_evals - self.fun_evals)
+            self._stats = {'fit_time': 0.0, 'nlp_time': 0.0}
+            batch, f_pred, g_pred = self._infill_batch(lb, ub, n_points,
+                                                       center)
+            sim_start = time.perf_counter()
+            results = self.model_function(batch)
+            sim_time = time.perf_counter() - sim_start
+            self.fun_evals += len(batch)
+
+            # only converged points are added to the surrogates data
+            for xk, res in zip(batch, results):
+                if res['status']:
+                    self.x = np.vstack((self.x, xk))
+                    self.f = np.append(self.f, res['f'])
+                    self.g = np.vstack((self.g,
+                                        np.reshape(res['g'], (1, -1))))
+
+            best = self._best_index()
+            moved = np.abs((self.x[best] - center) / np.where(
+                scale == 0, 1.0, scale)).max()
+
+            if moved > self.ref_tol:
+                movement = 'Refinement'
+            else:
+                movement = 'Contraction'
+                size *= self.second_factor
+
+                merit = self._merit(self.f[[best]], self.g[[best]]).item()
+                converged = abs(merit - last_merit) < \
+                    self.term_tol * (1 + abs(last_merit))
+                last_merit = merit
+
+            g_max = self.g[best].max() if self.g.shape[1] > 0 else 0.0
+            self._print(iteration, movement, self.fun_evals, self.f[best],
+                        g_max, size)
+
+            if self.telemetry is not None:
+                self.telemetry.write(
+                    'iteration', iter=iteration, movement=movement,
+                    center=center, lb=lb, ub=ub, size=size, x=batch,
+                    f_pred=f_pred, g_pred=g_pred,
+                    f=[res['f'] for res in results],
+                    g=[res['g'] for res in results],
+                    status=[bool(res['status']) for res in results],
+                    sim_time=sim_time, **self._stats)
+
+            if movement == 'Contraction' and \
+                    (size < self.contraction_tol or converged):
+                break
+
+        return best
+
+    # --------------------------- PUBLIC FUNCTIONS --------------------------
+    def optimize(self) -> None:
+        """Runs the procedure. The best point found is stored in `xopt`,
+        `gopt` and `fopt`. The wall time of each NLP start (multistart only)
+        is stored in `start_times`.
+        """
+        if self.telemetry is not None:
+            self.telemetry.write('start', procedure='batch',
+                                 options=self.options(), lb=self.lb,
+                                 ub=self.ub, x=self.x, f=self.f, g=self.g)
+
+        # the worker processes are created once and kept for the whole
+        # procedure
+        if self.n_starts > 1 and self.n_workers > 1 and \
+                self.nlp_server_url is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.n_workers)
+
+        try:
+            best = self._refine()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+        self.xopt = self.x[best]
+        self.gopt = self.g[best]
+        self.fopt = self.f[best]
+
+        if self.telemetry is not None:
+            self.telemetry.write('end', xopt=self.xopt, fopt=self.fopt,
+                                 gopt=self.gopt, fun_evals=self.fun_evals)
+
+    def options(self) -> dict:
+        """Options of the procedure (keyword arguments of the constructor
+        other than the data, functions and bounds).
+        """
+        return {'regression': self.regression,
+                'batch_size': self.batch_size,
+                'max_fun_evals': self.max_fun_evals,
+                'feasible_tol': self.feasible_tol,
+                'penalty_factor': self.penalty_factor,
+                'ref_tol': self.ref_tol, 'term_tol': self.term_tol,
+                'first_factor': self.first_factor,
+                'second_factor': self.second_factor,
+                'contraction_tol': self.contraction_tol,
+                'n_starts': self.n_starts, 'start_design': self.start_design,
+                'n_workers': self.n_workers, 'dedup_tol': self.dedup_tol,
+                'nlp_server_url': self.nlp_server_url,
+                'nlp_options': self.nlp_options,
+                'incremental': self.incremental,
+                'random_state': self.random_state}
@@ -0,0 +1,135 @@
+import numpy as np
+
+
+def _scaled(points: np.ndarray, lb, ub) -> np.ndarray:
+    lb = np.asarray(lb, dtype=float)
+    ub = np.asarray(ub, dtype=float)
+    span = np.where(ub > lb, ub - lb, 1.0)
+    return (np.asarray(points, dtype=float) - lb) / span
+
+
+def path_length(points: np.ndarray, order, lb, ub, x0=None) -> float:
+    """Length of the path through the `points` (rows) in `order`, in the
+    design space scaled by the bounds [lb, ub]. When `x0` is given, the path
+    starts from it.
+    """
+    x = _scaled(np.asarray(points)[np.asarray(order, dtype=int)], lb, ub)
+    if x0 is not None:
+        x = np.vstack((_scaled(np.reshape(x0, (1, -1)), lb, ub), x))
+
+    return float(np.linalg.norm(np.diff(x, axis=0), axis=1).sum())
+
+
+def _nearest_neighbor(x: np.ndarray) -> np.ndarray:
+    # path from the first point, always to the nearest point not visited
+    n = x.shape[0]
+    order = np.empty(n, dtype=int)
+    visited = np.zeros(n, dtype=bool)
+    order[0] = 0
+    visited[0] = True
+    for k in range(1, n):
+        dist = ((x - x[order[k - 1]]) ** 2).sum(axis=1)
+        dist[visited] = np.inf
+        order[k] = np.argmin(dist)
+        visited[order[k]] = True
+
+    return order
+
+
+def _two_opt(x: np.ndarray, order: np.ndarray, max_passes: int) -> np.ndarray:
+    # 2-opt of the open path with a fixed first point: the segment i..j is
+    # reversed when it shortens the path. The path points are kept
+    # contiguous (y) so the gains of every j are computed at once.
+    order = order.copy()
+    y = x[order]
+    n = y.shape[0]
+    for _ in range(max_passes):
+        improved = False
+        for i in range(1, n - 1):
+            edges = np.linalg.norm(np.diff(y, axis=0), axis=1)
+            j = np.arange(i + 1, n)
+
+            # edge (i-1, i) replaced by (i-1, j)
+            gain = edges[i - 1] - np.linalg.norm(y[j] - y[i - 1], axis=1)
+
+            # edge (j, j+1) replaced by (i, j+1), none when j is the last
+            gain[:-1] += edges[j[:-1]] - \
+                np.linalg.norm(y[j[:-1] + 1] - y[i], axis=1)
+
+            best = np.argmax(gain)
+            if gain[best] > 1e-12:
+                k = j[best]
+                order[i:k + 1] = order[i:k + 1][::-1].copy()
+                y[i:k + 1] = y[i:k + 1][::-1].copy()
+                improved = True
+
+        if not improved:
+            break
+
+    return order
+
+
+def order_cases(points: np.ndarray, lb, ub, x0=None,
+                max_passes: int = 20) -> np.ndarray:
+    """Order of the cases of a design that makes a short path through the
+    design space (scaled by the bounds), so each simulation starts from the
+    converged state of a nearby case. The path is built by nearest neighbour
+    and shortened by 2-opt moves.
+
+    Parameters
+    ----------
+    points : np.ndarray
+        Design points (cases x variables).
+    lb, ub : array_like
+        Bounds of the design variables.
+    x0 : array_like, optional
+        Point where the simulator is (e.g. the input values of the simulation
+        file), the start of the path. Default is to start from the first case.
+    max_passes : int, optional
+        Maximum number of 2-opt passes through the path.
+
+    Returns
+    -------
+    np.ndarray
+        Indexes of the cases (rows of `points`) in the order to simulate.
+    """
+    x = _scaled(np.atleast_2d(points), lb, ub)
+    n = x.shape[0]
+    if n < 3 and x0 is None:
+        return np.arange(n)
+
+    if x0 is not None:
+        # the start is a fixed point of the path, not a case
+        x = np.vstack((_scaled(np.reshape(x0, (1, -1)), lb, ub), x))
+
+    order = _two_opt(x, _nearest_neighbor(x), max_passes)
+
+    return order[1:] - 1 if x0 is not None else order
+
+
+def sampling_summary(run_times, statuses) -> dict:
+    """Per case statistics of a sampling run.
+
+    Parameters
+    ----------
+    run_times : array_like
+        Run time (s) of each case.
+    statuses : array_like
+        Status of each case ('ok', 'error' or other failure statuses).
+
+    Returns
+    -------
+    dict
+        Number of cases ('cases'), total and mean run time ('total_time',
+        'mean_time'), number of failed cases ('failed', timeouts included),
+        failure rate ('failure_rate') and number of cases that timed out
+        ('timeouts').
+    """
+    run_times = np.asarray(run_times, dtype=float)
+    statuses = np.asarray(statuses, dtype=object)
+    failed = int(np.sum(statuses != 'ok'))
+    n = run_times.size
+    return {'cases': n, 'total_time': float(run_times.sum()),
+            'mean_time': float(run_times.mean()) if n else 0.0,
+            'failed': failed, 'failure_rate': failed / n if n else 0.0,
+            'timeouts': int(np.sum(statuses == 'timeout'))}
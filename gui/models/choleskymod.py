@@ -1,11 +1,14 @@
 import numpy as np
-import scipy as sp
+from scipy import linalg, sparse
 
 _FINFO = np.finfo(float)
 _EPS = _FINFO.eps
 
+# number of columns factorized before the trailing matrix is updated
+_BLOCK_SIZE = 64
 
-def cholmod(A):
+
+def cholmod(A, block_size: int = _BLOCK_SIZE):
     """Modified Cholesky factorization
 
     `R = cholmod(A)` returns the upper Cholesky factor of `A` (same as `chol`)
@@ -15,14 +18,16 @@ def cholmod(A):
     where `delta` and `beta` are defined in terms of size of diagonal and
     offdiagonal entries of A and the machine precision; see below.
     The idea is to ensure that `E = A - R'*R` is reasonably small if `A` is
-    not too far from being indefinite.  If `A` is sparse, so is `R.
-    The output parameter indef is set to 0 if `A` is sufficiently positive
-    definite and to 1 if the factorization is modified.
+    not too far from being indefinite.  If `A` is sparse, so are `Ap` and
+    `R`. The output parameter indef is set to False if `A` is sufficiently
+    positive definite and to True if the factorization is modified.
 
-    The point of modified Cholesky is to avoid computing eigenvalues,
-    but for dense matrices, MODCHOL takes longer than calling the built-in
-    EIG, because of the cost of interpreting the code, even though it
-    only has one loop and uses vector operations.
+    The point of modified Cholesky is to avoid computing eigenvalues. The
+    LAPACK Cholesky factorization (`scipy.linalg.cho_factor`) is tried first
+    and its pivots are checked against the same `delta` and `beta` bounds. Only
+    the matrices that fail this test go through the Gill-Murray modification,
+    which is performed in blocked form: `block_size` columns are factorized
+    and then the trailing matrix is updated at once (BLAS-3).
 
     reference: Nocedal and Wright, Algorithm 3.4 and subsequent discussion
     (not Algorithm 3.5, which is more complicated)
@@ -32,6 +37,28 @@ def cholmod(A):
     convenient to work with A = LDL' where D is diagonal, L is unit
     lower triangular, and so R = (LD^(1/2))'
 
+    Parameters
+    ----------
+    A : np.ndarray or scipy.sparse matrix
+        Symmetric matrix of shape (n, n) or stack of symmetric matrices of
+        shape (k, n, n) (e.g. the Hessians of several disturbance scenarios or
+        operating points). Sparse input must be a single matrix.
+    block_size : int, optional
+        Number of columns per block in the modified factorization. Default is
+        64.
+
+    Returns
+    -------
+    Ap : np.ndarray or scipy.sparse matrix
+        Modified matrix `R'*R`. Same shape as `A`.
+    R : np.ndarray or scipy.sparse matrix
+        Upper (modified) Cholesky factor. Same shape as `A`.
+    indef : bool or np.ndarray
+        Whether the factorization was modified. For a stack, a boolean array of
+        shape (k,).
+    e : np.ndarray
+        Diagonal of `Ap - A`. Shape (n,) or (k, n) for a stack.
+
     Notes
     -----
     This code is from PyMMF Package from Michael Forbes, all credits to him! available at: https://bitbucket.org/mforbes/pymmf
@@ -94,55 +121,150 @@ def cholmod(A):
             E = A - R'*R;
         end
     """
-    assert np.allclose(A, A.T)
-    n = A.shape[0]
-    A_diag = A.diagonal()
-    gamma = abs(A_diag).max()
-    xi = abs(A - np.diag(A_diag)).max()  # max offidagonal entry
-
-    delta = _EPS * max(gamma + xi, 1)
-    beta = np.sqrt(max(gamma, xi / n, _EPS))
-    indef = 0
-
-    # initialize d and L
-
-    d = np.zeros(n, dtype=float)
-    if sp.sparse.issparse(A):
-        L = sp.sparse.issparse(*A.shape)
-    else:
-        L = np.eye(n)
-
-    # there are no inner for loops, everything implemented with
-    # vector operations for a reasonable level of efficiency
-
-    for j in range(n):
-        if j == 0:
-            K = []  # column index: all columns to left of diagonal
-            # d(K) doesn't work in case K is empty
-        else:
-            K = np.s_[:j]
-
-        djtemp = A[j, j] - np.dot(L[j, K], d[K] * L[j, K].T)  # C(j,j) in book
-        if j < n - 1:
-            I = np.s_[j + 1:n]  # row index: all rows below diagonal
-            Ccol = A[I, j] - np.dot(L[I, K], d[K] *
-                                    L[j, K].T)  # C(I,j) in book
-            theta = abs(Ccol).max()
-            # guarantees d(j) not too small and L(I,j) not too big
-            # in sufficiently positive definite case, d(j) = djtemp
-            d[j] = max(abs(djtemp), (theta / beta) ** 2, delta)
-            L[I, j] = Ccol / d[j]
+    is_sparse = sparse.issparse(A)
+    if is_sparse:
+        # the factor of a Hessian is dense in general, factorize the dense
+        # array and hand back sparse containers
+        A = A.toarray()
+
+    A = np.asarray(A, dtype=float)
+    if A.ndim not in (2, 3) or A.shape[-1] != A.shape[-2]:
+        raise ValueError("A must be a square matrix or a stack of square "
+                         "matrices.")
+
+    if not np.allclose(A, np.swapaxes(A, -1, -2)):
+        raise ValueError("A is not symmetric.")
+
+    n = A.shape[-1]
+    A_stack = A.reshape(-1, n, n)
+
+    # set parameters governing bounds on L and D (per matrix)
+    A_diag = np.diagonal(A_stack, axis1=1, axis2=2)
+    gamma = np.abs(A_diag).max(axis=1)  # max diagonal entry
+    off_diag = np.abs(A_stack - A_diag[:, :, None] * np.eye(n))
+    xi = off_diag.reshape(A_stack.shape[0], -1).max(axis=1)
+
+    delta = _EPS * np.maximum(gamma + xi, 1)
+    beta = np.sqrt(np.maximum.reduce([gamma, xi / n,
+                                      np.full_like(gamma, _EPS)]))
+
+    R = np.zeros_like(A_stack)
+    indef = np.zeros(A_stack.shape[0], dtype=bool)
+
+    # LAPACK fast path
+    for i, Ai in enumerate(A_stack):
+        try:
+            c, _ = linalg.cho_factor(Ai, lower=False, check_finite=False)
+        except linalg.LinAlgError:
+            indef[i] = True
         else:
-            d[j] = max(abs(djtemp), delta)
-        if d[j] > djtemp:  # A was not sufficiently positive definite
-            indef = True
-
-    # convert to usual output format: replace L by L*sqrt(D) and transpose
-    for j in range(n):
-        # L = L*diag(sqrt(d)) bad in sparse case
-        L[:, j] = L[:, j] * np.sqrt(d[j])
-
-    e = (np.dot(L, L.T) - A).diagonal()
-    R = L.conj().T
-    Ap = R.conj().T @ R
+            R[i] = np.triu(c)
+            indef[i] = not _is_sufficiently_pd(R[i], delta[i], beta[i])
+
+    if indef.any():
+        L, d = _gill_murray(A_stack[indef], delta[indef], beta[indef],
+                            block_size)
+        # convert to usual output format: replace L by L*sqrt(D) and transpose
+        R[indef] = np.swapaxes(L * np.sqrt(d)[:, None, :], -1, -2)
+
+    Ap = np.swapaxes(R, -1, -2) @ R
+    e = np.diagonal(Ap - A_stack, axis1=1, axis2=2)
+
+    if A.ndim == 2:
+        Ap, R, indef, e = Ap[0], R[0], bool(indef[0]), e[0]
+
+        if is_sparse:
+            Ap = sparse.csr_matrix(Ap)
+            R = sparse.csr_matrix(R)
+
     return Ap, R, indef, e
+
+
+def _is_sufficiently_pd(R: np.ndarray, delta: float, beta: float) -> bool:
+    """Checks whether a regular Cholesky factor satisfies the bounds of the
+    modified factorization, i.e. whether the Gill-Murray algorithm would
+    return it unchanged.
+
+    Parameters
+    ----------
+    R : np.ndarray
+        Upper Cholesky factor of shape (n, n).
+    delta : float
+        Lower bound of the pivots.
+    beta : float
+        Upper bound of the off-diagonal entries of `R`.
+
+    Returns
+    -------
+    bool
+        True if no pivot would be modified, False otherwise.
+    """
+    r_diag = R.diagonal()
+    d = r_diag ** 2
+
+    # theta(j) = max(abs(C(I, j))) = d(j) * max(abs(L(I, j)))
+    theta = np.zeros_like(d)
+    if R.shape[0] > 1:
+        theta[:-1] = r_diag[:-1] * np.abs(np.triu(R, k=1)[:-1]).max(axis=1)
+
+    return bool(np.all(d >= np.maximum((theta / beta) ** 2, delta)))
+
+
+def _gill_murray(A: np.ndarray, delta: np.ndarray, beta: np.ndarray,
+                 block_size: int) -> tuple:
+    """Blocked Gill-Murray modified LDL' factorization of a stack of
+    symmetric matrices.
+
+    Parameters
+    ----------
+    A : np.ndarray
+        Stack of symmetric matrices of shape (k, n, n).
+    delta : np.ndarray
+        Lower bounds of the pivots, shape (k,).
+    beta : np.ndarray
+        Upper bounds of the off-diagonal entries of the factor, shape (k,).
+    block_size : int
+        Number of columns factorized before the trailing matrix update.
+
+    Returns
+    -------
+    tuple
+        Unit lower triangular factors `L` (k, n, n) and pivots `d` (k, n).
+    """
+    k, n, _ = A.shape
+    block_size = max(int(block_size), 1)
+
+    # C holds the Schur complement of the already processed blocks
+    C = A.copy()
+    L = np.zeros_like(A)
+    L[:, np.arange(n), np.arange(n)] = 1.0
+    d = np.zeros((k, n), dtype=float)
+
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+
+        for j in range(start, stop):
+            K = np.s_[start:j]  # columns of this block left of the diagonal
+
+            # column j of the Schur complement: C(j:n, j) in book
+            Ccol = C[:, j:, j] - np.einsum('kij,kj->ki', L[:, j:, K],
+                                           d[:, K] * L[:, j, K])
+            djtemp = Ccol[:, 0]
+
+            if j < n - 1:
+                theta = np.abs(Ccol[:, 1:]).max(axis=1)
+                # guarantees d(j) not too small and L(I,j) not too big
+                # in sufficiently positive definite case, d(j) = djtemp
+                d[:, j] = np.maximum.reduce([np.abs(djtemp),
+                                             (theta / beta) ** 2, delta])
+                L[:, j + 1:, j] = Ccol[:, 1:] / d[:, j, None]
+            else:
+                d[:, j] = np.maximum(np.abs(djtemp), delta)
+
+        if stop < n:
+            # rank-(stop - start) update of the trailing matrix
+            L_blk = L[:, stop:, start:stop]
+            C[:, stop:, stop:] -= (L_blk * d[:, None, start:stop]) @ \
+                np.swapaxes(L_blk, -1, -2)
+
+    return L, d
@@ -0,0 +1,214 @@
+import collections
+import pathlib
+import shutil
+import tempfile
+
+import numpy as np
+
+# `Export` type of a backup (.bkp) archive of the document
+_HAPEXP_BKP = 1
+
+
+def _remove(path: str) -> None:
+    try:
+        pathlib.Path(path).unlink()
+    except OSError:
+        pass
+
+
+class ConvergedStates:
+    """Snapshots of recently converged simulation states, keyed by the input
+    vector of their case. After a case fails, the engine is restored to the
+    snapshot nearest to the case in the input space (scaled by the bounds)
+    instead of being reinitialized, so the next case starts from a converged
+    state close to it rather than from the built-in initial guesses.
+
+    Each snapshot is a backup archive of the simulation exported to a
+    temporary folder (`Export`, which unlike `SaveAs` leaves the document
+    bound to its file) and loaded back in the running engine
+    (`InitFromArchive2`), which doesn't start a new server. Since each export
+    writes a whole archive, only one in `record_every` converged cases is
+    saved, when no snapshot is within `min_distance` of it, and only the
+    `max_snapshots` most recent ones are kept.
+
+    The store belongs to a single engine: it must be used by one thread at a
+    time (e.g. by the jobs of a `SimulationSession`). Loading a snapshot
+    binds the engine document to the snapshot archive, removed by `close`,
+    so once `loaded` the engine must not be reused for the simulation file
+    (e.g. its session is discarded, see `SimulationSessionCache.release`).
+
+    Parameters
+    ----------
+    lb, ub : array_like
+        Bounds of the input variables.
+    max_snapshots : int, optional
+        Maximum number of snapshots kept.
+    min_distance : float, optional
+        Distance (in the input space scaled by the bounds) below which a
+        converged case is not saved, a snapshot that near is already kept.
+    record_every : int, optional
+        Number of converged cases per snapshot saved (the cases in between
+        are not saved).
+    directory : str, optional
+        Folder of the snapshot archives. Default is a new temporary folder,
+        removed by `close`.
+
+    Attributes
+    ----------
+    n_restores : int
+        Number of failed cases after which a snapshot was restored.
+    n_recovered : int
+        Number of those whose next case converged.
+    n_reinits : int
+        Number of failed cases with no snapshot to restore (the engine is
+        reinitialized).
+    n_reinit_recovered : int
+        Number of those whose next case converged.
+    loaded : bool
+        Whether a snapshot was loaded (or its load attempted) in the engine.
+    """
+
+    def __init__(self, lb, ub, max_snapshots: int = 8,
+                 min_distance: float = 0.1, record_every: int = 5,
+                 directory: str = None):
+        if max_snapshots < 1:
+            raise ValueError("At least one snapshot must be kept.")
+        if record_every < 1:
+            raise ValueError("record_every must be a positive integer.")
+
+        lb = np.asarray(lb, dtype=float)
+        ub = np.asarray(ub, dtype=float)
+        self._lb = lb
+        self._span = np.where(ub > lb, ub - lb, 1.0)
+        self.max_snapshots = int(max_snapshots)
+        self.min_distance = min_distance
+        self.record_every = int(record_every)
+
+        self._owns_directory = directory is None
+        self._directory = pathlib.Path(
+            tempfile.mkdtemp(prefix='metacontrol_states_')
+            if directory is None else directory)
+
+        self._snapshots = collections.OrderedDict()  # archive path: point
+        self._n_saved = 0
+        self._n_skipped = 0  # converged cases since the last snapshot
+        self._recovery = None  # how the engine recovered from the last case
+        self.n_restores = 0
+        self.n_recovered = 0
+        self.n_reinits = 0
+        self.n_reinit_recovered = 0
+        self.loaded = False
+
+    def _scaled(self, x) -> np.ndarray:
+        return (np.asarray(x, dtype=float).flatten() - self._lb) / self._span
+
+    def _distances(self, point: np.ndarray) -> tuple:
+        paths = list(self._snapshots.keys())
+        points = np.array(list(self._snapshots.values()))
+        return paths, np.linalg.norm(points - point, axis=1)
+
+    @property
+    def n_snapshots(self) -> int:
+        """Number of snapshots kept."""
+        return len(self._snapshots)
+
+    def case_finished(self, converged: bool) -> None:
+        """Records the outcome of a case, counted as a recovery when the case
+        before it failed (after a snapshot restore or a reinitialization).
+        """
+        if self._recovery == 'snapshot':
+            self.n_recovered += int(converged)
+        elif self._recovery == 'reinit':
+            self.n_reinit_recovered += int(converged)
+
+        self._recovery = None
+
+    def record(self, engine, x) -> bool:
+        """Saves the converged state of the engine, at the input vector `x`,
+        unless fewer than `record_every` converged cases were recorded since
+        the last snapshot or a snapshot is within `min_distance`. The oldest
+        snapshot is dropped when more than `max_snapshots` are kept.
+
+        Returns
+        -------
+        bool
+            Whether the state was saved.
+        """
+        self._n_skipped += 1
+        if self.n_snapshots != 0 and self._n_skipped < self.record_every:
+            return False
+
+        point = self._scaled(x)
+        if self.n_snapshots != 0 and \
+                self._distances(point)[1].min() < self.min_distance:
+            return False
+
+        path = self._directory / 'state_{0}.bkp'.format(self._n_saved)
+        try:
+            engine.Export(_HAPEXP_BKP, str(path))
+        except Exception:
+            # COM errors of the engine, the case just isn't kept
+            return False
+
+        self._n_saved += 1
+        self._n_skipped = 0
+        self._snapshots[str(path)] = point
+        if self.n_snapshots > self.max_snapshots:
+            oldest, _ = self._snapshots.popitem(last=False)
+            _remove(oldest)
+
+        return True
+
+    def restore(self, engine, x) -> bool:
+        """Loads the snapshot nearest to the input vector `x` (of a failed
+        case) in the engine.
+
+        Returns
+        -------
+        bool
+            Whether a snapshot was restored. When False (no snapshot or a
+            failed load), the engine has to be reinitialized.
+        """
+        restored = False
+        if self.n_snapshots != 0:
+            paths, distances = self._distances(self._scaled(x))
+            self.loaded = True
+            try:
+                engine.InitFromArchive2(paths[np.argmin(distances)])
+            except Exception:
+                pass
+            else:
+                restored = True
+
+        if restored:
+            self.n_restores += 1
+            self._recovery = 'snapshot'
+        else:
+            self.n_reinits += 1
+            self._recovery = 'reinit'
+
+        return restored
+
+    def summary(self) -> dict:
+        """Number of snapshots restored ('restores') and of reinitializations
+        ('reinits') after failed cases, the number of those followed by a
+        converged case ('recovered', 'reinit_recovered') and the ratio of
+        converged next cases of each ('recovery_rate', 'reinit_recovery_rate').
+        """
+        return {'restores': self.n_restores, 'recovered': self.n_recovered,
+                'recovery_rate': self.n_recovered / self.n_restores
+                if self.n_restores else 0.0,
+                'reinits': self.n_reinits,
+                'reinit_recovered': self.n_reinit_recovered,
+                'reinit_recovery_rate':
+                self.n_reinit_recovered / self.n_reinits
+                if self.n_reinits else 0.0}
+
+    def close(self) -> None:
+        """Removes the snapshot archives."""
+        for path in self._snapshots:
+            _remove(path)
+        self._snapshots.clear()
+
+        if self._owns_directory:
+            shutil.rmtree(str(self._directory), ignore_errors=True)
@@ -0,0 +1,115 @@
+import os
+
+import numpy as np
+import pandas as pd
+from PyQt5.QtCore import QThread, pyqtSignal
+
+# number of rows displayed in the alias pairing table
+PREVIEW_ROWS = 100
+
+# number of rows read at a time when importing the checked columns
+_CHUNK_SIZE = 50000
+
+
+def read_csv_header(csv_filepath: str) -> list:
+    """Reads only the header (column names) of a .csv file.
+
+    Parameters
+    ----------
+    csv_filepath : str
+        Full path of the .csv file.
+
+    Returns
+    -------
+    list
+        Column names.
+    """
+    return pd.read_csv(csv_filepath, nrows=0).columns.tolist()
+
+
+def read_csv_preview(csv_filepath: str, n_rows: int = PREVIEW_ROWS) \
+        -> pd.DataFrame:
+    """Reads the first `n_rows` rows of a .csv file. Used in the alias pairing
+    step, where the whole file is not needed.
+    """
+    return pd.read_csv(csv_filepath, nrows=n_rows)
+
+
+def read_csv_columns(csv_filepath: str, value_columns: list,
+                     status_column: str, chunk_size: int = _CHUNK_SIZE,
+                     progress_callback=None) -> pd.DataFrame:
+    """Reads only the selected columns of a .csv file, in chunks of
+    `chunk_size` rows. The value columns are parsed directly as float64, so
+    the memory used is proportional to the number of columns selected.
+
+    Parameters
+    ----------
+    csv_filepath : str
+        Full path of the .csv file.
+    value_columns : list
+        Names of the numeric columns to be read.
+    status_column : str
+        Name of the column with the convergence flag. Read with the dtype
+        inferred by pandas.
+    chunk_size : int, optional
+        Number of rows read at a time. Default is 50000.
+    progress_callback : callable, optional
+        Called after each chunk with the percentage (int, 0 - 100) of the file
+        read so far.
+
+    Returns
+    -------
+    pd.DataFrame
+        The `value_columns` followed by the `status_column`.
+    """
+    dtypes = {col: np.float64 for col in value_columns
+              if col != status_column}
+    columns = list(dict.fromkeys(list(value_columns) + [status_column]))
+    file_size = max(os.path.getsize(csv_filepath), 1)
+
+    chunks = []
+    with open(csv_filepath, 'rb') as csv_file:
+        reader = pd.read_csv(csv_file, usecols=columns, dtype=dtypes,
+                             chunksize=chunk_size)
+        for chunk in reader:
+            chunks.append(chunk)
+
+            if progress_callback is not None:
+                progress_callback(
+                    min(int(100 * csv_file.tell() / file_size), 100))
+
+    if len(chunks) == 0:
+        data = pd.DataFrame({col: pd.Series(dtype=dtypes.get(col, object))
+                             for col in columns})
+    else:
+        data = pd.concat(chunks, ignore_index=True) \
+            if len(chunks) > 1 else chunks[0]
+
+    return data[columns]
+
+
+class CsvReaderThread(QThread):
+    """Thread that reads the checked columns of a .csv file (see
+    `read_csv_columns`) and emits the DataFrame read.
+    """
+    progress_changed = pyqtSignal(int)
+    data_loaded = pyqtSignal(object)
+    read_failed = pyqtSignal(str)
+
+    def __init__(self, csv_filepath: str, value_columns: list,
+                 status_column: str, parent=None):
+        QThread.__init__(self, parent)
+        self._csv_filepath = csv_filepath
+        self._value_columns = value_columns
+        self._status_column = status_column
+
+    def run(self):
+        try:
+            data = read_csv_columns(
+                self._csv_filepath, self._value_columns, self._status_column,
+                progress_callback=self.progress_changed.emit)
+        except (OSError, ValueError) as error:
+            # unreadable file or non numeric values in a checked column
+            self.read_failed.emit(str(error))
+        else:
+            self.data_loaded.emit(data)
@@ -1,3 +1,4 @@
+import collections
 import copy
 import simplejson as json
 import pathlib
@@ -9,6 +10,7 @@ from PyQt5.QtCore import QObject, pyqtSignal
 from scipy.special import comb
 
 from gui.models.math_check import is_expression_valid
+from gui.models.model_registry import SURROGATE_TYPES, KrigingModelRegistry
 from gui.calls.base import warn_the_user
 
 # TODO: Implement class object to handle temporary file/folder creation for the
@@ -24,6 +26,134 @@ class PandasEncoder(json.JSONEncoder):
         return json.JSONEncoder.default(self, o)
 
 
+class AliasIndex:
+    """Read-only index of the variables (aliases) of the input, output and
+    expression tables, by table, type and position. Built by `DataStorage`
+    (see `DataStorage.alias_index`) and discarded whenever one of these
+    tables is replaced.
+
+    Queries of aliases by table and type are memoised, so repeated calls with
+    the same arguments do not filter the tables again.
+
+    Parameters
+    ----------
+    tables : dict
+        DataFrames of the 'input', 'output' and 'expression' tables.
+    type_names : dict
+        For each table, dictionary of type key (e.g. 'mv') to the type name
+        stored in the table (e.g. 'Manipulated (MV)').
+    """
+    TABLES = ('input', 'output', 'expression')
+
+    # column with the simulation path (or the expression) of each table
+    _VALUE_COLS = {'input': 'Path', 'output': 'Path',
+                   'expression': 'Expression'}
+
+    def __init__(self, tables: dict, type_names: dict):
+        self._type_names = type_names
+        self._rows = {}
+        self._info = {}
+        self._counts = {}
+        self._queries = {}
+
+        for table in self.TABLES:
+            # rows of (alias, type, path/expression, name of the column)
+            value_col = self._VALUE_COLS[table]
+            rows = tuple(row + (value_col,) for row in tables[table].reindex(
+                columns=['Alias', 'Type', value_col]
+            ).itertuples(index=False, name=None))
+            self._rows[table] = rows
+            self._counts[table] = collections.Counter(row[0] for row in rows)
+
+            for position, (alias, alias_type, value, _) in enumerate(rows):
+                # keep the first occurrence of duplicated aliases
+                self._info.setdefault(alias, {'table': table,
+                                              'type': alias_type,
+                                              'position': position,
+                                              value_col: value})
+
+    def __contains__(self, alias) -> bool:
+        return alias in self._info
+
+    def _query(self, tables, types: tuple) -> tuple:
+        tables = (tables,) if isinstance(tables, str) else tuple(tables)
+        query = (tables, types)
+
+        if query not in self._queries:
+            invalid_tables = [t for t in tables if t not in self.TABLES]
+            if len(invalid_tables) != 0:
+                raise ValueError("Invalid table(s) {0}. Must be one of "
+                                 "{1}.".format(invalid_tables, self.TABLES))
+
+            invalid_types = [k for k in types
+                             if all(k not in self._type_names[t]
+                                    for t in tables)]
+            if len(invalid_types) != 0:
+                raise ValueError("Invalid alias type(s) {0} for the table(s) "
+                                 "{1}.".format(invalid_types, tables))
+
+            rows = []
+            for table in tables:
+                if len(types) == 0:
+                    rows.extend(self._rows[table])
+                else:
+                    names = self._type_names[table]
+                    type_names = {names[k] for k in types if k in names}
+                    rows.extend(row for row in self._rows[table]
+                                if row[1] in type_names)
+
+            self._queries[query] = tuple(rows)
+
+        return self._queries[query]
+
+    def aliases(self, tables, *types: str) -> list:
+        """Aliases of the variables in `tables` whose type is one of `types`,
+        in table order.
+
+        Parameters
+        ----------
+        tables : str or list of str
+            Table ('input', 'output' or 'expression') or tables (concatenated
+            in the order given) to look into.
+        *types : str
+            Type keys (e.g. 'mv', 'cv', 'obj'). If none is given, every alias
+            of `tables` is returned.
+
+        Returns
+        -------
+        list
+            Aliases found. A new list on every call.
+        """
+        return [row[0] for row in self._query(tables, types)]
+
+    def records(self, tables, *types: str) -> list:
+        """Same as `aliases`, but each variable is returned as a dictionary
+        with its 'Alias' and 'Path' (or 'Expression', for the expression
+        table). The dictionaries are new on every call, so they can be
+        updated by the caller (e.g. with the sampled values).
+        """
+        return [{'Alias': alias, value_col: value}
+                for alias, _, value, value_col in self._query(tables, types)]
+
+    def count(self, alias: str, tables=TABLES) -> int:
+        """Number of times `alias` is used in `tables` (used to detect
+        duplicated names).
+        """
+        tables = (tables,) if isinstance(tables, str) else tables
+        return sum(self._counts[table][alias] for table in tables)
+
+    def info(self, alias: str) -> dict:
+        """Table, type (name), position in the table and path (or expression)
+        of `alias`.
+
+        Raises
+        ------
+        KeyError
+            If `alias` is not in any of the tables.
+        """
+        return dict(self._info[alias])
+
+
 class DataStorage(QObject):
     """Application data storage. This is for reuse of application data such as
     tree models, simulation data, aliases,
@@ -107,11 +237,22 @@ class DataStorage(QObject):
     # reduced space bounds
     _REDSPACE_BNDS_COLS = ['name', 'lb', 'nominal', 'ub']
 
+    # valid ranges of the integer optimization parameters of the batch
+    # procedure (e.g. number of sessions opened for the infill batch)
+    _OPT_INT_RANGES = {
+        'infill_batch': (1, 64),
+        'nlp_starts': (1, 10000),
+        'nlp_workers': (1, 64)
+    }
+
     def __init__(self):
         super().__init__()
         self._simulation_file = ''
+        self._case_timeout = 0.0
         self._tree_model_input = {}
         self._tree_model_output = {}
+        self._alias_index = None
+        self._model_registry = KrigingModelRegistry()
         self.input_table_data = pd.DataFrame(columns=self._ALIAS_COLS)
         self.output_table_data = pd.DataFrame(columns=self._ALIAS_COLS)
         self.expression_table_data = pd.DataFrame(columns=self._EXPR_COLS)
@@ -119,6 +260,7 @@ class DataStorage(QObject):
         self._hessian_data = {'metamodel_data': {'selected': []},
                               'regression': 'poly0',
                               'correlation': 'corrgauss',
+                              'surrogate': 'dace',
                               'gy': {},
                               'gyd': {},
                               'juu': {},
@@ -200,6 +342,9 @@ class DataStorage(QObject):
         # - check_reduced_space_setup
         self.reduced_doe_sampled_data_changed.connect(
             self.check_reduced_space_setup)
+        # - models fitted to the previous data are no longer needed
+        self.reduced_doe_sampled_data_changed.connect(
+            self._model_registry.clear)
 
         # whenever constraint activity/ expr data changes, update disturbance
         # and measurement error magnitudes data
@@ -251,6 +396,22 @@ class DataStorage(QObject):
         else:
             raise TypeError('Simulation file path must be a string.')
 
+    @property
+    def case_timeout(self):
+        """Maximum run time (s) of a simulation case. After it, the engine is
+        killed and opened again and the case has the 'timeout' status (see
+        `sim_connections.SimulationSession`). 0 is no timeout.
+        """
+        return self._case_timeout
+
+    @case_timeout.setter
+    def case_timeout(self, value: float):
+        if isinstance(value, (int, float)) and value >= 0:
+            self._case_timeout = float(value)
+        else:
+            raise ValueError("The case timeout must be a non negative "
+                             "number.")
+
     @property
     def tree_model_input(self):
         """Input variable tree model of the simulation. JSON compatible
@@ -324,6 +485,7 @@ class DataStorage(QObject):
                     value.index = value.index.astype(int)
 
                 self._input_table_data = value
+                self._alias_index = None
                 self.input_alias_data_changed.emit()
 
             else:
@@ -346,6 +508,7 @@ class DataStorage(QObject):
                     value.index = value.index.astype(int)
 
                 self._output_table_data = value
+                self._alias_index = None
                 self.output_alias_data_changed.emit()
             else:
                 raise ValueError("'output_table_data' must have its columns "
@@ -367,6 +530,7 @@ class DataStorage(QObject):
                     value.index = value.index.astype(int)
 
                 self._expression_table_data = value
+                self._alias_index = None
                 self.expr_data_changed.emit()
             else:
                 raise ValueError("'expression_table_data' must have its "
@@ -374,6 +538,32 @@ class DataStorage(QObject):
         else:
             raise TypeError("Expression table data must be a DataFrame.")
 
+    @property
+    def alias_index(self):
+        """Index of the variables in the input, output and expression tables
+        by table, type and position (see `AliasIndex`). Built on first use and
+        rebuilt only after one of these tables is set again. e.g. the MV
+        aliases are `alias_index.aliases('input', 'mv')`."""
+        if self._alias_index is None:
+            self._alias_index = AliasIndex(
+                tables={'input': self.input_table_data,
+                        'output': self.output_table_data,
+                        'expression': self.expression_table_data},
+                type_names={'input': self._INPUT_ALIAS_TYPES,
+                            'output': self._OUTPUT_ALIAS_TYPES,
+                            'expression': self._EXPR_ALIAS_TYPES}
+            )
+
+        return self._alias_index
+
+    @property
+    def model_registry(self):
+        """Reduced space kriging models already fitted (see
+        `KrigingModelRegistry`), shared by the reduced space metamodel
+        validation and the differentials (gradients/hessians) evaluation.
+        Not saved in the .mtc file."""
+        return self._model_registry
+
     @property
     def doe_mv_bounds(self):
         """DataFrame containing the MVs and its bounds to be displayed or
@@ -406,19 +596,33 @@ class DataStorage(QObject):
     @property
     def doe_lhs_settings(self):
         """LHS info (Series) to read/write into LHS settings dialog.
-        Keys are: 'n_samples', 'n_iter', 'inc_vertices'."""
+        Keys are: 'n_samples', 'n_iter', 'inc_vertices', 'method' ('lhs'
+        or one of `space_filling.DESIGN_METHODS`), 'order_cases' (see
+        `case_ordering.order_cases`) and the adaptive sampling
+        settings 'adaptive', 'batch_size', 'max_samples', 'target_error' and
+        'criterion' (see `adaptive_sampling.AdaptiveSampler`)."""
         if not hasattr(self, '_doe_lhs_settings'):
             # attribute not created (init), create now
             self._doe_lhs_settings = pd.Series({'n_samples': 50,
                                                 'n_iter': 5,
-                                                'inc_vertices': False})
+                                                'inc_vertices': False,
+                                                'method': 'lhs',
+                                                'order_cases': False,
+                                                'adaptive': False,
+                                                'batch_size': 5,
+                                                'max_samples': 100,
+                                                'target_error': 0.05,
+                                                'criterion': 'mse'})
 
         return self._doe_lhs_settings
 
     @doe_lhs_settings.setter
     def doe_lhs_settings(self, value: pd.Series):
         if isinstance(value, pd.Series):
-            if value.index.isin(['n_samples', 'n_iter', 'inc_vertices']).all():
+            if value.index.isin(['n_samples', 'n_iter', 'inc_vertices',
+                                 'method', 'order_cases', 'adaptive',
+                                 'batch_size', 'max_samples',
+                                 'target_error', 'criterion']).all():
                 self._doe_lhs_settings = value
             else:
                 raise ValueError("'doe_lhs_settings' must have its fields "
@@ -546,6 +750,12 @@ class DataStorage(QObject):
                 'tol1': 1e-4,
                 'tol2': 1e-5,
                 'maxfunevals': 1000,
+                'infill_batch': 1,
+                'nlp_starts': 1,
+                'start_design': 'lhs',
+                'nlp_workers': 1,
+                'incremental_fit': False,
+                'telemetry': False,
                 'regrpoly': 'poly0',
                 'nlp_params': {
                     'solver_type': 'ipopt_local',
@@ -562,12 +772,34 @@ class DataStorage(QObject):
     @optimization_parameters.setter
     def optimization_parameters(self, value: dict):
         if isinstance(value, dict):
+            for key in self._OPT_INT_RANGES:
+                if key in value:
+                    value[key] = self.clamp_optimization_parameter(
+                        key, value[key])
+
             self._optimization_parameters = value
             self.optimization_parameters_changed.emit()
 
         else:
             raise TypeError("Optimization parameters must be a dictionary.")
 
+    @classmethod
+    def clamp_optimization_parameter(cls, key: str, value):
+        """Value of the optimization parameter `key` brought to its valid
+        range (integer parameters of the batch procedure). Invalid values are
+        set to the lower bound. Other parameters are returned unchanged.
+        """
+        if key not in cls._OPT_INT_RANGES:
+            return value
+
+        lb, ub = cls._OPT_INT_RANGES[key]
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            value = lb
+
+        return min(max(value, lb), ub)
+
     @property
     def reduced_space_dof(self):
         """DataFrame containing which MV's are in the reduced space degrees of
@@ -615,19 +847,22 @@ class DataStorage(QObject):
     @property
     def reduced_doe_lhs_settings(self):
         """LHS info (Series) to read/write into LHS settings dialog.
-        Keys are: 'n_samples', 'n_iter', 'inc_vertices'."""
+        Keys are: 'n_samples', 'n_iter', 'inc_vertices' and 'method' ('lhs'
+        or one of `space_filling.DESIGN_METHODS`)."""
         if not hasattr(self, '_reduced_doe_lhs_settings'):
             # attribute not created (init), create now
             self._reduced_doe_lhs_settings = pd.Series({'n_samples': 50,
                                                         'n_iter': 5,
-                                                        'inc_vertices': False})
+                                                        'inc_vertices': False,
+                                                        'method': 'lhs'})
 
         return self._reduced_doe_lhs_settings
 
     @reduced_doe_lhs_settings.setter
     def reduced_doe_lhs_settings(self, value: pd.Series):
         if isinstance(value, pd.Series):
-            if value.index.isin(['n_samples', 'n_iter', 'inc_vertices']).all():
+            if value.index.isin(['n_samples', 'n_iter', 'inc_vertices',
+                                 'method']).all():
                 self._reduced_doe_lhs_settings = value
             else:
                 raise ValueError("'reduced_doe_lhs_settings' must have its "
@@ -781,6 +1016,20 @@ class DataStorage(QObject):
         else:
             self._hessian_data['correlation'] = value
 
+    @property
+    def differential_surrogate_model(self):
+        """The Kriging surrogate type to be used in reduced space model:
+        'dace' (all the samples) or 'local' (nearest neighbours, for large
+        data sets)."""
+        return self._hessian_data.get('surrogate', 'dace')
+
+    @differential_surrogate_model.setter
+    def differential_surrogate_model(self, value: str):
+        if value not in SURROGATE_TYPES:
+            raise ValueError("Invalid surrogate model.")
+        else:
+            self._hessian_data['surrogate'] = value
+
     @property
     def differential_gy(self):
         """Gradient of reduced space (Gy)."""
@@ -921,9 +1170,7 @@ class DataStorage(QObject):
         (SLOT)
         """
         # list of aliases that are MV
-        inps = self.input_table_data
-        mv_aliases = inps.loc[inps['Type'] == self._INPUT_ALIAS_TYPES['mv'],
-                              'Alias'].tolist()
+        mv_aliases = self.alias_index.aliases('input', 'mv')
 
         # delete the variables that aren't in the mv list
         bnd_df = self.doe_mv_bounds
@@ -957,9 +1204,7 @@ class DataStorage(QObject):
         """Updates the theta list whenever alias data is changed. (SLOT)
         """
         # list of aliases that are MV
-        inps = self.input_table_data
-        input_aliases = inps.loc[inps['Type'] == self._INPUT_ALIAS_TYPES['mv'],
-                                 'Alias'].tolist()
+        input_aliases = self.alias_index.aliases('input', 'mv')
 
         # delete the variables that aren't in the mv list
         theta_df = self.metamodel_theta_data
@@ -994,22 +1239,10 @@ class DataStorage(QObject):
         """Updates the list of selected variables for model construction
         whenever alias or expression data is changed (SLOT).
         """
-        # list of variables
-        conc_tab = pd.concat([self.output_table_data,
-                              self.expression_table_data],
-                             axis='index', join='inner',
-                             ignore_index=True
-                             ).drop_duplicates().reset_index(drop=True)
-        var_list = conc_tab.loc[
-            (conc_tab['Type'] == self._OUTPUT_ALIAS_TYPES['cv']) |
-            (conc_tab['Type'].isin(self._EXPR_ALIAS_TYPES.values()))
-        ]
-
-        # set the var_list index to the aliases (easier indexing)
-        var_list.set_index('Alias', inplace=True)
-
-        # list of aliases
-        aliases = var_list.index.tolist()
+        # list of variables (outputs and expressions with a type defined)
+        alias_index = self.alias_index
+        aliases = alias_index.aliases(['output', 'expression'],
+                                      'cv', 'aux', 'cst', 'obj')
 
         # delete variables that aren't in the list
         sel_df = self.metamodel_selected_data
@@ -1022,7 +1255,7 @@ class DataStorage(QObject):
             if alias not in new_vars_list:
                 nv.append({
                     'Alias': alias,
-                    'Type': var_list.at[alias, 'Type'],
+                    'Type': alias_index.info(alias)['type'],
                     'Checked': False
                 })
 
@@ -1039,11 +1272,7 @@ class DataStorage(QObject):
         self.metamodel_selected_data = new_vars
 
     def _update_reduced_space_dof(self) -> None:
-        inp_tab = self.input_table_data
-        aliases = inp_tab.loc[
-            inp_tab['Type'] == self._INPUT_ALIAS_TYPES['mv'],
-            'Alias'
-        ].tolist()
+        aliases = self.alias_index.aliases('input', 'mv')
 
         dof_df = self.reduced_space_dof
         # delete the variables that aren't in the mv list
@@ -1075,16 +1304,7 @@ class DataStorage(QObject):
         self.reduced_space_dof = new_vars
 
     def _update_active_candidates(self) -> None:
-        out_data = self.output_table_data
-        exp_data = self.expression_table_data
-
-        var_tab = pd.concat([out_data, exp_data], axis='index',
-                            ignore_index=True)
-        aliases = var_tab.loc[
-            (var_tab['Type'] == self._OUTPUT_ALIAS_TYPES['cv']) |
-            (var_tab['Type'] == self._EXPR_ALIAS_TYPES['cv']),
-            'Alias'
-        ].tolist()
+        aliases = self.alias_index.aliases(['output', 'expression'], 'cv')
         act_df = self.active_candidates
 
         # delete the variables that aren't in the mv list
@@ -1120,9 +1340,7 @@ class DataStorage(QObject):
         alias data is changed. (SLOT)
         """
         # list of aliases that are D
-        inps = self.input_table_data
-        d_aliases = inps.loc[inps['Type'] == self._INPUT_ALIAS_TYPES['d'],
-                             'Alias'].tolist()
+        d_aliases = self.alias_index.aliases('input', 'd')
 
         red_dof = self.reduced_space_dof
         non_consumed_aliases = red_dof.loc[red_dof['Checked'], 'Alias'].tolist(
@@ -1170,9 +1388,7 @@ class DataStorage(QObject):
         (SLOT) - associated with alias and constraint activity change.
         """
         # list of aliases that are D
-        inps = self.input_table_data
-        d_aliases = inps.loc[inps['Type'] == self._INPUT_ALIAS_TYPES['d'],
-                             'Alias'].tolist()
+        d_aliases = self.alias_index.aliases('input', 'd')
 
         red_dof = self.reduced_space_dof
         non_consumed_aliases = red_dof.loc[red_dof['Checked'], 'Alias'].tolist(
@@ -1227,26 +1443,11 @@ class DataStorage(QObject):
             'Alias'
         ].tolist()
 
-        conc_tab = pd.concat([self.output_table_data,
-                              self.expression_table_data],
-                             axis='index', join='inner',
-                             ignore_index=True
-                             ).drop_duplicates().reset_index(drop=True)
-
-        var_list = conc_tab.loc[
-            (~conc_tab['Alias'].isin(act_aliases)) &
-            (
-                (conc_tab['Type'] == self._OUTPUT_ALIAS_TYPES['cv']) |
-                (conc_tab['Type'] == self._EXPR_ALIAS_TYPES['obj'])
-            ),
-            ['Alias', 'Type']
-        ]
-
-        # set the var_list index to the aliases (easier indexing)
-        var_list.set_index('Alias', inplace=True)
-
-        # list of aliases
-        aliases = var_list.index.tolist()
+        # list of aliases (candidates and objective) that are not active
+        alias_index = self.alias_index
+        aliases = [alias for alias in
+                   alias_index.aliases(['output', 'expression'], 'cv', 'obj')
+                   if alias not in act_aliases]
 
         # delete variables that aren't in the list
         sel_df = self.reduced_metamodel_selected_data
@@ -1259,7 +1460,7 @@ class DataStorage(QObject):
             if alias not in new_vars_list:
                 nv.append({
                     'Alias': alias,
-                    'Type': var_list.at[alias, 'Type'],
+                    'Type': alias_index.info(alias)['type'],
                     'Checked': True
                 })
 
@@ -1279,9 +1480,7 @@ class DataStorage(QObject):
         """Updates the distubance and measurement error magnitudes whenever
         alias data changes. (SLOT)"""
         # disturbances
-        inps = self.input_table_data
-        d_aliases = inps.loc[inps['Type'] == self._INPUT_ALIAS_TYPES['d'],
-                             'Alias'].tolist()
+        d_aliases = self.alias_index.aliases('input', 'd')
         # d_aliases = [row['Alias'] for row in self.input_table_data
         #              if row['Type'] == 'Disturbance (d)']
 
@@ -1366,6 +1565,7 @@ class DataStorage(QObject):
         app_data = {
             'simulation_info': {
                 'sim_filename': self.simulation_file,
+                'sim_case_timeout': self.case_timeout,
                 'sim_info': self.simulation_data,
                 'sim_tree_input': self.tree_model_input,
                 'sim_tree_output': self.tree_model_output,
@@ -1425,7 +1625,8 @@ class DataStorage(QObject):
         diff_info = app_data['differential_info']
         soc_info = app_data['soc_info']
 
-        # loadsimtab
+        # loadsimtab (older files don't have the case timeout)
+        self.case_timeout = sim_info.get('sim_case_timeout', 0.0)
         try:
             self.simulation_file = sim_info['sim_filename']
         except FileNotFoundError:
@@ -1486,20 +1687,17 @@ class DataStorage(QObject):
         is_bkp_valid = fpath.exists() and fpath.is_file()
 
         # get aliases
-        aliases = pd.concat([self.input_table_data, self.output_table_data],
-                            axis='index', ignore_index=True, sort=False)
+        aliases = self.alias_index.aliases(['input', 'output'])
+        names = aliases + self.alias_index.aliases('expression')
 
         # get expressions validity
         expr_df = self.expression_table_data
         expr_valid_check = expr_df['Expression'].apply(
-            lambda x: is_expression_valid(x, aliases['Alias'].tolist() + expr_df['Alias'].tolist()
-            )
+            lambda x: is_expression_valid(x, names)
         )
 
-        is_name_not_duplicated = pd.concat(
-            [aliases['Alias'], expr_df['Alias']],
-            axis='index', ignore_index=True
-        ).is_unique and not aliases.empty and not expr_df.empty
+        is_name_not_duplicated = len(set(names)) == len(names) and \
+            len(aliases) != 0 and not expr_df.empty
 
         # expressions check is True if all expressions are valid and not empty
         is_exprs_valid = not expr_df.empty and expr_valid_check.all()
@@ -1527,15 +1725,8 @@ class DataStorage(QObject):
         fpath = pathlib.Path(self.simulation_file)
         is_bkp_valid = fpath.exists() and fpath.is_file()
 
-        inp_data = self.input_table_data
-        out_data = self.output_table_data
-        expr_data = self.expression_table_data
-        input_alias = inp_data.loc[
-            inp_data['Type'] == self._INPUT_ALIAS_TYPES['mv'], 'Alias'
-        ].tolist()
-        output_alias = out_data.loc[:, 'Alias'].tolist()
-        expr_alias = expr_data.loc[:, 'Alias'].tolist()
-        aliases = input_alias + output_alias + expr_alias
+        aliases = self.alias_index.aliases('input', 'mv') + \
+            self.alias_index.aliases(['output', 'expression'])
 
         # build the DataFrame
         df = self.doe_sampled_data
@@ -1616,14 +1807,11 @@ class DataStorage(QObject):
         if space_type not in ['original', 'reduced']:
             raise ValueError("The space type must be 'original' or 'reduced'.")
 
-        aliases = pd.concat([self.input_table_data, self.output_table_data],
-                            axis='index', ignore_index=True, sort=False)
-
         if space_type == 'original':
-            hdr = aliases.loc[aliases['Type'] != self._INPUT_ALIAS_TYPES['d'],
-                              'Alias'].tolist()
+            hdr = self.alias_index.aliases('input', 'mv') + \
+                self.alias_index.aliases('output')
         else:
-            hdr = aliases.loc[:, 'Alias'].tolist()
+            hdr = self.alias_index.aliases(['input', 'output'])
 
         df_headers = ['case', 'status'] + hdr
         if not sampled_data.empty:
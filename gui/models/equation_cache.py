@@ -0,0 +1,231 @@
+import hashlib
+import pathlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from PyQt5.QtCore import QThread, pyqtSignal
+from PyQt5.QtGui import QImage
+
+# default folder of the on-disk store of rendered equations
+DEFAULT_CACHE_FOLDER = pathlib.Path.home() / '.metacontrol' / 'equation_cache'
+
+# bump when the rendering changes, so older images on disk are not reused
+RENDER_VERSION = 1
+
+
+def combination_equation(coefficients: pd.Series) -> str:
+    """LaTeX string of a measurement combination (row of the H matrix). NaN
+    coefficients (measurements not in the structure) are skipped.
+    """
+    eq = ""
+    for name, value in coefficients.items():
+        if not np.isnan(value):
+            eq += " {0:+.5f} {1}".format(value, name).strip("+")
+
+    return eq
+
+
+def render_equation(equation: str, font_size: int,
+                    pixel_ratio: float = 1.0) -> QImage:
+    """Renders a LaTeX (mathtext) equation with matplotlib into an image
+    tightly fitted to the text. Does not use pyplot, so it can be called
+    outside the GUI thread.
+
+    Parameters
+    ----------
+    equation : str
+        Equation, without the enclosing '$'.
+    font_size : int
+        Font size in points.
+    pixel_ratio : float, optional
+        Device pixel ratio of the screen where the image is drawn. The image
+        has `pixel_ratio` times more pixels, but the same logical size.
+
+    Returns
+    -------
+    QImage
+        Rendered equation (transparent background).
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure()
+    fig.set_dpi(fig.get_dpi() * pixel_ratio)
+    fig.patch.set_facecolor('none')
+    fig.set_canvas(FigureCanvasAgg(fig))
+    renderer = fig.canvas.get_renderer()
+
+    # plot expression
+    ax = fig.add_axes([0, 0, 1, 1])
+    ax.axis('off')
+    ax.patch.set_facecolor('none')
+    t = ax.text(0, 0, r'${}$'.format(equation), ha='left', va='bottom',
+                fontsize=font_size)
+
+    # fit figure
+    fwidth, fheight = fig.get_size_inches()
+    fig_bbox = fig.get_window_extent(renderer)
+
+    text_bbox = t.get_window_extent(renderer)
+
+    tight_fwidth = text_bbox.width * fwidth / fig_bbox.width
+    tight_fheight = text_bbox.height * fheight / fig_bbox.height
+
+    fig.set_size_inches(tight_fwidth, tight_fheight)
+
+    # convert to image (rgbSwapped returns a copy that owns its buffer)
+    buf, size = fig.canvas.print_to_buffer()
+    image = QImage.rgbSwapped(QImage(buf, size[0], size[1],
+                                     QImage.Format_ARGB32))
+    image.setDevicePixelRatio(pixel_ratio)
+
+    return image
+
+
+class EquationImageCache:
+    """Cache of rendered equations keyed by (equation, font size, device
+    pixel ratio). The images are kept in memory up to `max_items` (least
+    recently used are discarded first) and, when `cache_folder` is set,
+    stored as PNG files there, so they survive the dialog and the
+    application. Safe to use from several threads.
+
+    Parameters
+    ----------
+    max_items : int, optional
+        Maximum number of images in memory.
+    cache_folder : str, optional
+        Folder of the on-disk store. Default is None (memory only).
+    renderer : callable, optional
+        Function with the signature of `render_equation` used on misses.
+    """
+
+    def __init__(self, max_items: int = 512, cache_folder: str = None,
+                 renderer=render_equation):
+        if max_items < 1:
+            raise ValueError("The cache must hold at least one image.")
+
+        self.max_items = max_items
+        self._folder = pathlib.Path(cache_folder) \
+            if cache_folder is not None else None
+        self._renderer = renderer
+        self._images = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # --------------------------- PRIVATE FUNCTIONS --------------------------
+    def _file_path(self, key: tuple) -> pathlib.Path:
+        name = "{0}|{1}|{2:g}|v{3}".format(*key, RENDER_VERSION)
+        return self._folder / (hashlib.sha1(name.encode('utf-8')).hexdigest()
+                               + '.png')
+
+    def _load(self, key: tuple) -> QImage:
+        if self._folder is None:
+            return None
+
+        file_path = self._file_path(key)
+        if not file_path.exists():
+            return None
+
+        image = QImage(str(file_path))
+        if image.isNull():
+            # corrupted file, treat as a cache miss
+            return None
+
+        image.setDevicePixelRatio(key[2])
+        return image
+
+    def _save(self, key: tuple, image: QImage) -> None:
+        if self._folder is None:
+            return
+
+        self._folder.mkdir(parents=True, exist_ok=True)
+
+        # write to a temporary file first so a crash does not corrupt it
+        file_path = self._file_path(key)
+        tmp_path = file_path.with_name(
+            "{0}.{1}.tmp".format(file_path.stem, threading.get_ident()))
+        if image.save(str(tmp_path), 'PNG'):
+            tmp_path.replace(file_path)
+
+    def _store(self, key: tuple, image: QImage) -> None:
+        with self._lock:
+            self._images[key] = image
+            self._images.move_to_end(key)
+            while len(self._images) > self.max_items:
+                self._images.popitem(last=False)
+
+    # --------------------------- PUBLIC FUNCTIONS ---------------------------
+    def get(self, equation: str, font_size: int,
+            pixel_ratio: float = 1.0) -> QImage:
+        """Cached image of an equation (memory or disk), None if there is
+        none. Never renders.
+        """
+        key = (equation, font_size, float(pixel_ratio))
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._images.move_to_end(key)
+                self.hits += 1
+                return image
+
+        image = self._load(key)
+        if image is not None:
+            self._store(key, image)
+            self.hits += 1
+
+        return image
+
+    def render(self, equation: str, font_size: int,
+               pixel_ratio: float = 1.0) -> QImage:
+        """Image of an equation, rendered (and cached) if it isn't cached."""
+        image = self.get(equation, font_size, pixel_ratio)
+        if image is None:
+            key = (equation, font_size, float(pixel_ratio))
+            image = self._renderer(equation, font_size, key[2])
+            self.misses += 1
+            self._store(key, image)
+            self._save(key, image)
+
+        return image
+
+    def clear(self) -> None:
+        """Empties the memory cache (the disk store is kept)."""
+        with self._lock:
+            self._images.clear()
+
+    def __len__(self):
+        return len(self._images)
+
+
+class EquationRenderThread(QThread):
+    """Thread that renders a list of equations into an `EquationImageCache`
+    and emits the position of each one rendered. Stops early when
+    `requestInterruption` is called.
+    """
+    equation_rendered = pyqtSignal(int)
+    render_failed = pyqtSignal(str)
+
+    def __init__(self, cache: EquationImageCache, equations: list,
+                 font_size: int, pixel_ratio: float = 1.0, parent=None):
+        QThread.__init__(self, parent)
+        self._cache = cache
+        self._equations = list(equations)
+        self._font_size = font_size
+        self._pixel_ratio = pixel_ratio
+
+    def run(self):
+        for i, equation in enumerate(self._equations):
+            if self.isInterruptionRequested():
+                return
+
+            try:
+                self._cache.render(equation, self._font_size,
+                                   self._pixel_ratio)
+            except (ValueError, RuntimeError) as error:
+                # invalid mathtext, the delegate shows the plain equation
+                self.render_failed.emit(str(error))
+            else:
+                self.equation_rendered.emit(i)
@@ -11,7 +11,9 @@ def hesscorrgauss(x: np.ndarray, dmodel) -> np.ndarray:
     x: np.ndarray
         Trial design site.
     dmodel: Dace
-        Dace model object containing the trained data.
+        Dace model object containing the trained data. For models with a
+        `local_model` method (e.g. `LocalKriging`), the Hessian is the one of
+        the local model of `x`.
 
     Returns
     -------
@@ -19,6 +21,9 @@ def hesscorrgauss(x: np.ndarray, dmodel) -> np.ndarray:
         Hessian evaluated at `x`. The order of columns/rows is the same as `x`.
     """
 
+    if hasattr(dmodel, 'local_model'):
+        dmodel = dmodel.local_model(x)
+
     if isinstance(dmodel, dict):
         # older version of pydace
         S = dmodel['S']
@@ -0,0 +1,293 @@
+import numpy as np
+from scipy.linalg import LinAlgError, cholesky, qr, solve_triangular
+
+
+def _dace_factory(regression: str):
+    from pydace import Dace
+    return Dace(regression=regression, correlation='corrgauss')
+
+
+def _regpoly(x: np.ndarray, regression: str) -> tuple:
+    # DACE regression polynomials (and their jacobians) of the scaled inputs
+    k, n = x.shape
+    if regression == 'poly0':
+        return np.ones((k, 1)), np.zeros((k, 1, n))
+
+    terms = [np.ones(k)] + [x[:, i] for i in range(n)]
+    dterms = [np.zeros((k, n))] + [np.tile(np.eye(n)[i], (k, 1))
+                                   for i in range(n)]
+    if regression == 'poly2':
+        for i in range(n):
+            for j in range(i, n):
+                terms.append(x[:, i] * x[:, j])
+                dterm = np.zeros((k, n))
+                dterm[:, i] += x[:, j]
+                dterm[:, j] += x[:, i]
+                dterms.append(dterm)
+
+    elif regression != 'poly1':
+        raise ValueError("Invalid regression polynomial.")
+
+    return np.column_stack(terms), np.stack(dterms, axis=1)
+
+
+def _correlation(xa: np.ndarray, xb: np.ndarray, theta: np.ndarray):
+    d = xa[:, None, :] - xb[None, :, :]
+    return np.exp(-(theta * d ** 2).sum(axis=2))
+
+
+class IncrementalKriging:
+    """Kriging model with gaussian correlation whose data can be extended
+    without a full refit. `fit` optimizes the correlation parameters (with a
+    `pydace.Dace` model); `append` keeps them fixed and extends the Cholesky
+    factor of the correlation matrix with a block update, which costs
+    O(n^2 k) for k new points on n sampled instead of the O(n^3) of every
+    likelihood evaluation of a refit.
+
+    The correlation parameters are optimized again (full refit) when the
+    appended data drifts from the model: when the mean squared standardized
+    prediction error (the error divided by the kriging standard deviation,
+    before the points are appended) of the points appended since the last
+    refit is above `drift_tol`, or when more than `max_growth` times the
+    number of points of the last refit were appended.
+
+    Has the `pydace.Dace` interface (`fit(S, Y, theta0, lob, upb)` and
+    `predict(X, compute_jacobian)`) and fitted attributes (`S`, `_Ssc`,
+    `_Ysc`, `theta` and `_fitpar`, with 'gamma' stored q x m as in `Dace`),
+    so it can be used by their consumers (e.g. `hesscorrgauss`).
+
+    Parameters
+    ----------
+    regression : str, optional
+        Regression polynomial ('poly0', 'poly1' or 'poly2').
+    drift_tol : float, optional
+        Mean squared standardized error of the appended points above which
+        the model is refitted. About 1 when the model is right.
+    max_growth : float, optional
+        Fraction of the data of the last refit that can be appended before
+        the model is refitted.
+    model_factory : callable, optional
+        Called with `regression` to create the model whose `fit` optimizes
+        the correlation parameters (`theta` attribute, in the inputs scaled
+        by its `_Ssc` attribute when it has one). Default is a `Dace` model
+        with gaussian correlation.
+    """
+
+    def __init__(self, regression: str = 'poly0', drift_tol: float = 4.0,
+                 max_growth: float = 0.5, model_factory=None):
+        self.regression = regression
+        self.drift_tol = drift_tol
+        self.max_growth = max_growth
+        self.model_factory = _dace_factory if model_factory is None \
+            else model_factory
+
+        # number of hyperparameter optimizations and of block updates
+        self.n_refits = 0
+        self.n_updates = 0
+
+    # --------------------------- PRIVATE FUNCTIONS --------------------------
+    def _refit(self) -> None:
+        X, Y = self._X, self._Y
+        model = self.model_factory(self.regression)
+        model.fit(S=X, Y=Y if Y.shape[1] > 1 else Y[:, 0],
+                  theta0=self._theta0, lob=self._lob, upb=self._upb)
+        self.n_refits += 1
+
+        Ssc = getattr(model, '_Ssc', None)
+        if Ssc is None:
+            std = X.std(axis=0)
+            Ssc = np.vstack((X.mean(axis=0), np.where(std > 0, std, 1.0)))
+        self._Ssc = np.asarray(Ssc, dtype=float)
+
+        std = Y.std(axis=0)
+        self._Ysc = np.vstack((Y.mean(axis=0), np.where(std > 0, std, 1.0)))
+        self.theta = np.asarray(model.theta, dtype=float).flatten()
+
+        self._n_fit = X.shape[0]
+        self._drift = []
+        self._factorize()
+
+    def _factorize(self) -> None:
+        # factorization of the whole data at the current correlation
+        # parameters
+        X, Y = self._X, self._Y
+        self.S = (X - self._Ssc[0]) / self._Ssc[1]
+        n = self.S.shape[0]
+        self._nugget = (10 + n) * np.finfo(float).eps
+        R = _correlation(self.S, self.S, self.theta) + \
+            self._nugget * np.eye(n)
+        self._L = cholesky(R, lower=True)
+        F = _regpoly(self.S, self.regression)[0]
+        self._Ft = solve_triangular(self._L, F, lower=True)
+        self._Yt = solve_triangular(self._L, self._scaled_y(Y), lower=True)
+        self._solve()
+
+    def _scaled_y(self, Y: np.ndarray) -> np.ndarray:
+        return (Y - self._Ysc[0]) / self._Ysc[1]
+
+    def _solve(self) -> None:
+        # generalized least squares of the regression coefficients
+        Q, G = qr(self._Ft, mode='economic')
+        beta = solve_triangular(G, Q.T @ self._Yt)
+        rho = self._Yt - self._Ft @ beta
+        gamma = solve_triangular(self._L.T, rho, lower=False)
+        self._G = G
+        self._fitpar = {'beta': beta, 'gamma': gamma.T, 'G': G, 'C': self._L,
+                        'Ft': self._Ft,
+                        'sigma2': (rho ** 2).sum(axis=0) / rho.shape[0]}
+
+    def _standardized_errors(self, X: np.ndarray,
+                             Y: np.ndarray) -> np.ndarray:
+        # prediction errors of (X, Y) divided by the kriging standard
+        # deviation (k x q)
+        xs = (X - self._Ssc[0]) / self._Ssc[1]
+        r = _correlation(xs, self.S, self.theta)
+        F = _regpoly(xs, self.regression)[0]
+        fp = self._fitpar
+
+        rt = solve_triangular(self._L, r.T, lower=True)
+        u = solve_triangular(self._G.T, self._Ft.T @ rt - F.T, lower=True)
+        mse = np.maximum(1.0 + (u ** 2).sum(axis=0) - (rt ** 2).sum(axis=0),
+                         self._nugget)
+
+        pred = F @ fp['beta'] + r @ fp['gamma'].T
+        err = self._scaled_y(Y) - pred
+        return err / np.sqrt(np.outer(mse, np.maximum(fp['sigma2'],
+                                                       self._nugget)))
+
+    # --------------------------- PUBLIC FUNCTIONS ---------------------------
+    def fit(self, S: np.ndarray, Y: np.ndarray, theta0, lob, upb) -> None:
+        """Fits the model to the data (S, Y), optimizing the correlation
+        parameters from `theta0` inside [lob, upb].
+        """
+        self._X = np.atleast_2d(np.asarray(S, dtype=float))
+        self._Y = np.asarray(Y, dtype=float).reshape(self._X.shape[0], -1)
+        self._theta0, self._lob, self._upb = theta0, lob, upb
+        self._refit()
+
+    def append(self, S: np.ndarray, Y: np.ndarray,
+               refit: bool = True) -> bool:
+        """Adds the points (S, Y) to the data of the model.
+
+        Parameters
+        ----------
+        S, Y : np.ndarray
+            Points and their outputs.
+        refit : bool, optional
+            Whether the correlation parameters may be optimized again (drift
+            and growth criteria). When False (e.g. believed predictions that
+            are dropped later), they are kept fixed and the correlation
+            matrix is only factorized again when the block update fails.
+
+        Returns
+        -------
+        bool
+            True if the model was refitted (drift or growth criterion, or a
+            new point too close to the data to extend the factorization).
+
+        Raises
+        ------
+        ValueError
+            If a point is already in the data (as in a `Dace` fit).
+        """
+        X = np.atleast_2d(np.asarray(S, dtype=float))
+        Y = np.asarray(Y, dtype=float).reshape(X.shape[0], -1)
+        if X.shape[0] == 0:
+            return False
+
+        sites = np.vstack((self._X, X))
+        if np.unique(sites, axis=0).shape[0] < sites.shape[0]:
+            raise ValueError("Multiple design sites are not allowed.")
+
+        z = self._standardized_errors(X, Y)
+        self._drift.extend((z ** 2).mean(axis=1).tolist())
+        self._X = np.vstack((self._X, X))
+        self._Y = np.vstack((self._Y, Y))
+
+        appended = len(self._drift)
+        if refit and (np.mean(self._drift) > self.drift_tol or
+                      appended > self.max_growth * self._n_fit):
+            self._refit()
+            return True
+
+        # block update of the Cholesky factor: R = [R11 R12; R21 R22]
+        xs = (X - self._Ssc[0]) / self._Ssc[1]
+        R12 = _correlation(self.S, xs, self.theta)
+        R22 = _correlation(xs, xs, self.theta) + \
+            self._nugget * np.eye(xs.shape[0])
+        L21 = solve_triangular(self._L, R12, lower=True).T
+        try:
+            L22 = cholesky(R22 - L21 @ L21.T, lower=True)
+        except LinAlgError:
+            if refit:
+                self._refit()
+            else:
+                self._factorize()
+            return refit
+
+        n, k = self._L.shape[0], xs.shape[0]
+        L = np.zeros((n + k, n + k))
+        L[:n, :n] = self._L
+        L[n:, :n] = L21
+        L[n:, n:] = L22
+        self._L = L
+
+        F = _regpoly(xs, self.regression)[0]
+        self._Ft = np.vstack((self._Ft, solve_triangular(
+            L22, F - L21 @ self._Ft, lower=True)))
+        self._Yt = np.vstack((self._Yt, solve_triangular(
+            L22, self._scaled_y(Y) - L21 @ self._Yt, lower=True)))
+        self.S = np.vstack((self.S, xs))
+
+        self.n_updates += 1
+        self._solve()
+        return False
+
+    def truncate(self, n_points: int) -> None:
+        """Drops the data after the first `n_points` (e.g. the believed
+        predictions of a kriging believer batch). The leading block of the
+        Cholesky factor is the factor of the data kept, so no factorization
+        is needed unless data of the last refit is dropped.
+        """
+        if n_points >= self._X.shape[0]:
+            return
+
+        self._X = self._X[:n_points]
+        self._Y = self._Y[:n_points]
+        if n_points < self._n_fit:
+            self._refit()
+            return
+
+        self._L = self._L[:n_points, :n_points]
+        self._Ft = self._Ft[:n_points]
+        self._Yt = self._Yt[:n_points]
+        self.S = self.S[:n_points]
+        self._drift = self._drift[:n_points - self._n_fit]
+        self._solve()
+
+    def predict(self, X: np.ndarray, compute_jacobian: bool = False) -> tuple:
+        """Predictions (k x q) at the points X (k x n) and, when
+        `compute_jacobian` is True, their gradients (k x n for a single
+        output, k x q x n otherwise).
+        """
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        xs = (X - self._Ssc[0]) / self._Ssc[1]
+        d = xs[:, None, :] - self.S[None, :, :]
+        r = np.exp(-(self.theta * d ** 2).sum(axis=2))
+        F, dF = _regpoly(xs, self.regression)
+        beta, gamma = self._fitpar['beta'], self._fitpar['gamma']
+
+        y = self._Ysc[0] + self._Ysc[1] * (F @ beta + r @ gamma.T)
+        if not compute_jacobian:
+            return y, None
+
+        dr = -2 * self.theta * d * r[:, :, None]
+        dys = np.einsum('kpn,pq->kqn', dF, beta) + \
+            np.einsum('kmn,qm->kqn', dr, gamma)
+        dy = self._Ysc[1][None, :, None] * dys / self._Ssc[1]
+        return y, dy[:, 0, :] if dy.shape[1] == 1 else dy
+
+    @property
+    def n_samples(self) -> int:
+        """Number of points in the data of the model."""
+        return self._X.shape[0]
@@ -0,0 +1,235 @@
+import numpy as np
+from scipy.linalg import cho_factor, cho_solve, qr, solve_triangular
+from scipy.spatial import cKDTree
+
+from gui.models.incremental_kriging import _correlation, _regpoly
+
+
+def _dace_factory(regression: str, correlation: str = 'corrgauss'):
+    from pydace import Dace
+    return Dace(regression=regression, correlation=correlation)
+
+
+def kriging_model(surrogate: str, regression: str, correlation: str,
+                  model_factory=None):
+    """Unfitted kriging model of a surrogate type.
+
+    Parameters
+    ----------
+    surrogate : str
+        One of `model_registry.SURROGATE_TYPES`: 'dace' (`pydace.Dace`) or
+        'local' (`LocalKriging`).
+    regression, correlation : str
+        Regression and correlation model names.
+    model_factory : callable, optional
+        Called with the regression and correlation names, returns an unfitted
+        model with the `pydace.Dace` interface. Default is `pydace.Dace`.
+    """
+    factory = _dace_factory if model_factory is None else model_factory
+
+    if surrogate == 'dace':
+        return factory(regression, correlation)
+    elif surrogate == 'local':
+        return LocalKriging(regression, correlation,
+                            model_factory=lambda regr: factory(regr,
+                                                               correlation))
+    else:
+        raise ValueError("Invalid surrogate type.")
+
+
+class LocalModel:
+    """Kriging interpolant of a few sites at fixed correlation parameters
+    (a neighbourhood of `LocalKriging`). Has the `pydace.Dace` fitted
+    attributes (`S`, `_Ssc`, `_Ysc`, `theta` and `_fitpar`), so it can be
+    used where a `Dace` model is, e.g. in `hesscorrgauss`.
+
+    Parameters
+    ----------
+    S : np.ndarray
+        Scaled sites (k x n).
+    Y : np.ndarray
+        Scaled outputs (k x q).
+    Ssc, Ysc : np.ndarray
+        Scaling factors (mean and standard deviation) of the inputs and
+        outputs.
+    theta : np.ndarray
+        Correlation parameters.
+    regression : str
+        Regression polynomial ('poly0', 'poly1' or 'poly2').
+    """
+
+    def __init__(self, S: np.ndarray, Y: np.ndarray, Ssc: np.ndarray,
+                 Ysc: np.ndarray, theta: np.ndarray, regression: str):
+        self.S = S
+        self._Ssc = Ssc
+        self._Ysc = Ysc
+        self.theta = theta
+        self.regression = regression
+
+        k = S.shape[0]
+        R = _correlation(S, S, theta) + (10 + k) * np.finfo(float).eps * \
+            np.eye(k)
+        C = cho_factor(R, lower=True)
+        F = _regpoly(S, regression)[0]
+        Ft = solve_triangular(C[0], F, lower=True, check_finite=False)
+        Yt = solve_triangular(C[0], Y, lower=True, check_finite=False)
+
+        # generalized least squares of the regression coefficients
+        Q, G = qr(Ft, mode='economic')
+        beta = solve_triangular(G, Q.T @ Yt)
+        gamma = cho_solve(C, Y - F @ beta)
+        self._fitpar = {'beta': beta, 'gamma': gamma.T}
+
+    def predict(self, X: np.ndarray, compute_jacobian: bool = False) -> tuple:
+        """Predictions (k x q) at the points X (k x n) and, when
+        `compute_jacobian` is True, their gradients: n x q for a single point
+        (as `pydace.Dace`), k x n x q otherwise.
+        """
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        xs = (X - self._Ssc[0]) / self._Ssc[1]
+        d = xs[:, None, :] - self.S[None, :, :]
+        r = np.exp(-(self.theta * d ** 2).sum(axis=2))
+        F, dF = _regpoly(xs, self.regression)
+        beta, gamma = self._fitpar['beta'], self._fitpar['gamma']
+
+        y = self._Ysc[0] + self._Ysc[1] * (F @ beta + r @ gamma.T)
+        if not compute_jacobian:
+            return y, None
+
+        dr = -2 * self.theta * d * r[:, :, None]
+        dys = np.einsum('kpn,pq->knq', dF, beta) + \
+            np.einsum('kmn,qm->knq', dr, gamma)
+        dy = self._Ysc[1] * dys / self._Ssc[1][:, None]
+        return y, dy[0] if dy.shape[0] == 1 else dy
+
+
+class LocalKriging:
+    """Nearest neighbour kriging for large data sets (more than a few
+    thousand samples), where the dense correlation matrix of `pydace.Dace`
+    takes too much memory and time.
+
+    The correlation parameters are optimized once by a `Dace` fit on a random
+    subset of at most `max_fit_samples` points. Each prediction is then the
+    kriging interpolant (`LocalModel`) of the `n_neighbors` samples nearest
+    to the point in the metric of the correlation, so the memory is linear in
+    the number of samples and each prediction costs O(n_neighbors^3).
+
+    Has the `pydace.Dace` interface (`fit(S, Y, theta0, lob, upb)` and
+    `predict(X, compute_jacobian)`). Hessians (`hesscorrgauss`) are the ones
+    of the local model of the point (`local_model`).
+
+    Parameters
+    ----------
+    regression : str, optional
+        Regression polynomial ('poly0', 'poly1' or 'poly2').
+    correlation : str, optional
+        Correlation model. Only 'corrgauss' is supported.
+    n_neighbors : int, optional
+        Number of samples of each local model.
+    max_fit_samples : int, optional
+        Maximum number of samples of the hyperparameter optimization.
+    model_factory : callable, optional
+        Called with `regression` to create the model whose `fit` optimizes
+        the correlation parameters (`theta` attribute, in the inputs scaled
+        by its `_Ssc` attribute when it has one). Default is a `Dace` model.
+    random_state : int, optional
+        Seed of the hyperparameter optimization subset.
+    """
+
+    def __init__(self, regression: str = 'poly0',
+                 correlation: str = 'corrgauss', n_neighbors: int = 100,
+                 max_fit_samples: int = 1000, model_factory=None,
+                 random_state=0):
+        if correlation != 'corrgauss':
+            raise ValueError("Local kriging only supports the gaussian "
+                             "correlation.")
+
+        if n_neighbors < 2 or max_fit_samples < 2:
+            raise ValueError("The local models and the hyperparameter "
+                             "optimization need at least 2 samples.")
+
+        self.regression = regression
+        self.correlation = correlation
+        self.n_neighbors = int(n_neighbors)
+        self.max_fit_samples = int(max_fit_samples)
+        self.model_factory = _dace_factory if model_factory is None \
+            else model_factory
+        self.random_state = random_state
+
+    def fit(self, S: np.ndarray, Y: np.ndarray, theta0, lob, upb) -> None:
+        """Fits the model to the data (S, Y), optimizing the correlation
+        parameters from `theta0` inside [lob, upb] on a subset of the data.
+        """
+        X = np.atleast_2d(np.asarray(S, dtype=float))
+        Y = np.asarray(Y, dtype=float).reshape(X.shape[0], -1)
+        m = X.shape[0]
+
+        std = X.std(axis=0)
+        self._Ssc = np.vstack((X.mean(axis=0), np.where(std > 0, std, 1.0)))
+        std = Y.std(axis=0)
+        self._Ysc = np.vstack((Y.mean(axis=0), np.where(std > 0, std, 1.0)))
+
+        subset = np.arange(m)
+        if m > self.max_fit_samples:
+            rng = np.random.RandomState(self.random_state)
+            subset = np.sort(rng.choice(m, self.max_fit_samples,
+                                        replace=False))
+
+        model = self.model_factory(self.regression)
+        model.fit(S=X[subset], Y=Y[subset] if Y.shape[1] > 1
+                  else Y[subset, 0], theta0=theta0, lob=lob, upb=upb)
+
+        # correlation parameters of the subset scaling in this one
+        theta = np.asarray(model.theta, dtype=float).flatten()
+        sub_Ssc = getattr(model, '_Ssc', None)
+        if sub_Ssc is not None:
+            theta = theta * (self._Ssc[1] / np.asarray(sub_Ssc)[1]) ** 2
+
+        self.theta = theta
+        self.perf = getattr(model, 'perf', None)
+        self.S = (X - self._Ssc[0]) / self._Ssc[1]
+        self._Y = (Y - self._Ysc[0]) / self._Ysc[1]
+        self._tree = cKDTree(self.S * np.sqrt(self.theta))
+
+    def _neighbors(self, xs: np.ndarray) -> np.ndarray:
+        k = min(self.n_neighbors, self.S.shape[0])
+        _, idx = self._tree.query(xs * np.sqrt(self.theta), k=k)
+        return np.sort(np.reshape(idx, (xs.shape[0], k)), axis=1)
+
+    def local_model(self, x: np.ndarray) -> LocalModel:
+        """Kriging interpolant of the neighbours of the point `x`."""
+        xs = (np.reshape(np.asarray(x, dtype=float), (1, -1)) -
+              self._Ssc[0]) / self._Ssc[1]
+        idx = self._neighbors(xs)[0]
+        return LocalModel(self.S[idx], self._Y[idx], self._Ssc, self._Ysc,
+                          self.theta, self.regression)
+
+    def predict(self, X: np.ndarray, compute_jacobian: bool = False) -> tuple:
+        """Predictions (k x q) at the points X (k x n) and, when
+        `compute_jacobian` is True, their gradients: n x q for a single point
+        (as `pydace.Dace`), k x n x q otherwise.
+        """
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        neighbors = self._neighbors((X - self._Ssc[0]) / self._Ssc[1])
+
+        # points with the same neighbourhood share the local model
+        keys, inverse = np.unique(neighbors, axis=0, return_inverse=True)
+        y = np.empty((X.shape[0], self._Y.shape[1]))
+        dy = np.empty((X.shape[0], X.shape[1], self._Y.shape[1]))
+        for i, idx in enumerate(keys):
+            model = LocalModel(self.S[idx], self._Y[idx], self._Ssc,
+                               self._Ysc, self.theta, self.regression)
+            rows = np.flatnonzero(inverse == i)
+            y[rows], dyi = model.predict(X[rows], compute_jacobian)
+            if compute_jacobian:
+                dy[rows] = dyi if rows.size > 1 else dyi[None]
+
+        if not compute_jacobian:
+            return y, None
+
+        return y, dy[0] if dy.shape[0] == 1 else dy
+
+    @property
+    def n_samples(self) -> int:
+        """Number of points in the data of the model."""
+        return self.S.shape[0]
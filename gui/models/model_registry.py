@@ -0,0 +1,121 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# surrogate types of the metamodel tab and reduced space dialog: 'dace' builds
+# the dense correlation matrix of all the samples, 'local' only the ones of
+# the nearest neighbours of each prediction point (`LocalKriging`)
+SURROGATE_TYPES = ('dace', 'local')
+
+
+def training_key(X: np.ndarray, Y: np.ndarray, regression: str,
+                 correlation: str, theta0, lob, upb,
+                 surrogate: str = 'dace') -> str:
+    """Hash of a kriging training set (inputs and outputs) and of its
+    hyperparameter settings and surrogate type. Two fits with the same key
+    give the same model.
+    """
+    sha = hashlib.sha1()
+    for values in (X, Y, theta0, lob, upb):
+        values = np.ascontiguousarray(values, dtype=float)
+        sha.update(str(values.shape).encode('utf-8'))
+        sha.update(values.tobytes())
+
+    sha.update("{0}|{1}|{2}".format(regression, correlation,
+                                    surrogate).encode('utf-8'))
+
+    return sha.hexdigest()
+
+
+class KrigingModelRegistry:
+    """In-memory registry of fitted kriging models keyed by output alias and
+    `training_key`, so a model fitted on a data set is reused by every step
+    that needs it (e.g. the 'Perf' row of the reduced space metamodel
+    validation, the gradients and the hessians) instead of being fitted again.
+    The least recently used models are dropped when there are more than
+    `max_models`. Safe to use from several threads.
+
+    Parameters
+    ----------
+    max_models : int, optional
+        Maximum number of models kept.
+    model_factory : callable, optional
+        Called with the regression and correlation names, returns an unfitted
+        model with the `pydace.Dace` fit/predict interface. Default is
+        `pydace.Dace`.
+    """
+
+    def __init__(self, max_models: int = 256, model_factory=None):
+        if max_models < 1:
+            raise ValueError("The registry must hold at least one model.")
+
+        self.max_models = max_models
+        self._factory = model_factory
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, alias, key: str):
+        """Model registered for `alias` and `key`, None if there is none."""
+        with self._lock:
+            model = self._models.get((alias, key))
+            if model is not None:
+                self._models.move_to_end((alias, key))
+
+        return model
+
+    def fit(self, alias, X: np.ndarray, Y: np.ndarray, regression: str,
+            correlation: str, theta0, lob, upb, surrogate: str = 'dace'):
+        """Model of `alias` fitted to (X, Y) with the settings given. Fitted
+        (and registered) only if it isn't registered yet.
+
+        Parameters
+        ----------
+        alias : str or tuple
+            Output alias (tuple of aliases for multiple output models).
+        X, Y : np.ndarray
+            Training inputs and outputs.
+        regression, correlation : str
+            Regression and correlation model names (e.g. 'poly1' and
+            'corrgauss').
+        theta0, lob, upb
+            Initial estimate and bounds of the correlation parameters.
+        surrogate : str, optional
+            Surrogate type (see `SURROGATE_TYPES`).
+
+        Returns
+        -------
+        Dace
+            Fitted model. Don't fit it again, it's shared.
+        """
+        key = training_key(X, Y, regression, correlation, theta0, lob, upb,
+                           surrogate)
+        model = self.get(alias, key)
+        if model is not None:
+            self.hits += 1
+            return model
+
+        # pydace/scipy are only imported when a model is fitted
+        from gui.models.local_kriging import kriging_model
+
+        model = kriging_model(surrogate, regression, correlation,
+                              self._factory)
+        model.fit(S=X, Y=Y, theta0=theta0, lob=lob, upb=upb)
+        self.misses += 1
+
+        with self._lock:
+            self._models[(alias, key)] = model
+            while len(self._models) > self.max_models:
+                self._models.popitem(last=False)
+
+        return model
+
+    def clear(self) -> None:
+        with self._lock:
+            self._models.clear()
+
+    def __len__(self):
+        return len(self._models)
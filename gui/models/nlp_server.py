@@ -0,0 +1,426 @@
+import argparse
+import atexit
+import json
+import pathlib
+import subprocess
+import sys
+import urllib.error
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+import numpy as np
+
+from gui.models.batch_infill import multistart_nlp, solve_surrogate_nlp
+from gui.models.incremental_kriging import IncrementalKriging, _regpoly
+
+# name returned by the status request, used to tell this server apart from
+# other NLP services (e.g. the surropt docker container)
+SERVICE_NAME = 'metacontrol-nlp'
+PROTOCOL_VERSION = 1
+
+_REPO_ROOT = pathlib.Path(__file__).resolve().parents[2]
+
+
+def kriging_to_dict(model, regression: str) -> dict:
+    """JSON compatible parameters of a fitted single output `pydace.Dace`
+    model with gaussian correlation (see `KrigingPredictor`).
+
+    Parameters
+    ----------
+    model : Dace
+        Fitted model.
+    regression : str
+        Regression polynomial of the model ('poly0', 'poly1' or 'poly2').
+
+    Returns
+    -------
+    dict
+        Scaled sites ('S'), scaling factors ('Ssc' and 'Ysc'), correlation
+        parameters ('theta') and regression/correlation coefficients ('beta'
+        and 'gamma').
+    """
+    return {
+        'regression': regression,
+        'S': np.asarray(model.S).tolist(),
+        'Ssc': np.asarray(model._Ssc).tolist(),
+        'Ysc': np.asarray(model._Ysc).reshape(2, -1)[:, 0].tolist(),
+        'theta': np.asarray(model.theta).flatten().tolist(),
+        'beta': np.asarray(model._fitpar['beta']).flatten().tolist(),
+        'gamma': np.asarray(model._fitpar['gamma']).flatten().tolist()
+    }
+
+
+class KrigingPredictor:
+    """Predictor of a single output kriging model with gaussian correlation,
+    built from the parameters of `kriging_to_dict`. Has the same `predict`
+    interface as `pydace.Dace`, so it can be used in `solve_surrogate_nlp`.
+    """
+
+    def __init__(self, params: dict):
+        self.regression = params['regression']
+        self.S = np.asarray(params['S'], dtype=float)
+        self.Ssc = np.asarray(params['Ssc'], dtype=float)
+        self.Ysc = np.asarray(params['Ysc'], dtype=float)
+        self.theta = np.asarray(params['theta'], dtype=float)
+        self.beta = np.asarray(params['beta'], dtype=float)
+        self.gamma = np.asarray(params['gamma'], dtype=float)
+
+        if self.S.ndim != 2 or self.gamma.size != self.S.shape[0]:
+            raise ValueError("Inconsistent kriging model parameters.")
+
+    def predict(self, X: np.ndarray, compute_jacobian: bool = False) -> tuple:
+        """Predictions (k,) at the points X (k x n) and, when
+        `compute_jacobian` is True, their gradients (k x n).
+        """
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        xs = (X - self.Ssc[0]) / self.Ssc[1]
+        d = xs[:, None, :] - self.S[None, :, :]
+        r = np.exp(-(self.theta * d ** 2).sum(axis=2))
+        F, dF = _regpoly(xs, self.regression)
+
+        y = self.Ysc[0] + self.Ysc[1] * (F @ self.beta + r @ self.gamma)
+        if not compute_jacobian:
+            return y, None
+
+        dr = -2 * self.theta * d * r[:, :, None]
+        dys = np.einsum('kpn,p->kn', dF, self.beta) + \
+            np.einsum('kmn,m->kn', dr, self.gamma)
+        return y, self.Ysc[1] * dys / self.Ssc[1]
+
+
+def solve_request(request: dict, executor=None) -> dict:
+    """Solves the multistart surrogate NLP of a '/solve' request.
+
+    Parameters
+    ----------
+    request : dict
+        'models': objective followed by the constraints (`kriging_to_dict`),
+        'starts': starting points, 'lb' and 'ub': bounds. Optional keys:
+        'feasible_tol', 'penalty_factor', 'dedup_tol' and 'nlp_options' (see
+        `multistart_nlp`).
+    executor : concurrent.futures.Executor, optional
+        Pool where the starts are solved.
+
+    Returns
+    -------
+    dict
+        The results of `multistart_nlp` with lists instead of arrays.
+    """
+    models = [KrigingPredictor(params) for params in request['models']]
+    starts = np.atleast_2d(np.asarray(request['starts'], dtype=float))
+    res = multistart_nlp(models, request['lb'], request['ub'], starts,
+                         feasible_tol=request.get('feasible_tol', 1e-6),
+                         penalty_factor=request.get('penalty_factor', 1e3),
+                         dedup_tol=request.get('dedup_tol', 1e-4),
+                         executor=executor,
+                         nlp_options=request.get('nlp_options', None))
+
+    solutions = [{'x': sol['x'].tolist(), 'f': float(sol['f']),
+                  'g': sol['g'].tolist(), 'success': sol['success'],
+                  'n_starts': sol['n_starts']} for sol in res['solutions']]
+
+    return {'solutions': solutions,
+            'start_times': res['start_times'].tolist(),
+            'wall_time': res['wall_time']}
+
+
+class _FixedTheta:
+    # 'fit' of the `IncrementalKriging` models of a surropt request: the
+    # correlation parameters are the ones sent and the inputs are scaled as
+    # in `pydace.Dace`
+
+    def __init__(self, regression: str):
+        self.regression = regression
+
+    def fit(self, S, Y, theta0, lob, upb):
+        std = S.std(axis=0, ddof=1)
+        self._Ssc = np.vstack((S.mean(axis=0), np.where(std > 0, std, 1.0)))
+        self.theta = np.asarray(theta0, dtype=float).flatten()
+
+
+def _fixed_kriging(S: np.ndarray, y, theta, regression: str):
+    model = IncrementalKriging(regression, model_factory=_FixedTheta)
+    model.fit(S, np.asarray(y, dtype=float).flatten(), theta, None, None)
+    return model
+
+
+def solve_surropt_request(request: dict) -> dict:
+    """Solves the surrogate NLP of an '/opt' request of the surropt IpOpt
+    server protocol (`surropt.core.nlp.optimize_nlp` with `DockerNLPOptions`).
+    The kriging models are built from the observations of the request at
+    their correlation parameters and the NLP is solved from 'x0' by
+    `solve_surrogate_nlp` (SLSQP instead of IpOpt).
+
+    Parameters
+    ----------
+    request : dict
+        'x0', 'lb' and 'ub', 'surr_data' ('input_design', 'fobj_data' with
+        'fobj_obs' and 'fobj_theta', 'const_data' with 'const_obs' and
+        'const_theta', 'regmodel' and 'corrmodel') and 'nlp_opts' ('tol',
+        'max_iter' and 'con_tol').
+
+    Returns
+    -------
+    dict
+        Solution 'x', objective prediction 'fval' and 'exitflag' (1 when the
+        solver converged, 0 otherwise), as the surropt server.
+    """
+    surr_data = request['surr_data']
+    if surr_data.get('corrmodel', 'corrgauss') != 'corrgauss':
+        raise ValueError("Only the gaussian correlation ('corrgauss') is "
+                         "supported.")
+
+    S = np.atleast_2d(np.asarray(surr_data['input_design'], dtype=float))
+    regression = surr_data['regmodel']
+    fobj_data = surr_data['fobj_data']
+    const_data = surr_data['const_data']
+    g = np.asarray(const_data['const_obs'], dtype=float).reshape(
+        S.shape[0], -1)
+    if g.shape[1] != len(const_data['const_theta']):
+        raise ValueError("One set of correlation parameters per constraint "
+                         "is expected.")
+
+    models = [_fixed_kriging(S, fobj_data['fobj_obs'],
+                             fobj_data['fobj_theta'], regression)]
+    models += [_fixed_kriging(S, g[:, j], theta, regression)
+               for j, theta in enumerate(const_data['const_theta'])]
+
+    nlp_opts = request.get('nlp_opts', {})
+    sol = solve_surrogate_nlp(
+        models, np.asarray(request['x0'], dtype=float).flatten(),
+        np.asarray(request['lb'], dtype=float).flatten(),
+        np.asarray(request['ub'], dtype=float).flatten(),
+        feasible_tol=nlp_opts.get('con_tol', 1e-6),
+        nlp_options={key: nlp_opts[key] for key in ('tol', 'max_iter')
+                     if key in nlp_opts})
+
+    return {'x': sol['x'].tolist(), 'fval': float(sol['f']),
+            'exitflag': int(sol['success'])}
+
+
+class _NlpRequestHandler(BaseHTTPRequestHandler):
+
+    def _reply(self, code: int, content: dict) -> None:
+        body = json.dumps(content).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip('/') in ('', '/status'):
+            self._reply(200, {'service': SERVICE_NAME, 'status': 'ok',
+                              'version': PROTOCOL_VERSION})
+        else:
+            self._reply(404, {'error': "Unknown path."})
+
+    def do_POST(self):
+        path = self.path.rstrip('/')
+        if path not in ('/solve', '/opt'):
+            self._reply(404, {'error': "Unknown path."})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length).decode('utf-8'))
+            if path == '/opt':
+                result = solve_surropt_request(request)
+            else:
+                result = solve_request(request, self.server.executor)
+        except (KeyError, ValueError, TypeError, IndexError) as error:
+            self._reply(400, {'error': "{0}: {1}".format(
+                type(error).__name__, error)})
+        else:
+            self._reply(200, result)
+
+    def log_message(self, format, *args):
+        # requests are not logged to stderr
+        pass
+
+
+class NlpServer(ThreadingMixIn, HTTPServer):
+    """HTTP server of the surrogate NLPs. Each request is handled in its own
+    thread, so several optimizations can use the same server, and the starts
+    of a request are solved in a pool of `workers` processes (when above 1).
+
+    It speaks the protocol of the surropt IpOpt server (the docker
+    container of `DockerNLPOptions`), so it can replace it, and extends it
+    with the multistart requests of the batch procedure.
+
+    Requests
+    --------
+    GET / : status ({'service': 'metacontrol-nlp', 'status': 'ok', ...}).
+    POST /opt : JSON request of `solve_surropt_request` (surropt protocol),
+        replies with {'x', 'fval', 'exitflag'}.
+    POST /solve : JSON request of `solve_request`, replies with its results.
+
+    Invalid requests are answered with status 400 and {'error': message}.
+    """
+    daemon_threads = True
+
+    def __init__(self, server_address: tuple, workers: int = 1):
+        HTTPServer.__init__(self, server_address, _NlpRequestHandler)
+        self.executor = ProcessPoolExecutor(max_workers=workers) \
+            if workers > 1 else None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return "http://{0}:{1}".format(host, port)
+
+    def server_close(self):
+        HTTPServer.server_close(self)
+        if self.executor is not None:
+            self.executor.shutdown()
+
+
+def _request(url: str, data: dict = None, timeout: float = None) -> dict:
+    body = None if data is None else json.dumps(data).encode('utf-8')
+    req = urllib.request.Request(
+        url, data=body, headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            return json.loads(response.read().decode('utf-8'))
+    except urllib.error.HTTPError as error:
+        try:
+            msg = json.loads(error.read().decode('utf-8'))['error']
+        except (ValueError, KeyError):
+            msg = "The server at {0} is not a {1} server.".format(
+                url, SERVICE_NAME)
+        raise ValueError(msg) from error
+    except (urllib.error.URLError, OSError) as error:
+        raise ValueError("Couldn't reach the NLP server at {0} "
+                         "({1}).".format(url, error)) from error
+
+
+def ping_nlp_server(server_url: str, timeout: float = 5.0) -> bool:
+    """Whether `server_url` answers as a `NlpServer`."""
+    try:
+        status = _request(server_url.rstrip('/') + '/', timeout=timeout)
+    except ValueError:
+        return False
+
+    return isinstance(status, dict) and status.get('service') == SERVICE_NAME
+
+
+def solve_remote(server_url: str, models: list, starts: np.ndarray, lb, ub,
+                 feasible_tol: float = 1e-6, penalty_factor: float = 1e3,
+                 dedup_tol: float = 1e-4, timeout: float = None,
+                 nlp_options: dict = None) -> dict:
+    """Solves the multistart surrogate NLP in a `NlpServer`.
+
+    Parameters
+    ----------
+    server_url : str
+        Address of the server (e.g. 'http://localhost:5000').
+    models : list
+        Parameters (`kriging_to_dict`) of the objective followed by the
+        constraint models.
+    starts, lb, ub, feasible_tol, penalty_factor, dedup_tol
+        See `multistart_nlp`.
+    timeout : float, optional
+        Seconds to wait for the reply.
+    nlp_options : dict, optional
+        Options of the solver (see `solve_surrogate_nlp`).
+
+    Returns
+    -------
+    dict
+        Same results as `multistart_nlp`.
+
+    Raises
+    ------
+    ValueError
+        When the server can't be reached or rejects the request.
+    """
+    request = {'models': models,
+               'starts': np.atleast_2d(starts).tolist(),
+               'lb': np.asarray(lb, dtype=float).tolist(),
+               'ub': np.asarray(ub, dtype=float).tolist(),
+               'feasible_tol': feasible_tol,
+               'penalty_factor': penalty_factor,
+               'dedup_tol': dedup_tol,
+               'nlp_options': nlp_options}
+    res = _request(server_url.rstrip('/') + '/solve', request, timeout)
+
+    for sol in res['solutions']:
+        sol['x'] = np.asarray(sol['x'])
+        sol['g'] = np.asarray(sol['g'])
+    res['start_times'] = np.asarray(res['start_times'])
+
+    return res
+
+
+class LocalNlpServer:
+    """`NlpServer` started as a subprocess on localhost, where the batch
+    procedure solves its surrogate NLPs (see `BatchCaballero`) and that can
+    be used as the IpOpt server of the surropt procedure (`DockerNLPOptions`
+    with `url`), e.g. without the docker container. The process is terminated
+    by `close` or when the application exits.
+
+    Parameters
+    ----------
+    port : int, optional
+        Port listened. Default is 0 (any free port, see `url`).
+    workers : int, optional
+        Number of processes that solve the starts of each request.
+    """
+
+    def __init__(self, port: int = 0, workers: int = 1):
+        cmd = [sys.executable, '-m', 'gui.models.nlp_server',
+               '--port', str(port), '--workers', str(workers)]
+        self._process = subprocess.Popen(cmd, cwd=str(_REPO_ROOT),
+                                         stdout=subprocess.PIPE,
+                                         universal_newlines=True)
+
+        # the server prints its address once it is listening
+        line = self._process.stdout.readline()
+        if not line.startswith('NLP server listening on'):
+            self.close()
+            raise OSError("The local NLP server failed to start.")
+
+        self.url = line.split()[-1]
+        atexit.register(self.close)
+
+    @property
+    def running(self) -> bool:
+        return self._process.poll() is None
+
+    def close(self) -> None:
+        if self._process.poll() is None:
+            self._process.terminate()
+            self._process.wait(timeout=10)
+
+        self._process.stdout.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(
+        description="Local NLP server of the surrogate optimization.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--workers', type=int, default=1,
+                        help="processes that solve the starts of a request")
+    args = parser.parse_args(argv)
+
+    server = NlpServer((args.host, args.port), workers=args.workers)
+    print("NLP server listening on {0}".format(server.url), flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+from math import ceil
+
+import numpy as np
+
+# points drawn per subplot before the cloud is thinned
+MAX_SCATTER_POINTS = 2000
+
+# scatter clouds above this size are rasterized (drawn as a single image)
+RASTERIZE_ABOVE = 500
+
+# grid (per axis) used to thin dense clouds, see `thin_scatter`
+_THIN_BINS = 150
+
+
+def thin_scatter(x: np.ndarray, y: np.ndarray,
+                 max_points: int = MAX_SCATTER_POINTS,
+                 random_state=None) -> np.ndarray:
+    """Indices of the (x, y) points to draw so a scatter plot looks the same
+    with at most `max_points` markers: the plot area is split in a grid and
+    only one point per occupied cell is kept, so isolated points (outliers)
+    are always drawn while the dense regions lose the overlapping markers. If
+    the occupied cells are still more than `max_points`, a random subset of
+    them is kept. Non finite points are dropped.
+
+    Parameters
+    ----------
+    x, y : np.ndarray
+        Point coordinates (1D arrays of the same size).
+    max_points : int, optional
+        Maximum number of points kept.
+    random_state : int or np.random.RandomState, optional
+        Seed of the random subset.
+
+    Returns
+    -------
+    np.ndarray
+        Sorted indices of the points kept.
+    """
+    x = np.asarray(x, dtype=float).flatten()
+    y = np.asarray(y, dtype=float).flatten()
+    if x.size != y.size:
+        raise ValueError("x and y must have the same number of points.")
+
+    idx = np.flatnonzero(np.isfinite(x) & np.isfinite(y))
+    if idx.size <= max_points:
+        return idx
+
+    cells = []
+    for values in (x[idx], y[idx]):
+        lo, hi = values.min(), values.max()
+        span = hi - lo if hi > lo else 1.0
+        cells.append(np.minimum(((values - lo) / span * _THIN_BINS)
+                                .astype(int), _THIN_BINS - 1))
+
+    _, first = np.unique(cells[0] * _THIN_BINS + cells[1], return_index=True)
+    idx = idx[first]
+
+    if idx.size > max_points:
+        rng = random_state if isinstance(random_state, np.random.RandomState) \
+            else np.random.RandomState(random_state)
+        idx = rng.choice(idx, size=max_points, replace=False)
+
+    return np.sort(idx)
+
+
+def plot_pages(n_vars: int, per_page: int) -> list:
+    """Indices of the variables shown on each page of `per_page` subplots."""
+    if per_page < 1:
+        raise ValueError("Each page must have at least one plot.")
+
+    return [list(range(start, min(start + per_page, n_vars)))
+            for start in range(0, n_vars, per_page)]
+
+
+def draw_parity_page(figure, test_data: np.ndarray, pred_data: np.ndarray,
+                     labels: list, variables: list, n_cols: int = 2,
+                     max_points: int = MAX_SCATTER_POINTS) -> None:
+    """Draws the parity plots (predicted against test values) of `variables`
+    on a matplotlib figure. Every subplot is drawn once and the canvas isn't
+    drawn (call `figure.canvas.draw_idle` afterwards).
+
+    Parameters
+    ----------
+    figure : matplotlib.figure.Figure
+        Figure (cleared before drawing).
+    test_data, pred_data : np.ndarray
+        Test and predicted values (points x variables).
+    labels : list
+        Title of each variable (column).
+    variables : list
+        Columns plotted.
+    n_cols : int, optional
+        Number of subplot columns.
+    max_points : int, optional
+        Maximum number of markers per subplot (see `thin_scatter`).
+    """
+    figure.clear()
+    n_rows = max(ceil(len(variables) / n_cols), 1)
+
+    for pos, i in enumerate(variables):
+        ax = figure.add_subplot(n_rows, n_cols, pos + 1,
+                                xlabel='Test values',
+                                ylabel='Predicted values', title=labels[i])
+
+        x, y = test_data[:, i], pred_data[:, i]
+        keep = thin_scatter(x, y, max_points, random_state=i)
+        ax.plot(x[keep], y[keep], 'b.',
+                rasterized=keep.size > RASTERIZE_ABOVE)
+        ax.grid(True)
+
+        # 45 degree line, over the whole data range (not only the points kept)
+        finite = np.isfinite(x) & np.isfinite(y)
+        if finite.any():
+            lo = min(x[finite].min(), y[finite].min())
+            hi = max(x[finite].max(), y[finite].max())
+            ax.plot([lo, hi], [lo, hi], 'k')
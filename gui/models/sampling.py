@@ -1,3 +1,4 @@
+import time
 import traceback
 
 import numpy as np
@@ -12,17 +13,29 @@ from surropt.caballero import Caballero, CaballeroOptions
 from surropt.caballero.problem import CaballeroReport
 from surropt.core.options.nlp import DockerNLPOptions, IpOptOptions
 
+from gui.models.adaptive_sampling import AdaptiveSampler
+from gui.models.batch_infill import BatchCaballero, uses_batch_procedure
+from gui.models.case_ordering import order_cases, path_length, sampling_summary
+from gui.models.converged_states import ConvergedStates
 from gui.models.data_storage import DataStorage
-from gui.models.sim_connections import AspenConnection
+from gui.models.sim_connections import (CaseTimeoutError, SimulationSession,
+                                        SimulationSessionPool, shared_sessions)
+from gui.models.space_filling import design
+from gui.models.telemetry import TelemetryLog
 
 # import ptvsd
 
 
-def lhs(n_samples: int, lb: list, ub: list, n_iter: int, inc_vertices: bool) \
-        -> np.ndarray:
+def lhs(n_samples: int, lb: list, ub: list, n_iter: int, inc_vertices: bool,
+        method: str = 'lhs') -> np.ndarray:
     lb = np.asarray(lb)
     ub = np.asarray(ub)
 
+    if method != 'lhs':
+        # optimized latin hypercubes and low discrepancy sequences
+        return design(n_samples, lb, ub, method=method, n_iter=n_iter,
+                      include_vertices=inc_vertices)
+
     return lhsdesign(n_samples, lb, ub, k=n_iter,
                      include_vertices=inc_vertices)
 
@@ -32,61 +45,240 @@ class SamplerThread(QThread):
     Sampling thread that opens the aspen connection to keep the sampling
     assistant GUI responsive while the sampling is
     performed
+
+    When `ordered` is True, the cases are simulated along a short path
+    through the design space (see `case_ordering.order_cases`) instead of in
+    the design order, so each run starts from the converged state of a
+    nearby case. The results are emitted with the case number of the design.
+    The cases run under the case timeout of the application (see
+    `run_supervised_case`), in a session leased from the application cache
+    (see `sim_connections.SimulationSessionCache`). After a failed case, the
+    engine is restored to the nearest converged state of the run (see
+    `ConvergedStates`). The run time, failure rate, timeouts and recoveries
+    of the cases are reported at the end, along with the error that stopped
+    the sampling, if any (e.g. a hung engine that couldn't be killed). The
+    session is released when the sampling ends.
     """
 
     case_sampled = pyqtSignal(int, object)
+    report = pyqtSignal(str)
 
     def __init__(self, input_design_data: pd.DataFrame, app_data: DataStorage,
-                 parent=None):
+                 ordered: bool = False, parent=None):
         QThread.__init__(self, parent)
         self._input_des_data = input_design_data
         self._app_data = app_data
+        self._ordered = ordered
 
-        # https://stackoverflow.com/questions/26764978/using-win32com-with-multithreading
-        # initialize
-        pythoncom.CoInitialize()
-        self._aspen_connection = AspenConnection(app_data.simulation_file)
-
-        # create id
-        self._aspen_id = pythoncom.CoMarshalInterThreadInterfaceInStream(
-            pythoncom.IID_IDispatch,
-            self._aspen_connection.get_connection_object())
+        # the engine runs in a session thread of its own, that is killed and
+        # opened again when a case hangs
+        self._session = shared_sessions().lease(
+            app_data.simulation_file, app_data.case_timeout or None,
+            [var['Path'] for var in app_data.alias_index.records('input',
+                                                                 'mv')])
 
         # clean up
         self.finished.connect(self.__del__)
 
     def __del__(self):
-        # kill the connection on thread cleanup
-        self._aspen_connection.close_connection()
+        # return the session on thread cleanup
+        self._release_session()
+
+    def _release_session(self, states: ConvergedStates = None):
+        # an engine loaded from a snapshot isn't bound to the simulation file
+        # anymore, it isn't reused
+        if getattr(self, '_session', None) is not None:
+            shared_sessions().release(
+                self._session,
+                discard=states is not None and states.loaded)
+            self._session = None
+
+    def _bounds(self, input_vars: list) -> tuple:
+        bounds = self._app_data.doe_mv_bounds.set_index('name').loc[
+            [var['Alias'] for var in input_vars], :]
+        return bounds['lb'].to_numpy(), bounds['ub'].to_numpy()
+
+    def _case_order(self, points: np.ndarray, input_vars: list) -> tuple:
+        # order of the cases from the current state of the simulation, and
+        # the path lengths of that order and of the design order
+        lb, ub = self._bounds(input_vars)
+        x0 = self._session.run(
+            lambda aspen_obj: [aspen_obj.Tree.FindNode(var['Path']).Value
+                               for var in input_vars])
+
+        design_order = np.arange(points.shape[0])
+        order = order_cases(points, lb, ub, x0=x0) if self._ordered \
+            else design_order
+        return order, path_length(points, order, lb, ub, x0=x0), \
+            path_length(points, design_order, lb, ub, x0=x0)
+
+    def _report_summary(self, run_times: list, statuses: list,
+                        length: float, design_length: float,
+                        states: ConvergedStates, error: str = None) -> None:
+        summary = sampling_summary(run_times, statuses)
+        summary.update(states.summary())
+        message = \
+            "{0} cases in {1:.1f} s ({2:.2f} s per case), {3} failed " \
+            "({4:.1%}, {5} timed out). Path length {6:.2f} (design order " \
+            "{7:.2f}). Next case converged after {8} of {9} converged state " \
+            "restores and {10} of {11} reinitializations.".format(
+                summary['cases'], summary['total_time'],
+                summary['mean_time'], summary['failed'],
+                summary['failure_rate'], summary['timeouts'], length,
+                design_length, summary['recovered'], summary['restores'],
+                summary['reinit_recovered'], summary['reinits'])
+        if error is not None:
+            message += " Sampling stopped by an error: {0}".format(error)
+
+        self.report.emit(message)
 
     def run(self):
         # ptvsd.debug_this_thread()
-        # initialize
-        pythoncom.CoInitialize()
+        alias_index = self._app_data.alias_index
+        input_vars = alias_index.records('input', 'mv')
+        output_vars = alias_index.records('output')
 
-        # get instance from id
-        aspen_con = win32com.client.Dispatch(
-            pythoncom.CoGetInterfaceAndReleaseStream(
-                self._aspen_id, pythoncom.IID_IDispatch)
-        )
-        inp_data = self._app_data.input_table_data
-        out_data = self._app_data.output_table_data
-        input_vars = inp_data.loc[
-            inp_data['Type'] == self._app_data._INPUT_ALIAS_TYPES['mv'],
-            ['Alias', 'Path']
-        ].to_dict(orient='records')
-        output_vars = out_data.loc[:,
-                                   ['Alias', 'Path']].to_dict(orient='records')
-
-        for row in range(self._input_des_data.shape[0]):
-            [var.update({'value': self._input_des_data.loc[row, var['Alias']]})
-             for var in input_vars]
-            self.case_sampled.emit(row + 1,
-                                   run_case(input_vars, output_vars, aspen_con)
-                                   )
-
-            if self.isInterruptionRequested():  # to allow task abortion
-                return
+        points = self._input_des_data[
+            [var['Alias'] for var in input_vars]].to_numpy(dtype=float)
+        states = ConvergedStates(*self._bounds(input_vars))
+
+        run_times, statuses = [], []
+        length = design_length = 0.0
+        error = None
+        try:
+            order, length, design_length = self._case_order(
+                points, input_vars)
+            for row in order:
+                for var in input_vars:
+                    var['value'] = self._input_des_data.loc[row, var['Alias']]
+
+                start = time.perf_counter()
+                res = run_supervised_case(input_vars, output_vars,
+                                          self._session, states)
+                run_times.append(time.perf_counter() - start)
+                statuses.append(res['success'])
+
+                # case number of the design, whatever the order of simulation
+                self.case_sampled.emit(row + 1, res)
+
+                if self.isInterruptionRequested():  # to allow task abortion
+                    break
+
+        except Exception as ex:
+            # e.g. a hung engine that couldn't be killed
+            error = repr(ex)
+
+        finally:
+            self._report_summary(run_times, statuses, length, design_length,
+                                 states, error)
+            states.close()
+            self._release_session(states)
+
+
+class AdaptiveSamplerThread(SamplerThread):
+    """
+    Sampling thread of the adaptive design (see `AdaptiveSampler`). The input
+    design in display is the initial design and the points of each new batch
+    are emitted (`points_added`) before they are sampled. The models are
+    fitted to the selected metamodel variables (all the outputs when none is
+    selected). When `ordered`, the initial design and each batch are
+    simulated along a short path.
+    """
+
+    points_added = pyqtSignal(object)
+
+    def __init__(self, input_design_data: pd.DataFrame, app_data: DataStorage,
+                 settings: dict, ordered: bool = False, parent=None):
+        SamplerThread.__init__(self, input_design_data, app_data, ordered,
+                               parent)
+        self._settings = settings
+
+    def run(self):
+        app_data = self._app_data
+        alias_index = app_data.alias_index
+        input_vars = alias_index.records('input', 'mv')
+        output_vars = alias_index.records('output')
+        mv_aliases = [var['Alias'] for var in input_vars]
+
+        selected = app_data.metamodel_selected_data
+        fit_aliases = selected.loc[selected['Checked'] == True,
+                                   'Alias'].tolist()
+        if len(fit_aliases) == 0:
+            fit_aliases = alias_index.aliases('output')
+
+        bounds = app_data.doe_mv_bounds.set_index('name').loc[mv_aliases, :]
+        n_initial = self._input_des_data.shape[0]
+        run_times, statuses = [], []
+        lengths = np.zeros(2)
+        states = ConvergedStates(bounds['lb'].to_numpy(),
+                                 bounds['ub'].to_numpy())
+
+        def simulate(points):
+            first = self._n_sampled
+            if first >= n_initial:
+                self.points_added.emit(pd.DataFrame(points,
+                                                    columns=mv_aliases))
+
+            order, length, design_length = self._case_order(
+                np.asarray(points, dtype=float), input_vars)
+            lengths[:] += [length, design_length]
+
+            rows = []
+            for k in order:
+                if self.isInterruptionRequested():  # to allow task abortion
+                    raise InterruptedError
+
+                point = points[k]
+                for var, value in zip(input_vars, point):
+                    var['value'] = value
+
+                start = time.perf_counter()
+                res = run_supervised_case(input_vars, output_vars,
+                                          self._session, states)
+                run_times.append(time.perf_counter() - start)
+                statuses.append(res['success'])
+
+                self.case_sampled.emit(first + k + 1, dict(res))
+                self._n_sampled += 1
+
+                row = {'case': first + k + 1, 'status': res['success']}
+                row.update(zip(mv_aliases, point))
+                row.update((var['Alias'], res[var['Alias']])
+                           for var in output_vars)
+                rows.append(row)
+
+            # expressions (e.g. objective and constraints) of the batch, in
+            # the order of the points
+            rows.sort(key=lambda row: row['case'])
+            data = app_data.evaluate_expr_data(pd.DataFrame(rows),
+                                               'original')
+            return data[fit_aliases].to_numpy(dtype=float), \
+                (data['status'] == 'ok').to_numpy()
+
+        settings = self._settings
+        self._n_sampled = 0
+        sampler = AdaptiveSampler(
+            bounds['lb'].to_numpy(), bounds['ub'].to_numpy(), simulate,
+            n_initial=max(n_initial, 2),
+            batch_size=settings.get('batch_size', 5),
+            max_samples=max(settings.get('max_samples', 100), n_initial),
+            target_error=settings.get('target_error', 0.05),
+            criterion=settings.get('criterion', 'mse'),
+            report=self.report.emit, stop=self.isInterruptionRequested)
+
+        error = None
+        try:
+            sampler.run(self._input_des_data[mv_aliases].to_numpy())
+        except InterruptedError:
+            pass
+        except Exception as ex:
+            # e.g. a hung engine that couldn't be killed
+            error = repr(ex)
+        finally:
+            self._report_summary(run_times, statuses, *lengths, states,
+                                 error=error)
+            states.close()
+            self._release_session(states)
 
 
 class ReducedSamplerThread(SamplerThread):
@@ -95,55 +287,88 @@ class ReducedSamplerThread(SamplerThread):
         QThread.__init__(self, parent)
         self._input_des_data = input_design_data
         self._app_data = app_data
-
-        # initialize
-        pythoncom.CoInitialize()
-        self._aspen_connection = AspenConnection(bkp_filepath)
-
-        # create id
-        self._aspen_id = pythoncom.CoMarshalInterThreadInterfaceInStream(
-            pythoncom.IID_IDispatch,
-            self._aspen_connection.get_connection_object())
+        self._session = shared_sessions().lease(
+            bkp_filepath, app_data.case_timeout or None,
+            [var['Path'] for var in app_data.alias_index.records('input')])
 
         # clean up
         self.finished.connect(self.__del__)
 
     def run(self):
         # ptvsd.debug_this_thread()
-        # initialize
-        pythoncom.CoInitialize()
-
-        # get instance from id
-        aspen_con = win32com.client.Dispatch(
-            pythoncom.CoGetInterfaceAndReleaseStream(
-                self._aspen_id, pythoncom.IID_IDispatch)
-        )
-        inp_data = self._app_data.input_table_data
-        out_data = self._app_data.output_table_data
+        alias_index = self._app_data.alias_index
         # TODO: move consumed aliases from input into output collection
-        inp_data_ph = inp_data.set_index('Alias')
         red_inp_alias = self._app_data.reduced_doe_d_bounds.loc[
             :, 'name'].tolist()
-        output_mvs = inp_data.loc[~inp_data['Alias'].isin(red_inp_alias)]
-        input_vars = inp_data_ph.loc[red_inp_alias,
-                                     'Path'].reset_index().to_dict(orient='records')
-        output_vars = pd.concat([out_data.loc[:, ['Alias', 'Path']],
-                                 output_mvs], ignore_index=True,
-                                axis='index', sort=False).to_dict(orient='records')
+        input_vars = [{'Alias': alias,
+                       'Path': alias_index.info(alias)['Path']}
+                      for alias in red_inp_alias]
+        output_mvs = [var for var in alias_index.records('input')
+                      if var['Alias'] not in red_inp_alias]
+        output_vars = alias_index.records('output') + output_mvs
+
+        bounds = self._app_data.reduced_doe_d_bounds.set_index('name').loc[
+            red_inp_alias, :]
+        states = ConvergedStates(bounds['lb'].to_numpy(dtype=float),
+                                 bounds['ub'].to_numpy(dtype=float))
+
+        try:
+            for row in range(self._input_des_data.shape[0]):
+                for var in input_vars:
+                    var['value'] = self._input_des_data.loc[row, var['Alias']]
+                self.case_sampled.emit(
+                    row + 1,
+                    run_supervised_case(input_vars, output_vars,
+                                        self._session, states))
+
+                if self.isInterruptionRequested():  # to allow task abortion
+                    break
+
+        except Exception as ex:
+            # e.g. a hung engine that couldn't be killed
+            self.report.emit("Sampling stopped by an error: {0}".format(
+                repr(ex)))
+
+        finally:
+            states.close()
+            self._release_session(states)
+
+
+def _timeout_result(output_data: list) -> dict:
+    # outputs of a case that timed out, as the ones of a failed case
+    res_dict = {'success': 'timeout'}
+    for out_var in output_data:
+        res_dict[out_var['Alias']] = np.spacing(1)
+
+    return res_dict
 
-        for row in range(self._input_des_data.shape[0]):
-            [var.update({'value': self._input_des_data.loc[row, var['Alias']]})
-             for var in input_vars]
-            self.case_sampled.emit(row + 1,
-                                   run_case(input_vars, output_vars, aspen_con)
-                                   )
 
-            if self.isInterruptionRequested():  # to allow task abortion
-                return
+def _case_job(aspen_obj, mv_values: list, output_data: list,
+              states: ConvergedStates = None) -> dict:
+    # `run_case` with the engine object first, as the session jobs
+    return run_case(mv_values, output_data, aspen_obj, states=states)
+
+
+def run_supervised_case(mv_values: list, output_data: list,
+                        session: SimulationSession,
+                        states: ConvergedStates = None) -> dict:
+    """Same as `run_case`, in the engine of `session`. A case that takes
+    longer than the timeout of the session has the 'timeout' status (instead
+    of 'ok' or 'error') and the session is respawned from the simulation file.
+    """
+    try:
+        # the values are copied since a hung case may still hold them
+        return session.run(_case_job, [dict(var) for var in mv_values],
+                           output_data, states)
+    except CaseTimeoutError:
+        if states is not None:
+            states.case_finished(False)
+
+        return _timeout_result(output_data)
 
 
 def run_case(mv_values: list, output_data: list, aspen_obj,
-             reset_sim: bool = False):
+             reset_sim: bool = False, states: ConvergedStates = None):
     """
     Samples a single case of DOE.
 
@@ -158,6 +383,11 @@ def run_case(mv_values: list, output_data: list, aspen_obj,
     reset_sim : float
         Whether or not to purge all results before running the case. Default
         is False (do not purge previous results).
+    states : ConvergedStates, optional
+        Snapshots of converged states. The state of a converged case is
+        recorded and, after a failed case, the engine is restored to the
+        snapshot nearest to it instead of reinitialized. Default is None
+        (always reinitialized).
 
     Returns
     -------
@@ -185,13 +415,24 @@ def run_case(mv_values: list, output_data: list, aspen_obj,
         for out_var in output_data:
             res_dict[out_var['Alias']] = aspen_obj.Tree.FindNode(
                 out_var['Path']).Value
+
+        if states is not None:
+            states.case_finished(True)
+            states.record(aspen_obj, [var['value'] for var in mv_values])
     else:
         res_dict['success'] = 'error'
         for out_var in output_data:
             res_dict[out_var['Alias']] = np.spacing(1)
 
-        # reset the simulation when an error occurs
-        aspen_obj.Reinit()
+        # reset the simulation when an error occurs, from the nearest
+        # converged state when there is one
+        if states is not None:
+            states.case_finished(False)
+
+        if states is None or \
+                not states.restore(aspen_obj,
+                                   [var['value'] for var in mv_values]):
+            aspen_obj.Reinit()
 
     return res_dict
 
@@ -251,9 +492,18 @@ class SamplerWorker(QObject):
 
 class ReportObject(CaballeroReport):
 
-    def __init__(self, iteration_printed, terminal=False, plot=False):
+    def __init__(self, iteration_printed, terminal=False, plot=False,
+                 telemetry=None):
         CaballeroReport.__init__(self, terminal=terminal, plot=plot)
         self.iteration_printed = iteration_printed
+        self.telemetry = telemetry
+
+        # simulation time since the last iteration (added by the model
+        # function), the remaining time is spent in the surrogate steps
+        self.sim_time = 0.0
+        self.sim_status = True
+        self.fun_evals = 0
+        self._last_iter = time.perf_counter()
 
     def build_iter_report(self, movement, iter_count, x, f_pred, f_actual,
                           g_actual, header=False, field_size=12):
@@ -262,6 +512,19 @@ class ReportObject(CaballeroReport):
                                             f_actual, g_actual, header=header,
                                             field_size=field_size)
         self.iteration_printed.emit(str_msg)
+
+        if self.telemetry is not None and not header:
+            # surropt doesn't expose the hypercube nor the fit/NLP split
+            now = time.perf_counter()
+            self.telemetry.write(
+                'iteration', iter=iter_count, movement=movement,
+                x=np.reshape(x, (1, -1)), f_pred=[f_pred], f=[f_actual],
+                g=np.reshape(g_actual, (1, -1)), status=[self.sim_status],
+                sim_time=self.sim_time,
+                surrogate_time=now - self._last_iter - self.sim_time)
+            self.sim_time = 0.0
+            self._last_iter = now
+
         return str_msg
 
     def get_results_report(self, index, r, x, f, lb, ub, fun_evals):
@@ -290,8 +553,7 @@ class CaballeroWorker(QObject):
         self.optimization_failed = optimization_failed
 
     def __del__(self):
-        if hasattr(self, 'asp_obj'):
-            self.asp_obj.close_connection()
+        self.close_connection()
 
     def start_optimization(self):
         # ptvsd.debug_this_thread()
@@ -306,92 +568,139 @@ class CaballeroWorker(QObject):
         tol1 = params['tol1']
         tol2 = params['tol2']
         maxfunevals = params['maxfunevals']
+        infill_batch = params.get('infill_batch', 1)
+        nlp_starts = params.get('nlp_starts', 1)
+        incremental_fit = params.get('incremental_fit', False)
         regrpoly = params['regrpoly']
+        telemetry_path = params.get('telemetry_path')
+
+        # the surropt procedure evaluates a single point per iteration from a
+        # single NLP start and refits its surrogates for every point
+        batch_mode = uses_batch_procedure(params)
 
         nlp_params = params['nlp_dict']
 
         # setup the problem data
-        inp_data = self.app_data.input_table_data
-        expr_data = self.app_data.expression_table_data
-
-        inp_aliases = inp_data.loc[
-            inp_data['Type'] == self.app_data._INPUT_ALIAS_TYPES['mv'],
-            'Alias'].tolist()
-        con_aliases = expr_data.loc[
-            expr_data['Type'] == self.app_data._EXPR_ALIAS_TYPES['cst'],
-            'Alias'].tolist()
-        obj_alias = expr_data.loc[
-            expr_data['Type'] == self.app_data._EXPR_ALIAS_TYPES['obj'],
-            'Alias'].tolist()
+        alias_index = self.app_data.alias_index
+        inp_aliases = alias_index.aliases('input', 'mv')
+        con_aliases = alias_index.aliases('expression', 'cst')
+        obj_alias = alias_index.aliases('expression', 'obj')
 
         doe = self.app_data.doe_sampled_data
         x = doe.loc[:, inp_aliases].to_numpy()
         g = doe.loc[:, con_aliases].to_numpy()
         f = doe.loc[:, obj_alias].to_numpy().flatten()
 
-        # open the aspen connection
-        self.open_connection()
-
-        # define model function
-        def model_fun(pt): return self.model_function(pt)
-
-        # nlp bounds
-        lb_list = self.app_data.doe_mv_bounds.loc[:, 'lb'].tolist()
-        ub_list = self.app_data.doe_mv_bounds.loc[:, 'ub'].tolist()
-
-        # nlp options (assumes that the user already tested the connection)
-        if nlp_params['solver_type'] == "ipopt_server":
-            server_url = nlp_params['server_url']
-            ipopt_tol = nlp_params['tol']
-            ipopt_max_iter = nlp_params['max_iter']
-            ipopt_con_tol = nlp_params['con_tol']
-            nlp_opts = DockerNLPOptions(name='nlp-server',
-                                        server_url=server_url,
+        telemetry = None
+        try:
+            # open the aspen connection (one per point of the infill batch)
+            if batch_mode:
+                self.open_session_pool(infill_batch)
+            else:
+                self.open_connection()
+
+            # structured log of the iterations (see gui.models.telemetry)
+            if telemetry_path:
+                telemetry = TelemetryLog(telemetry_path)
+
+            # define model function
+            def model_fun(pt):
+                sim_start = time.perf_counter()
+                res = self.model_function(pt)
+                report_obj.sim_time += time.perf_counter() - sim_start
+                report_obj.sim_status = res['status']
+                report_obj.fun_evals += 1
+                return res
+
+            # nlp bounds
+            lb_list = self.app_data.doe_mv_bounds.loc[:, 'lb'].tolist()
+            ub_list = self.app_data.doe_mv_bounds.loc[:, 'ub'].tolist()
+
+            # nlp options (assumes that the user already tested the connection)
+            if nlp_params['solver_type'] == "ipopt_server":
+                server_url = nlp_params['server_url']
+                ipopt_tol = nlp_params['tol']
+                ipopt_max_iter = nlp_params['max_iter']
+                ipopt_con_tol = nlp_params['con_tol']
+                nlp_opts = DockerNLPOptions(name='nlp-server',
+                                            server_url=server_url,
+                                            tol=ipopt_tol,
+                                            max_iter=ipopt_max_iter,
+                                            con_tol=ipopt_con_tol)
+
+            elif nlp_params['solver_type'] == "ipopt_local":
+                ipopt_tol = nlp_params['tol']
+                ipopt_max_iter = nlp_params['max_iter']
+                ipopt_con_tol = nlp_params['con_tol']
+                nlp_opts = IpOptOptions(name='nlp-server',
                                         tol=ipopt_tol,
                                         max_iter=ipopt_max_iter,
                                         con_tol=ipopt_con_tol)
 
-        elif nlp_params['solver_type'] == "ipopt_local":
-            ipopt_tol = nlp_params['tol']
-            ipopt_max_iter = nlp_params['max_iter']
-            ipopt_con_tol = nlp_params['con_tol']
-            nlp_opts = IpOptOptions(name='nlp-server',
-                                    tol=ipopt_tol,
-                                    max_iter=ipopt_max_iter,
-                                    con_tol=ipopt_con_tol)
-
-        # algorithm options
-        cab_opts = CaballeroOptions(max_fun_evals=maxfunevals,
-                                    feasible_tol=con_tol,
-                                    penalty_factor=penalty,
-                                    ref_tol=tol1, term_tol=tol2,
-                                    first_factor=first_factor,
-                                    second_factor=sec_factor,
-                                    contraction_tol=tol_contract)
-
-        report_obj = ReportObject(iteration_printed=self.iteration_printed,
-                                  terminal=False, plot=False)
-
-        opt_obj = Caballero(x=x, g=g, f=f, model_function=model_fun,
-                            lb=lb_list, ub=ub_list, regression=regrpoly,
-                            options=cab_opts, nlp_options=nlp_opts,
-                            report_options=report_obj)
+            # algorithm options
+            cab_opts = CaballeroOptions(max_fun_evals=maxfunevals,
+                                        feasible_tol=con_tol,
+                                        penalty_factor=penalty,
+                                        ref_tol=tol1, term_tol=tol2,
+                                        first_factor=first_factor,
+                                        second_factor=sec_factor,
+                                        contraction_tol=tol_contract)
+
+            report_obj = ReportObject(iteration_printed=self.iteration_printed,
+                                      terminal=False, plot=False,
+                                      telemetry=telemetry)
+
+            if batch_mode:
+                # the points of each iteration are simulated concurrently and
+                # the surrogate NLP may be solved from several starting points
+                opt_obj = BatchCaballero(
+                    x=x, g=g, f=f, model_function=self.model_function_batch,
+                    lb=lb_list, ub=ub_list, regression=regrpoly,
+                    batch_size=infill_batch, max_fun_evals=maxfunevals,
+                    feasible_tol=con_tol, penalty_factor=penalty, ref_tol=tol1,
+                    term_tol=tol2, first_factor=first_factor,
+                    second_factor=sec_factor, contraction_tol=tol_contract,
+                    n_starts=nlp_starts,
+                    start_design=params.get('start_design', 'lhs'),
+                    n_workers=params.get('nlp_workers', 1),
+                    nlp_server_url=params.get('nlp_server_url', None),
+                    nlp_options={'tol': nlp_params['tol'],
+                                 'max_iter': nlp_params['max_iter']},
+                    incremental=incremental_fit, telemetry=telemetry,
+                    report=self.iteration_printed.emit)
+            else:
+                opt_obj = Caballero(x=x, g=g, f=f, model_function=model_fun,
+                                    lb=lb_list, ub=ub_list,
+                                    regression=regrpoly, options=cab_opts,
+                                    nlp_options=nlp_opts,
+                                    report_options=report_obj)
+
+                if telemetry is not None:
+                    telemetry.write(
+                        'start', procedure='caballero', lb=lb_list, ub=ub_list,
+                        x=x, f=f, g=g,
+                        options={'regression': regrpoly,
+                                 'max_fun_evals': maxfunevals,
+                                 'feasible_tol': con_tol,
+                                 'penalty_factor': penalty, 'ref_tol': tol1,
+                                 'term_tol': tol2,
+                                 'first_factor': first_factor,
+                                 'second_factor': sec_factor,
+                                 'contraction_tol': tol_contract,
+                                 'nlp': nlp_params})
 
-        try:
             opt_obj.optimize()
         except (pywintypes.com_error, NotImplementedError, IndexError,
-                ValueError, AttributeError) as ex:
-            # close the connection
-            self.asp_obj.close_connection()
-
-            # emit the error message to be re raised in the main thread
+                ValueError, AttributeError, RuntimeError, TimeoutError) as ex:
+            # emit the error message to be re raised in the main thread (e.g.
+            # the RuntimeError of a hung engine that couldn't be killed)
             self.optimization_failed.emit(traceback.format_exc())
 
-            # notify the main thread (quit this one)
-            self.optimization_finished.emit()
-
         else:
-            self.asp_obj.close_connection()
+            if telemetry is not None and not batch_mode:
+                telemetry.write('end', xopt=opt_obj.xopt,
+                                fopt=opt_obj.fopt, gopt=opt_obj.gopt,
+                                fun_evals=report_obj.fun_evals)
 
             # create the results table report
             opt_vals = np.append(opt_obj.xopt,
@@ -401,36 +710,110 @@ class CaballeroWorker(QObject):
 
             self.results_ready.emit(report)
 
+        finally:
+            # close the connection, whatever the error
+            self.close_connection()
+
+            if telemetry is not None:
+                telemetry.close()
+
+            # notify the main thread (quit this one)
             self.optimization_finished.emit()
 
     def open_connection(self):
         # warn others that a simulation engine connection is about to be opened
         self.opening_connection.emit()
 
-        pythoncom.CoInitialize()
-        asp_obj = AspenConnection(self.app_data.simulation_file)
-        self.asp_obj = asp_obj
-        self._aspen_connection = asp_obj.get_connection_object()
+        # the cases run under the case timeout of the application
+        self._session = shared_sessions().lease(
+            self.app_data.simulation_file, self.app_data.case_timeout or None,
+            self._input_paths())
+        self._session.wait_open()
+
+        # failed cases restart from the nearest converged state
+        bounds = self.app_data.doe_mv_bounds
+        self._states = ConvergedStates(bounds['lb'].to_numpy(dtype=float),
+                                       bounds['ub'].to_numpy(dtype=float))
 
         # emit the signal to warn others that the connection is done
         self.connection_opened.emit()
 
+    def open_session_pool(self, n_sessions: int):
+        # each session is an engine instance with its own thread
+        self.opening_connection.emit()
+
+        self._session_pool = SimulationSessionPool(
+            self.app_data.simulation_file, n_sessions,
+            timeout=self.app_data.case_timeout or None,
+            cache=shared_sessions(),
+            input_paths=self._input_paths())
+
+        self.connection_opened.emit()
+
+    def _input_paths(self) -> list:
+        return [var['Path']
+                for var in self.app_data.alias_index.records('input', 'mv')]
+
+    def close_connection(self):
+        states = getattr(self, '_states', None)
+        if getattr(self, '_session', None) is not None:
+            # an engine loaded from a snapshot isn't reused
+            shared_sessions().release(
+                self._session,
+                discard=states is not None and states.loaded)
+            self._session = None
+
+        if states is not None:
+            states.close()
+            self._states = None
+
+        if getattr(self, '_session_pool', None) is not None:
+            self._session_pool.close()
+            self._session_pool = None
+
     def model_function(self, x):
-        inp_data = self.app_data.input_table_data
-        out_data = self.app_data.output_table_data
-        expr_data = self.app_data.expression_table_data
-        input_vars = inp_data.loc[
-            inp_data['Type'] == self.app_data._INPUT_ALIAS_TYPES['mv'],
-            ['Alias', 'Path']
-        ].to_dict(orient='records')
-        output_vars = out_data.loc[:,
-                                   ['Alias', 'Path']].to_dict(orient='records')
+        alias_index = self.app_data.alias_index
+        input_vars = alias_index.records('input', 'mv')
+        output_vars = alias_index.records('output')
 
         # update input values
         [var.update({'value': x[idx]}) for idx, var in enumerate(input_vars)]
 
         # query the simulation engine, store the results
-        results = run_case(input_vars, output_vars, self._aspen_connection)
+        results = run_supervised_case(input_vars, output_vars, self._session,
+                                      self._states)
+
+        return self._case_outcome(input_vars, results)
+
+    def model_function_batch(self, x):
+        """Simulates the points (rows) of `x` concurrently over the session
+        pool. Returns the list of results of `model_function` of each point.
+        """
+        alias_index = self.app_data.alias_index
+        output_vars = alias_index.records('output')
+        cases = []
+        for point in x:
+            input_vars = alias_index.records('input', 'mv')
+            [var.update({'value': point[idx]})
+             for idx, var in enumerate(input_vars)]
+            cases.append(input_vars)
+
+        futures = [self._session_pool.submit(_case_job, input_vars,
+                                             output_vars)
+                   for input_vars in cases]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except CaseTimeoutError:
+                results.append(_timeout_result(output_vars))
+
+        # the expressions are parsed here since the parser is not thread safe
+        return [self._case_outcome(input_vars, res)
+                for input_vars, res in zip(cases, results)]
+
+    def _case_outcome(self, input_vars: list, results: dict) -> dict:
+        alias_index = self.app_data.alias_index
 
         # update the results including input variables values
         results.update({var['Alias']: var['value'] for var in input_vars})
@@ -438,23 +821,19 @@ class CaballeroWorker(QObject):
         # evaluate constraint and objective functions
         expr_values = {}
         parser = self.parser
-        for _, expr in expr_data.iterrows():
+        for expr in alias_index.records('expression'):
             expr_to_parse = parser.parse(expr['Expression'])
             var_list = expr_to_parse.variables()
             expr_values[expr['Alias']] = expr_to_parse.evaluate(results)
             results.update(expr_values)
 
         # separate constraints values
-        con_aliases = expr_data.loc[
-            expr_data['Type'] == self.app_data._EXPR_ALIAS_TYPES['cst'],
-            'Alias'].tolist()
+        con_aliases = alias_index.aliases('expression', 'cst')
 
         g = [expr_values[cn_alias] for cn_alias in con_aliases]
 
         # objective function
-        obj_alias = expr_data.loc[
-            expr_data['Type'] == self.app_data._EXPR_ALIAS_TYPES['obj'],
-            'Alias'].tolist()
+        obj_alias = alias_index.aliases('expression', 'obj')
 
         f = [expr_values[alias] for alias in obj_alias]
 
@@ -1,18 +1,108 @@
-import copy
+import collections
+import concurrent.futures
+import os
 import pathlib
+import queue
+import subprocess
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 
+import pythoncom
 import pywintypes
 from win32com import client as win32
 
-from anytree import Node, RenderTree, PostOrderIter
-from anytree.exporter import DictExporter
-from anytree.importer import DictImporter
-
 from gui.models.aspen_var_catalogue import (
     BLOCKS_CATALOGUE, DESPEC_CATALOGUE, STREAMS_CATALOGUE)
 
 
 # ---------------------------- ASPEN PLUS SECTION ----------------------------
+class NodeReader:
+    """Reads the nodes of an Aspen Plus variable tree. Each node is read into a
+    single record holding every attribute needed to build the JSON trees, so
+    an attribute is never requested twice from the COM server and the
+    attributes that are not needed (e.g. units of an empty value) are not
+    requested at all.
+
+    Every COM call made is counted by name in `calls`.
+
+    Parameters
+    ----------
+    tree : win32.CDispatch
+        Root node of the variable tree (`Tree` property of the Aspen Plus
+        document).
+    calls : collections.Counter, optional
+        Counter where the COM calls are accumulated. Default is a new counter.
+    """
+
+    # ASPEN PLUS AttibuteValue ARGUMENTS
+    _HAP_HASCHILDREN = 38  # Does this directory actually have any children?
+    _HAP_RECORDTYPE = 6  # If the node contains record, the type of that record
+
+    # ValueType of real (float) values
+    _REAL_VALUE_TYPE = 2
+
+    def __init__(self, tree: win32.CDispatch,
+                 calls: collections.Counter = None):
+        self._tree = tree
+        self.calls = collections.Counter() if calls is None else calls
+
+    def find(self, node_path: str) -> win32.CDispatch:
+        """Returns the node at `node_path`. None if it does not exist.
+        """
+        self.calls['FindNode'] += 1
+        return self._tree.FindNode(node_path)
+
+    def elements(self, node: win32.CDispatch) -> list:
+        """Returns the children nodes of `node`.
+        """
+        self.calls['Elements'] += 1
+        return list(node.Elements)
+
+    def record_type(self, node: win32.CDispatch) -> tuple:
+        """Returns the name and record type (e.g. 'RadFrac') of `node`.
+        """
+        self.calls['Name'] += 1
+        self.calls['AttributeValue'] += 1
+        return node.Name, node.AttributeValue(self._HAP_RECORDTYPE)
+
+    def read(self, node: win32.CDispatch) -> dict:
+        """Reads the attributes of `node` needed to build the JSON trees.
+
+        Parameters
+        ----------
+        node : win32.CDispatch
+            Node to be read.
+
+        Returns
+        -------
+        dict
+            Node record. The keys are:
+                'node' - name of the node;
+                'is_leaf' - whether the node has no children;
+                'value' - value of the leaf, only present if it is a float that
+                    is not None;
+                'units' - units of 'value', only present along with it;
+        """
+        record = {'node': node.Name,
+                  'is_leaf': node.AttributeValue(self._HAP_HASCHILDREN) == 0}
+        self.calls['Name'] += 1
+        self.calls['AttributeValue'] += 1
+
+        if record['is_leaf']:
+            self.calls['ValueType'] += 1
+            if node.ValueType == self._REAL_VALUE_TYPE:
+                self.calls['Value'] += 1
+                value = node.Value
+
+                if value is not None:
+                    self.calls['UnitString'] += 1
+                    record['value'] = value
+                    record['units'] = node.UnitString
+
+        return record
+
+
 class AspenConnection:
     """Aspen Plus connection class that handles JSON compatible tree
     generation.
@@ -22,6 +112,12 @@ class AspenConnection:
     file_path : str
         Full path string to the .bkp or .inp file.
 
+    Attributes
+    ----------
+    com_calls : collections.Counter
+        Number of COM calls made, by name, during the last tree build (see
+        `NodeReader`).
+
     Notes
     -----
         Explicitly call the close_connection() function to destroy the
@@ -41,6 +137,12 @@ class AspenConnection:
     _HAP_VALUEDEFAULT = 10  # The default value for the value attribute
     _HAP_ENTERABLE = 7  # Can the value attribute be modified?
 
+    # executable of the COM server process (the engine processes are its
+    # children) and lock of the server starts, so the process started by
+    # each connection can be told apart (see `kill_connection`)
+    _SERVER_EXE = 'aspenplus.exe'
+    _open_lock = threading.Lock()
+
     def __init__(self, file_path: str):
         if pathlib.Path(file_path).is_file:
             self._aspen_filepath = file_path
@@ -48,6 +150,9 @@ class AspenConnection:
             raise FileNotFoundError("Couldn't find the specified .bkp file.")
 
         self._aspen = None
+        self._reader = None
+        self._server_pids = set()
+        self.com_calls = collections.Counter()
 
     # --------------------------- PRIVATE FUNCTIONS --------------------------
     def _check_simulation_results(self) -> None:
@@ -73,25 +178,18 @@ class AspenConnection:
                 # the simulation hasn't output data.
                 self._aspen.Engine.Run2()
 
-    def _isleaf(self, node: win32.CDispatch) -> bool:
-        """Check if node is leaf or branch.
-
-        Parameters
-        ----------
-        node : win32.CDispatch
-            Node to be checked.
-
-        Returns
-        -------
-        bool
-            Whether the node is a leaf (True) or not (False).
+    def _start_build(self) -> None:
+        """Opens the connection if needed and resets the COM calls counting of
+        a new tree build.
         """
-        if node.AttributeValue(self._HAP_HASCHILDREN) == 0:  # node is a leaf
-            return True
-        else:
-            return False
+        if self._aspen is None:
+            self.open_connection()
 
-    def _traverse_branch(self, node: win32.CDispatch) -> dict:
+        self.com_calls = collections.Counter()
+        self._reader = NodeReader(self._aspen.Tree, self.com_calls)
+
+    def _traverse_branch(self, node: win32.CDispatch,
+                         max_depth: int = None) -> dict:
         """Traverse the branch through recursion and return its nodes as JSON tree
         dictionary.
 
@@ -99,6 +197,10 @@ class AspenConnection:
         ----------
         node : win32.CDispatch
             Node to be traversed.
+        max_depth : int, optional
+            How many levels of children to traverse below `node`. Branches
+            beyond this depth are not read and are flagged with the 'lazy' key
+            instead. Default is None (traverse the whole branch).
 
         Returns
         -------
@@ -107,17 +209,19 @@ class AspenConnection:
                 'node' - name of the node;
                 'children' - if this key is present, then its value returns the
                     list of children pertaining to the `node`;
+                'lazy' - if this key is present, the node has children that
+                    were not read yet (see `get_simulation_branch`);
         """
-        n = {'node': node.Name}
-        if not self._isleaf(node):
-            n['children'] = [self._traverse_branch(child)
-                             for child in node.Elements]
-        else:
-            # node is a leaf, if the value is a float and not None append its
-            # units
-            if node.ValueType == 2 and node.Value is not None:
-                n['value'] = node.Value
-                n['units'] = node.UnitString
+        # if the node is a leaf and its value is a float and not None, the
+        # record already has its value and units
+        n = self._reader.read(node)
+        if not n.pop('is_leaf'):
+            if max_depth is not None and max_depth <= 0:
+                n['lazy'] = True
+            else:
+                child_depth = None if max_depth is None else max_depth - 1
+                n['children'] = [self._traverse_branch(child, child_depth)
+                                 for child in self._reader.elements(node)]
 
         return n
 
@@ -133,14 +237,107 @@ class AspenConnection:
         sim_nodes = {'Streams': {}, 'Blocks': {},
                      'Flowsheeting Options\\Design-Spec': {}}
         for node in sim_nodes:
-            for o in self._aspen.Tree.FindNode("\\Data\\" + node).Elements:
-                sim_nodes[node][o.Name] = o.AttributeValue(
-                    self._HAP_RECORDTYPE)
+            parent = self._reader.find("\\Data\\" + node)
+            for o in self._reader.elements(parent):
+                name, record_type = self._reader.record_type(o)
+                sim_nodes[node][name] = record_type
 
         return sim_nodes
 
+    def _node_catalogues(self, nodetype: str) -> tuple:
+        """Returns the input and output catalogues of a node type and the name
+        of its folder in the simulation tree.
+
+        Parameters
+        ----------
+        nodetype : str
+            Type of node. Valid values are 'blocks', 'streams' and 'des_spec'.
+
+        Returns
+        -------
+        tuple
+            Input catalogue, output catalogue and folder name.
+        """
+        if nodetype == 'blocks':
+            return (BLOCKS_CATALOGUE['Input'], BLOCKS_CATALOGUE['Output'],
+                    nodetype.capitalize())
+
+        elif nodetype == 'streams':
+            return (STREAMS_CATALOGUE['Input'], STREAMS_CATALOGUE['Output'],
+                    nodetype.capitalize())
+
+        else:
+            # swap to an aspen accepted node name since that the design spec
+            # node is inside flowsheeting options
+            return (DESPEC_CATALOGUE['Input'], DESPEC_CATALOGUE['Output'],
+                    'Flowsheeting Options\\Design-Spec')
+
+    def _build_leaves(self, node: str, record_type: str, nodetype: str,
+                      iotype: str, max_depth: int = None) -> list:
+        """Build the catalogue variables of a single block/stream.
+
+        Parameters
+        ----------
+        node : str
+            Name of the block/stream.
+        record_type : str
+            Type of the block/stream (catalogue key).
+        nodetype : str
+            Type of node. Valid values are 'blocks', 'streams' and 'des_spec'.
+        iotype : str
+            Type of input/output data from node to be built. Valid values are
+            'input' and 'output'
+        max_depth : int, optional
+            Depth of the variable branches to be read below each catalogue
+            entry (see `_traverse_branch`). Default is None (whole branch).
+
+        Returns
+        -------
+        list
+            Catalogue variables nodes of the block/stream.
+        """
+        INPUT_CATALOGUE, OUTPUT_CATALOGUE, folder = \
+            self._node_catalogues(nodetype)
+        CATALOGUE = INPUT_CATALOGUE if iotype == 'input' else OUTPUT_CATALOGUE
+
+        var_catalogue = sorted(CATALOGUE[record_type], key=lambda k: k['Name'])
+        leaves = []
+
+        for entry in var_catalogue:
+            # build a new node from the catalogue entry (renaming the 'Name'
+            # key to 'node') instead of copying the catalogue
+            leaf = {'node': entry['Name']}
+
+            if 'Description' in entry:
+                leaf['description'] = entry['Description']
+
+            leaves.append(leaf)
+
+            # append children nodes if they exist
+            node_path = self._NODE_PATH_FORMAT.format(
+                folder,
+                node,
+                iotype.capitalize(),
+                leaf['node']
+            )
+            children_node_ph = self._reader.find(node_path)
+
+            if children_node_ph is None:
+                # node not found, raise exception
+                raise ValueError(
+                    "Can't find path: \n{0}".format(node_path)
+                )
+            children_nodes = self._traverse_branch(children_node_ph,
+                                                   max_depth)
+            if any(x in children_nodes
+                   for x in ['children', 'value', 'lazy']):
+                leaf.update(children_nodes)
+
+        return leaves
+
     def _build_nodes(self, simulation_node: dict, root_node: dict,
-                     nodetype: str, iotype: str) -> None:
+                     nodetype: str, iotype: str,
+                     max_depth: int = None) -> None:
         """Build the nodes of the simulation (both streams and blocks).
 
         Parameters
@@ -157,6 +354,9 @@ class AspenConnection:
         iotype : str
             Type of input/output data from node to be built. Valid values are
             'input' and 'output'
+        max_depth : int, optional
+            Depth of the variable branches to be read below each catalogue
+            entry (see `_traverse_branch`). Default is None (whole branch).
 
         Notes
         -----
@@ -179,64 +379,16 @@ class AspenConnection:
 
         # if the node name is present in the catalogue, build the branches for
         # that node
-        if nodetype == 'blocks':
-            INPUT_CATALOGUE = BLOCKS_CATALOGUE['Input']
-            OUTPUT_CATALOGUE = BLOCKS_CATALOGUE['Output']
-
-            nodetype = nodetype.capitalize()
-
-        elif nodetype == 'streams':
-            INPUT_CATALOGUE = STREAMS_CATALOGUE['Input']
-            OUTPUT_CATALOGUE = STREAMS_CATALOGUE['Output']
-
-            nodetype = nodetype.capitalize()
-
-        else:
-            INPUT_CATALOGUE = DESPEC_CATALOGUE['Input']
-            OUTPUT_CATALOGUE = DESPEC_CATALOGUE['Output']
-
-            # swap to an aspen accepted node name since that the design spec
-            # node is inside flowsheeting options
-            nodetype = 'Flowsheeting Options\\Design-Spec'
-
-        # grab the catalogue for that block
-        if iotype == 'input':
-            CATALOGUE = INPUT_CATALOGUE
-        else:
-            CATALOGUE = OUTPUT_CATALOGUE
+        INPUT_CATALOGUE, OUTPUT_CATALOGUE, folder = \
+            self._node_catalogues(nodetype)
 
         for node in simulation_node:
 
             if simulation_node[node] in INPUT_CATALOGUE and \
                     simulation_node[node] in OUTPUT_CATALOGUE:
 
-                var_catalogue = copy.deepcopy(CATALOGUE[simulation_node[node]])
-                leaves = sorted(var_catalogue, key=lambda k: k['Name'])
-
-                for leaf in leaves:
-                    # rename the 'Name' key to 'node'
-                    leaf['node'] = leaf.pop('Name')
-
-                    if 'Description' in leaf:
-                        leaf['description'] = leaf.pop('Description')
-
-                    # append children nodes if they exist
-                    node_path = self._NODE_PATH_FORMAT.format(
-                        nodetype,
-                        node,
-                        iotype.capitalize(),
-                        leaf['node']
-                    )
-                    children_node_ph = self._aspen.Tree.FindNode(node_path)
-
-                    if children_node_ph is None:
-                        # node not found, raise exception
-                        raise ValueError(
-                            "Can't find path: \n{0}".format(node_path)
-                        )
-                    children_nodes = self._traverse_branch(children_node_ph)
-                    if any(x in children_nodes for x in ['children', 'value']):
-                        leaf.update(children_nodes)
+                leaves = self._build_leaves(node, simulation_node[node],
+                                            nodetype, iotype, max_depth)
 
                 leaves_node = {'node': iotype.capitalize(), 'children': leaves}
 
@@ -257,15 +409,19 @@ class AspenConnection:
                         root_node['children'] = [node_to_append]
 
             else:
-                if simulation_node[node] not in INPUT_CATALOGUE or \
-                        simulation_node[node] not in OUTPUT_CATALOGUE:
-                    raise KeyError(
-                        "{0} type {1} not inplemented in {0} {1} catalogue."
-                        .format(nodetype.capitalize(), iotype))
+                raise KeyError(
+                    "{0} type {1} not inplemented in {0} {1} catalogue."
+                    .format(folder.capitalize(), iotype))
 
-    def _prune_leaves(self, root_node) -> dict:
+    @staticmethod
+    def _prune_leaves(root_node: dict) -> dict:
         """Prune all the leaves that does not have 'value' attribute in them.
         In other words, remove the leaves that user did not set in file.
+        Branches that were not read yet ('lazy' nodes) are kept.
+
+        The tree is pruned in a single post-order pass: a branch is removed
+        when none of its children are kept, so chains of valueless branches
+        are removed at once instead of one layer at a time.
 
         Parameters
         ----------
@@ -275,33 +431,90 @@ class AspenConnection:
         Returns
         -------
         dict
-            Pruned branch.
+            Pruned branch. The nodes of `root_node` are not modified.
         """
-        importer = DictImporter()
-        exporter = DictExporter()
-
-        inptree = importer.import_(root_node)
-
-        # keep checking for leaves without value attribute
-        while True:
-            all_has_value = all(hasattr(leaf, 'value')
-                                for leaf in inptree.leaves)
-
-            if all_has_value:
-                break
-
-            for leaf in inptree.leaves:
-                if not hasattr(leaf, 'value'):
-                    # prune leaves without value attribute
-                    leaf.parent = None
-
-        return exporter.export(inptree)
+        # each stack entry is (node, kept children list of its parent); the
+        # node is visited twice: on the way down (children pushed) and on the
+        # way up (children already pruned)
+        pruned_root = []
+        stack = [(root_node, pruned_root, None)]
+
+        while stack:
+            node, parent_children, kept_children = stack.pop()
+            children = node.get('children', [])
+
+            if kept_children is None and len(children) != 0:
+                # first visit of a branch: schedule its children
+                kept_children = []
+                stack.append((node, parent_children, kept_children))
+                stack.extend((child, kept_children, None)
+                             for child in reversed(children))
+
+            elif kept_children is not None:
+                # branch with all its children processed
+                if len(kept_children) != 0 or node is root_node:
+                    pruned = dict(node)
+                    pruned['children'] = kept_children
+                    parent_children.append(pruned)
+
+            elif 'value' in node or 'lazy' in node or node is root_node:
+                # leaf
+                parent_children.append(node)
+
+        return pruned_root[0]
+
+    @classmethod
+    def _server_processes(cls) -> set:
+        """Ids of the running COM server processes."""
+        import win32api
+        import win32con
+        import win32process
+
+        pids = set()
+        for pid in win32process.EnumProcesses():
+            try:
+                handle = win32api.OpenProcess(
+                    win32con.PROCESS_QUERY_INFORMATION |
+                    win32con.PROCESS_VM_READ, False, pid)
+            except pywintypes.error:
+                # system or other users processes
+                continue
+
+            try:
+                exe = win32process.GetModuleFileNameEx(handle, 0)
+            except pywintypes.error:
+                continue
+            finally:
+                win32api.CloseHandle(handle)
+
+            if pathlib.Path(exe).name.lower() == cls._SERVER_EXE:
+                pids.add(pid)
+
+        return pids
 
     # --------------------------- PUBLIC FUNCTIONS --------------------------
+    @classmethod
+    def from_engine(cls, file_path: str,
+                    engine: win32.CDispatch) -> 'AspenConnection':
+        """Connection to an engine already opened from `file_path`, e.g. the
+        engine object of a `SimulationSession` job. It must only be used in
+        the thread of the engine and must not be closed, the engine belongs
+        to its session.
+        """
+        connection = cls(file_path)
+        connection._aspen = engine
+        return connection
+
     def open_connection(self) -> None:
-        """Opens the COM/OLE server of an Aspen Plus application.
+        """Opens the COM/OLE server of an Aspen Plus application, in a new
+        server process (not one already running, e.g. a hung engine of a
+        killed connection).
         """
-        self._aspen = win32.Dispatch('Apwn.Document')
+        with AspenConnection._open_lock:
+            running = self._server_processes()
+            self._aspen = win32.DispatchEx('Apwn.Document')
+            self._server_pids = self._server_processes() - running
+
         self._aspen.InitFromArchive2(pathlib.Path(self._aspen_filepath))
 
     def close_connection(self) -> None:
@@ -311,6 +524,29 @@ class AspenConnection:
             self._aspen.Quit()
             self._aspen = None
 
+    def kill_connection(self) -> None:
+        """Terminates the COM server process of the connection and its engine
+        processes, without any COM call. Unlike `close_connection`, it can be
+        called from any thread while the engine is hung (e.g. in
+        `Engine.Run2`).
+
+        Raises
+        ------
+        RuntimeError
+            If no server process was started by the connection (e.g. it was
+            attached to a server already running), so nothing was killed.
+        """
+        self._aspen = None
+        if len(self._server_pids) == 0:
+            raise RuntimeError("The server process of the Aspen Plus "
+                               "connection is unknown, it can't be killed.")
+
+        for pid in self._server_pids:
+            subprocess.call(['taskkill', '/F', '/T', '/PID', str(pid)],
+                            stdout=subprocess.DEVNULL,
+                            stderr=subprocess.DEVNULL)
+        self._server_pids = set()
+
     def get_simulation_data(self) -> dict:
         """Returns the simulation data dictionary with blocks names, components,
         streams, etc.
@@ -368,6 +604,30 @@ class AspenConnection:
 
         return simulation_data
 
+    def get_flowsheet_nodes(self) -> dict:
+        """Returns the names and types of the streams, blocks and design specs
+        of the flowsheet. This is a cheap signature of the flowsheet, used to
+        check whether a cached variable tree is still valid.
+
+        Returns
+        -------
+        dict
+            JSON compatible dictionary with the node names as keys and their
+            record types as values (see `_get_simulation_node_names`).
+        """
+        self._start_build()
+
+        return self._get_simulation_node_names()
+
+    def find_missing_nodes(self, node_paths: list) -> list:
+        """Returns the paths of `node_paths` that aren't nodes of the
+        simulation (e.g. variables of a cached tree no longer in the file).
+        """
+        self._start_build()
+
+        return [path for path in node_paths
+                if self._reader.find(path) is None]
+
     def get_connection_object(self) -> win32.CDispatch:
         """Returns the aspen object connection reference.
 
@@ -381,7 +641,8 @@ class AspenConnection:
 
         return self._aspen
 
-    def get_simulation_partial_io_tree(self, iotype: str) -> dict:
+    def get_simulation_partial_io_tree(self, iotype: str,
+                                       max_depth: int = None) -> dict:
         """Builds partial (input or output) blocks and streams branches in a
         single tree.
 
@@ -390,6 +651,11 @@ class AspenConnection:
         iotype : str
             Type of input/output data from node to be built. Valid values are
             'input' and 'output'.
+        max_depth : int, optional
+            Depth of the variable branches to be read below each catalogue
+            entry. Use 0 to read only the catalogue entries and leave their
+            branches to be fetched on demand through `get_simulation_branch`.
+            Default is None (whole tree).
 
         Returns
         -------
@@ -407,8 +673,7 @@ class AspenConnection:
                 self._check_simulation_results()
 
         # open the connection if it is not opened
-        if self._aspen is None:
-            self.open_connection()
+        self._start_build()
 
         # build root nodes
         sim_nodes = self._get_simulation_node_names()
@@ -427,21 +692,67 @@ class AspenConnection:
 
         # streams
         self._build_nodes(sim_nodes['Streams'], root_stream,
-                          'streams', iotype)
+                          'streams', iotype, max_depth)
 
         # blocks
         self._build_nodes(sim_nodes['Blocks'], root_block,
-                          'blocks', iotype)
+                          'blocks', iotype, max_depth)
 
         # design specs
         self._build_nodes(sim_nodes['Flowsheeting Options\\Design-Spec'],
-                          root_desspec, 'des_spec', iotype)
+                          root_desspec, 'des_spec', iotype, max_depth)
 
         if iotype == 'input':
             root_node = self._prune_leaves(root_node)
 
         return root_node
 
+    def get_simulation_branch(self, node_path: str, iotype: str,
+                              max_depth: int = 1) -> dict:
+        """Reads a single branch of the simulation tree. Used to expand the
+        'lazy' nodes of trees built with a limited `max_depth`.
+
+        Parameters
+        ----------
+        node_path : str
+            Full path of the node to be read (e.g.
+            '\\Data\\Blocks\\B1\\Input\\FEED_STAGE').
+        iotype : str
+            Type of input/output data of the node. Valid values are 'input' and
+            'output'. Input branches have their leaves without value pruned.
+        max_depth : int, optional
+            How many levels of children to read. Default is 1 (only the direct
+            children of the node).
+
+        Returns
+        -------
+        dict
+            JSON compatible branch with the node as root.
+        """
+        if iotype != 'input' and iotype != 'output':
+            raise ValueError(
+                "Invalid IO type specification. "
+                "Valid values are 'input' and 'output'."
+            )
+
+        self._start_build()
+
+        node = self._reader.find(node_path)
+
+        if node is None:
+            # node not found, raise exception
+            raise ValueError("Can't find path: \n{0}".format(node_path))
+
+        branch = self._traverse_branch(node, max_depth)
+
+        if iotype == 'input' and 'children' in branch:
+            branch['children'] = [
+                child for child in branch['children']
+                if any(x in child for x in ['children', 'value', 'lazy'])
+            ]
+
+        return branch
+
     def get_simulation_tree(self) -> dict:
         """Builds full blocks and streams branches in a single tree.
 
@@ -457,6 +768,8 @@ class AspenConnection:
         # check if the simulation has results
         self._check_simulation_results()
 
+        self._start_build()
+
         # build root nodes
         sim_nodes = self._get_simulation_node_names()
 
@@ -479,6 +792,554 @@ class AspenConnection:
         return root_node
 
 
+class CaseTimeoutError(TimeoutError):
+    """A job of a `SimulationSession` took longer than its timeout."""
+
+
+class SimulationSession:
+    """Simulation engine session (`AspenConnection`) owned by its own thread,
+    therefore by its own COM apartment, whose jobs run under a watchdog.
+
+    A hung engine call (e.g. `Engine.Run2` of a pathological case) can't be
+    interrupted from another thread. When a job takes longer than `timeout`,
+    the engine processes are killed, a new session is opened from the
+    simulation file and `CaseTimeoutError` is raised, so the caller can go on
+    with its next case.
+
+    Parameters
+    ----------
+    file_path : str
+        Simulation file opened by the session.
+    timeout : float, optional
+        Maximum time (s) of each job. Default is None (no timeout).
+    connection_factory : callable, optional
+        Called with `file_path` in the session thread to create its connection.
+        Default is `AspenConnection`.
+
+    Attributes
+    ----------
+    n_respawns : int
+        Number of sessions killed and opened again after a timeout.
+    """
+
+    def __init__(self, file_path: str, timeout: float = None,
+                 connection_factory=AspenConnection):
+        self._file_path = file_path
+        self.timeout = timeout
+        self._connection_factory = connection_factory
+        self.n_respawns = 0
+        self._spawn()
+
+    def _spawn(self) -> None:
+        # the engine is opened as soon as the thread starts
+        self._jobs = queue.Queue()
+        self._opened = Future()
+        self._thread = threading.Thread(target=self._serve,
+                                        args=(self._jobs, self._opened),
+                                        daemon=True)
+        self._thread.start()
+
+    def _serve(self, jobs: queue.Queue, opened: Future) -> None:
+        pythoncom.CoInitialize()
+        connection = None
+        try:
+            try:
+                connection = self._connection_factory(self._file_path)
+                engine = connection.get_connection_object()
+            except BaseException as error:
+                opened.set_exception(error)
+                return
+
+            opened.set_result(connection)
+            while True:
+                job = jobs.get()
+                if job is None:
+                    break
+
+                future, fn, args = job
+                if not future.set_running_or_notify_cancel():
+                    continue
+
+                try:
+                    result = fn(engine, *args)
+                except BaseException as error:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+        finally:
+            # nothing to close when the engine was killed (`kill_connection`)
+            if connection is not None:
+                connection.close_connection()
+            pythoncom.CoUninitialize()
+
+    def wait_open(self) -> None:
+        """Blocks until the engine is opened. Raises the error of the opening,
+        if any.
+        """
+        self._opened.result()
+
+    def submit(self, fn, *args) -> Future:
+        """Schedules `fn(engine_object, *args)` in the session thread, after
+        the jobs already submitted, without waiting for it (nor for the
+        engine to open) and without timeout.
+
+        Returns
+        -------
+        Future
+            Result of the call.
+        """
+        future = Future()
+        self._jobs.put((future, fn, args))
+        return future
+
+    def run(self, fn, *args):
+        """Runs `fn(engine_object, *args)` in the session thread.
+
+        Returns
+        -------
+        object
+            Result of `fn`.
+
+        Raises
+        ------
+        CaseTimeoutError
+            If `fn` took longer than `timeout` (the time to open the engine
+            is not counted). The session is respawned.
+        RuntimeError
+            If `fn` took longer than `timeout` and its engine couldn't be
+            killed (see `AspenConnection.kill_connection`). The session is
+            respawned in a new engine all the same.
+        """
+        connection = self._opened.result()
+        future = self.submit(fn, *args)
+        try:
+            return future.result(timeout=self.timeout)
+        except concurrent.futures.TimeoutError:
+            # the hung thread leaves when the killed engine call returns
+            self._jobs.put(None)
+            self.n_respawns += 1
+            try:
+                connection.kill_connection()
+            finally:
+                self._spawn()
+
+            raise CaseTimeoutError("The job took more than {0} s."
+                                   .format(self.timeout))
+
+    def close(self) -> None:
+        """Closes the session once the jobs already submitted are done."""
+        self._jobs.put(None)
+        self._thread.join()
+
+    def kill(self) -> None:
+        """Terminates the engine processes of the session without waiting for
+        its jobs (e.g. a hung one). The session can't be used afterwards.
+
+        Raises
+        ------
+        RuntimeError
+            If the engine couldn't be killed (see
+            `AspenConnection.kill_connection`).
+        """
+        self._jobs.put(None)
+        if self._opened.done() and self._opened.exception() is None:
+            self._opened.result().kill_connection()
+
+
+class SimulationSessionPool:
+    """Pool of simulation engine sessions that run cases concurrently. Each
+    session is a separate engine instance (`SimulationSession`) and the jobs
+    submitted are served by the first session free.
+
+    Parameters
+    ----------
+    file_path : str
+        Simulation file opened by every session.
+    n_sessions : int
+        Number of engine instances (threads).
+    connection_factory : callable, optional
+        Called with `file_path` in the session thread to create its connection.
+        Default is `AspenConnection`.
+    timeout : float, optional
+        Maximum time (s) of each job, see `SimulationSession`. Default is None
+        (no timeout).
+    cache : SimulationSessionCache, optional
+        Cache the sessions are leased from, and released to when the pool is
+        closed, instead of being opened by the pool (`connection_factory` is
+        then the one of the cache).
+    input_paths : list, optional
+        Input nodes changed by the jobs, see `SimulationSessionCache.lease`.
+    """
+
+    def __init__(self, file_path: str, n_sessions: int,
+                 connection_factory=AspenConnection, timeout: float = None,
+                 cache: 'SimulationSessionCache' = None,
+                 input_paths: list = ()):
+        if n_sessions < 1:
+            raise ValueError("The pool needs at least one session.")
+
+        self._cache = cache
+        if cache is None:
+            self._sessions = [SimulationSession(file_path, timeout,
+                                                connection_factory)
+                              for _ in range(n_sessions)]
+        else:
+            self._sessions = [cache.lease(file_path, timeout, input_paths)
+                              for _ in range(n_sessions)]
+        self._free = queue.Queue()
+        for session in self._sessions:
+            self._free.put(session)
+        self._executor = ThreadPoolExecutor(max_workers=n_sessions)
+
+    @property
+    def n_sessions(self) -> int:
+        """Number of sessions in the pool."""
+        return len(self._sessions)
+
+    @property
+    def n_respawns(self) -> int:
+        """Number of sessions respawned after a timeout."""
+        return sum(session.n_respawns for session in self._sessions)
+
+    def _run(self, fn, args):
+        session = self._free.get()
+        try:
+            return session.run(fn, *args)
+        finally:
+            self._free.put(session)
+
+    def submit(self, fn, *args) -> Future:
+        """Schedules `fn(engine_object, *args)` in the first session free.
+
+        Parameters
+        ----------
+        fn : callable
+            Function that receives the engine COM object of the session as
+            first argument (e.g. `run_case` with the arguments swapped).
+        *args
+            Remaining arguments of `fn`.
+
+        Returns
+        -------
+        Future
+            Result of the call (`CaseTimeoutError` if it timed out).
+        """
+        return self._executor.submit(self._run, fn, args)
+
+    def map(self, fn, *iterables) -> list:
+        """Runs `fn(engine_object, *items)` for each item of `iterables`,
+        concurrently over the sessions.
+
+        Returns
+        -------
+        list
+            Results in the order of `iterables`.
+        """
+        futures = [self.submit(fn, *args) for args in zip(*iterables)]
+        return [future.result() for future in futures]
+
+    def close(self) -> None:
+        """Closes (or releases to the cache) every session once the jobs
+        already submitted are done.
+        """
+        self._executor.shutdown(wait=True)
+        for session in self._sessions:
+            if self._cache is None:
+                session.close()
+            else:
+                self._cache.release(session)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# run status node of the simulation (8 is converged without errors)
+_RUN_STATUS_PATH = r"\Data\Results Summary\Run-Status\Output\UOSSTAT2"
+
+
+def read_node_values(engine: win32.CDispatch, node_paths: list) -> dict:
+    """Values of the nodes at `node_paths` (path: value) of the engine."""
+    return {path: engine.Tree.FindNode(path).Value for path in node_paths}
+
+
+def restore_archived_state(engine: win32.CDispatch, values: dict) -> None:
+    """Brings the engine back to the state of its simulation file: hides its
+    GUI, sets the input nodes back to their archived `values` (path: value)
+    and runs it. The run starts from the current state, so it is reinitialized
+    and run again only if it doesn't reach the archived run status (the value
+    of `_RUN_STATUS_PATH` in `values`, converged when not given).
+
+    Raises
+    ------
+    RuntimeError
+        If the engine didn't reach the archived run status.
+    """
+    engine.Visible = 0
+    for path, value in values.items():
+        if path != _RUN_STATUS_PATH:
+            engine.Tree.FindNode(path).Value = value
+
+    status = values.get(_RUN_STATUS_PATH, 8)
+    engine.Engine.Run2()
+    if engine.Tree.FindNode(_RUN_STATUS_PATH).Value != status:
+        engine.Reinit()
+        engine.Engine.Run2()
+        if engine.Tree.FindNode(_RUN_STATUS_PATH).Value != status:
+            raise RuntimeError("The simulation did not return to its "
+                               "archived state.")
+
+
+class SimulationSessionCache:
+    """Warm simulation sessions (`SimulationSession`) shared by the stages of
+    the application (sampling, optimization and variable trees), so each
+    simulation file is opened (`InitFromArchive2`) once instead of by every
+    stage.
+
+    A stage leases a session (`lease`) and releases it when done (`release`).
+    The released session is brought back to the state of its simulation file
+    in background (`restore_archived_state`), with the values of the input
+    nodes recorded when they were first leased. It is then idle until leased
+    again, and closed after `idle_timeout` s idle. A session that can't be
+    restored is closed, and the sessions of a file modified since they were
+    opened are not leased again.
+
+    Parameters
+    ----------
+    idle_timeout : float, optional
+        Time (s) an idle session is kept open. Default is 10 minutes.
+    close_timeout : float, optional
+        Time (s) `close` waits for the sessions being restored, the ones still
+        restoring after it are killed (`SimulationSession.kill`). Default is
+        5 s.
+    connection_factory : callable, optional
+        Called with the simulation file in the session thread to create its
+        connection. Default is `AspenConnection`.
+
+    Attributes
+    ----------
+    n_opened : int
+        Number of sessions opened.
+    n_leases : int
+        Number of leases, the ones of warm sessions included.
+    """
+
+    def __init__(self, idle_timeout: float = 600.0,
+                 close_timeout: float = 5.0,
+                 connection_factory=AspenConnection):
+        self.idle_timeout = idle_timeout
+        self.close_timeout = close_timeout
+        self._connection_factory = connection_factory
+        self._lock = threading.Lock()
+        self._idle = collections.defaultdict(list)  # file key: sessions
+        self._timers = {}  # idle session: idle timer
+        self._files = {}  # session: file key (leased and idle sessions)
+        self._archived = {}  # session: {path: future of archived values}
+        self._restoring = {}  # thread restoring a released session: session
+        self._closed = False
+        self.n_opened = 0
+        self.n_leases = 0
+
+    @staticmethod
+    def _file_key(file_path: str) -> tuple:
+        # sessions of a file changed since they were opened are not reused
+        try:
+            modified = os.path.getmtime(file_path)
+        except OSError:
+            modified = None
+
+        return os.path.normcase(os.path.abspath(file_path)), modified
+
+    @property
+    def n_idle(self) -> int:
+        """Number of idle sessions."""
+        with self._lock:
+            return sum(len(sessions) for sessions in self._idle.values())
+
+    def lease(self, file_path: str, timeout: float = None,
+              input_paths: list = ()) -> SimulationSession:
+        """Leases a session of the simulation file, a warm one if there is
+        one idle. Doesn't wait for the engine to open (see
+        `SimulationSession.wait_open`).
+
+        Parameters
+        ----------
+        file_path : str
+            Simulation file of the session.
+        timeout : float, optional
+            Maximum time (s) of each job of the lease. Default is None (no
+            timeout).
+        input_paths : list, optional
+            Paths of the input nodes the lease may change, restored when the
+            session is released. Their archived values are read by the first
+            job of the session that leases them.
+
+        Returns
+        -------
+        SimulationSession
+            Session to be returned with `release`.
+        """
+        key = self._file_key(file_path)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The session cache is closed.")
+
+            idle = self._idle[key]
+            if len(idle) != 0:
+                session = idle.pop()
+                self._timers.pop(session).cancel()
+                input_paths = list(input_paths)
+            else:
+                session = SimulationSession(file_path, timeout,
+                                            self._connection_factory)
+                self._files[session] = key
+                self._archived[session] = {}
+                self.n_opened += 1
+                input_paths = [_RUN_STATUS_PATH] + list(input_paths)
+
+            self.n_leases += 1
+
+        session.timeout = timeout
+        archived = self._archived[session]
+        paths = [path for path in input_paths if path not in archived]
+        if len(paths) != 0:
+            values = session.submit(read_node_values, paths)
+            archived.update((path, values) for path in paths)
+
+        return session
+
+    def release(self, session: SimulationSession, wait: bool = False,
+                discard: bool = False) -> None:
+        """Returns a leased session. It is restored to the archived state in
+        background, or before returning when `wait` is True. With `discard`,
+        the session is closed instead of kept (e.g. its engine was loaded
+        from an archive other than its simulation file, see
+        `ConvergedStates.loaded`).
+        """
+        with self._lock:
+            if self._closed or discard:
+                self._forget(session)
+                closed = True
+            else:
+                thread = threading.Thread(target=self._restore,
+                                          args=(session,), daemon=True)
+                self._restoring[thread] = session
+                closed = False
+
+        if closed:
+            session.close()
+            return
+
+        thread.start()
+        if wait:
+            thread.join()
+
+    def _forget(self, session: SimulationSession) -> None:
+        # called with the lock held
+        self._files.pop(session, None)
+        self._archived.pop(session, None)
+
+    def _restore(self, session: SimulationSession) -> None:
+        try:
+            values = {path: future.result()[path]
+                      for path, future in self._archived[session].items()}
+            session.run(restore_archived_state, values)
+        except Exception:
+            restored = False
+        else:
+            restored = True
+
+        with self._lock:
+            self._restoring.pop(threading.current_thread(), None)
+            keep = restored and not self._closed
+            if keep:
+                timer = threading.Timer(self.idle_timeout, self._expire,
+                                        args=(session,))
+                timer.daemon = True
+                self._timers[session] = timer
+                self._idle[self._files[session]].append(session)
+                timer.start()
+            else:
+                self._forget(session)
+
+        if not keep:
+            session.close()
+
+    def _expire(self, session: SimulationSession) -> None:
+        with self._lock:
+            if session not in self._timers:
+                # leased meanwhile
+                return
+
+            del self._timers[session]
+            self._idle[self._files[session]].remove(session)
+            self._forget(session)
+
+        session.close()
+
+    def close(self) -> None:
+        """Closes the idle sessions, once the released ones are restored. The
+        ones still restoring after `close_timeout` s (e.g. a hung run) are
+        killed instead of waited for. The sessions still leased are closed
+        when released.
+        """
+        with self._lock:
+            self._closed = True
+            restoring = dict(self._restoring)
+
+        deadline = time.monotonic() + self.close_timeout
+        for thread, session in restoring.items():
+            thread.join(max(deadline - time.monotonic(), 0.0))
+            if thread.is_alive():
+                try:
+                    session.kill()
+                except RuntimeError:
+                    # nothing else to do on close, the engine is left behind
+                    pass
+
+        with self._lock:
+            sessions = [session for idle in self._idle.values()
+                        for session in idle]
+            for timer in self._timers.values():
+                timer.cancel()
+
+            self._idle.clear()
+            self._timers.clear()
+            for session in sessions:
+                self._forget(session)
+
+        for session in sessions:
+            session.close()
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def shared_sessions() -> SimulationSessionCache:
+    """Session cache of the application, created on first use."""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = SimulationSessionCache()
+
+        return _shared_cache
+
+
+def close_shared_sessions() -> None:
+    """Closes the session cache of the application, if it was created (e.g.
+    on application exit).
+    """
+    global _shared_cache
+    with _shared_cache_lock:
+        cache, _shared_cache = _shared_cache, None
+
+    if cache is not None:
+        cache.close()
+
+
 if __name__ == "__main__":
     from tests_.mock_data import ASPEN_BKP_FILE_PATH
     # filepath = r"C:\Users\Felipe\Desktop\GUI\python\infill.bkp"
@@ -0,0 +1,488 @@
+import itertools
+
+import numpy as np
+
+# number of bits of the Sobol integers
+_SOBOL_BITS = 30
+
+# primitive polynomials (degree s, coefficients a) and initial direction
+# numbers m of the dimensions 2 - 21 of the Sobol sequence (Joe & Kuo,
+# new-joe-kuo-6.21201). The first dimension is the van der Corput sequence.
+_SOBOL_PARAMS = [
+    (1, 0, [1]),
+    (2, 1, [1, 3]),
+    (3, 1, [1, 3, 1]),
+    (3, 2, [1, 1, 1]),
+    (4, 1, [1, 1, 3, 3]),
+    (4, 4, [1, 3, 5, 13]),
+    (5, 2, [1, 1, 5, 5, 17]),
+    (5, 4, [1, 1, 5, 5, 5]),
+    (5, 7, [1, 1, 7, 11, 19]),
+    (5, 11, [1, 1, 5, 1, 1]),
+    (5, 13, [1, 1, 1, 3, 11]),
+    (5, 14, [1, 3, 5, 5, 31]),
+    (6, 1, [1, 3, 3, 9, 7, 49]),
+    (6, 13, [1, 1, 1, 15, 21, 21]),
+    (6, 16, [1, 3, 1, 13, 27, 49]),
+    (6, 19, [1, 1, 1, 15, 7, 5]),
+    (6, 22, [1, 3, 1, 15, 13, 25]),
+    (6, 25, [1, 1, 5, 5, 19, 61]),
+    (7, 1, [1, 3, 7, 11, 23, 15, 103]),
+    (7, 4, [1, 3, 7, 13, 13, 15, 69]),
+]
+
+SOBOL_MAX_DIM = len(_SOBOL_PARAMS) + 1
+
+
+def _sobol_directions(dim: int) -> np.ndarray:
+    v = np.zeros((dim, _SOBOL_BITS), dtype=np.int64)
+    v[0, :] = [1 << (_SOBOL_BITS - 1 - i) for i in range(_SOBOL_BITS)]
+
+    for d in range(1, dim):
+        s, a, m = _SOBOL_PARAMS[d - 1]
+        for i in range(_SOBOL_BITS):
+            if i < s:
+                v[d, i] = m[i] << (_SOBOL_BITS - 1 - i)
+            else:
+                v[d, i] = v[d, i - s] ^ (v[d, i - s] >> s)
+                for k in range(1, s):
+                    if (a >> (s - 1 - k)) & 1:
+                        v[d, i] ^= v[d, i - k]
+
+    return v
+
+
+def sobol(n_points: int, dim: int, skip: int = 0) -> np.ndarray:
+    """Points of the Sobol low discrepancy sequence in the unit hypercube.
+
+    Parameters
+    ----------
+    n_points : int
+        Number of points.
+    dim : int
+        Number of dimensions (up to `SOBOL_MAX_DIM`).
+    skip : int, optional
+        Number of initial points of the sequence discarded (the first one is
+        the origin). Default is 0.
+
+    Returns
+    -------
+    np.ndarray
+        Points (n_points x dim) in [0, 1).
+    """
+    if not 1 <= dim <= SOBOL_MAX_DIM:
+        raise ValueError("The Sobol sequence is available from 1 up to {0} "
+                         "dimensions.".format(SOBOL_MAX_DIM))
+
+    v = _sobol_directions(dim)
+    points = np.empty((n_points, dim))
+    x = np.zeros(dim, dtype=np.int64)
+
+    # gray code construction: the next point flips the direction number of
+    # the rightmost zero bit of the current index
+    for index in range(n_points + skip):
+        if index >= skip:
+            points[index - skip] = x / 2.0 ** _SOBOL_BITS
+
+        c = 0
+        while (index >> c) & 1:
+            c += 1
+        x ^= v[:, c]
+
+    return points
+
+
+def random_lhs(n_points: int, dim: int, random_state=None) -> np.ndarray:
+    """Random (not optimized) latin hypercube in the unit hypercube.
+
+    Parameters
+    ----------
+    n_points : int
+        Number of points (levels of each dimension).
+    dim : int
+        Number of dimensions.
+    random_state : int or np.random.RandomState, optional
+        Seed or generator of the permutations and of the positions inside each
+        level.
+
+    Returns
+    -------
+    np.ndarray
+        Points (n_points x dim) in [0, 1).
+    """
+    rng = random_state if isinstance(random_state, np.random.RandomState) \
+        else np.random.RandomState(random_state)
+
+    levels = np.column_stack([rng.permutation(n_points) for _ in range(dim)])
+    return (levels + rng.rand(n_points, dim)) / n_points
+
+
+def scale_to_bounds(points: np.ndarray, lb, ub) -> np.ndarray:
+    """Maps points of the unit hypercube into the box [lb, ub]."""
+    lb = np.asarray(lb, dtype=float)
+    ub = np.asarray(ub, dtype=float)
+    return lb + points * (ub - lb)
+
+
+def _primes(count: int) -> list:
+    primes = []
+    candidate = 2
+    while len(primes) < count:
+        if all(candidate % prime != 0 for prime in primes
+               if prime * prime <= candidate):
+            primes.append(candidate)
+        candidate += 1
+
+    return primes
+
+
+def halton(n_points: int, dim: int, skip: int = 0) -> np.ndarray:
+    """Points of the Halton low discrepancy sequence (radical inverses in the
+    first `dim` prime bases) in the unit hypercube.
+
+    Parameters
+    ----------
+    n_points : int
+        Number of points.
+    dim : int
+        Number of dimensions.
+    skip : int, optional
+        Number of initial points of the sequence discarded (the first one is
+        the origin). Default is 0.
+
+    Returns
+    -------
+    np.ndarray
+        Points (n_points x dim) in [0, 1).
+    """
+    index = np.arange(skip, skip + n_points)
+    points = np.zeros((n_points, dim))
+
+    for d, base in enumerate(_primes(dim)):
+        digits = index.copy()
+        factor = 1.0
+        while digits.any():
+            factor /= base
+            points[:, d] += factor * (digits % base)
+            digits //= base
+
+    return points
+
+
+def _level_distances(levels: np.ndarray) -> np.ndarray:
+    # squared distances between the rows, in level units (exact integers),
+    # with an infinite diagonal so that no point is its own neighbour
+    sq = (levels ** 2).sum(axis=1)
+    dist = sq[:, None] + sq[None, :] - 2.0 * levels @ levels.T
+    np.fill_diagonal(dist, np.inf)
+    return dist
+
+
+def _swap_rows(dist: np.ndarray, levels: np.ndarray, col: int, a: np.ndarray,
+               b: np.ndarray) -> tuple:
+    # squared distances of the rows a and b (arrays of candidates) to all the
+    # others after swapping their levels in column `col`, updated from the
+    # current ones instead of recomputed (O(n) per candidate)
+    column = levels[:, col]
+    va = column[a][:, None]
+    vb = column[b][:, None]
+    change = (vb - column) ** 2 - (va - column) ** 2
+
+    idx = np.arange(a.size)
+    new_a = dist[a] + change
+    new_b = dist[b] - change
+    new_a[idx, b] = new_b[idx, a] = dist[a, b]
+
+    return new_a, new_b
+
+
+def _apply_swap(dist: np.ndarray, levels: np.ndarray, col: int, a: int,
+                b: int, new_a: np.ndarray, new_b: np.ndarray) -> None:
+    levels[[a, b], col] = levels[[b, a], col]
+    dist[a, :] = dist[:, a] = new_a
+    dist[b, :] = dist[:, b] = new_b
+
+
+def ese_lhs(n_points: int, dim: int, n_iter: int = 5, p: int = 50,
+            random_state=None) -> np.ndarray:
+    """Latin hypercube optimized by the enhanced stochastic evolutionary
+    algorithm (Jin, Chen & Sudjianto, 2005) for the phi_p criterion (a
+    smooth version of the maximin distance).
+
+    Each step tries a few swaps of two levels in a column and keeps the best
+    one when it improves the design or, with a probability controlled by an
+    adaptive threshold, when it doesn't (to escape local optima). The
+    pairwise distances of the swapped rows are updated, not recomputed, so a
+    step costs O(n) per tried swap, but the distance matrix takes O(n^2)
+    memory.
+
+    Parameters
+    ----------
+    n_points : int
+        Number of points (levels of each dimension).
+    dim : int
+        Number of dimensions.
+    n_iter : int, optional
+        Number of outer iterations (threshold updates).
+    p : int, optional
+        Exponent of the phi_p criterion.
+    random_state : int or np.random.RandomState, optional
+        Seed or generator of the initial design and of the swaps.
+
+    Returns
+    -------
+    np.ndarray
+        Points (n_points x dim) at the centers of the levels, in (0, 1).
+    """
+    rng = random_state if isinstance(random_state, np.random.RandomState) \
+        else np.random.RandomState(random_state)
+    levels = np.column_stack([rng.permutation(n_points)
+                              for _ in range(dim)]).astype(float)
+    if n_points < 3:
+        return (levels + 0.5) / n_points
+
+    dist = _level_distances(levels)
+    q = p / 2.0
+
+    def criterion_sum(dist):
+        return np.triu(dist ** -q, 1).sum()
+
+    # number of swaps tried per step and of steps per outer iteration
+    n_pairs = n_points * (n_points - 1) // 2
+    n_tries = min(max(n_pairs // 5, 1), 50)
+    n_steps = min(max(2 * n_pairs * dim // n_tries, 1), 100)
+
+    crit = exact_crit = criterion_sum(dist)
+    best_levels, best_crit = levels.copy(), crit
+    threshold = 0.005 * crit ** (1 / p)
+
+    for _ in range(n_iter):
+        old_best = best_crit
+        n_accepted = n_improved = 0
+
+        for step in range(n_steps):
+            col = step % dim
+            a = rng.randint(n_points, size=n_tries)
+            b = (a + rng.randint(1, n_points, size=n_tries)) % n_points
+            new_a, new_b = _swap_rows(dist, levels, col, a, b)
+
+            # change of the criterion sum (the distance between a and b and
+            # the infinite diagonal terms don't change)
+            delta = (new_a ** -q - dist[a] ** -q).sum(axis=1) + \
+                (new_b ** -q - dist[b] ** -q).sum(axis=1)
+            k = int(np.argmin(delta))
+
+            new_crit = crit + delta[k]
+            if np.maximum(new_crit, 0.0) ** (1 / p) - crit ** (1 / p) <= \
+                    threshold * rng.rand():
+                _apply_swap(dist, levels, col, a[k], b[k], new_a[k], new_b[k])
+                crit = new_crit
+                n_accepted += 1
+
+                # the rounding errors of the updates are relative to the
+                # last exact sum, recompute it once the sum is much smaller
+                if crit < 1e-6 * exact_crit:
+                    crit = exact_crit = criterion_sum(dist)
+
+                if crit < best_crit:
+                    best_levels, best_crit = levels.copy(), crit
+                    n_improved += 1
+
+        # exact sum, the updates accumulate rounding errors
+        crit = exact_crit = criterion_sum(dist)
+
+        # threshold control: cool down while improving, explore otherwise
+        accepted = n_accepted / n_steps
+        if best_crit < old_best * (1 - 1e-8):
+            if accepted > 0.1 and n_improved < n_accepted:
+                threshold *= 0.8
+            elif accepted <= 0.1:
+                threshold /= 0.8
+        elif accepted < 0.1:
+            threshold /= 0.7
+        elif accepted > 0.8:
+            threshold *= 0.9
+
+    return (best_levels + 0.5) / n_points
+
+
+def maximin_lhs(n_points: int, dim: int, n_iter: int = 5,
+                random_state=None) -> np.ndarray:
+    """Latin hypercube refined for the maximin distance: each step takes a
+    point of the closest pair, tries swapping one of its levels with other
+    points and applies the swap that moves it furthest from its neighbours,
+    when that doesn't create a pair closer than the current minimum. The
+    minimum distance never decreases.
+
+    Parameters
+    ----------
+    n_points : int
+        Number of points (levels of each dimension).
+    dim : int
+        Number of dimensions.
+    n_iter : int, optional
+        Number of refinement sweeps (`n_points` steps each).
+    random_state : int or np.random.RandomState, optional
+        Seed or generator of the initial design and of the swaps.
+
+    Returns
+    -------
+    np.ndarray
+        Points (n_points x dim) at the centers of the levels, in (0, 1).
+    """
+    rng = random_state if isinstance(random_state, np.random.RandomState) \
+        else np.random.RandomState(random_state)
+    levels = np.column_stack([rng.permutation(n_points)
+                              for _ in range(dim)]).astype(float)
+    if n_points < 3:
+        return (levels + 0.5) / n_points
+
+    dist = _level_distances(levels)
+    row_min = dist.min(axis=1)
+    n_tries = min(n_points - 1, 64)
+
+    for _ in range(n_iter * n_points):
+        d_min = row_min.min()
+        a = rng.choice(np.flatnonzero(row_min == d_min))
+        col = rng.randint(dim)
+        b = rng.choice(n_points - 1, size=n_tries, replace=False)
+        b[b >= a] += 1
+
+        new_a, new_b = _swap_rows(dist, levels, col, np.full(n_tries, a), b)
+        cand_min = np.minimum(new_a.min(axis=1), new_b.min(axis=1))
+        k = int(np.argmax(cand_min))
+        if cand_min[k] <= d_min:
+            continue
+
+        # rows whose nearest neighbour was a or b may now be further away
+        old_a, old_b = dist[a].copy(), dist[b[k]].copy()
+        _apply_swap(dist, levels, col, a, b[k], new_a[k], new_b[k])
+
+        stale = (old_a == row_min) | (old_b == row_min)
+        row_min = np.minimum(row_min, np.minimum(dist[a], dist[b[k]]))
+        stale[[a, b[k]]] = True
+        row_min[stale] = dist[stale].min(axis=1)
+
+    return (levels + 0.5) / n_points
+
+
+def _pairwise_min(points: np.ndarray, chunk: int = 1024) -> np.ndarray:
+    # squared distance of each point to its nearest neighbour, by row blocks
+    sq = (points ** 2).sum(axis=1)
+    nearest = np.empty(points.shape[0])
+    for start in range(0, points.shape[0], chunk):
+        block = points[start:start + chunk]
+        dist = sq[start:start + chunk, None] + sq[None, :] - \
+            2.0 * block @ points.T
+        dist[np.arange(block.shape[0]), start + np.arange(block.shape[0])] = \
+            np.inf
+        nearest[start:start + chunk] = np.maximum(dist.min(axis=1), 0.0)
+
+    return nearest
+
+
+def min_distance(points: np.ndarray) -> float:
+    """Smallest distance between two points of a design (maximin criterion,
+    larger is better)."""
+    return float(np.sqrt(_pairwise_min(np.asarray(points, dtype=float)).min()))
+
+
+def phi_p(points: np.ndarray, p: int = 50, chunk: int = 1024) -> float:
+    """Morris & Mitchell phi_p criterion of a design (smaller is better),
+    computed relative to the minimum distance to avoid overflows."""
+    points = np.asarray(points, dtype=float)
+    d_min = np.sqrt(_pairwise_min(points, chunk).min())
+    sq = (points ** 2).sum(axis=1)
+
+    total = 0.0
+    for start in range(0, points.shape[0], chunk):
+        block = points[start:start + chunk]
+        dist = np.sqrt(np.maximum(sq[start:start + chunk, None] + sq[None, :] -
+                                  2.0 * block @ points.T, 0.0))
+        upper = np.arange(points.shape[0])[None, :] > \
+            start + np.arange(block.shape[0])[:, None]
+        total += ((dist[upper] / d_min) ** -p).sum()
+
+    return float(total ** (1 / p) / d_min)
+
+
+def centered_discrepancy(points: np.ndarray, chunk: int = 256) -> float:
+    """Centered L2 discrepancy (Hickernell) of a design in the unit
+    hypercube (uniformity, smaller is better)."""
+    points = np.asarray(points, dtype=float)
+    n, dim = points.shape
+    z = np.abs(points - 0.5)
+
+    first = (13.0 / 12.0) ** dim
+    second = 2.0 / n * np.prod(1 + 0.5 * z - 0.5 * z ** 2, axis=1).sum()
+
+    third = 0.0
+    for start in range(0, n, chunk):
+        block = slice(start, start + chunk)
+        terms = 1 + 0.5 * z[block, None, :] + 0.5 * z[None, :, :] - \
+            0.5 * np.abs(points[block, None, :] - points[None, :, :])
+        third += np.prod(terms, axis=2).sum()
+
+    return float(np.sqrt(max(first - second + third / n ** 2, 0.0)))
+
+
+# largest design of the optimized latin hypercubes (their distance matrix
+# takes O(n^2) memory)
+MAX_OPTIMIZED_POINTS = 5000
+
+# methods of `design` (the 'lhs' method of the sampling assistant is the
+# best of `n_iter` random latin hypercubes of pydace)
+DESIGN_METHODS = ('ese', 'maximin', 'sobol', 'halton')
+
+
+def design(n_points: int, lb, ub, method: str = 'ese', n_iter: int = 5,
+           include_vertices: bool = False, random_state=None) -> np.ndarray:
+    """Space filling design in the box [lb, ub].
+
+    Parameters
+    ----------
+    n_points : int
+        Number of points (without the vertices).
+    lb, ub : list
+        Bounds of the box.
+    method : str, optional
+        'ese' (`ese_lhs`), 'maximin' (`maximin_lhs`), 'sobol' (`sobol`) or
+        'halton' (`halton`).
+    n_iter : int, optional
+        Iterations of the 'ese' and 'maximin' methods.
+    include_vertices : bool, optional
+        Whether the 2^n vertices of the box are appended to the design.
+    random_state : int or np.random.RandomState, optional
+        Seed or generator of the 'ese' and 'maximin' methods.
+
+    Returns
+    -------
+    np.ndarray
+        Points of the design.
+
+    Raises
+    ------
+    ValueError
+        When the method is invalid or doesn't support the design size.
+    """
+    dim = len(lb)
+    if method in ('ese', 'maximin') and n_points > MAX_OPTIMIZED_POINTS:
+        raise ValueError("The optimized latin hypercubes are limited to {0} "
+                         "points.".format(MAX_OPTIMIZED_POINTS))
+
+    if method == 'ese':
+        points = ese_lhs(n_points, dim, n_iter, random_state=random_state)
+    elif method == 'maximin':
+        points = maximin_lhs(n_points, dim, n_iter, random_state=random_state)
+    elif method == 'sobol':
+        points = sobol(n_points, dim)
+    elif method == 'halton':
+        points = halton(n_points, dim)
+    else:
+        raise ValueError("Invalid design method.")
+
+    if include_vertices:
+        vertices = np.array(list(itertools.product([0.0, 1.0], repeat=dim)))
+        points = np.vstack((points, vertices))
+
+    return scale_to_bounds(points, lb, ub)
@@ -0,0 +1,284 @@
+import json
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from gui.models.batch_infill import BatchCaballero, _predict
+
+# options of the 'start' event that are passed to `BatchCaballero` on replay
+_REPLAY_OPTIONS = ('regression', 'feasible_tol', 'penalty_factor',
+                   'n_starts', 'start_design', 'n_workers', 'dedup_tol',
+                   'nlp_options', 'incremental', 'random_state')
+
+
+def _to_json(value):
+    # numpy arrays and scalars are written as plain lists and numbers
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    elif isinstance(value, np.generic):
+        return value.item()
+    elif isinstance(value, dict):
+        return {key: _to_json(val) for key, val in value.items()}
+    elif isinstance(value, (list, tuple)):
+        return [_to_json(val) for val in value]
+    else:
+        return value
+
+
+class TelemetryLog:
+    """Event log of an optimization run, written as one JSON object per line
+    (JSONL) as the run goes, so a crashed run keeps the events written so
+    far. Safe to write from several threads.
+
+    Every event has the keys 'event' (type) and 't' (seconds since the log
+    was opened). The optimization procedures write:
+
+    - 'start': procedure name ('procedure'), options ('options'), bounds
+      ('lb' and 'ub') and initial data ('x', 'f' and 'g');
+    - 'iteration': iteration number ('iter'), movement type ('movement'),
+      points simulated ('x'), surrogate predictions ('f_pred' and 'g_pred'),
+      simulation results ('f', 'g' and 'status') and wall times in seconds
+      ('sim_time', and 'fit_time' and 'nlp_time' or 'surrogate_time'). The
+      batch procedure also writes the hypercube ('center', 'lb', 'ub' and
+      'size');
+    - 'end': best point ('xopt', 'fopt' and 'gopt') and number of
+      evaluations ('fun_evals').
+
+    Parameters
+    ----------
+    path : str
+        File written (overwritten if it exists).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'w')
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+
+    def write(self, event: str, **fields) -> None:
+        """Appends an event of type `event` with the values of `fields`."""
+        record = {'event': event,
+                  't': round(time.perf_counter() - self._start, 6)}
+        record.update(_to_json(fields))
+        line = json.dumps(record, separators=(',', ':'))
+
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_telemetry(path: str) -> list:
+    """Events (dicts) of a `TelemetryLog` file. A truncated last line (e.g.
+    the application was killed while writing) is ignored.
+
+    Raises
+    ------
+    ValueError
+        When a line other than the last isn't a JSON object or the file has
+        no 'start' event.
+    """
+    with open(path, 'r') as fp:
+        lines = [line for line in fp.read().splitlines() if line.strip()]
+
+    events = []
+    for number, line in enumerate(lines, start=1):
+        try:
+            events.append(json.loads(line))
+        except ValueError:
+            if number < len(lines):
+                raise ValueError("Invalid telemetry line {0} in "
+                                 "{1}.".format(number, path))
+
+    if not any(event.get('event') == 'start' for event in events):
+        raise ValueError("{0} isn't an optimization telemetry log.".format(
+            path))
+
+    return events
+
+
+def _events(events: list, kind: str) -> list:
+    return [event for event in events if event.get('event') == kind]
+
+
+def iteration_table(events: list) -> pd.DataFrame:
+    """One row per 'iteration' event with the number of points, best values
+    simulated, largest prediction errors of the surrogates and wall times
+    (and the distance to the logged points of replayed iterations).
+    """
+    columns = ['Iter', 'Movement', 'Points', 'f', 'max(g)', '|f - f_pred|',
+               'max|g - g_pred|', 'Simulation (s)', 'Fit (s)', 'NLP (s)',
+               'Surrogate (s)']
+    rows = []
+    for event in _events(events, 'iteration'):
+        f = np.asarray(event['f'], dtype=float)
+        g = np.asarray(event['g'], dtype=float).reshape(f.size, -1)
+        f_err = np.abs(f - np.asarray(event['f_pred'], dtype=float))
+        if event.get('g_pred') is not None:
+            g_err = np.abs(g - np.asarray(event['g_pred'], dtype=float)
+                           .reshape(g.shape))
+            g_err = g_err.max() if g_err.size > 0 else 0.0
+        else:
+            g_err = np.nan
+
+        fit_time = event.get('fit_time', np.nan)
+        nlp_time = event.get('nlp_time', np.nan)
+        surrogate_time = event.get('surrogate_time', fit_time + nlp_time)
+
+        rows.append([event['iter'], event['movement'], f.size, f.min(),
+                     g.max() if g.size > 0 else 0.0, f_err.max(), g_err,
+                     event.get('sim_time', np.nan), fit_time, nlp_time,
+                     surrogate_time])
+
+    table = pd.DataFrame(rows, columns=columns)
+    if any('distance' in event for event in _events(events, 'iteration')):
+        table['Distance'] = [event.get('distance', np.nan)
+                             for event in _events(events, 'iteration')]
+
+    return table
+
+
+def run_summary(events: list) -> dict:
+    """Totals of a run: procedure name, number of iterations and function
+    evaluations, wall time and the time spent in the simulations, in the
+    surrogate fits and in the NLPs (NaN when the log doesn't have them).
+    """
+    start = _events(events, 'start')[0]
+    table = iteration_table(events)
+    end = _events(events, 'end')
+
+    return {
+        'procedure': start['procedure'],
+        'iterations': table.shape[0],
+        'fun_evals': end[0]['fun_evals'] if len(end) > 0
+        else int(table['Points'].sum()),
+        'finished': len(end) > 0,
+        'wall_time': events[-1]['t'] - start['t'],
+        'sim_time': table['Simulation (s)'].sum(),
+        'fit_time': table['Fit (s)'].sum(min_count=1),
+        'nlp_time': table['NLP (s)'].sum(min_count=1),
+        'surrogate_time': table['Surrogate (s)'].sum(min_count=1)
+    }
+
+
+def replay(events: list, report=None, surrogate_factory=None,
+           **options) -> list:
+    """Re-runs the surrogate steps of a logged run without the simulator:
+    before each logged iteration, the surrogates are fitted to the data the
+    run had at that point (initial data plus the simulation results logged
+    so far) and, when the log has the hypercube of the iteration (batch
+    procedure), the infill points are proposed again. The logged simulation
+    results are then added to the data, so every iteration is replayed from
+    the same data as the original run whatever the `options`.
+
+    Parameters
+    ----------
+    events : list
+        Events of `read_telemetry`.
+    report : callable, optional
+        Called with a text line per replayed iteration.
+    surrogate_factory : callable, optional
+        See `BatchCaballero`.
+    **options
+        Overrides of the logged surrogate/NLP options: 'regression',
+        'feasible_tol', 'penalty_factor', 'n_starts', 'start_design',
+        'n_workers', 'dedup_tol', 'nlp_options', 'incremental' and
+        'random_state'.
+
+    Returns
+    -------
+    list
+        One 'iteration' event per logged iteration, with the keys 'replay'
+        (True), 'iter', 'movement', 'x' (proposed points, logged ones when the
+        hypercube wasn't logged), 'f_pred' and 'g_pred' (predictions of the
+        replayed surrogates at 'x'), 'f' and 'g' (the logged results when the
+        logged points are proposed again, NaN otherwise), 'fit_time',
+        'nlp_time', 'sim_time' (0) and 'distance' (largest distance between the
+        replayed and logged points, relative to the bounds range).
+    """
+    start = _events(events, 'start')[0]
+    unknown = set(options) - set(_REPLAY_OPTIONS)
+    if len(unknown) > 0:
+        raise ValueError("Invalid replay options: {0}.".format(
+            ', '.join(sorted(unknown))))
+
+    opts = {key: val for key, val in start['options'].items()
+            if key in _REPLAY_OPTIONS}
+    opts.update(options)
+
+    x = np.asarray(start['x'], dtype=float)
+    f = np.asarray(start['f'], dtype=float).flatten()
+    g = np.asarray(start['g'], dtype=float).reshape(x.shape[0], -1)
+    opt = BatchCaballero(x, g, f, model_function=None, lb=start['lb'],
+                         ub=start['ub'], surrogate_factory=surrogate_factory,
+                         **opts)
+    scale = np.where(opt.ub == opt.lb, 1.0, opt.ub - opt.lb)
+
+    if opt.n_starts > 1 and opt.n_workers > 1:
+        opt._executor = ProcessPoolExecutor(max_workers=opt.n_workers)
+
+    replayed = []
+    try:
+        for event in _events(events, 'iteration'):
+            logged_x = np.atleast_2d(np.asarray(event['x'], dtype=float))
+            logged_f = np.asarray(event['f'], dtype=float).flatten()
+            logged_g = np.asarray(event['g'], dtype=float).reshape(
+                logged_f.size, -1)
+            opt._stats = {'fit_time': 0.0, 'nlp_time': 0.0}
+
+            if 'lb' in event:
+                points, f_pred, g_pred = opt._infill_batch(
+                    np.asarray(event['lb']), np.asarray(event['ub']),
+                    logged_x.shape[0], np.asarray(event['center']))
+            else:
+                points = logged_x
+                fit_start = time.perf_counter()
+                models = opt._fit()
+                opt._stats['fit_time'] += time.perf_counter() - fit_start
+                pred = np.array([[_predict(model, xk)[0] for model in models]
+                                 for xk in points])
+                f_pred, g_pred = pred[:, 0], pred[:, 1:]
+
+            distance = np.abs((points - logged_x) / scale).max()
+            same = distance < 1e-6
+            nan = np.full(logged_f.size, np.nan)
+            replayed.append({
+                'event': 'iteration', 'replay': True, 'iter': event['iter'],
+                'movement': event['movement'], 'x': points,
+                'f_pred': np.asarray(f_pred).flatten(), 'g_pred': g_pred,
+                'f': logged_f if same else nan,
+                'g': logged_g if same else np.full(logged_g.shape, np.nan),
+                'fit_time': opt._stats['fit_time'],
+                'nlp_time': opt._stats['nlp_time'] if 'lb' in event
+                else np.nan, 'sim_time': 0.0, 'distance': distance
+            })
+            if report is not None:
+                report("{0:>6} fit {1:8.3f} s  NLP {2:8.3f} s  distance "
+                       "{3:10.4g}".format(event['iter'],
+                                          replayed[-1]['fit_time'],
+                                          replayed[-1]['nlp_time'], distance))
+
+            # the next iteration starts from the data of the original run
+            status = np.asarray(event['status'], dtype=bool)
+            opt.x = np.vstack((opt.x, logged_x[status]))
+            opt.f = np.append(opt.f, logged_f[status])
+            opt.g = np.vstack((opt.g, logged_g[status]))
+    finally:
+        if opt._executor is not None:
+            opt._executor.shutdown()
+            opt._executor = None
+
+    return replayed
@@ -0,0 +1,164 @@
+import hashlib
+import pathlib
+
+import simplejson as json
+
+from gui.models.aspen_var_catalogue import CATALOGUE_VERSION
+
+# default folder where the simulation trees are cached
+_CACHE_FOLDER = pathlib.Path.home() / '.metacontrol' / 'tree_cache'
+
+# size of the chunks read when hashing the simulation file
+_CHUNK_SIZE = 1 << 20
+
+
+def simulation_fingerprint(file_path: str) -> str:
+    """Fingerprint of a simulation file: hash of its content combined with the
+    version of the variable catalogue used to build the trees.
+
+    Parameters
+    ----------
+    file_path : str
+        Full path string to the .bkp file.
+
+    Returns
+    -------
+    str
+        Hexadecimal fingerprint string.
+    """
+    sha = hashlib.sha256()
+    with open(file_path, 'rb') as sim_file:
+        for chunk in iter(lambda: sim_file.read(_CHUNK_SIZE), b''):
+            sha.update(chunk)
+
+    return "{0}-v{1}".format(sha.hexdigest(), CATALOGUE_VERSION)
+
+
+def collapse_fetched(tree: dict) -> dict:
+    """Copy of a variable tree with the branches fetched from the simulation
+    (flagged as 'fetched', see `SimulationTreeModel`) turned back into lazy
+    nodes, so they are read again from the simulation when expanded.
+    """
+    if tree.get('fetched', False):
+        return dict({k: v for k, v in tree.items()
+                     if k not in ('children', 'fetched')}, lazy=True)
+
+    node = dict(tree)
+    if 'children' in node:
+        node['children'] = [collapse_fetched(child)
+                            for child in node['children']]
+    return node
+
+
+def leaf_paths(tree: dict) -> list:
+    """Paths (as in `AspenConnection.get_simulation_branch`) of the variables
+    (non lazy leaves) of a variable tree.
+    """
+    paths = []
+
+    def visit(node, path):
+        path = path + '\\' + node['node'].lstrip()
+        if 'children' in node:
+            for child in node['children']:
+                visit(child, path)
+        elif not node.get('lazy', False):
+            paths.append(path)
+
+    if len(tree) != 0:
+        visit(tree, '')
+
+    return paths
+
+
+class SimulationTreeCache:
+    """Persistent cache of the simulation variable trees.
+
+    Each entry is a JSON file named after the simulation fingerprint (see
+    `simulation_fingerprint`) with the keys:
+        'filepath' - path of the simulation file when the entry was stored;
+        'flowsheet' - names/types of streams, blocks and design specs (see
+            `AspenConnection.get_flowsheet_nodes`);
+        'simulation_data' - simulation data dictionary;
+        'paths' - variable paths of the trees when they were loaded (see
+            `leaf_paths`);
+        'input' - input variable tree;
+        'output' - output variable tree;
+
+    An index file keeps the last fingerprint stored for each simulation file
+    path, so an outdated entry can be shown while it is revalidated (the
+    flowsheet, simulation data and variable paths are checked against the
+    simulation).
+
+    Parameters
+    ----------
+    cache_folder : str, optional
+        Folder where the entries are stored. Default is
+        '~/.metacontrol/tree_cache'.
+    """
+
+    _INDEX_FILENAME = 'index.json'
+
+    def __init__(self, cache_folder: str = None):
+        self._folder = pathlib.Path(cache_folder) if cache_folder is not None \
+            else _CACHE_FOLDER
+
+    # --------------------------- PRIVATE FUNCTIONS --------------------------
+    def _entry_path(self, fingerprint: str) -> pathlib.Path:
+        return self._folder / (fingerprint + '.json')
+
+    def _read_json(self, file_path: pathlib.Path) -> dict:
+        try:
+            with open(file_path, 'r') as json_file:
+                return json.load(json_file)
+        except (OSError, ValueError):
+            # missing or corrupted file, treat as a cache miss
+            return {}
+
+    def _write_json(self, file_path: pathlib.Path, data: dict) -> None:
+        self._folder.mkdir(parents=True, exist_ok=True)
+
+        # write to a temporary file first so a crash does not corrupt it
+        tmp_path = file_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as json_file:
+            json.dump(data, json_file, ignore_nan=True)
+        tmp_path.replace(file_path)
+
+    # --------------------------- PUBLIC FUNCTIONS ---------------------------
+    def get(self, fingerprint: str) -> dict:
+        """Returns the cached entry of a fingerprint. Empty dict if there is
+        none.
+        """
+        return self._read_json(self._entry_path(fingerprint))
+
+    def get_latest(self, file_path: str) -> dict:
+        """Returns the last entry stored for a simulation file path, regardless
+        of its fingerprint (i.e. the entry may be outdated). Empty dict if
+        there is none.
+        """
+        index = self._read_json(self._folder / self._INDEX_FILENAME)
+        key = str(pathlib.Path(file_path).resolve())
+
+        if key in index:
+            return self.get(index[key])
+        else:
+            return {}
+
+    def put(self, file_path: str, fingerprint: str, entry: dict) -> None:
+        """Stores an entry and makes it the latest one of `file_path`. The
+        previous entry of the same path is removed.
+        """
+        key = str(pathlib.Path(file_path).resolve())
+        index = self._read_json(self._folder / self._INDEX_FILENAME)
+
+        entry = dict(entry, filepath=key)
+        self._write_json(self._entry_path(fingerprint), entry)
+
+        old_fingerprint = index.get(key, fingerprint)
+        old_entry_path = self._entry_path(old_fingerprint)
+        if old_fingerprint != fingerprint and old_entry_path.exists() and \
+                old_fingerprint not in (v for k, v in index.items()
+                                        if k != key):
+            old_entry_path.unlink()
+
+        index[key] = fingerprint
+        self._write_json(self._folder / self._INDEX_FILENAME, index)
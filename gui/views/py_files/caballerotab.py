@@ -94,15 +94,50 @@ class Ui_Form(object):
         self.maxFunEvalsLineEdit.setAlignment(QtCore.Qt.AlignCenter)
         self.maxFunEvalsLineEdit.setObjectName("maxFunEvalsLineEdit")
         self.formLayout.setWidget(7, QtWidgets.QFormLayout.FieldRole, self.maxFunEvalsLineEdit)
+        self.infillBatchLabel = QtWidgets.QLabel(self.groupBox_2)
+        self.infillBatchLabel.setObjectName("infillBatchLabel")
+        self.formLayout.setWidget(8, QtWidgets.QFormLayout.LabelRole, self.infillBatchLabel)
+        self.infillBatchLineEdit = QtWidgets.QLineEdit(self.groupBox_2)
+        self.infillBatchLineEdit.setText("")
+        self.infillBatchLineEdit.setAlignment(QtCore.Qt.AlignCenter)
+        self.infillBatchLineEdit.setObjectName("infillBatchLineEdit")
+        self.formLayout.setWidget(8, QtWidgets.QFormLayout.FieldRole, self.infillBatchLineEdit)
+        self.nlpStartsLabel = QtWidgets.QLabel(self.groupBox_2)
+        self.nlpStartsLabel.setObjectName("nlpStartsLabel")
+        self.formLayout.setWidget(9, QtWidgets.QFormLayout.LabelRole, self.nlpStartsLabel)
+        self.nlpStartsLineEdit = QtWidgets.QLineEdit(self.groupBox_2)
+        self.nlpStartsLineEdit.setText("")
+        self.nlpStartsLineEdit.setAlignment(QtCore.Qt.AlignCenter)
+        self.nlpStartsLineEdit.setObjectName("nlpStartsLineEdit")
+        self.formLayout.setWidget(9, QtWidgets.QFormLayout.FieldRole, self.nlpStartsLineEdit)
+        self.startDesignLabel = QtWidgets.QLabel(self.groupBox_2)
+        self.startDesignLabel.setObjectName("startDesignLabel")
+        self.formLayout.setWidget(10, QtWidgets.QFormLayout.LabelRole, self.startDesignLabel)
+        self.startDesignComboBox = QtWidgets.QComboBox(self.groupBox_2)
+        self.startDesignComboBox.setObjectName("startDesignComboBox")
+        self.startDesignComboBox.addItem("")
+        self.startDesignComboBox.addItem("")
+        self.formLayout.setWidget(10, QtWidgets.QFormLayout.FieldRole, self.startDesignComboBox)
+        self.nlpWorkersLabel = QtWidgets.QLabel(self.groupBox_2)
+        self.nlpWorkersLabel.setObjectName("nlpWorkersLabel")
+        self.formLayout.setWidget(11, QtWidgets.QFormLayout.LabelRole, self.nlpWorkersLabel)
+        self.nlpWorkersLineEdit = QtWidgets.QLineEdit(self.groupBox_2)
+        self.nlpWorkersLineEdit.setText("")
+        self.nlpWorkersLineEdit.setAlignment(QtCore.Qt.AlignCenter)
+        self.nlpWorkersLineEdit.setObjectName("nlpWorkersLineEdit")
+        self.formLayout.setWidget(11, QtWidgets.QFormLayout.FieldRole, self.nlpWorkersLineEdit)
         self.label_18 = QtWidgets.QLabel(self.groupBox_2)
         self.label_18.setObjectName("label_18")
-        self.formLayout.setWidget(8, QtWidgets.QFormLayout.LabelRole, self.label_18)
+        self.formLayout.setWidget(12, QtWidgets.QFormLayout.LabelRole, self.label_18)
         self.regrpolyComboBox = QtWidgets.QComboBox(self.groupBox_2)
         self.regrpolyComboBox.setObjectName("regrpolyComboBox")
         self.regrpolyComboBox.addItem("")
         self.regrpolyComboBox.addItem("")
         self.regrpolyComboBox.addItem("")
-        self.formLayout.setWidget(8, QtWidgets.QFormLayout.FieldRole, self.regrpolyComboBox)
+        self.formLayout.setWidget(12, QtWidgets.QFormLayout.FieldRole, self.regrpolyComboBox)
+        self.incrementalFitCheckBox = QtWidgets.QCheckBox(self.groupBox_2)
+        self.incrementalFitCheckBox.setObjectName("incrementalFitCheckBox")
+        self.formLayout.setWidget(13, QtWidgets.QFormLayout.SpanningRole, self.incrementalFitCheckBox)
         self.gridLayout_2.addWidget(self.groupBox_2, 1, 0, 1, 1)
         self.groupBox_3 = QtWidgets.QGroupBox(self.groupBox)
         sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Preferred)
@@ -134,6 +169,12 @@ class Ui_Form(object):
         self.abortOptPushButton.setEnabled(False)
         self.abortOptPushButton.setObjectName("abortOptPushButton")
         self.gridLayout_3.addWidget(self.abortOptPushButton, 2, 0, 1, 1)
+        self.telemetryCheckBox = QtWidgets.QCheckBox(self.groupBox_3)
+        self.telemetryCheckBox.setObjectName("telemetryCheckBox")
+        self.gridLayout_3.addWidget(self.telemetryCheckBox, 3, 0, 1, 1)
+        self.viewTelemetryPushButton = QtWidgets.QPushButton(self.groupBox_3)
+        self.viewTelemetryPushButton.setObjectName("viewTelemetryPushButton")
+        self.gridLayout_3.addWidget(self.viewTelemetryPushButton, 4, 0, 1, 1)
         self.gridLayout_2.addWidget(self.groupBox_3, 4, 0, 1, 1)
         self.groupBox_5 = QtWidgets.QGroupBox(self.groupBox)
         sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Preferred)
@@ -216,6 +257,9 @@ class Ui_Form(object):
         self.ipoptTestConnectionPushButton = QtWidgets.QPushButton(self.ipOptServerTab)
         self.ipoptTestConnectionPushButton.setObjectName("ipoptTestConnectionPushButton")
         self.formLayout_2.setWidget(1, QtWidgets.QFormLayout.FieldRole, self.ipoptTestConnectionPushButton)
+        self.localNlpServerPushButton = QtWidgets.QPushButton(self.ipOptServerTab)
+        self.localNlpServerPushButton.setObjectName("localNlpServerPushButton")
+        self.formLayout_2.setWidget(1, QtWidgets.QFormLayout.LabelRole, self.localNlpServerPushButton)
         self.tabWidget.addTab(self.ipOptServerTab, "")
         self.gridLayout_5.addWidget(self.tabWidget, 2, 0, 1, 1)
         self.label_12 = QtWidgets.QLabel(self.groupBox_5)
@@ -304,13 +348,26 @@ class Ui_Form(object):
         self.label_7.setText(_translate("Form", "Refinement tolerance:"))
         self.label_8.setText(_translate("Form", "Termination tolerance:"))
         self.label_11.setText(_translate("Form", "Maximum function evaluations:"))
+        self.infillBatchLabel.setToolTip(_translate("Form", "Points simulated per iteration. Above 1, the batch procedure is used and its surrogate NLPs are solved with SLSQP instead of IpOpt"))
+        self.infillBatchLabel.setText(_translate("Form", "Infill batch size:"))
+        self.nlpStartsLabel.setToolTip(_translate("Form", "Starting points of each surrogate NLP. Above 1, the batch procedure is used and its surrogate NLPs are solved with SLSQP instead of IpOpt"))
+        self.nlpStartsLabel.setText(_translate("Form", "Surrogate NLP starts:"))
+        self.startDesignLabel.setText(_translate("Form", "NLP start points:"))
+        self.startDesignComboBox.setItemText(0, _translate("Form", "LHS"))
+        self.startDesignComboBox.setItemText(1, _translate("Form", "Sobol"))
+        self.nlpWorkersLabel.setText(_translate("Form", "NLP worker processes:"))
         self.label_18.setText(_translate("Form", "Regression model:"))
         self.regrpolyComboBox.setItemText(0, _translate("Form", "poly0"))
         self.regrpolyComboBox.setItemText(1, _translate("Form", "poly1"))
         self.regrpolyComboBox.setItemText(2, _translate("Form", "poly2"))
+        self.incrementalFitCheckBox.setToolTip(_translate("Form", "Extends the surrogates with the new points at fixed hyperparameters and only refits them when the data drifts (batch procedure, surrogate NLPs solved with SLSQP instead of IpOpt)"))
+        self.incrementalFitCheckBox.setText(_translate("Form", "Incremental surrogate updates"))
         self.label_9.setText(_translate("Form", "Perform optimization"))
         self.startOptPushButton.setText(_translate("Form", "Start"))
         self.abortOptPushButton.setText(_translate("Form", "Abort"))
+        self.telemetryCheckBox.setToolTip(_translate("Form", "Writes the points, predictions, results and timings of each iteration to a .jsonl file next to the simulation file"))
+        self.telemetryCheckBox.setText(_translate("Form", "Record telemetry log"))
+        self.viewTelemetryPushButton.setText(_translate("Form", "View telemetry log..."))
         self.label_19.setText(_translate("Form", "Maximum number of iterations:"))
         self.label_20.setText(_translate("Form", "Constraint tolerance:"))
         self.label_21.setText(_translate("Form", "Dual feasibility tolerance:"))
@@ -324,6 +381,8 @@ class Ui_Form(object):
         self.label_16.setText(_translate("Form", "Dual feasibility tolerance:"))
         self.ipoptServerDualFeasLineEdit.setText(_translate("Form", "1e-8"))
         self.ipoptTestConnectionPushButton.setText(_translate("Form", "Test server connection"))
+        self.localNlpServerPushButton.setToolTip(_translate("Form", "Starts a NLP server on this machine (batch optimization and IpOpt server address)"))
+        self.localNlpServerPushButton.setText(_translate("Form", "Start local server"))
         self.tabWidget.setTabText(self.tabWidget.indexOf(self.ipOptServerTab), _translate("Form", "IpOpt - Server"))
         self.label_12.setText(_translate("Form", "NLP solvers options"))
         self.selectSolverComboBox.setItemText(0, _translate("Form", "IpOpt (local)"))
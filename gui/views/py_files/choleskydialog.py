@@ -30,6 +30,11 @@ class Ui_Dialog(object):
         self.setPushButton = QtWidgets.QPushButton(self.groupBox_2)
         self.setPushButton.setObjectName("setPushButton")
         self.gridLayout_3.addWidget(self.setPushButton, 2, 0, 1, 1)
+        self.timingLabel = QtWidgets.QLabel(self.groupBox_2)
+        self.timingLabel.setText("")
+        self.timingLabel.setAlignment(QtCore.Qt.AlignCenter)
+        self.timingLabel.setObjectName("timingLabel")
+        self.gridLayout_3.addWidget(self.timingLabel, 3, 0, 1, 1)
         self.gridLayout.addWidget(self.groupBox_2, 1, 1, 1, 1)
         spacerItem1 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
         self.gridLayout.addItem(spacerItem1, 1, 2, 1, 1)
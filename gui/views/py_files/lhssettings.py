@@ -12,7 +12,7 @@ class Ui_Dialog(object):
     def setupUi(self, Dialog):
         Dialog.setObjectName("Dialog")
         Dialog.setWindowModality(QtCore.Qt.ApplicationModal)
-        Dialog.resize(268, 128)
+        Dialog.resize(320, 315)
         Dialog.setModal(True)
         self.gridLayout = QtWidgets.QGridLayout(Dialog)
         self.gridLayout.setObjectName("gridLayout")
@@ -30,27 +30,110 @@ class Ui_Dialog(object):
         self.lineEditNIter = QtWidgets.QLineEdit(Dialog)
         self.lineEditNIter.setObjectName("lineEditNIter")
         self.formLayout.setWidget(1, QtWidgets.QFormLayout.FieldRole, self.lineEditNIter)
+        self.label_3 = QtWidgets.QLabel(Dialog)
+        self.label_3.setObjectName("label_3")
+        self.formLayout.setWidget(2, QtWidgets.QFormLayout.LabelRole, self.label_3)
+        self.comboBoxMethod = QtWidgets.QComboBox(Dialog)
+        self.comboBoxMethod.setObjectName("comboBoxMethod")
+        self.comboBoxMethod.addItem("")
+        self.comboBoxMethod.addItem("")
+        self.comboBoxMethod.addItem("")
+        self.comboBoxMethod.addItem("")
+        self.comboBoxMethod.addItem("")
+        self.formLayout.setWidget(2, QtWidgets.QFormLayout.FieldRole, self.comboBoxMethod)
         self.gridLayout.addLayout(self.formLayout, 1, 0, 1, 1)
+        self.groupBoxAdaptive = QtWidgets.QGroupBox(Dialog)
+        self.groupBoxAdaptive.setCheckable(True)
+        self.groupBoxAdaptive.setChecked(False)
+        self.groupBoxAdaptive.setObjectName("groupBoxAdaptive")
+        self.formLayout_2 = QtWidgets.QFormLayout(self.groupBoxAdaptive)
+        self.formLayout_2.setObjectName("formLayout_2")
+        self.label_4 = QtWidgets.QLabel(self.groupBoxAdaptive)
+        self.label_4.setObjectName("label_4")
+        self.formLayout_2.setWidget(0, QtWidgets.QFormLayout.LabelRole, self.label_4)
+        self.spinBoxBatchSize = QtWidgets.QSpinBox(self.groupBoxAdaptive)
+        self.spinBoxBatchSize.setMinimum(1)
+        self.spinBoxBatchSize.setMaximum(100)
+        self.spinBoxBatchSize.setProperty("value", 5)
+        self.spinBoxBatchSize.setObjectName("spinBoxBatchSize")
+        self.formLayout_2.setWidget(0, QtWidgets.QFormLayout.FieldRole, self.spinBoxBatchSize)
+        self.label_5 = QtWidgets.QLabel(self.groupBoxAdaptive)
+        self.label_5.setObjectName("label_5")
+        self.formLayout_2.setWidget(1, QtWidgets.QFormLayout.LabelRole, self.label_5)
+        self.spinBoxMaxSamples = QtWidgets.QSpinBox(self.groupBoxAdaptive)
+        self.spinBoxMaxSamples.setMinimum(3)
+        self.spinBoxMaxSamples.setMaximum(10000)
+        self.spinBoxMaxSamples.setProperty("value", 100)
+        self.spinBoxMaxSamples.setObjectName("spinBoxMaxSamples")
+        self.formLayout_2.setWidget(1, QtWidgets.QFormLayout.FieldRole, self.spinBoxMaxSamples)
+        self.label_6 = QtWidgets.QLabel(self.groupBoxAdaptive)
+        self.label_6.setObjectName("label_6")
+        self.formLayout_2.setWidget(2, QtWidgets.QFormLayout.LabelRole, self.label_6)
+        self.doubleSpinBoxTargetError = QtWidgets.QDoubleSpinBox(self.groupBoxAdaptive)
+        self.doubleSpinBoxTargetError.setDecimals(1)
+        self.doubleSpinBoxTargetError.setMinimum(0.1)
+        self.doubleSpinBoxTargetError.setMaximum(50.0)
+        self.doubleSpinBoxTargetError.setProperty("value", 5.0)
+        self.doubleSpinBoxTargetError.setObjectName("doubleSpinBoxTargetError")
+        self.formLayout_2.setWidget(2, QtWidgets.QFormLayout.FieldRole, self.doubleSpinBoxTargetError)
+        self.label_7 = QtWidgets.QLabel(self.groupBoxAdaptive)
+        self.label_7.setObjectName("label_7")
+        self.formLayout_2.setWidget(3, QtWidgets.QFormLayout.LabelRole, self.label_7)
+        self.comboBoxCriterion = QtWidgets.QComboBox(self.groupBoxAdaptive)
+        self.comboBoxCriterion.setObjectName("comboBoxCriterion")
+        self.comboBoxCriterion.addItem("")
+        self.comboBoxCriterion.addItem("")
+        self.formLayout_2.setWidget(3, QtWidgets.QFormLayout.FieldRole, self.comboBoxCriterion)
+        self.gridLayout.addWidget(self.groupBoxAdaptive, 4, 0, 1, 1)
         self.buttonBox = QtWidgets.QDialogButtonBox(Dialog)
         self.buttonBox.setOrientation(QtCore.Qt.Horizontal)
         self.buttonBox.setStandardButtons(QtWidgets.QDialogButtonBox.Cancel|QtWidgets.QDialogButtonBox.Ok)
         self.buttonBox.setObjectName("buttonBox")
-        self.gridLayout.addWidget(self.buttonBox, 3, 0, 1, 1)
+        self.gridLayout.addWidget(self.buttonBox, 5, 0, 1, 1)
         self.checkBoxIncVertices = QtWidgets.QCheckBox(Dialog)
         self.checkBoxIncVertices.setObjectName("checkBoxIncVertices")
         self.gridLayout.addWidget(self.checkBoxIncVertices, 2, 0, 1, 1)
+        self.checkBoxOrderCases = QtWidgets.QCheckBox(Dialog)
+        self.checkBoxOrderCases.setObjectName("checkBoxOrderCases")
+        self.gridLayout.addWidget(self.checkBoxOrderCases, 3, 0, 1, 1)
 
         self.retranslateUi(Dialog)
         self.buttonBox.accepted.connect(Dialog.accept)
         self.buttonBox.rejected.connect(Dialog.reject)
         QtCore.QMetaObject.connectSlotsByName(Dialog)
         Dialog.setTabOrder(self.lineEditNSamples, self.lineEditNIter)
-        Dialog.setTabOrder(self.lineEditNIter, self.checkBoxIncVertices)
+        Dialog.setTabOrder(self.lineEditNIter, self.comboBoxMethod)
+        Dialog.setTabOrder(self.comboBoxMethod, self.checkBoxIncVertices)
+        Dialog.setTabOrder(self.checkBoxIncVertices, self.checkBoxOrderCases)
+        Dialog.setTabOrder(self.checkBoxOrderCases, self.groupBoxAdaptive)
+        Dialog.setTabOrder(self.groupBoxAdaptive, self.spinBoxBatchSize)
+        Dialog.setTabOrder(self.spinBoxBatchSize, self.spinBoxMaxSamples)
+        Dialog.setTabOrder(self.spinBoxMaxSamples, self.doubleSpinBoxTargetError)
+        Dialog.setTabOrder(self.doubleSpinBoxTargetError, self.comboBoxCriterion)
 
     def retranslateUi(self, Dialog):
         _translate = QtCore.QCoreApplication.translate
         Dialog.setWindowTitle(_translate("Dialog", "LHS Settings"))
         self.label.setText(_translate("Dialog", "Number of samples:"))
         self.label_2.setText(_translate("Dialog", "Number of iterations:"))
+        self.label_3.setText(_translate("Dialog", "Design method:"))
+        self.comboBoxMethod.setToolTip(_translate("Dialog", "The iterations only apply to the latin hypercube methods"))
+        self.comboBoxMethod.setItemText(0, _translate("Dialog", "Best of random LHS (pydace)"))
+        self.comboBoxMethod.setItemText(1, _translate("Dialog", "Optimized LHS (ESE)"))
+        self.comboBoxMethod.setItemText(2, _translate("Dialog", "Maximin LHS"))
+        self.comboBoxMethod.setItemText(3, _translate("Dialog", "Sobol sequence"))
+        self.comboBoxMethod.setItemText(4, _translate("Dialog", "Halton sequence"))
+        self.groupBoxAdaptive.setToolTip(_translate("Dialog", "Starts from the number of samples above and adds batches where the metamodels are the most uncertain until the validation error is reached"))
+        self.groupBoxAdaptive.setTitle(_translate("Dialog", "Adaptive sampling"))
+        self.label_4.setText(_translate("Dialog", "Batch size:"))
+        self.label_5.setText(_translate("Dialog", "Maximum samples:"))
+        self.label_6.setText(_translate("Dialog", "Target validation error:"))
+        self.doubleSpinBoxTargetError.setToolTip(_translate("Dialog", "RMSE of the predictions of each new batch, relative to the output range"))
+        self.doubleSpinBoxTargetError.setSuffix(_translate("Dialog", " %"))
+        self.label_7.setText(_translate("Dialog", "Criterion:"))
+        self.comboBoxCriterion.setItemText(0, _translate("Dialog", "Prediction variance (MSE)"))
+        self.comboBoxCriterion.setItemText(1, _translate("Dialog", "Integrated variance (IMSE)"))
         self.checkBoxIncVertices.setText(_translate("Dialog", "Include hypercube vertices"))
+        self.checkBoxOrderCases.setToolTip(_translate("Dialog", "Simulates the cases along a short path through the design space (nearest neighbour and 2-opt), so each run starts from the converged state of a nearby case"))
+        self.checkBoxOrderCases.setText(_translate("Dialog", "Sample along a short path"))
 
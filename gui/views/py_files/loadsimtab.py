@@ -96,6 +96,12 @@ class Ui_Form(object):
         self.tableViewAliasDisplay.setObjectName("tableViewAliasDisplay")
         self.tableViewAliasDisplay.horizontalHeader().setStretchLastSection(True)
         self.gridLayout.addWidget(self.tableViewAliasDisplay, 5, 1, 1, 2)
+        self.caseTimeoutSpinBox = QtWidgets.QSpinBox(self.groupBox)
+        self.caseTimeoutSpinBox.setAlignment(QtCore.Qt.AlignCenter)
+        self.caseTimeoutSpinBox.setMaximum(86400)
+        self.caseTimeoutSpinBox.setSingleStep(30)
+        self.caseTimeoutSpinBox.setObjectName("caseTimeoutSpinBox")
+        self.gridLayout.addWidget(self.caseTimeoutSpinBox, 4, 2, 1, 1)
         self.gridLayout_2.addWidget(self.groupBox, 0, 0, 1, 1)
         self.groupBox_2 = QtWidgets.QGroupBox(Form)
         self.groupBox_2.setMinimumSize(QtCore.QSize(475, 500))
@@ -207,6 +213,10 @@ class Ui_Form(object):
 "</style></head><body style=\" font-family:\'MS Shell Dlg 2\'; font-size:8.25pt; font-weight:400; font-style:normal;\">\n"
 "<p style=\" margin-top:0px; margin-bottom:0px; margin-left:0px; margin-right:0px; -qt-block-indent:0; text-indent:0px;\"><span style=\" font-size:8pt;\">Select a simulation file.</span></p></body></html>"))
         self.label_11.setText(_translate("Form", "Selected variables aliases"))
+        self.caseTimeoutSpinBox.setToolTip(_translate("Form", "Maximum run time of each simulation case (sampling and optimization). A hung simulation engine is killed and opened again, and the case gets the timeout status."))
+        self.caseTimeoutSpinBox.setSpecialValueText(_translate("Form", "No case timeout"))
+        self.caseTimeoutSpinBox.setSuffix(_translate("Form", " s"))
+        self.caseTimeoutSpinBox.setPrefix(_translate("Form", "Case timeout: "))
         self.label_10.setText(_translate("Form", "Simulation Description"))
         self.label_14.setText(_translate("Form", "Simulation Info"))
         self.buttonAddExpr.setToolTip(_translate("Form", "<html><head/><body><p>Inserts a new expression slot</p></body></html>"))
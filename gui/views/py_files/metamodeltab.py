@@ -141,6 +141,18 @@ class Ui_Form(object):
         self.corrComboBox.setObjectName("corrComboBox")
         self.corrComboBox.addItem("")
         self.formLayout.setWidget(1, QtWidgets.QFormLayout.FieldRole, self.corrComboBox)
+        self.surrogateLabel = QtWidgets.QLabel(self.groupBox_2)
+        font = QtGui.QFont()
+        font.setBold(True)
+        font.setWeight(75)
+        self.surrogateLabel.setFont(font)
+        self.surrogateLabel.setObjectName("surrogateLabel")
+        self.formLayout.setWidget(2, QtWidgets.QFormLayout.LabelRole, self.surrogateLabel)
+        self.surrogateComboBox = QtWidgets.QComboBox(self.groupBox_2)
+        self.surrogateComboBox.setObjectName("surrogateComboBox")
+        self.surrogateComboBox.addItem("")
+        self.surrogateComboBox.addItem("")
+        self.formLayout.setWidget(2, QtWidgets.QFormLayout.FieldRole, self.surrogateComboBox)
         self.gridLayout_3.addLayout(self.formLayout, 4, 0, 1, 1)
         spacerItem4 = QtWidgets.QSpacerItem(20, 10, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
         self.gridLayout_3.addItem(spacerItem4, 5, 0, 1, 1)
@@ -265,6 +277,10 @@ class Ui_Form(object):
         self.regrComboBox.setItemText(2, _translate("Form", "Quadratic (2nd order)"))
         self.label_3.setText(_translate("Form", "Correlation (kernel) model:"))
         self.corrComboBox.setItemText(0, _translate("Form", "Exponential Gaussian (Kriging)"))
+        self.surrogateLabel.setText(_translate("Form", "Surrogate size:"))
+        self.surrogateComboBox.setToolTip(_translate("Form", "Local kriging only uses the nearest samples of each prediction point, for data sets of more than a few thousand samples"))
+        self.surrogateComboBox.setItemText(0, _translate("Form", "Full (all samples)"))
+        self.surrogateComboBox.setItemText(1, _translate("Form", "Local (nearest neighbours)"))
         self.label_5.setText(_translate("Form", "Results generation and visualization"))
         self.generateModelpushButton.setText(_translate("Form", "Generate metamodel"))
         self.viewPlotPushButton.setText(_translate("Form", "View graphical results"))
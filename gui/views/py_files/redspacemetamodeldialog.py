@@ -149,6 +149,18 @@ class Ui_Dialog(object):
         self.corrComboBox.setObjectName("corrComboBox")
         self.corrComboBox.addItem("")
         self.formLayout.setWidget(1, QtWidgets.QFormLayout.FieldRole, self.corrComboBox)
+        self.surrogateLabel = QtWidgets.QLabel(self.groupBox_2)
+        font = QtGui.QFont()
+        font.setBold(True)
+        font.setWeight(75)
+        self.surrogateLabel.setFont(font)
+        self.surrogateLabel.setObjectName("surrogateLabel")
+        self.formLayout.setWidget(2, QtWidgets.QFormLayout.LabelRole, self.surrogateLabel)
+        self.surrogateComboBox = QtWidgets.QComboBox(self.groupBox_2)
+        self.surrogateComboBox.setObjectName("surrogateComboBox")
+        self.surrogateComboBox.addItem("")
+        self.surrogateComboBox.addItem("")
+        self.formLayout.setWidget(2, QtWidgets.QFormLayout.FieldRole, self.surrogateComboBox)
         self.gridLayout_3.addLayout(self.formLayout, 4, 0, 1, 1)
         spacerItem6 = QtWidgets.QSpacerItem(20, 10, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
         self.gridLayout_3.addItem(spacerItem6, 5, 0, 1, 1)
@@ -273,6 +285,10 @@ class Ui_Dialog(object):
         self.regrComboBox.setItemText(1, _translate("Dialog", "Linear (1st order)"))
         self.label_3.setText(_translate("Dialog", "Correlation (kernel) model:"))
         self.corrComboBox.setItemText(0, _translate("Dialog", "Exponential Gaussian (Kriging)"))
+        self.surrogateLabel.setText(_translate("Dialog", "Surrogate size:"))
+        self.surrogateComboBox.setToolTip(_translate("Dialog", "Local kriging only uses the nearest samples of each prediction point, for data sets of more than a few thousand samples"))
+        self.surrogateComboBox.setItemText(0, _translate("Dialog", "Full (all samples)"))
+        self.surrogateComboBox.setItemText(1, _translate("Dialog", "Local (nearest neighbours)"))
         self.label_5.setText(_translate("Dialog", "Results generation and visualization"))
         self.generateModelpushButton.setText(_translate("Dialog", "Generate metamodel"))
         self.viewPlotPushButton.setText(_translate("Dialog", "View graphical results"))
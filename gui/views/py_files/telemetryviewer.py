@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'gui/views/ui_files/telemetryviewer.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_Dialog(object):
+    def setupUi(self, Dialog):
+        Dialog.setObjectName("Dialog")
+        Dialog.resize(1000, 600)
+        self.gridLayout = QtWidgets.QGridLayout(Dialog)
+        self.gridLayout.setObjectName("gridLayout")
+        self.summaryLabel = QtWidgets.QLabel(Dialog)
+        self.summaryLabel.setTextInteractionFlags(QtCore.Qt.TextSelectableByMouse)
+        self.summaryLabel.setObjectName("summaryLabel")
+        self.gridLayout.addWidget(self.summaryLabel, 0, 0, 1, 1)
+        self.tabWidget = QtWidgets.QTabWidget(Dialog)
+        self.tabWidget.setObjectName("tabWidget")
+        self.loggedTab = QtWidgets.QWidget()
+        self.loggedTab.setObjectName("loggedTab")
+        self.gridLayout_2 = QtWidgets.QGridLayout(self.loggedTab)
+        self.gridLayout_2.setObjectName("gridLayout_2")
+        self.iterationsTableView = QtWidgets.QTableView(self.loggedTab)
+        self.iterationsTableView.setObjectName("iterationsTableView")
+        self.gridLayout_2.addWidget(self.iterationsTableView, 0, 0, 1, 1)
+        self.tabWidget.addTab(self.loggedTab, "")
+        self.replayTab = QtWidgets.QWidget()
+        self.replayTab.setObjectName("replayTab")
+        self.gridLayout_3 = QtWidgets.QGridLayout(self.replayTab)
+        self.gridLayout_3.setObjectName("gridLayout_3")
+        self.replayTableView = QtWidgets.QTableView(self.replayTab)
+        self.replayTableView.setObjectName("replayTableView")
+        self.gridLayout_3.addWidget(self.replayTableView, 0, 0, 1, 1)
+        self.tabWidget.addTab(self.replayTab, "")
+        self.gridLayout.addWidget(self.tabWidget, 1, 0, 1, 1)
+        self.replayGroupBox = QtWidgets.QGroupBox(Dialog)
+        self.replayGroupBox.setObjectName("replayGroupBox")
+        self.horizontalLayout = QtWidgets.QHBoxLayout(self.replayGroupBox)
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        self.regressionLabel = QtWidgets.QLabel(self.replayGroupBox)
+        self.regressionLabel.setObjectName("regressionLabel")
+        self.horizontalLayout.addWidget(self.regressionLabel)
+        self.regressionComboBox = QtWidgets.QComboBox(self.replayGroupBox)
+        self.regressionComboBox.setObjectName("regressionComboBox")
+        self.regressionComboBox.addItem("")
+        self.regressionComboBox.addItem("")
+        self.regressionComboBox.addItem("")
+        self.horizontalLayout.addWidget(self.regressionComboBox)
+        self.nlpStartsLabel = QtWidgets.QLabel(self.replayGroupBox)
+        self.nlpStartsLabel.setObjectName("nlpStartsLabel")
+        self.horizontalLayout.addWidget(self.nlpStartsLabel)
+        self.nlpStartsSpinBox = QtWidgets.QSpinBox(self.replayGroupBox)
+        self.nlpStartsSpinBox.setMinimum(1)
+        self.nlpStartsSpinBox.setMaximum(10000)
+        self.nlpStartsSpinBox.setObjectName("nlpStartsSpinBox")
+        self.horizontalLayout.addWidget(self.nlpStartsSpinBox)
+        self.startDesignLabel = QtWidgets.QLabel(self.replayGroupBox)
+        self.startDesignLabel.setObjectName("startDesignLabel")
+        self.horizontalLayout.addWidget(self.startDesignLabel)
+        self.startDesignComboBox = QtWidgets.QComboBox(self.replayGroupBox)
+        self.startDesignComboBox.setObjectName("startDesignComboBox")
+        self.startDesignComboBox.addItem("")
+        self.startDesignComboBox.addItem("")
+        self.horizontalLayout.addWidget(self.startDesignComboBox)
+        self.nlpWorkersLabel = QtWidgets.QLabel(self.replayGroupBox)
+        self.nlpWorkersLabel.setObjectName("nlpWorkersLabel")
+        self.horizontalLayout.addWidget(self.nlpWorkersLabel)
+        self.nlpWorkersSpinBox = QtWidgets.QSpinBox(self.replayGroupBox)
+        self.nlpWorkersSpinBox.setMinimum(1)
+        self.nlpWorkersSpinBox.setMaximum(64)
+        self.nlpWorkersSpinBox.setObjectName("nlpWorkersSpinBox")
+        self.horizontalLayout.addWidget(self.nlpWorkersSpinBox)
+        spacerItem = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout.addItem(spacerItem)
+        self.replayPushButton = QtWidgets.QPushButton(self.replayGroupBox)
+        self.replayPushButton.setObjectName("replayPushButton")
+        self.horizontalLayout.addWidget(self.replayPushButton)
+        self.gridLayout.addWidget(self.replayGroupBox, 2, 0, 1, 1)
+        self.buttonBox = QtWidgets.QDialogButtonBox(Dialog)
+        self.buttonBox.setOrientation(QtCore.Qt.Horizontal)
+        self.buttonBox.setStandardButtons(QtWidgets.QDialogButtonBox.Close)
+        self.buttonBox.setObjectName("buttonBox")
+        self.gridLayout.addWidget(self.buttonBox, 3, 0, 1, 1)
+
+        self.retranslateUi(Dialog)
+        self.tabWidget.setCurrentIndex(0)
+        self.buttonBox.rejected.connect(Dialog.reject) # type: ignore
+        QtCore.QMetaObject.connectSlotsByName(Dialog)
+
+    def retranslateUi(self, Dialog):
+        _translate = QtCore.QCoreApplication.translate
+        Dialog.setWindowTitle(_translate("Dialog", "Optimization telemetry"))
+        self.summaryLabel.setText(_translate("Dialog", "No log loaded."))
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.loggedTab), _translate("Dialog", "Logged run"))
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.replayTab), _translate("Dialog", "Replay"))
+        self.replayGroupBox.setTitle(_translate("Dialog", "Replay (surrogate and NLP steps only, the simulator isn\'t used)"))
+        self.regressionLabel.setText(_translate("Dialog", "Regression:"))
+        self.regressionComboBox.setItemText(0, _translate("Dialog", "Constant"))
+        self.regressionComboBox.setItemText(1, _translate("Dialog", "Linear"))
+        self.regressionComboBox.setItemText(2, _translate("Dialog", "Quadratic"))
+        self.nlpStartsLabel.setText(_translate("Dialog", "NLP starts:"))
+        self.startDesignLabel.setText(_translate("Dialog", "Start points:"))
+        self.startDesignComboBox.setItemText(0, _translate("Dialog", "LHS"))
+        self.startDesignComboBox.setItemText(1, _translate("Dialog", "Sobol"))
+        self.nlpWorkersLabel.setText(_translate("Dialog", "NLP workers:"))
+        self.replayPushButton.setText(_translate("Dialog", "Replay"))
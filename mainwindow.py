@@ -1,16 +1,10 @@
 from gui.views.py_files.mainwindow import Ui_MainWindow
 from gui.models.data_storage import DataStorage
-from gui.calls.tabs.soctab import SocTab
-from gui.calls.tabs.reducedspacetab import ReducedSpaceTab
-from gui.calls.tabs.optimizationtab import OptimizationTab
-from gui.calls.tabs.metamodeltab import MetamodelTab
-from gui.calls.tabs.loadsimtab import LoadSimTab
-from gui.calls.tabs.hessianextractiontab import HessianExtractionTab
-from gui.calls.tabs.doetab import DoeTab
 from PyQt5.QtWidgets import (QApplication, QComboBox, QFileDialog,
                              QItemDelegate, QLineEdit, QMainWindow,
                              QMessageBox)
 from PyQt5.QtCore import QAbstractItemModel, QRegExp, Qt
+import importlib
 import pathlib
 import sys
 
@@ -19,6 +13,7 @@ sys.path.append(str(pathlib.Path(__file__).resolve().parent))
 
 
 class MainWindow(QMainWindow):
+    _LOADSIMTAB_IDX = 0
     _DOETAB_IDX = 1
     _METAMODELTAB_IDX = 2
     _OPTTAB_IDX = 3
@@ -26,6 +21,25 @@ class MainWindow(QMainWindow):
     _HESSIANTAB_IDX = 5
     _SOCTAB_IDX = 6
 
+    # tab index: (attribute name, module, widget class, parent tab widget)
+    _TABS = {
+        _LOADSIMTAB_IDX: ('tab_loadsim', 'gui.calls.tabs.loadsimtab',
+                          'LoadSimTab', 'simulationTab'),
+        _DOETAB_IDX: ('tab_doe', 'gui.calls.tabs.doetab', 'DoeTab',
+                      'samplingTab'),
+        _METAMODELTAB_IDX: ('tab_metamodel', 'gui.calls.tabs.metamodeltab',
+                            'MetamodelTab', 'metamodelTab'),
+        _OPTTAB_IDX: ('tab_optimization', 'gui.calls.tabs.optimizationtab',
+                      'OptimizationTab', 'optimizationTab'),
+        _REDSPACETAB_IDX: ('tab_reducedspace',
+                           'gui.calls.tabs.reducedspacetab',
+                           'ReducedSpaceTab', 'reducedspaceTab'),
+        _HESSIANTAB_IDX: ('tab_hessianext',
+                          'gui.calls.tabs.hessianextractiontab',
+                          'HessianExtractionTab', 'hessianextractionTab'),
+        _SOCTAB_IDX: ('tab_soc', 'gui.calls.tabs.soctab', 'SocTab', 'socTab')
+    }
+
     def __init__(self):
         # ------------------------- UI Initialization -------------------------
         super().__init__()
@@ -47,20 +61,13 @@ class MainWindow(QMainWindow):
         self.application_database = DataStorage()
 
         # ----------------------- Load the tabs widgets -----------------------
-        self.tab_loadsim = LoadSimTab(self.application_database,
-                                      parent_tab=self.ui.simulationTab)
-        self.tab_doe = DoeTab(self.application_database,
-                              parent_tab=self.ui.samplingTab)
-        self.tab_metamodel = MetamodelTab(self.application_database,
-                                          parent_tab=self.ui.metamodelTab)
-        self.tab_optimization = OptimizationTab(self.application_database,
-                                                parent_tab=self.ui.optimizationTab)
-        self.tab_reducedspace = ReducedSpaceTab(self.application_database,
-                                                parent_tab=self.ui.reducedspaceTab)
-        self.tab_hessianext = HessianExtractionTab(self.application_database,
-                                                   parent_tab=self.ui.hessianextractionTab)
-        self.tab_soc = SocTab(self.application_database,
-                              parent_tab=self.ui.socTab)
+        # only the tab displayed is built now, the others (and the modules
+        # they import) are loaded when first activated
+        for attr_name, *_ in self._TABS.values():
+            setattr(self, attr_name, None)
+
+        self.load_tab(maintab.currentIndex())
+        maintab.currentChanged.connect(self.load_tab)
 
         # ------------------------ Actions connections ------------------------
         self.ui.actionOpen.triggered.connect(self.open_file)
@@ -89,6 +96,36 @@ class MainWindow(QMainWindow):
             self.on_soc_enabled
         )
 
+    def load_tab(self, index: int):
+        """Builds the widget of the tab at `index`, if not built yet. The tab
+        module is imported here, so the numerical packages used by each stage
+        are not loaded before the window is displayed.
+
+        Parameters
+        ----------
+        index : int
+            Index of the tab in the main tab widget.
+
+        Returns
+        -------
+        QWidget or None
+            The tab widget. None if `index` is not a tab (e.g. -1).
+        """
+        if index not in self._TABS:
+            return None
+
+        attr_name, module_name, class_name, parent_name = self._TABS[index]
+        tab = getattr(self, attr_name)
+
+        if tab is None:
+            tab_class = getattr(importlib.import_module(module_name),
+                                class_name)
+            tab = tab_class(self.application_database,
+                            parent_tab=getattr(self.ui, parent_name))
+            setattr(self, attr_name, tab)
+
+        return tab
+
     def open_file(self):
         """Prompts the user to select which .mtc file to open.
         """
@@ -152,6 +189,15 @@ class MainWindow(QMainWindow):
     def on_soc_enabled(self, is_enabled):
         self.ui.tabMainWidget.setTabEnabled(self._SOCTAB_IDX, is_enabled)
 
+    def closeEvent(self, event):
+        # close the simulation sessions kept warm for the stages, if any was
+        # opened (the module is only loaded by the stages that simulate)
+        sim_connections = sys.modules.get('gui.models.sim_connections')
+        if sim_connections is not None:
+            sim_connections.close_shared_sessions()
+
+        super().closeEvent(event)
+
 
 if __name__ == "__main__":
     from gui.calls.base import my_exception_hook
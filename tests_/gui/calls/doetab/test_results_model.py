@@ -0,0 +1,187 @@
+import time
+
+import numpy as np
+import pandas as pd
+from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtWidgets import QApplication
+
+from gui.calls.base import CellTextCache
+from gui.calls.dialogs.samplingassistant import (SampledDataTableModel,
+                                                 SampledDataView)
+from gui.calls.tabs.doetab import DoeResultsModel, DoeResultsView
+from gui.models.data_storage import AliasIndex, DataStorage
+
+app = QApplication.instance() or QApplication([])
+
+
+class ResultsStorage(QObject):
+    """Minimal application data with the tables used by the results models."""
+    doe_sampled_data_changed = pyqtSignal()
+
+    _INPUT_ALIAS_TYPES = DataStorage._INPUT_ALIAS_TYPES
+    _OUTPUT_ALIAS_TYPES = DataStorage._OUTPUT_ALIAS_TYPES
+    _EXPR_ALIAS_TYPES = DataStorage._EXPR_ALIAS_TYPES
+
+    def __init__(self, n_rows: int = 10, n_inp: int = 2, n_out: int = 3):
+        super().__init__()
+        inputs = ['x{0}'.format(i) for i in range(n_inp)]
+        outputs = ['y{0}'.format(i) for i in range(n_out)]
+
+        self.input_table_data = pd.DataFrame(
+            {'Alias': inputs,
+             'Type': self._INPUT_ALIAS_TYPES['mv']})
+        self.output_table_data = pd.DataFrame(
+            {'Alias': outputs,
+             'Type': self._OUTPUT_ALIAS_TYPES['cv']})
+        self.expression_table_data = pd.DataFrame(
+            {'Alias': ['f'], 'Type': self._EXPR_ALIAS_TYPES['obj']})
+
+        rng = np.random.RandomState(0)
+        self.doe_sampled_data = pd.DataFrame(
+            rng.standard_normal((n_rows, n_inp + n_out + 1)),
+            columns=inputs + outputs + ['f'])
+        self.doe_sampled_data.insert(0, 'status', 'ok')
+        self.doe_sampled_data.insert(0, 'case', np.arange(1, n_rows + 1))
+
+        self.doe_lhs_settings = {'n_samples': n_rows, 'n_iter': 5,
+                                 'inc_vertices': False}
+        self.doe_mv_bounds = pd.DataFrame({'name': inputs, 'lb': 0.0,
+                                           'ub': 1.0})
+
+    @property
+    def alias_index(self):
+        # tables are set directly here, so the index is never memoised
+        return AliasIndex(
+            tables={'input': self.input_table_data,
+                    'output': self.output_table_data,
+                    'expression': self.expression_table_data},
+            type_names={'input': self._INPUT_ALIAS_TYPES,
+                        'output': self._OUTPUT_ALIAS_TYPES,
+                        'expression': self._EXPR_ALIAS_TYPES})
+
+
+def test_cell_text_cache():
+    values = np.array([[1.0, np.nan], [2.0, 3.0]])
+    cache = CellTextCache(max_rows=1)
+    cache.set_values(values)
+
+    assert cache.text(0, 0) == "1.0000000" and cache.text(0, 1) is None
+
+    # cached strings are kept until the row is invalidated
+    values[0, 0] = 5.0
+    assert cache.text(0, 0) == "1.0000000"
+    cache.invalidate_rows(0)
+    assert cache.text(0, 0) == "5.0000000"
+
+    # only the last row displayed is kept
+    assert cache.text(1, 1) == "3.0000000"
+    values[0, 0] = 6.0
+    assert cache.text(0, 0) == "6.0000000"
+
+
+def test_doe_results_model():
+    storage = ResultsStorage()
+    model = DoeResultsModel(storage)
+    doe_data = storage.doe_sampled_data
+
+    assert model.rowCount() == 10 + 2 and model.columnCount() == 6 + 2
+    assert model.index(0, 2).data() == "Inputs - Manipulated"
+    assert model.index(0, 7).data() == "Objective"
+    assert model.span(model.index(0, 4)).width() == 3
+    assert model.index(1, 7).data() == 'f'
+    assert model.index(2, 0).data() == '1'
+    assert model.index(2, 1).data() == 'ok'
+    assert model.index(3, 4).data() == "{0:.7f}".format(doe_data.at[1, 'y0'])
+
+    # the application data is not modified nor copied into the model
+    assert 'case' in doe_data and 'status' in doe_data
+
+    doe_data.loc[1, 'y0'] = 1.5
+    storage.doe_sampled_data_changed.emit()
+    assert model.index(3, 4).data() == "1.5000000"
+
+
+def test_sampling_assistant_model():
+    storage = ResultsStorage(n_rows=4)
+    model = SampledDataTableModel(storage, parent=None)
+
+    assert not model.is_input_design_generated
+    assert model.get_doe_data().empty
+
+    model.input_design = pd.DataFrame(np.full((4, 2), 0.5),
+                                      columns=['x0', 'x1'])
+    assert model.is_input_design_generated
+    assert model.rowCount() == 4 + 2 and model.columnCount() == 2 + 2 + 3
+
+    model.on_case_sampled(2, {'success': 'ok', 'y2': 3.0, 'y0': 1.0,
+                              'y1': None})
+    assert model.index(3, 1).data() == 'ok'
+    assert model.index(3, 4).data() == "1.0000000"
+    assert model.index(3, 5).data() is None
+    assert model.index(3, 6).data() == "3.0000000"
+
+    doe = model.get_doe_data()
+    assert doe.columns.tolist() == ['case', 'status', 'x0', 'x1', 'y0', 'y1',
+                                    'y2']
+    assert doe.at[1, 'y2'] == 3.0 and np.isnan(doe.at[0, 'y0'])
+
+
+def test_case_sampled_updates_only_its_cells():
+    storage = ResultsStorage(n_rows=100)
+    model = SampledDataTableModel(storage, parent=None)
+    model.input_design = pd.DataFrame(np.full((100, 2), 0.5),
+                                      columns=['x0', 'x1'])
+    changed = []
+    model.dataChanged.connect(
+        lambda tl, br, roles: changed.append((tl.row(), tl.column(),
+                                              br.row(), br.column())))
+
+    model.on_case_sampled(50, {'success': 'ok', 'y0': 1.0, 'y1': 2.0,
+                               'y2': 3.0})
+
+    assert changed == [(51, 0, 51, 1), (51, 4, 51, 6)]
+
+
+def test_views_span_header_only():
+    storage = ResultsStorage(n_rows=100)
+    view = DoeResultsView()
+    view.setModel(DoeResultsModel(storage, parent=view))
+
+    assert view.rowSpan(0, 0) == 2 and view.columnSpan(0, 2) == 2
+    assert view.columnSpan(0, 4) == 3 and view.columnSpan(0, 7) == 1
+
+    # spans follow the model when it is reset
+    model = SampledDataTableModel(storage, parent=None)
+    sampling_view = SampledDataView()
+    sampling_view.setModel(model)
+    assert sampling_view.columnSpan(0, 4) == 3
+
+    storage.output_table_data = storage.output_table_data.iloc[:2]
+    model.load_data()
+    model.input_design = pd.DataFrame(np.ones((100, 2)),
+                                      columns=['x0', 'x1'])
+    assert sampling_view.columnSpan(0, 4) == 2
+
+
+def main():
+    # rough timing of the display of a 10000 x 80 results grid, scrolled page
+    # by page (30 rows each) twice: first with an empty cache, then cached
+    storage = ResultsStorage(n_rows=10000, n_inp=10, n_out=69)
+    start = time.perf_counter()
+    model = DoeResultsModel(storage)
+    print("load: {0:.3f} ms".format((time.perf_counter() - start) * 1e3))
+
+    for label in ['first pass', 'cached pass']:
+        start = time.perf_counter()
+        for first_row in range(2, model.rowCount(), 30):
+            for row in range(first_row, min(first_row + 30,
+                                            model.rowCount())):
+                for col in range(model.columnCount()):
+                    model.data(model.index(row, col))
+        elapsed = time.perf_counter() - start
+        print("{0:>11}: {1:.3f} ms per page".format(
+            label, elapsed * 1e3 / (model.rowCount() / 30)))
+
+
+if __name__ == "__main__":
+    main()
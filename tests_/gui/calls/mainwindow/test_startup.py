@@ -0,0 +1,88 @@
+import pathlib
+import subprocess
+import sys
+import time
+
+from PyQt5.QtWidgets import QApplication
+
+from mainwindow import MainWindow
+
+app = QApplication.instance() or QApplication([])
+
+REPO_DIR = pathlib.Path(__file__).parents[4]
+
+# packages that must not be imported before the window is displayed
+HEAVY_MODULES = ['matplotlib', 'sklearn', 'pydace', 'surropt', 'pysoc',
+                 'win32com', 'pythoncom']
+
+# builds the main window in a fresh interpreter and reports the time taken
+# and which heavy packages were imported
+STARTUP_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+from PyQt5.QtWidgets import QApplication
+from mainwindow import MainWindow
+app = QApplication(['metacontrol', '-platform', 'offscreen'])
+w = MainWindow()
+{build_tabs}
+app.processEvents()
+print(time.perf_counter() - start)
+print(' '.join(sorted(m for m in {heavy} if m in sys.modules)))
+"""
+
+
+def _cold_start(build_tabs: bool = False) -> tuple:
+    script = STARTUP_SCRIPT.format(
+        heavy=HEAVY_MODULES,
+        build_tabs="[w.load_tab(i) for i in w._TABS]" if build_tabs else "")
+    out = subprocess.run([sys.executable, '-c', script], cwd=str(REPO_DIR),
+                         stdout=subprocess.PIPE, check=True,
+                         universal_newlines=True).stdout.splitlines()
+    return float(out[-2]), out[-1].split()
+
+
+def test_heavy_modules_not_imported_at_startup():
+    _, imported = _cold_start()
+
+    assert imported == []
+
+
+def test_tabs_built_on_first_activation():
+    w = MainWindow()
+    maintab = w.ui.tabMainWidget
+
+    assert w.tab_loadsim is not None
+    assert all(getattr(w, attr_name) is None
+               for attr_name, *_ in list(w._TABS.values())[1:])
+
+    maintab.setCurrentIndex(w._REDSPACETAB_IDX)
+    tab = w.tab_reducedspace
+    assert tab is not None and w.tab_doe is None
+
+    # activating again does not rebuild the tab
+    maintab.setCurrentIndex(w._LOADSIMTAB_IDX)
+    maintab.setCurrentIndex(w._REDSPACETAB_IDX)
+    assert w.tab_reducedspace is tab
+
+
+def test_late_tab_shows_stored_data():
+    w = MainWindow()
+    storage = w.application_database
+    storage.differential_gy = {'u1': {'y1': 1.0, 'y2': 2.0}}
+
+    tab = w.load_tab(w._HESSIANTAB_IDX)
+
+    assert tab.ui.gyTableView.model().rowCount() == 2
+
+
+def main():
+    # rough cold start timing: window with only the first tab built against
+    # the window with every tab built (as before)
+    for label, build_tabs in [('lazy tabs', False), ('all tabs', True)]:
+        elapsed, imported = _cold_start(build_tabs)
+        print("{0:>9}: {1:7.1f} ms, heavy modules: {2}".format(
+            label, elapsed * 1e3, ', '.join(imported) or '-'))
+
+
+if __name__ == "__main__":
+    main()
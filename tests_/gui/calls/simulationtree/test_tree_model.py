@@ -0,0 +1,40 @@
+from PyQt5.QtCore import QModelIndex, Qt
+
+from gui.calls.dialogs.simulationtree import SimulationTreeModel
+
+TREE = {'node': 'Data', 'children': [
+    {'node': 'B1', 'lazy': True},
+    {'node': 'B2', 'lazy': True},
+    {'node': 'TEMP', 'value': 300.0}]}
+
+
+def _model():
+    model = SimulationTreeModel('Input variables', 'input')
+    model.set_tree({'node': TREE['node'],
+                    'children': [dict(child) for child in TREE['children']]})
+    return model
+
+
+def _child(model, *rows):
+    index = QModelIndex()
+    for row in rows:
+        index = model.index(row, 0, index)
+    return index
+
+
+def test_fetched_branches():
+    model = _model()
+    b1, b2, temp = [_child(model, 0, row) for row in range(3)]
+    assert model.is_leaf(temp) and not model.is_leaf(b1)
+
+    model.insert_branch('\\Data\\B1', {'node': 'B1', 'children': [
+        {'node': 'FEED', 'value': 1.0}]})
+    assert model.rowCount(b1) == 1 and model.is_leaf(_child(model, 0, 0, 0))
+
+    # a branch with no children is still a branch and can't be selected
+    model.insert_branch('\\Data\\B2', {'node': 'B2'})
+    assert model.rowCount(b2) == 0 and not model.hasChildren(b2)
+    assert not model.is_leaf(b2)
+    assert not model.flags(b2) & Qt.ItemIsSelectable
+    assert model.flags(b1) & Qt.ItemIsSelectable
+    assert model.flags(temp) & Qt.ItemIsSelectable
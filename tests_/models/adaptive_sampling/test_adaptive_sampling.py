@@ -0,0 +1,181 @@
+import time
+
+import numpy as np
+import pytest
+from scipy.linalg import cholesky, qr, solve_triangular
+
+from gui.models.adaptive_sampling import (AdaptiveSampler, imse_reduction,
+                                          kriging_variance)
+from gui.models.incremental_kriging import IncrementalKriging
+from gui.models.space_filling import random_lhs, scale_to_bounds
+
+
+class FixedThetaKriging:
+    """Ordinary kriging with fixed correlation parameters and the fitted
+    attributes of `pydace.Dace` (`S`, `_Ssc`, `theta` and the factorization
+    terms 'C', 'Ft' and 'G' of `_fitpar`)."""
+
+    def __init__(self, regression='poly0'):
+        self.regression = regression
+
+    def fit(self, S, Y, theta0, lob, upb):
+        S = np.asarray(S, dtype=float)
+        Y = np.asarray(Y, dtype=float).flatten()
+        self._Ssc = np.vstack((S.mean(axis=0), S.std(axis=0)))
+        self.S = (S - self._Ssc[0]) / self._Ssc[1]
+        self.theta = 2.0 * np.asarray(theta0, dtype=float)
+
+        R = self._corr(self.S) + 1e-10 * np.eye(S.shape[0])
+        ones = np.ones(S.shape[0])
+        self.mean = ones @ np.linalg.solve(R, Y) / \
+            (ones @ np.linalg.solve(R, ones))
+        self.gamma = np.linalg.solve(R, Y - self.mean)
+
+        C = cholesky(R, lower=True)
+        Ft = solve_triangular(C, ones[:, None], lower=True)
+        self._fitpar = {'C': C, 'Ft': Ft, 'G': qr(Ft, mode='economic')[1]}
+
+    def _corr(self, xs):
+        d = xs[:, None, :] - self.S[None, :, :]
+        return np.exp(-(self.theta * d ** 2).sum(axis=2))
+
+    def predict(self, X, compute_jacobian=False):
+        xs = (np.atleast_2d(X) - self._Ssc[0]) / self._Ssc[1]
+        return (self.mean + self._corr(xs) @ self.gamma)[:, None], None
+
+
+def _outputs(x):
+    return np.column_stack((np.sin(3 * x[:, 0]) + x[:, 1] ** 2,
+                            np.exp(-x[:, 0]) * x[:, 1]))
+
+
+def _simulate(calls):
+    def simulate(points):
+        calls.append(points.shape[0])
+        return _outputs(points), np.ones(points.shape[0], dtype=bool)
+
+    return simulate
+
+
+def _model(n=15):
+    x = scale_to_bounds(random_lhs(n, 2, 0), [0, 0], [2, 2])
+    model = FixedThetaKriging()
+    model.fit(x, _outputs(x)[:, 0], np.ones(2), None, None)
+    return x, model
+
+
+def test_variance_vanishes_at_the_samples():
+    x, model = _model()
+
+    np.testing.assert_allclose(kriging_variance(model, x), 0.0, atol=1e-6)
+    assert kriging_variance(model, [[50.0, 50.0]])[0] > 0.99
+
+    # the largest reduction of the integrated variance is far from the data
+    candidates = np.vstack((x[:1] + 1e-3, [[1.9, 0.05]]))
+    reduction = imse_reduction(model, candidates)
+    assert reduction[1] > reduction[0] >= 0
+
+
+def test_variance_of_the_fitted_factorization():
+    x = scale_to_bounds(random_lhs(25, 2, 0), [0, 0], [2, 2])
+    model = IncrementalKriging('poly1', model_factory=FixedThetaKriging,
+                               drift_tol=np.inf)
+    model.fit(x[:20], _outputs(x[:20])[:, 0], np.ones(2), None, None)
+    model.append(x[20:], _outputs(x[20:])[:, 0])
+
+    # DACE mse (divided by the process variance) from a new factorization
+    points = scale_to_bounds(random_lhs(10, 2, 1), [0, 0], [2, 2])
+    xs = (points - model._Ssc[0]) / model._Ssc[1]
+    d = model.S[:, None, :] - model.S[None, :, :]
+    R = np.exp(-(model.theta * d ** 2).sum(axis=2)) + \
+        model._nugget * np.eye(25)
+    r = np.exp(-(model.theta * (xs[:, None, :] - model.S) ** 2).sum(axis=2))
+    F = np.column_stack((np.ones(25), model.S))
+    f = np.column_stack((np.ones(10), xs))
+    u = F.T @ np.linalg.solve(R, r.T) - f.T
+    expected = 1.0 + (u * np.linalg.solve(
+        F.T @ np.linalg.solve(R, F), u)).sum(axis=0) - \
+        (r.T * np.linalg.solve(R, r.T)).sum(axis=0)
+
+    np.testing.assert_allclose(kriging_variance(model, points), expected,
+                               atol=1e-8)
+    np.testing.assert_allclose(kriging_variance(model, x), 0.0, atol=1e-6)
+
+
+@pytest.mark.parametrize('criterion', ['mse', 'imse'])
+def test_adaptive_sampling_reaches_target(criterion):
+    calls = []
+    sampler = AdaptiveSampler([0, 0], [2, 2], _simulate(calls), n_initial=8,
+                              batch_size=4, max_samples=80,
+                              target_error=0.02, criterion=criterion,
+                              n_candidates=300,
+                              surrogate_factory=FixedThetaKriging,
+                              random_state=0)
+    sampler.run()
+
+    assert sampler.converged
+    assert sampler.x.shape[0] == sum(calls) < 80
+    assert calls[0] == 8 and all(n == 4 for n in calls[1:])
+    assert sampler.history[-1]['error'] <= 0.02
+
+    # batch points are spread: no two closer than 1% of the range
+    d = np.sqrt(((sampler.x[:, None] - sampler.x[None]) ** 2).sum(axis=2))
+    assert d[np.triu_indices(d.shape[0], 1)].min() > 0.02
+
+
+def test_failed_cases_and_budget():
+    def simulate(points):
+        # the cases with x0 > 1.5 don't converge
+        return _outputs(points), points[:, 0] <= 1.5
+
+    sampler = AdaptiveSampler([0, 0], [2, 2], simulate, n_initial=6,
+                              batch_size=5, max_samples=18,
+                              target_error=0.0,
+                              surrogate_factory=FixedThetaKriging,
+                              random_state=1)
+    sampler.run()
+
+    assert sampler.x.shape[0] == 18 and not sampler.converged
+    assert sampler.status.sum() == (sampler.x[:, 0] <= 1.5).sum()
+
+    with pytest.raises(ValueError):
+        AdaptiveSampler([0], [1], simulate, criterion='ei')
+
+
+def _test_error(x, x_test):
+    # largest RMSE (relative to the output range) of models fitted to x
+    y, y_test = _outputs(x), _outputs(x_test)
+    span = y_test.max(axis=0) - y_test.min(axis=0)
+    errors = []
+    for j in range(y.shape[1]):
+        model = FixedThetaKriging()
+        model.fit(x, y[:, j], np.ones(2), None, None)
+        pred = model.predict(x_test)[0].flatten()
+        errors.append(np.sqrt(((pred - y_test[:, j]) ** 2).mean()) / span[j])
+
+    return max(errors)
+
+
+def main():
+    # test error of the models of the adaptive design (stopped at a 1%
+    # validation error) against one-shot latin hypercubes of several sizes
+    x_test = scale_to_bounds(random_lhs(2000, 2, 99), [0, 0], [2, 2])
+    sampler = AdaptiveSampler([0, 0], [2, 2], _simulate([]), n_initial=8,
+                              batch_size=4, max_samples=200,
+                              target_error=0.01,
+                              surrogate_factory=FixedThetaKriging,
+                              random_state=0)
+    start = time.perf_counter()
+    sampler.run()
+    elapsed = time.perf_counter() - start
+    print("adaptive: {0:4d} samples, test error {1:.4f} ({2:.2f} s)".format(
+        sampler.x.shape[0], _test_error(sampler.x, x_test), elapsed))
+
+    for n in [20, 40, 80, 160]:
+        x = scale_to_bounds(random_lhs(n, 2, n), [0, 0], [2, 2])
+        print("one-shot: {0:4d} samples, test error {1:.4f}".format(
+            n, _test_error(x, x_test)))
+
+
+if __name__ == "__main__":
+    main()
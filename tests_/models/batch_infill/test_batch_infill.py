@@ -0,0 +1,268 @@
+import pickle
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from gui.models.batch_infill import BatchCaballero
+from gui.models.sim_connections import SimulationSessionPool
+
+# seconds taken by each fake simulation in the timing comparison
+CASE_TIME = 0.02
+
+
+class FakeConnection:
+    """Stand-in of `AspenConnection` that records the thread it was used on."""
+    opened = []
+
+    def __init__(self, file_path):
+        self.thread = threading.get_ident()
+        self.closed = False
+        FakeConnection.opened.append(self)
+
+    def get_connection_object(self):
+        return self
+
+    def close_connection(self):
+        self.closed = True
+
+
+class RbfModel:
+    """Gaussian RBF interpolator with the `Dace` fit/predict interface."""
+
+    def __init__(self, regression):
+        self.regression = regression
+
+    def fit(self, S, Y, theta0, lob, upb):
+        self.S = np.asarray(S)
+        self.theta = np.full(self.S.shape[1], 2.0)
+        self.mean = np.mean(Y)
+        K = self._kernel(self.S) + 1e-10 * np.eye(self.S.shape[0])
+        self.w = np.linalg.solve(K, np.asarray(Y) - self.mean)
+
+    def _kernel(self, X):
+        d = X[:, None, :] - self.S[None, :, :]
+        return np.exp(-2.0 * (d ** 2).sum(axis=2))
+
+    def predict(self, X, compute_jacobian=False):
+        k = self._kernel(X)
+        y = self.mean + k @ self.w
+        d = X[:, None, :] - self.S[None, :, :]
+        dy = (-4.0 * d * (k * self.w)[:, :, None]).sum(axis=1)
+        return y, dy
+
+
+def _problem(x):
+    # minimum of the objective at (0.5, 0.5), constraint active at x0 = 0.75
+    f = (x[0] - 0.5) ** 2 + (x[1] - 0.5) ** 2
+    g = [0.75 - x[0]]
+    return f, g
+
+
+def _model_function(calls):
+    def model_function(points):
+        calls.append(len(points))
+        results = []
+        for point in points:
+            f, g = _problem(point)
+            results.append({'status': True, 'f': f, 'g': g, 'extras': []})
+        return results
+
+    return model_function
+
+
+def _initial_data(n=12):
+    rng = np.random.RandomState(1)
+    x = rng.rand(n, 2)
+    f, g = zip(*[_problem(point) for point in x])
+    return x, np.array(g), np.array(f)
+
+
+def test_pool_runs_jobs_on_every_session():
+    FakeConnection.opened.clear()
+    barrier = threading.Barrier(3, timeout=5)
+
+    def job(connection, value):
+        # only passes if the three sessions run at the same time
+        barrier.wait()
+        return value, connection.thread
+
+    with SimulationSessionPool('fake.bkp', 3,
+                               connection_factory=FakeConnection) as pool:
+        results = pool.map(job, [1, 2, 3])
+
+    assert [value for value, _ in results] == [1, 2, 3]
+    assert len({thread for _, thread in results}) == 3
+    assert len(FakeConnection.opened) == 3
+    assert all(con.closed for con in FakeConnection.opened)
+
+
+def test_pool_propagates_errors():
+    def job(connection):
+        raise ValueError("Simulation failed.")
+
+    with SimulationSessionPool('fake.bkp', 2,
+                               connection_factory=FakeConnection) as pool:
+        try:
+            pool.submit(job).result()
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("Session error not propagated.")
+
+        # the session keeps serving after the error
+        assert pool.submit(lambda con: 1).result() == 1
+
+
+def test_batch_optimization():
+    x, g, f = _initial_data()
+    calls = []
+    opt = BatchCaballero(x, g, f, _model_function(calls), lb=[0, 0],
+                         ub=[1, 1], batch_size=3, max_fun_evals=30,
+                         surrogate_factory=RbfModel, random_state=0)
+    opt.optimize()
+
+    assert opt.fun_evals == sum(calls) <= 30
+    assert all(n == 3 for n in calls[:-1])
+    assert opt.x.shape[0] == 12 + opt.fun_evals
+    np.testing.assert_allclose(opt.xopt, [0.75, 0.5], atol=5e-2)
+    assert opt.gopt[0] <= 1e-2
+
+
+def test_multistart_infill():
+    x, g, f = _initial_data()
+    messages = []
+    opt = BatchCaballero(x, g, f, _model_function([]), lb=[0, 0], ub=[1, 1],
+                         batch_size=2, max_fun_evals=10, n_starts=6,
+                         start_design='sobol', report=messages.append,
+                         term_tol=0.0, contraction_tol=1e-8,
+                         surrogate_factory=RbfModel, random_state=0)
+    opt.optimize()
+
+    # every surrogate NLP has its wall time per start reported
+    assert len(opt.start_times) % 6 == 0 and len(opt.start_times) >= 30
+    assert sum('NLP starts' in msg for msg in messages) == \
+        len(opt.start_times) // 6
+    assert opt.fun_evals == 10
+
+
+def test_incremental_surrogates():
+    x, g, f = _initial_data()
+    opt = BatchCaballero(x, g, f, _model_function([]), lb=[0, 0], ub=[1, 1],
+                         batch_size=3, max_fun_evals=30, incremental=True,
+                         surrogate_factory=RbfModel, random_state=0)
+    opt.optimize()
+
+    np.testing.assert_allclose(opt.xopt, [0.75, 0.5], atol=5e-2)
+
+    # the believed and sampled points are appended, with few refits
+    models = opt._models
+    assert len(models) == 2 and models[0].n_updates > 10
+    assert models[0].n_refits < opt.fun_evals // 3
+    assert models[0].n_samples == opt.x.shape[0] - 3
+    assert opt.options()['incremental']
+
+
+def test_batch_points_are_distinct():
+    x, g, f = _initial_data()
+    opt = BatchCaballero(x, g, f, _model_function([]), lb=[0, 0], ub=[1, 1],
+                         batch_size=4, surrogate_factory=RbfModel,
+                         random_state=0)
+
+    batch, f_pred, g_pred = opt._infill_batch(np.zeros(2), np.ones(2), 4,
+                                              x[0])
+    distances = np.abs(batch[:, None, :] - batch[None, :, :]).max(axis=2)
+
+    assert batch.shape == (4, 2)
+    assert f_pred.shape == (4,) and g_pred.shape == (4, 1)
+    assert distances[np.triu_indices(4, 1)].min() > 1e-6
+
+
+def test_believed_points_keep_the_hyperparameters():
+    fits = []
+
+    class CountedRbf(RbfModel):
+        def fit(self, S, Y, theta0, lob, upb):
+            fits.append(len(S))
+            super().fit(S, Y, theta0, lob, upb)
+
+    x, g, f = _initial_data()
+    opt = BatchCaballero(x, g, f, _model_function([]), lb=[0, 0], ub=[1, 1],
+                         batch_size=4, surrogate_factory=CountedRbf,
+                         random_state=0)
+    opt._infill_batch(np.zeros(2), np.ones(2), 4, x[0])
+
+    # one fit per output for the whole batch, on the sampled data only
+    assert fits == [12, 12]
+
+
+def test_nlp_options():
+    x, g, f = _initial_data()
+    opt = BatchCaballero(x, g, f, _model_function([]), lb=[0, 0], ub=[1, 1],
+                         nlp_options={'tol': 1e-8, 'max_iter': 50},
+                         surrogate_factory=RbfModel)
+    assert opt.options()['nlp_options'] == {'tol': 1e-8, 'max_iter': 50}
+
+    # the IPOPT options of the surropt procedure are not silently ignored
+    with pytest.raises(ValueError):
+        BatchCaballero(x, g, f, _model_function([]), lb=[0, 0], ub=[1, 1],
+                       nlp_options={'tol': 1e-8, 'con_tol': 1e-4})
+
+
+class PicklingExecutor:
+    """Executor stand-in that sends the jobs through pickle, as a process
+    pool does, and records the size of the function sent."""
+    _max_workers = 2
+
+    def map(self, fn, *iterables, chunksize=1):
+        self.sent = len(pickle.dumps(fn))
+        return map(pickle.loads(pickle.dumps(fn)), *iterables)
+
+
+def test_multistart_workers_get_the_kriging_parameters():
+    x, g, f = _initial_data(40)
+    lb, ub = np.zeros(2), np.ones(2)
+    opt = BatchCaballero(x, g, f, _model_function([]), lb=lb, ub=ub,
+                         n_starts=4, surrogate_factory=RbfModel,
+                         random_state=0)
+    models = opt._fit()
+    serial = opt._surrogate_optima(models, lb, ub, x[0])
+
+    opt._rng = np.random.RandomState(0)
+    opt._executor = PicklingExecutor()
+    pooled = opt._surrogate_optima(models, lb, ub, x[0])
+
+    np.testing.assert_allclose(pooled, serial, atol=1e-6)
+    assert opt._executor.sent < len(pickle.dumps(models)) / 4
+
+
+def main():
+    # wall time of the same evaluation budget with one point per iteration
+    # (one session) against batches of 4 points simulated over 4 sessions
+    def simulate(connection, point):
+        time.sleep(CASE_TIME)
+        f, g = _problem(point)
+        return {'status': True, 'f': f, 'g': g, 'extras': []}
+
+    for batch_size in [1, 4]:
+        x, g, f = _initial_data()
+        with SimulationSessionPool('fake.bkp', batch_size,
+                                   connection_factory=FakeConnection) as pool:
+            opt = BatchCaballero(
+                x, g, f, lambda points: pool.map(simulate, points),
+                lb=[0, 0], ub=[1, 1], batch_size=batch_size,
+                max_fun_evals=32, contraction_tol=1e-8, term_tol=0.0,
+                surrogate_factory=RbfModel, random_state=0)
+
+            start = time.perf_counter()
+            opt.optimize()
+            elapsed = time.perf_counter() - start
+
+        print("batch {0}: {1:3d} evaluations in {2:6.3f} s ({3:5.1f} ms each)"
+              ", f = {4:.6f}".format(batch_size, opt.fun_evals, elapsed,
+                                     elapsed * 1e3 / opt.fun_evals, opt.fopt))
+
+
+if __name__ == "__main__":
+    main()
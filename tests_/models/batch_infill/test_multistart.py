@@ -0,0 +1,97 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from gui.models.batch_infill import (multistart_nlp, solve_surrogate_nlp,
+                                     start_points)
+
+
+class MultimodalModel:
+    """Fitted surrogate stand-in: f(x) = sum(x^2 - 0.5 cos(3 pi x)), local
+    minima near every integer of each coordinate, global minimum at 0."""
+
+    def predict(self, X, compute_jacobian=False):
+        X = np.atleast_2d(X)
+        y = (X ** 2 - 0.5 * np.cos(3 * np.pi * X)).sum(axis=1)
+        dy = 2 * X + 1.5 * np.pi * np.sin(3 * np.pi * X)
+        return y, dy
+
+
+class LinearConstraintModel:
+    """g(x) = 0.3 - x[0] (feasible for x[0] >= 0.3)."""
+
+    def predict(self, X, compute_jacobian=False):
+        X = np.atleast_2d(X)
+        dy = np.zeros_like(X)
+        dy[:, 0] = -1.0
+        return 0.3 - X[:, 0], dy
+
+
+LB = [-2.0, -2.0]
+UB = [2.0, 2.0]
+
+
+def test_single_starts_are_local():
+    # single starts end in different local minima
+    fs = [solve_surrogate_nlp([MultimodalModel()], x0, LB, UB)['f']
+          for x0 in start_points(16, LB, UB, design='sobol')]
+
+    assert max(fs) - min(fs) > 0.5
+
+
+def test_multistart_finds_global_and_dedups():
+    starts = start_points(40, LB, UB, design='sobol')
+    res = multistart_nlp([MultimodalModel()], LB, UB, starts)
+    solutions = res['solutions']
+
+    np.testing.assert_allclose(solutions[0]['x'], [0, 0], atol=1e-4)
+    assert res['start_times'].shape == (40,)
+    assert sum(sol['n_starts'] for sol in solutions) <= 40
+    assert len(solutions) < 40
+
+    # distinct solutions, best merit first
+    fs = [sol['f'] for sol in solutions]
+    assert fs == sorted(fs)
+    xs = np.array([sol['x'] for sol in solutions])
+    dist = np.abs(xs[:, None, :] - xs[None, :, :]).max(axis=2)
+    assert dist[np.triu_indices(len(xs), 1)].min() >= 1e-4 * 4
+
+
+def test_multistart_constrained_in_processes():
+    models = [MultimodalModel(), LinearConstraintModel()]
+    starts = start_points(16, LB, UB, design='lhs', random_state=0)
+
+    serial = multistart_nlp(models, LB, UB, starts)
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        parallel = multistart_nlp(models, LB, UB, starts, executor=executor)
+
+    best = serial['solutions'][0]
+    assert best['g'][0] <= 1e-6 and best['x'][0] >= 0.3 - 1e-6
+    np.testing.assert_allclose(parallel['solutions'][0]['x'], best['x'])
+    assert len(parallel['solutions']) == len(serial['solutions'])
+
+
+def main():
+    # wall time of 256 starts in sequence and in a pool of 4 processes
+    models = [MultimodalModel(), LinearConstraintModel()]
+    lb, ub = [-2.0] * 8, [2.0] * 8
+    starts = start_points(256, lb, ub, design='sobol')
+
+    start = time.perf_counter()
+    res = multistart_nlp(models, lb, ub, starts)
+    print("serial:      {0:7.3f} s, {1:6.2f} ms per start, {2} optima".format(
+        time.perf_counter() - start, res['start_times'].mean() * 1e3,
+        len(res['solutions'])))
+
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        start = time.perf_counter()
+        res = multistart_nlp(models, lb, ub, starts, executor=executor)
+        print("4 processes: {0:7.3f} s, {1:6.2f} ms per start, {2} optima"
+              .format(time.perf_counter() - start,
+                      res['start_times'].mean() * 1e3,
+                      len(res['solutions'])))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import time
+
+import numpy as np
+
+from gui.models.case_ordering import (_nearest_neighbor, _scaled, order_cases,
+                                      path_length, sampling_summary)
+
+LB = [0.0, 100.0]
+UB = [1.0, 300.0]
+
+
+def _design(n, seed=0):
+    rng = np.random.RandomState(seed)
+    return np.asarray(LB) + rng.rand(n, 2) * (np.asarray(UB) - LB)
+
+
+def test_order_is_a_shorter_permutation():
+    points = _design(200)
+    order = order_cases(points, LB, UB)
+
+    assert np.array_equal(np.sort(order), np.arange(200))
+    assert order[0] == 0
+
+    # 2-opt only shortens the nearest neighbour path
+    nn = _nearest_neighbor(_scaled(points, LB, UB))
+    length = path_length(points, order, LB, UB)
+    assert length <= path_length(points, nn, LB, UB)
+    assert length < 0.25 * path_length(points, np.arange(200), LB, UB)
+
+
+def test_points_on_a_line_from_the_start_point():
+    # shuffled points of a line: the path goes from the end nearest x0
+    t = np.linspace(0, 1, 30)
+    points = np.column_stack((t, 100 + 200 * t))
+    shuffle = np.random.RandomState(1).permutation(30)
+
+    order = order_cases(points[shuffle], LB, UB, x0=[1.0, 300.0])
+    np.testing.assert_array_equal(shuffle[order], np.arange(30)[::-1])
+    assert np.isclose(path_length(points[shuffle], order, LB, UB,
+                                  x0=[1.0, 300.0]), np.sqrt(2))
+
+
+def test_few_cases():
+    points = _design(2)
+    np.testing.assert_array_equal(order_cases(points, LB, UB), [0, 1])
+    np.testing.assert_array_equal(
+        order_cases(points, LB, UB, x0=points[1]), [1, 0])
+    assert order_cases(points[:0], LB, UB, x0=points[0]).size == 0
+
+
+def test_sampling_summary():
+    summary = sampling_summary([1.0, 2.0, 3.0, 2.0],
+                               ['ok', 'error', 'ok', 'timeout'])
+    assert summary == {'cases': 4, 'total_time': 8.0, 'mean_time': 2.0,
+                       'failed': 2, 'failure_rate': 0.5, 'timeouts': 1}
+    assert sampling_summary([], [])['failure_rate'] == 0.0
+
+
+def main():
+    # path length (in the design space scaled by the bounds) of the design
+    # order of random designs against the ordered one, and ordering time
+    for dim in [2, 5]:
+        for n in [50, 200, 1000, 3000]:
+            points = np.random.RandomState(0).rand(n, dim)
+            lb, ub = np.zeros(dim), np.ones(dim)
+
+            start = time.perf_counter()
+            order = order_cases(points, lb, ub, x0=0.5 * np.ones(dim))
+            elapsed = time.perf_counter() - start
+
+            design = path_length(points, np.arange(n), lb, ub)
+            ordered = path_length(points, order, lb, ub)
+            print("dim = {0}, n = {1:5d}: design order {2:9.2f} ({3:.3f} "
+                  "per case), ordered {4:8.2f} ({5:.3f} per case), "
+                  "{6:6.2f} s".format(dim, n, design, design / n, ordered,
+                                      ordered / n, elapsed))
+
+
+if __name__ == "__main__":
+    main()
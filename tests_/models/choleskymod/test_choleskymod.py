@@ -0,0 +1,77 @@
+import time
+
+import numpy as np
+from scipy import sparse
+
+from gui.models.choleskymod import cholmod
+
+
+def _random_matrices(n: int, seed: int = 0):
+    rng = np.random.RandomState(seed)
+    B = rng.standard_normal((n, n))
+    pd_mat = B @ B.T + n * np.eye(n)
+    indef_mat = (B + B.T) / 2
+    return pd_mat, indef_mat
+
+
+def test_positive_definite_unmodified():
+    A, _ = _random_matrices(20)
+    Ap, R, indef, e = cholmod(A)
+
+    assert not indef
+    np.testing.assert_allclose(R, np.linalg.cholesky(A).T, atol=1e-10)
+    np.testing.assert_allclose(Ap, A, atol=1e-10)
+    np.testing.assert_allclose(e, 0.0, atol=1e-10)
+
+
+def test_indefinite_is_modified():
+    _, A = _random_matrices(20)
+    for block_size in [1, 4, 64]:
+        Ap, R, indef, e = cholmod(A, block_size=block_size)
+
+        assert indef
+        assert np.linalg.eigvalsh(Ap).min() > 0
+        np.testing.assert_allclose(R.T @ R, Ap)
+        np.testing.assert_allclose(np.diag(Ap - A), e)
+
+
+def test_block_size_invariance():
+    _, A = _random_matrices(50)
+    Ap_ref, R_ref, _, _ = cholmod(A, block_size=1)
+    Ap, R, _, _ = cholmod(A, block_size=16)
+
+    np.testing.assert_allclose(R, R_ref, atol=1e-10)
+    np.testing.assert_allclose(Ap, Ap_ref, atol=1e-10)
+
+
+def test_stack():
+    pd_mat, indef_mat = _random_matrices(10)
+    Ap, R, indef, e = cholmod(np.stack([pd_mat, indef_mat, pd_mat]))
+
+    assert Ap.shape == (3, 10, 10) and e.shape == (3, 10)
+    np.testing.assert_array_equal(indef, [False, True, False])
+    np.testing.assert_allclose(Ap[1], cholmod(indef_mat)[0])
+
+
+def test_sparse_input():
+    _, A = _random_matrices(10)
+    Ap, R, indef, e = cholmod(sparse.csr_matrix(A))
+
+    assert sparse.issparse(Ap) and sparse.issparse(R)
+    np.testing.assert_allclose(Ap.toarray(), cholmod(A)[0])
+
+
+def main():
+    # rough timing of the fast (LAPACK) path and the modified path
+    for n in [10, 100, 500]:
+        pd_mat, indef_mat = _random_matrices(n)
+        for label, A in [('positive definite', pd_mat),
+                         ('indefinite', indef_mat)]:
+            start = time.perf_counter()
+            cholmod(A)
+            print("n = {0:4d} {1:>17}: {2:.3f} ms".format(
+                n, label, (time.perf_counter() - start) * 1e3))
+
+
+if __name__ == "__main__":
+    main()
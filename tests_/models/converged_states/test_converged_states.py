@@ -0,0 +1,275 @@
+import json
+import os
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from gui.models.converged_states import ConvergedStates
+from gui.models.sampling import run_case, run_supervised_case
+from gui.models.sim_connections import SimulationSession
+
+LB = [0.0, 0.0]
+UB = [1.0, 1.0]
+
+_STATUS_PATH = r"\Data\Results Summary\Run-Status\Output\UOSSTAT2"
+_INPUT_PATHS = [r"\Data\x1", r"\Data\x2"]
+OUTPUTS = [{'Alias': 'y', 'Path': r"\Data\y"}]
+
+
+class ToyNode:
+    def __init__(self, engine, path):
+        self._engine = engine
+        self._path = path
+
+    @property
+    def Value(self):
+        if self._path == _STATUS_PATH:
+            return 8 if self._engine.converged else 0
+
+        return float(self._engine.state.sum())
+
+    @Value.setter
+    def Value(self, value):
+        self._engine.inputs[_INPUT_PATHS.index(self._path)] = value
+
+
+class ToyEngine:
+    """Stand-in of the Aspen Plus document whose state is the point of its
+    last converged case. A case converges when it starts within `reach` of
+    it, outside of the `hard` disk (cases that never converge). A failed run
+    leaves no state to start from and `Reinit` goes back to the built-in
+    initial guess. With `hung`, a run only returns once the engine is killed.
+    """
+
+    def __init__(self, reach=0.25, guess=(0.0, 0.0), hard=((0.5, 0.5), 0.1)):
+        self.reach = reach
+        self.guess = np.asarray(guess, dtype=float)
+        self.hard = (np.asarray(hard[0]), hard[1])
+        self.state = self.guess
+        self.inputs = np.zeros(2)
+        self.converged = True
+        self.hung = False
+        self.killed = threading.Event()
+        self.loads = 0
+        self.Tree = self
+        self.Engine = self
+
+    def FindNode(self, path):
+        return ToyNode(self, path)
+
+    def Run2(self):
+        if self.hung:
+            self.killed.wait()
+            raise RuntimeError("The server was killed.")
+
+        x = self.inputs.copy()
+        self.converged = self.state is not None and \
+            np.linalg.norm(x - self.state) < self.reach and \
+            np.linalg.norm(x - self.hard[0]) > self.hard[1]
+        self.state = x if self.converged else None
+
+    def Reinit(self):
+        self.state = self.guess
+
+    def Export(self, kind, path):
+        with open(path, 'w') as fp:
+            json.dump(self.state.tolist(), fp)
+
+    def InitFromArchive2(self, path):
+        self.loads += 1
+        with open(path) as fp:
+            self.state = np.asarray(json.load(fp))
+
+
+class ToyConnection:
+    """Stand-in of `AspenConnection` of a `ToyEngine`."""
+
+    def __init__(self, file_path):
+        self.engine = ToyEngine()
+
+    def get_connection_object(self):
+        return self.engine
+
+    def close_connection(self):
+        pass
+
+    def kill_connection(self):
+        self.engine.killed.set()
+
+
+def _inputs(x) -> list:
+    return [{'Path': path, 'value': value}
+            for path, value in zip(_INPUT_PATHS, x)]
+
+
+def _sample(engine, points, states=None) -> list:
+    # whether each case converged, sampled by `sampling.run_case`
+    return [run_case(_inputs(x), OUTPUTS, engine, states=states)['success']
+            == 'ok' for x in points]
+
+
+def _sweep(step=0.05, seed=0):
+    # rows of short steps through the unit square (e.g. an ordered design),
+    # with some noise
+    rows = []
+    for k, y in enumerate(np.arange(0.05, 1.0, 2 * step)):
+        x = np.arange(0.05, 1.0, step)
+        rows.append(np.column_stack((x if k % 2 == 0 else x[::-1],
+                                     np.full(x.size, y))))
+
+    points = np.vstack(rows)
+    noise = np.random.RandomState(seed).uniform(-0.01, 0.01, points.shape)
+    return np.clip(points + noise, 0, 1)
+
+
+def test_record_and_nearest_restore():
+    engine = ToyEngine()
+    states = ConvergedStates(LB, UB, max_snapshots=2, min_distance=0.1,
+                             record_every=1)
+    directory = states._directory
+
+    for x in [[0.1, 0.1], [0.15, 0.1], [0.5, 0.9], [0.9, 0.2]]:
+        engine.state = np.asarray(x)
+        states.record(engine, x)
+
+    # the near duplicate isn't kept and the oldest is dropped
+    assert states.n_snapshots == 2
+    assert len(os.listdir(str(directory))) == 2
+
+    assert states.restore(engine, [0.8, 0.3])
+    np.testing.assert_allclose(engine.state, [0.9, 0.2])
+    states.case_finished(True)
+    assert states.summary()['recovery_rate'] == 1.0
+
+    states.close()
+    assert not directory.exists()
+
+
+def test_no_snapshot_is_a_reinit():
+    engine = ToyEngine()
+    states = ConvergedStates(LB, UB)
+    assert not states.restore(engine, [0.5, 0.5])
+    states.case_finished(False)
+
+    # a snapshot that fails to load
+    states.record(engine, [0.0, 0.0])
+    engine.InitFromArchive2 = None
+    assert not states.restore(engine, [0.5, 0.5])
+    states.case_finished(True)
+
+    assert states.summary() == {'restores': 0, 'recovered': 0,
+                                'recovery_rate': 0.0, 'reinits': 2,
+                                'reinit_recovered': 1,
+                                'reinit_recovery_rate': 0.5}
+    states.close()
+
+    with pytest.raises(ValueError):
+        ConvergedStates(LB, UB, max_snapshots=0)
+    with pytest.raises(ValueError):
+        ConvergedStates(LB, UB, record_every=0)
+
+
+def test_record_cadence():
+    engine = ToyEngine()
+    states = ConvergedStates(LB, UB, min_distance=0.0, record_every=3)
+    saved = [states.record(engine, [0.1 * k, 0.0]) for k in range(7)]
+
+    # the first case and then one in 3
+    assert saved == [True, False, False, True, False, False, True]
+    assert states.n_snapshots == 3
+    states.close()
+
+
+def test_run_case_restores_the_nearest_state():
+    engine = ToyEngine()
+    states = ConvergedStates(LB, UB, record_every=1)
+
+    assert _sample(engine, [[0.1, 0.1], [0.3, 0.1]], states) == [True, True]
+    assert states.n_snapshots == 2
+
+    # the failed case restores the snapshot nearest to it (no reinit)...
+    assert _sample(engine, [[0.9, 0.9]], states) == [False]
+    np.testing.assert_allclose(engine.state, [0.3, 0.1])
+    assert engine.loads == 1
+
+    # ... and the next case is its recovery
+    assert _sample(engine, [[0.35, 0.15]], states) == [True]
+    assert states.summary()['recovered'] == 1
+
+    # without snapshots, the engine is reinitialized
+    assert _sample(engine, [[0.9, 0.9]]) == [False]
+    np.testing.assert_allclose(engine.state, engine.guess)
+    states.close()
+
+
+def test_timed_out_case_is_a_failure():
+    states = ConvergedStates(LB, UB, record_every=1)
+    session = SimulationSession('toy.bkp', timeout=0.2,
+                                connection_factory=ToyConnection)
+    engine = session.run(lambda engine: engine)
+
+    res = run_supervised_case(_inputs([0.1, 0.1]), OUTPUTS, session, states)
+    assert res['success'] == 'ok' and states.n_snapshots == 1
+    res = run_supervised_case(_inputs([0.9, 0.9]), OUTPUTS, session, states)
+    assert res['success'] == 'error'
+
+    # the case after the restore hangs, it isn't a recovery
+    engine.hung = True
+    res = run_supervised_case(_inputs([0.15, 0.1]), OUTPUTS, session, states)
+    assert res['success'] == 'timeout' and engine.killed.is_set()
+    assert states.summary()['restores'] == 1
+    assert states.summary()['recovered'] == 0
+
+    # the respawned engine goes on
+    res = run_supervised_case(_inputs([0.15, 0.1]), OUTPUTS, session, states)
+    assert res['success'] == 'ok'
+    assert session.run(lambda engine: engine) is not engine
+    session.close()
+    states.close()
+
+
+def test_snapshots_stop_the_failure_cascade():
+    points = _sweep()
+    cold = _sample(ToyEngine(), points)
+
+    states = ConvergedStates(LB, UB)
+    warm = _sample(ToyEngine(), points, states)
+    summary = states.summary()
+    states.close()
+
+    # only the hard cases fail, the ones after them start nearby instead of
+    # from the initial guess
+    hard = np.linalg.norm(points - 0.5, axis=1) <= 0.1
+    np.testing.assert_array_equal(np.logical_not(warm), hard)
+    assert summary['restores'] == hard.sum() and summary['recovered'] > 0
+    assert sum(cold) < 0.5 * sum(warm)
+
+
+def main():
+    # failed cases and recovery (next case converged) along a sweep of the
+    # design space, reinitializing after each failure against restoring the
+    # nearest snapshot, for engines of increasing reach
+    points = _sweep(0.02)
+    hard = np.sum(np.linalg.norm(points - 0.5, axis=1) <= 0.1)
+    for reach in [0.15, 0.25, 0.4]:
+        cold = _sample(ToyEngine(reach=reach), points)
+
+        states = ConvergedStates(LB, UB)
+        start = time.perf_counter()
+        warm = _sample(ToyEngine(reach=reach), points, states)
+        elapsed = time.perf_counter() - start
+        summary = states.summary()
+        states.close()
+
+        print("reach {0:.2f}: {1} cases, {2} hard, reinit {3:4d} failed, "
+              "snapshots {4:4d} failed ({5} restores, {6:.0%} recovered, "
+              "{7:.2f} s)".format(
+                  reach, len(points), hard, len(points) - sum(cold),
+                  len(points) - sum(warm), summary['restores'],
+                  summary['recovery_rate'], elapsed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import pathlib
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from gui.models.csv_import import (read_csv_columns, read_csv_header,
+                                   read_csv_preview)
+
+
+def _write_csv(file_path, n_rows: int, n_cols: int) -> pd.DataFrame:
+    rng = np.random.RandomState(0)
+    df = pd.DataFrame(rng.standard_normal((n_rows, n_cols)),
+                      columns=['col{0}'.format(i) for i in range(n_cols)])
+    df.insert(0, 'status', np.where(rng.rand(n_rows) > 0.1, 'ok', 'error'))
+    df.to_csv(file_path, index=False)
+    return df
+
+
+def test_header_and_preview(tmp_path):
+    csv_file = tmp_path / 'doe.csv'
+    df = _write_csv(csv_file, 500, 5)
+
+    assert read_csv_header(str(csv_file)) == df.columns.tolist()
+    assert read_csv_preview(str(csv_file), 10).shape == (10, 6)
+
+
+def test_checked_columns_in_chunks(tmp_path):
+    csv_file = tmp_path / 'doe.csv'
+    df = _write_csv(csv_file, 1000, 20)
+    progress = []
+
+    data = read_csv_columns(str(csv_file), ['col7', 'col2'], 'status',
+                            chunk_size=128,
+                            progress_callback=progress.append)
+
+    assert data.columns.tolist() == ['col7', 'col2', 'status']
+    assert data['col7'].dtype == np.float64 and data.shape[0] == 1000
+    np.testing.assert_allclose(data['col2'], df['col2'])
+    assert (data['status'] == df['status']).all()
+
+    assert len(progress) == 8 and progress == sorted(progress)
+    assert progress[-1] == 100
+
+
+def test_non_numeric_column(tmp_path):
+    csv_file = tmp_path / 'doe.csv'
+    _write_csv(csv_file, 10, 2)
+
+    try:
+        read_csv_columns(str(csv_file), ['status'], 'col0')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Non numeric column read as float.")
+
+
+def main():
+    # rough comparison of the whole file read against the checked columns
+    # import (5 out of 200 columns)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_file = str(pathlib.Path(tmp_dir) / 'doe.csv')
+        _write_csv(csv_file, 50000, 200)
+        columns = ['col{0}'.format(i) for i in range(0, 200, 40)]
+
+        for label, read in [
+                ('whole file', lambda: pd.read_csv(csv_file)),
+                ('checked columns',
+                 lambda: read_csv_columns(csv_file, columns, 'status'))]:
+            tracemalloc.start()
+            start = time.perf_counter()
+            read()
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            print("{0:>15}: {1:8.1f} ms, peak memory {2:7.1f} MB".format(
+                label, elapsed * 1e3, peak / 2 ** 20))
+
+
+if __name__ == "__main__":
+    main()
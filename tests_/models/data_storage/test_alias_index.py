@@ -0,0 +1,129 @@
+import time
+
+import pandas as pd
+import pytest
+
+from gui.models.data_storage import DataStorage
+
+MV = DataStorage._INPUT_ALIAS_TYPES['mv']
+D = DataStorage._INPUT_ALIAS_TYPES['d']
+CV = DataStorage._OUTPUT_ALIAS_TYPES['cv']
+AUX = DataStorage._OUTPUT_ALIAS_TYPES['aux']
+CST = DataStorage._EXPR_ALIAS_TYPES['cst']
+OBJ = DataStorage._EXPR_ALIAS_TYPES['obj']
+
+
+def _storage(n_vars: int = 1) -> DataStorage:
+    ds = DataStorage()
+    ds.input_table_data = pd.DataFrame(
+        {'Alias': ['u{0}'.format(i) for i in range(2 * n_vars)] + ['d1'],
+         'Path': ['\\Data\\u{0}'.format(i) for i in range(2 * n_vars)] +
+         ['\\Data\\d1'],
+         'Type': [MV, D] * n_vars + [D]})
+    ds.output_table_data = pd.DataFrame(
+        {'Alias': ['y{0}'.format(i) for i in range(2 * n_vars)],
+         'Path': ['\\Data\\y{0}'.format(i) for i in range(2 * n_vars)],
+         'Type': [CV, AUX] * n_vars})
+    ds.expression_table_data = pd.DataFrame(
+        {'Alias': ['c1', 'f', 'z', 'e'],
+         'Expression': ['y0 - 1', 'u0 ** 2', 'y0 + u0', 'u1'],
+         'Type': [CST, OBJ, CV, 'Choose a type']})
+    return ds
+
+
+def test_aliases_by_table_and_type():
+    index = _storage().alias_index
+
+    assert index.aliases('input', 'mv') == ['u0']
+    assert index.aliases('input', 'd') == ['u1', 'd1']
+    assert index.aliases(['output', 'expression'], 'cv') == ['y0', 'z']
+    assert index.aliases('expression', 'cst', 'obj') == ['c1', 'f']
+    assert index.aliases(['input', 'output']) == ['u0', 'u1', 'd1', 'y0',
+                                                  'y1']
+
+    assert index.info('y1') == {'table': 'output', 'type': AUX,
+                                'position': 1, 'Path': '\\Data\\y1'}
+    assert 'e' in index and 'x' not in index
+
+    with pytest.raises(ValueError):
+        index.aliases('input', 'obj')
+
+
+def test_records_are_new_dicts():
+    index = _storage().alias_index
+
+    records = index.records('input', 'mv')
+    assert records == [{'Alias': 'u0', 'Path': '\\Data\\u0'}]
+
+    records[0]['value'] = 1.0
+    assert index.records('input', 'mv') == [{'Alias': 'u0',
+                                             'Path': '\\Data\\u0'}]
+    assert index.records('expression', 'obj') == [{'Alias': 'f',
+                                                   'Expression': 'u0 ** 2'}]
+
+
+def test_index_rebuilt_only_when_tables_change():
+    ds = _storage()
+    index = ds.alias_index
+
+    # memoised: no rebuild nor new filtering while the tables are the same
+    assert ds.alias_index is index
+    assert index._query('input', ('mv',)) is index._query('input', ('mv',))
+
+    out = ds.output_table_data
+    out.loc[out['Alias'] == 'y1', 'Type'] = CV
+    ds.output_table_data = out
+
+    assert ds.alias_index is not index
+    assert ds.alias_index.aliases('output', 'cv') == ['y0', 'y1']
+    assert ds.metamodel_selected_data['Alias'].tolist() == \
+        ['y0', 'y1', 'c1', 'f', 'z']
+
+
+def test_duplicated_names():
+    ds = _storage()
+    expr = ds.expression_table_data
+    expr.loc[0, 'Alias'] = 'y0'
+    ds.expression_table_data = expr
+
+    assert ds.alias_index.count('y0') == 2
+    assert ds.alias_index.count('y0', ['input', 'output']) == 1
+    assert ds.alias_index.count('x') == 0
+
+
+def main():
+    # rough timing of the alias lookups done by the slots and models: MV,
+    # candidates, constraints and objective lists (table filtering) against
+    # the memoised index, for 500 variables
+    ds = _storage(n_vars=250)
+    n_calls = 1000
+    inp = ds.input_table_data
+    out = ds.output_table_data
+    expr = ds.expression_table_data
+
+    def filtered():
+        inp.loc[inp['Type'] == MV, 'Alias'].tolist()
+        cand = pd.concat([out, expr], axis='index', ignore_index=True,
+                         sort=False)
+        cand.loc[cand['Type'] == CV, 'Alias'].tolist()
+        expr.loc[expr['Type'] == CST, 'Alias'].tolist()
+        expr.loc[expr['Type'] == OBJ, 'Alias'].tolist()
+
+    def indexed():
+        index = ds.alias_index
+        index.aliases('input', 'mv')
+        index.aliases(['output', 'expression'], 'cv')
+        index.aliases('expression', 'cst')
+        index.aliases('expression', 'obj')
+
+    for label, lookup in [('filtered', filtered), ('index', indexed)]:
+        start = time.perf_counter()
+        for _ in range(n_calls):
+            lookup()
+        elapsed = time.perf_counter() - start
+        print("{0:>8}: {1:8.2f} us per lookup set".format(
+            label, elapsed * 1e6 / n_calls))
+
+
+if __name__ == "__main__":
+    main()
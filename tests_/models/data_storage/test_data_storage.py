@@ -2,6 +2,19 @@ from gui.models.data_storage import DataStorage
 import sys
 
 
+def test_optimization_parameters_are_clamped():
+    ds = DataStorage()
+    params = dict(ds.optimization_parameters, infill_batch=0,
+                  nlp_starts=20000, nlp_workers='a')
+    ds.optimization_parameters = params
+
+    params = ds.optimization_parameters
+    assert (params['infill_batch'], params['nlp_starts'],
+            params['nlp_workers']) == (1, 10000, 1)
+    assert DataStorage.clamp_optimization_parameter('infill_batch', 8) == 8
+    assert DataStorage.clamp_optimization_parameter('tol1', 2.0) == 2.0
+
+
 def main():
     ds = DataStorage()
 
@@ -0,0 +1,132 @@
+import time
+
+import numpy as np
+import pandas as pd
+from PyQt5.QtCore import QCoreApplication, Qt
+from PyQt5.QtGui import QColor, QImage
+
+from gui.models.equation_cache import (EquationImageCache,
+                                       EquationRenderThread,
+                                       combination_equation)
+
+# seconds taken by each fake rendering in the timing comparison
+RENDER_TIME = 0.005
+
+
+class FakeRenderer:
+    """Stand-in of `render_equation` that counts the equations rendered."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+
+    def __call__(self, equation, font_size, pixel_ratio=1.0):
+        time.sleep(self.delay)
+        self.calls.append((equation, font_size, pixel_ratio))
+        width = int(round(10 * len(equation) * pixel_ratio)) + 1
+        image = QImage(width, int(round(font_size * pixel_ratio)),
+                       QImage.Format_ARGB32)
+        image.fill(QColor(len(equation) % 256, 0, 0))
+        image.setDevicePixelRatio(pixel_ratio)
+        return image
+
+
+def _app():
+    app = QCoreApplication.instance()
+    return app if app is not None else QCoreApplication([])
+
+
+def test_combination_equation():
+    row = pd.Series([1.5, np.nan, -0.25], index=['x_1', 'x_2', 'x_3'])
+
+    assert combination_equation(row) == " +1.50000 x_1 -0.25000 x_3"
+
+
+def test_memory_lru():
+    renderer = FakeRenderer()
+    cache = EquationImageCache(max_items=2, renderer=renderer)
+
+    cache.render('a', 8)
+    cache.render('b', 8)
+    cache.render('a', 8)  # hit, 'b' is now the least recently used
+    cache.render('c', 8)
+
+    assert len(cache) == 2
+    assert cache.get('a', 8) is not None and cache.get('b', 8) is None
+    assert len(renderer.calls) == 3
+
+    # font size and pixel ratio are part of the key
+    image = cache.render('a', 8, 2.0)
+    assert image.devicePixelRatio() == 2.0
+    assert renderer.calls[-1] == ('a', 8, 2.0)
+
+
+def test_disk_store(tmp_path):
+    renderer = FakeRenderer()
+    cache = EquationImageCache(cache_folder=str(tmp_path), renderer=renderer)
+    image = cache.render('x_1 + x_2', 8, 2.0)
+
+    # a new cache (e.g. dialog opened again) loads it without rendering
+    other = EquationImageCache(cache_folder=str(tmp_path), renderer=renderer)
+    loaded = other.get('x_1 + x_2', 8, 2.0)
+    assert loaded.size() == image.size()
+    assert loaded.devicePixelRatio() == 2.0
+    assert len(renderer.calls) == 1
+
+    # corrupted files are misses
+    for file_path in tmp_path.glob('*.png'):
+        file_path.write_bytes(b'not a png')
+    assert other.get('x_1 + x_2', 8, 1.0) is None
+    assert EquationImageCache(cache_folder=str(tmp_path)).get(
+        'x_1 + x_2', 8, 2.0) is None
+
+
+def test_render_thread():
+    _app()
+    renderer = FakeRenderer()
+    cache = EquationImageCache(renderer=renderer)
+    equations = ['a', 'b', 'c', 'a']
+    rendered = []
+
+    thread = EquationRenderThread(cache, equations, 8)
+    thread.equation_rendered.connect(rendered.append, Qt.DirectConnection)
+    thread.start()
+    assert thread.wait(5000)
+
+    assert rendered == [0, 1, 2, 3]
+    assert len(renderer.calls) == 3
+    assert all(cache.get(eq, 8) is not None for eq in equations)
+
+
+def main():
+    # time to draw a table of 40 equations 10 times (e.g. scrolling) when
+    # rendering on every paint against drawing from the cache
+    _app()
+    equations = ["{0:+.5f} x_{1}".format(i / 7, i) for i in range(40)]
+    repaints = 10
+
+    renderer = FakeRenderer(RENDER_TIME)
+    start = time.perf_counter()
+    for _ in range(repaints):
+        for eq in equations:
+            renderer(eq, 8)
+    uncached = time.perf_counter() - start
+
+    cache = EquationImageCache(renderer=FakeRenderer(RENDER_TIME))
+    start = time.perf_counter()
+    thread = EquationRenderThread(cache, equations, 8)
+    thread.start()
+    thread.wait()
+    prefetch = time.perf_counter() - start
+    for _ in range(repaints):
+        for eq in equations:
+            cache.get(eq, 8)
+    cached = time.perf_counter() - start - prefetch
+
+    print("render on paint: {0:8.3f} s".format(uncached))
+    print("cached:          {0:8.3f} s prefetch + {1:8.5f} s repaints".format(
+        prefetch, cached))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+import time
+
+import numpy as np
+import pytest
+
+from gui.models.hessian_eval import hesscorrgauss
+from gui.models.incremental_kriging import IncrementalKriging
+from gui.models.nlp_server import KrigingPredictor, kriging_to_dict
+
+
+class FixedTheta:
+    """'Fit' that only sets the correlation parameters and the input
+    scaling, in place of the `pydace.Dace` hyperparameter optimization."""
+
+    def __init__(self, regression):
+        self.regression = regression
+
+    def fit(self, S, Y, theta0, lob, upb):
+        self._Ssc = np.vstack((np.zeros(S.shape[1]), np.ones(S.shape[1])))
+        self.theta = np.asarray(theta0, dtype=float)
+
+
+def _fun(x):
+    return np.sin(3 * x[:, 0]) + x[:, 1] ** 2
+
+
+def _data(n, seed=0, dim=2):
+    x = np.random.RandomState(seed).rand(n, dim)
+    return x, _fun(x)
+
+
+def _model(x, y, regression='poly1', **kwargs):
+    model = IncrementalKriging(regression, model_factory=FixedTheta,
+                               **kwargs)
+    model.fit(x, y, 10.0 * np.ones(x.shape[1]), None, None)
+    return model
+
+
+def test_block_update_matches_full_factorization():
+    x, y = _data(60)
+    x_test = _data(50, 1)[0]
+
+    model = _model(x[:40], y[:40], drift_tol=np.inf, max_growth=np.inf)
+    assert not model.append(x[40:50], y[40:50])
+    assert not model.append(x[50:], y[50:])
+
+    full = _model(x, y)
+    np.testing.assert_allclose(model.predict(x_test)[0],
+                               full.predict(x_test)[0], atol=1e-6)
+    assert (model.n_refits, model.n_updates) == (1, 2)
+    assert model.n_samples == 60
+
+    # the fitted attributes are the ones of a Dace model
+    predictor = KrigingPredictor(kriging_to_dict(model, 'poly1'))
+    np.testing.assert_allclose(predictor.predict(x_test)[0],
+                               model.predict(x_test)[0][:, 0], atol=1e-8)
+
+
+def test_jacobian():
+    x, y = _data(30)
+    model = _model(x, np.column_stack((y, 2 * y)), regression='poly2')
+
+    x0 = np.array([[0.3, 0.6]])
+    dy = model.predict(x0, compute_jacobian=True)[1]
+    h = 1e-6
+    fd = [(model.predict(x0 + h * e)[0] - model.predict(x0 - h * e)[0])
+          / (2 * h) for e in np.eye(2)]
+
+    assert dy.shape == (1, 2, 2)
+    np.testing.assert_allclose(dy[0], np.hstack(fd).reshape(2, 2).T,
+                               rtol=1e-5, atol=1e-6)
+
+    single = _model(x, y)
+    assert single.predict(x0, compute_jacobian=True)[1].shape == (1, 2)
+
+
+def test_hessian():
+    x, y = _data(30)
+    x0 = np.array([0.3, 0.6])
+    h = 1e-4
+    for regression in ['poly0', 'poly1']:
+        model = _model(x, y, regression=regression)
+        assert model._fitpar['gamma'].shape == (1, 30)
+
+        # central differences of the predictions
+        def f(xi):
+            return model.predict(xi[None, :])[0].item()
+
+        fd = np.zeros((2, 2))
+        for i, ei in enumerate(np.eye(2) * h):
+            for j, ej in enumerate(np.eye(2) * h):
+                fd[i, j] = (f(x0 + ei + ej) - f(x0 + ei - ej) -
+                            f(x0 - ei + ej) + f(x0 - ei - ej)) / (4 * h ** 2)
+
+        np.testing.assert_allclose(hesscorrgauss(x0, model), fd, rtol=1e-4,
+                                   atol=1e-4)
+
+
+def test_hessian_matches_dace():
+    pydace = pytest.importorskip('pydace')
+    if not hasattr(pydace.Dace, 'fit'):
+        pytest.skip("pydace has no Dace model")
+
+    x, y = _data(30)
+    x0 = np.array([0.3, 0.6])
+    theta0 = 10.0 * np.ones(2)
+    dace = pydace.Dace(regression='poly1', correlation='corrgauss')
+    dace.fit(x, y, theta0)
+
+    # same hyperparameters and scaling as the Dace fit
+    model = IncrementalKriging('poly1')
+    model.fit(x, y, theta0, None, None)
+    np.testing.assert_allclose(model.theta, dace.theta)
+    assert model._fitpar['gamma'].shape == dace._fitpar['gamma'].shape
+
+    np.testing.assert_allclose(hesscorrgauss(x0, model),
+                               hesscorrgauss(x0, dace), rtol=1e-6)
+
+
+def test_drift_and_growth_refit():
+    x, y = _data(40)
+    model = _model(x, y)
+
+    # data of the same function: block update
+    x_new, y_new = _data(5, 2)
+    assert not model.append(x_new, y_new)
+
+    # data of another function: refit
+    assert model.append(x_new + 0.01, 5 + y_new)
+    assert model.n_refits == 2
+
+    # more than half of the data of the last refit appended
+    model = _model(x[:10], y[:10], drift_tol=np.inf)
+    refits = [model.append(x[k:k + 2], y[k:k + 2]) for k in range(10, 20, 2)]
+    assert refits == [False, False, True, False, False]
+
+    # fixed correlation parameters: never refitted
+    model = _model(x[:10], y[:10])
+    refits = [model.append(x[k:k + 2], 5 + y[k:k + 2], refit=False)
+              for k in range(10, 20, 2)]
+    assert not any(refits) and model.n_refits == 1
+
+
+def test_duplicate_points():
+    x, y = _data(20)
+    model = _model(x, y, drift_tol=np.inf)
+
+    with pytest.raises(ValueError):
+        model.append(x[:1], y[:1])
+    with pytest.raises(ValueError):
+        model.append(np.vstack((x[:1], x[:1])) + 0.5, y[:2])
+    assert model.n_samples == 20
+
+
+def test_truncate():
+    x, y = _data(50)
+    x_test = _data(20, 1)[0]
+    model = _model(x[:40], y[:40], drift_tol=np.inf)
+    before = model.predict(x_test)[0]
+
+    # believed predictions appended then dropped
+    model.append(x[40:], model.predict(x[40:])[0])
+    model.truncate(40)
+
+    np.testing.assert_allclose(model.predict(x_test)[0], before, atol=1e-10)
+    assert model.n_refits == 1
+
+    model.truncate(30)
+    assert model.n_refits == 2 and model.n_samples == 30
+
+    with pytest.raises(ValueError):
+        IncrementalKriging('poly3', model_factory=FixedTheta).fit(
+            x, y, np.ones(2), None, None)
+
+
+def main():
+    # cost of appending 10 points (block update) against a factorization of
+    # all the data at the same correlation parameters, which the likelihood
+    # optimization of a refit repeats for every evaluation (6 inputs)
+    for n in [250, 500, 1000, 2000]:
+        x, y = _data(n + 10, dim=6)
+        model = _model(x[:n], y[:n], drift_tol=np.inf, max_growth=np.inf)
+
+        start = time.perf_counter()
+        model.append(x[n:], y[n:])
+        append_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        _model(x, y)
+        full_time = time.perf_counter() - start
+
+        print("n = {0:5d}: append 10 points {1:8.4f} s, factorization "
+              "{2:8.4f} s ({3:.1f}x)".format(n, append_time, full_time,
+                                             full_time / append_time))
+
+
+if __name__ == "__main__":
+    main()
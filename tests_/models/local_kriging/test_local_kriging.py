@@ -0,0 +1,148 @@
+import time
+
+import numpy as np
+import pytest
+
+from gui.models.hessian_eval import hesscorrgauss
+from gui.models.incremental_kriging import IncrementalKriging
+from gui.models.local_kriging import LocalKriging, kriging_model
+from gui.models.model_registry import KrigingModelRegistry
+
+THETA = 2.0
+
+
+class FixedTheta:
+    """'Fit' that only sets the correlation parameters (of the inputs
+    scaled by their mean and standard deviation) and counts the samples it
+    was given, in place of the `pydace.Dace` hyperparameter optimization."""
+
+    def __init__(self, regression, correlation='corrgauss'):
+        self.regression = regression
+
+    def fit(self, S, Y, theta0, lob, upb):
+        self.n_fit = S.shape[0]
+        self._Ssc = np.vstack((S.mean(axis=0), S.std(axis=0)))
+        self.theta = np.full(S.shape[1], THETA)
+        self.perf = {'perf': np.array([[0.5], [1.0]])}
+
+
+def _fun(x):
+    return np.sin(3 * x[:, 0]) + x[:, 1] ** 2 - x[:, 0] * x[:, 1]
+
+
+def _data(n, seed=0, dim=2):
+    x = np.random.RandomState(seed).rand(n, dim)
+    return x, _fun(x)
+
+
+def _local(x, y, regression='poly1', **kwargs):
+    model = LocalKriging(regression, model_factory=FixedTheta, **kwargs)
+    model.fit(x, y, np.ones(x.shape[1]), None, None)
+    return model
+
+
+def test_all_neighbors_is_full_kriging():
+    x, y = _data(80)
+    x_test = _data(30, 1)[0]
+    local = _local(x, y, n_neighbors=80)
+
+    # full kriging with the same correlation parameters and scaling
+    full = IncrementalKriging('poly1', model_factory=FixedTheta)
+    full.fit(x, y, np.ones(2), None, None)
+
+    np.testing.assert_allclose(local.predict(x_test)[0],
+                               full.predict(x_test)[0], atol=1e-6)
+    assert local.predict(x_test)[0].shape == (30, 1)
+
+
+def test_local_accuracy_and_subset_fit():
+    x, y = _data(3000)
+    x_test = _data(200, 1)[0]
+    local = _local(x, y, n_neighbors=60, max_fit_samples=500)
+
+    assert local.n_samples == 3000 and local.perf is not None
+    err = local.predict(x_test)[0][:, 0] - _fun(x_test)
+    assert np.sqrt(np.mean(err ** 2)) < 1e-3
+
+
+def test_jacobian_and_hessian():
+    x, y = _data(400)
+    local = _local(x, y, regression='poly0', n_neighbors=50)
+    x0 = np.array([[0.4, 0.7]])
+    h = 1e-4
+
+    # single point: n x q gradient, as Dace
+    _, dy = local.predict(x0, compute_jacobian=True)
+    fd = [(local.predict(x0 + h * e)[0] - local.predict(x0 - h * e)[0])[0, 0]
+          / (2 * h) for e in np.eye(2)]
+    assert dy.shape == (2, 1)
+    np.testing.assert_allclose(dy[:, 0], fd, rtol=1e-4)
+
+    # hessian of the local model of the point
+    hess = hesscorrgauss(x0, local)
+    model = local.local_model(x0)
+    fd_hess = np.column_stack([
+        (model.predict(x0 + h * e, compute_jacobian=True)[1] -
+         model.predict(x0 - h * e, compute_jacobian=True)[1])[:, 0] / (2 * h)
+        for e in np.eye(2)])
+    np.testing.assert_allclose(hess, fd_hess, rtol=1e-4, atol=1e-6)
+    np.testing.assert_allclose(hess, [[-9 * np.sin(1.2), -1], [-1, 2]],
+                               atol=5e-2)
+
+    # several points: k x n x q
+    assert local.predict(_data(5, 2)[0], compute_jacobian=True)[1].shape == \
+        (5, 2, 1)
+
+
+def test_surrogate_types_in_registry():
+    x, y = _data(100)
+    settings = ('poly0', 'corrgauss', np.ones(2), None, None)
+    registry = KrigingModelRegistry(model_factory=FixedTheta)
+
+    local = registry.fit('y', x, y, *settings, surrogate='local')
+    assert isinstance(local, LocalKriging)
+    assert registry.fit('y', x, y, *settings, surrogate='local') is local
+    assert isinstance(registry.fit('y', x, y, *settings), FixedTheta)
+    assert len(registry) == 2
+
+    with pytest.raises(ValueError):
+        kriging_model('sparse', 'poly0', 'corrgauss')
+    with pytest.raises(ValueError):
+        LocalKriging(correlation='correxp')
+
+
+def main():
+    # memory and time of the full kriging (dense correlation matrix) against
+    # the local kriging (100 neighbours), and their accuracy on 1000 points
+    x_test, y_test = _data(1000, 99, dim=4)
+    for n in [1000, 5000, 20000]:
+        x, y = _data(n, dim=4)
+        models = [('local', LocalKriging('poly1', n_neighbors=100,
+                                         model_factory=FixedTheta))]
+        if n <= 5000:
+            models.insert(0, ('full', IncrementalKriging(
+                'poly1', model_factory=FixedTheta)))
+
+        for name, model in models:
+            start = time.perf_counter()
+            model.fit(x, y, np.ones(4), None, None)
+            fit_time = time.perf_counter() - start
+            start = time.perf_counter()
+            pred = model.predict(x_test)[0][:, 0]
+            predict_time = time.perf_counter() - start
+
+            # correlation matrix and factor (full) or sites and tree (local)
+            memory = 2 * 8 * n ** 2 if name == 'full' else 3 * 8 * n * 4
+            rmse = np.sqrt(np.mean((pred - y_test) ** 2))
+            print("n = {0:5d} {1:5}: fit {2:7.3f} s, predict {3:7.3f} s, "
+                  "memory {4:9.2f} MB, RMSE {5:.2e}".format(
+                      n, name, fit_time, predict_time, memory / 2 ** 20,
+                      rmse))
+
+        if n > 5000:
+            print("n = {0:5d} full : not run, memory {1:9.2f} MB".format(
+                n, 2 * 8 * n ** 2 / 2 ** 20))
+
+
+if __name__ == "__main__":
+    main()
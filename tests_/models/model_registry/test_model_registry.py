@@ -0,0 +1,144 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from gui.models.model_registry import KrigingModelRegistry, training_key
+
+# seconds taken by each fake fit in the timing comparison
+FIT_TIME = 0.01
+
+
+class CountingModel:
+    """Model with the `Dace` fit/predict interface that counts its fits."""
+    fits = []
+
+    def __init__(self, regression, correlation, delay=0.0):
+        self.regression = regression
+        self.correlation = correlation
+        self.delay = delay
+
+    def fit(self, S, Y, theta0, lob, upb):
+        time.sleep(self.delay)
+        CountingModel.fits.append(self)
+        self.mean = np.mean(Y, axis=0)
+        self.perf = {'perf': np.array([[1.0], [np.mean(theta0)]])}
+
+    def predict(self, X, compute_jacobian=False):
+        return np.tile(self.mean, (np.atleast_2d(X).shape[0], 1)), None
+
+
+def _data(seed=0):
+    rng = np.random.RandomState(seed)
+    X = rng.rand(20, 3)
+    return X, np.column_stack((X.sum(axis=1), X.prod(axis=1)))
+
+
+def _settings():
+    return 'poly1', 'corrgauss', np.ones(3), 1e-3 * np.ones(3), \
+        1e3 * np.ones(3)
+
+
+def test_training_key():
+    X, Y = _data()
+    key = training_key(X, Y[:, 0], *_settings())
+
+    assert key == training_key(X.copy(), Y[:, 0].copy(), *_settings())
+    assert key != training_key(X, Y[:, 1], *_settings())
+    assert key != training_key(X, Y[:, 0], 'poly0', *_settings()[1:])
+
+    theta0 = _settings()[2] * 2
+    assert key != training_key(X, Y[:, 0], 'poly1', 'corrgauss', theta0,
+                               *_settings()[3:])
+
+
+def test_models_are_reused():
+    CountingModel.fits.clear()
+    registry = KrigingModelRegistry(model_factory=CountingModel)
+    X, Y = _data()
+
+    # validation 'Perf' row, then gradients of the same outputs
+    perf = [registry.fit(alias, X, Y[:, j], *_settings())
+            for j, alias in enumerate(['y1', 'y2'])]
+    grad = [registry.fit(alias, X, Y[:, j], *_settings())
+            for j, alias in enumerate(['y1', 'y2'])]
+
+    assert [a is b for a, b in zip(perf, grad)] == [True, True]
+    assert len(CountingModel.fits) == 2
+    assert (registry.hits, registry.misses) == (2, 2)
+
+    # new data or settings are fitted again
+    X2, Y2 = _data(1)
+    assert registry.fit('y1', X2, Y2[:, 0], *_settings()) is not perf[0]
+    assert registry.fit('y1', X, Y[:, 0], 'poly0',
+                        *_settings()[1:]) is not perf[0]
+    assert len(CountingModel.fits) == 4
+
+
+def test_least_recently_used_are_dropped():
+    registry = KrigingModelRegistry(max_models=2, model_factory=CountingModel)
+    X, Y = _data()
+
+    first = registry.fit('y1', X, Y[:, 0], *_settings())
+    registry.fit('y2', X, Y[:, 1], *_settings())
+    registry.fit('y1', X, Y[:, 0], *_settings())
+    registry.fit(('y1', 'y2'), X, Y, *_settings())
+
+    assert len(registry) == 2
+    assert registry.get('y1', training_key(X, Y[:, 0], *_settings())) is first
+    assert registry.get('y2', training_key(X, Y[:, 1], *_settings())) is None
+
+    registry.clear()
+    assert len(registry) == 0
+
+    with pytest.raises(ValueError):
+        KrigingModelRegistry(max_models=0)
+
+
+def test_concurrent_fits():
+    registry = KrigingModelRegistry(model_factory=CountingModel)
+    X, Y = _data()
+    models = []
+
+    def fit(j):
+        models.append(registry.fit('y{0}'.format(j), X, Y[:, j % 2],
+                                   *_settings()))
+
+    threads = [threading.Thread(target=fit, args=(j,)) for j in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(models) == 8 and len(registry) == 8
+
+
+def main():
+    # fits of the reduced space steps for 20 outputs: validation 'Perf' row,
+    # gradients and hessian (one objective), with and without the registry
+    X, Y = _data()
+    Y = np.tile(Y, (1, 10))
+    labels = ['y{0}'.format(j + 1) for j in range(Y.shape[1])]
+
+    def factory(regression, correlation):
+        return CountingModel(regression, correlation, FIT_TIME)
+
+    for shared in [False, True]:
+        CountingModel.fits.clear()
+        registry = KrigingModelRegistry(model_factory=factory)
+        start = time.perf_counter()
+        for step in ['perf', 'gradient', 'hessian']:
+            if not shared:
+                registry.clear()
+            outputs = labels[:1] if step == 'hessian' else labels
+            for j, alias in enumerate(outputs):
+                registry.fit(alias, X, Y[:, j], *_settings())
+        elapsed = time.perf_counter() - start
+
+        print("registry {0:5}: {1:3d} fits in {2:.3f} s".format(
+            str(shared), len(CountingModel.fits), elapsed))
+
+
+if __name__ == "__main__":
+    main()
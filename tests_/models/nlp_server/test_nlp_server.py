@@ -0,0 +1,258 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from gui.models.batch_infill import (BatchCaballero, multistart_nlp,
+                                     start_points)
+from gui.models.nlp_server import (KrigingPredictor, LocalNlpServer,
+                                   NlpServer, _regpoly, _request,
+                                   kriging_to_dict, ping_nlp_server,
+                                   solve_remote)
+
+
+class NumpyKriging:
+    """Kriging with fixed correlation parameters and the fitted attributes of
+    `pydace.Dace` read by `kriging_to_dict`."""
+
+    def __init__(self, regression='poly0'):
+        self.regression = regression
+
+    def fit(self, S, Y, theta0, lob, upb):
+        S = np.asarray(S, dtype=float)
+        Y = np.asarray(Y, dtype=float).flatten()
+        self._Ssc = np.vstack((S.mean(axis=0), S.std(axis=0)))
+        self._Ysc = np.array([[Y.mean()], [Y.std()]])
+        self.S = (S - self._Ssc[0]) / self._Ssc[1]
+        self.theta = np.asarray(theta0, dtype=float)
+
+        Ys = (Y - self._Ysc[0, 0]) / self._Ysc[1, 0]
+        d = self.S[:, None, :] - self.S[None, :, :]
+        R = np.exp(-(self.theta * d ** 2).sum(axis=2)) + \
+            1e-10 * np.eye(S.shape[0])
+        F, _ = _regpoly(self.S, self.regression)
+        RiF = np.linalg.solve(R, F)
+        beta = np.linalg.solve(F.T @ RiF, RiF.T @ Ys)
+        gamma = np.linalg.solve(R, Ys - F @ beta)
+        self._fitpar = {'beta': beta[:, None], 'gamma': gamma[None, :]}
+
+    def predict(self, X, compute_jacobian=False):
+        return KrigingPredictor(kriging_to_dict(self, self.regression)) \
+            .predict(X, compute_jacobian)
+
+
+def _fitted(regression, fun, n=30, dim=2, seed=0):
+    S = np.random.RandomState(seed).rand(n, dim) * 4 - 2
+    model = NumpyKriging(regression)
+    model.fit(S, fun(S), np.ones(dim), None, None)
+    return S, model
+
+
+def _objective(X):
+    return (X ** 2 - 0.5 * np.cos(3 * np.pi * X)).sum(axis=1)
+
+
+def _constraint(X):
+    return 0.3 - X[:, 0]
+
+
+class ServerThread:
+    """`NlpServer` in a thread of this process."""
+
+    def __init__(self, workers=1):
+        self.server = NlpServer(('127.0.0.1', 0), workers=workers)
+        self.thread = threading.Thread(target=self.server.serve_forever,
+                                       daemon=True)
+        self.thread.start()
+
+    def __enter__(self):
+        return self.server
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def test_predictor_interpolates_and_gradient():
+    for regression in ['poly0', 'poly1', 'poly2']:
+        S, model = _fitted(regression, _objective)
+        predictor = KrigingPredictor(kriging_to_dict(model, regression))
+
+        y, _ = predictor.predict(S)
+        np.testing.assert_allclose(y, _objective(S), atol=1e-6)
+
+        x = np.array([[0.3, -0.7]])
+        _, dy = predictor.predict(x, compute_jacobian=True)
+        h = 1e-6
+        fd = [(predictor.predict(x + h * e)[0] -
+               predictor.predict(x - h * e)[0]).item() / (2 * h)
+              for e in np.eye(2)]
+        np.testing.assert_allclose(dy[0], fd, rtol=1e-5, atol=1e-6)
+
+
+def test_server_solves_like_local_multistart():
+    models = [_fitted('poly0', _objective, n=60)[1],
+              _fitted('poly1', _constraint)[1]]
+    lb, ub = [-2.0, -2.0], [2.0, 2.0]
+    starts = start_points(12, lb, ub, design='sobol')
+
+    local = multistart_nlp([KrigingPredictor(kriging_to_dict(m, m.regression))
+                            for m in models], lb, ub, starts)
+
+    with ServerThread() as server:
+        assert ping_nlp_server(server.url)
+        params = [kriging_to_dict(m, m.regression) for m in models]
+
+        # several optimizations using the server at the same time
+        with ThreadPoolExecutor(max_workers=4) as clients:
+            results = list(clients.map(
+                lambda _: solve_remote(server.url, params, starts, lb, ub),
+                range(4)))
+
+    for remote in results:
+        assert len(remote['solutions']) == len(local['solutions'])
+        np.testing.assert_allclose(remote['solutions'][0]['x'],
+                                   local['solutions'][0]['x'])
+        assert remote['start_times'].shape == (12,)
+
+
+def test_invalid_requests():
+    with ServerThread() as server:
+        try:
+            solve_remote(server.url, [{'regression': 'poly0'}], [[0.0]],
+                         [0.0], [1.0])
+        except ValueError as error:
+            assert 'KeyError' in str(error)
+        else:
+            raise AssertionError("Invalid request accepted.")
+
+        url = server.url
+
+    assert not ping_nlp_server(url, timeout=1.0)
+
+
+def test_batch_optimization_on_server():
+    x = np.random.RandomState(1).rand(12, 2)
+    g = (0.75 - x[:, 0])[:, None]
+    f = ((x - 0.5) ** 2).sum(axis=1)
+
+    def model_function(points):
+        return [{'status': True, 'f': ((p - 0.5) ** 2).sum(),
+                 'g': [0.75 - p[0]], 'extras': []} for p in points]
+
+    with ServerThread() as server:
+        opt = BatchCaballero(x, g, f, model_function, lb=[0, 0], ub=[1, 1],
+                             regression='poly1', batch_size=2,
+                             max_fun_evals=20, n_starts=4,
+                             nlp_server_url=server.url,
+                             surrogate_factory=NumpyKriging, random_state=0)
+        opt.optimize()
+
+    np.testing.assert_allclose(opt.xopt, [0.75, 0.5], atol=5e-2)
+    assert len(opt.start_times) > 0
+
+
+def test_local_server_subprocess():
+    with LocalNlpServer() as server:
+        assert server.running and ping_nlp_server(server.url)
+
+    assert not server.running
+
+
+def _surropt_data(n=20, seed=2):
+    # samples of the problem min (x - 0.5)^2 s.t. 0.75 - x1 <= 0 in [0, 1]^2
+    x = np.random.RandomState(seed).rand(n, 2)
+    f = ((x - 0.5) ** 2).sum(axis=1)
+    g = (0.75 - x[:, 0])[:, None]
+    return x, g, f
+
+
+def test_surropt_protocol():
+    x, g, f = _surropt_data()
+    request = {'x0': [0.9, 0.1], 'lb': [0.0, 0.0], 'ub': [1.0, 1.0],
+               'surr_data': {'input_design': x.tolist(),
+                             'fobj_data': {'fobj_obs': f.tolist(),
+                                           'fobj_theta': [0.1, 0.1]},
+                             'const_data': {'const_obs': g.tolist(),
+                                            'const_theta': [[0.1, 0.1]]},
+                             'regmodel': 'poly1', 'corrmodel': 'corrgauss'},
+               'nlp_opts': {'tol': 1e-8, 'max_iter': 100, 'con_tol': 1e-6}}
+
+    with LocalNlpServer() as server:
+        sol = _request(server.url + '/opt', request)
+
+        request['surr_data']['corrmodel'] = 'corrcubic'
+        with pytest.raises(ValueError):
+            _request(server.url + '/opt', request)
+
+    assert sol['exitflag'] == 1
+    np.testing.assert_allclose(sol['x'], [0.75, 0.5], atol=1e-2)
+    assert abs(sol['fval'] - 0.0625) < 1e-2
+
+
+def test_surropt_optimize_nlp_on_local_server():
+    nlp = pytest.importorskip('surropt.core.nlp')
+    from surropt.core.options.nlp import DockerNLPOptions
+    from surropt.core.procedures import InfillProcedure
+
+    class Procedure(InfillProcedure):
+        # fitted surrogates read by `optimize_nlp`
+        def __init__(self, regression, surr_obj, surr_con):
+            self.regression = regression
+            self.surr_obj, self.surr_con = surr_obj, surr_con
+
+        def check_setup(self):
+            pass
+
+        def optimize(self):
+            pass
+
+    x, g, f = _surropt_data()
+    surr_obj = NumpyKriging('poly1')
+    surr_obj.fit(x, f, 0.1 * np.ones(2), None, None)
+    surr_con = NumpyKriging('poly1')
+    surr_con.fit(x, g, 0.1 * np.ones(2), None, None)
+
+    with LocalNlpServer() as server:
+        options = DockerNLPOptions(name='local', server_url=server.url)
+        options.test_connection()
+        sol = nlp.optimize_nlp(Procedure('poly1', surr_obj, [surr_con]), x,
+                               g, f, options, [0.9, 0.1], [0.0, 0.0],
+                               [1.0, 1.0])
+
+    assert sol['exitflag'] == 1
+    np.testing.assert_allclose(sol['x'], [0.75, 0.5], atol=1e-2)
+
+
+def main():
+    # wall time of the same multistart (64 starts) solved in this process, in
+    # a local server subprocess and by 4 clients sharing that server
+    models = [_fitted('poly0', _objective, n=100, dim=4)[1],
+              _fitted('poly1', _constraint, dim=4)[1]]
+    params = [kriging_to_dict(m, m.regression) for m in models]
+    lb, ub = [-2.0] * 4, [2.0] * 4
+    starts = start_points(64, lb, ub, design='sobol')
+
+    start = time.perf_counter()
+    multistart_nlp([KrigingPredictor(p) for p in params], lb, ub, starts)
+    print("in process:       {0:7.3f} s".format(time.perf_counter() - start))
+
+    with LocalNlpServer() as server:
+        start = time.perf_counter()
+        res = solve_remote(server.url, params, starts, lb, ub)
+        print("local server:     {0:7.3f} s ({1:.2f} ms per start)".format(
+            time.perf_counter() - start, res['start_times'].mean() * 1e3))
+
+        with ThreadPoolExecutor(max_workers=4) as clients:
+            start = time.perf_counter()
+            list(clients.map(
+                lambda _: solve_remote(server.url, params, starts, lb, ub),
+                range(4)))
+            print("4 clients:        {0:7.3f} s".format(
+                time.perf_counter() - start))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import time
+
+import numpy as np
+import pytest
+
+from gui.models.parity_plot import draw_parity_page, plot_pages, thin_scatter
+
+
+def _cloud(n, seed=0):
+    rng = np.random.RandomState(seed)
+    x = rng.randn(n)
+    return x, x + 0.01 * rng.randn(n)
+
+
+def test_small_sets_are_kept():
+    x, y = _cloud(100)
+    y[3] = np.nan
+
+    keep = thin_scatter(x, y, max_points=200)
+    np.testing.assert_array_equal(keep, np.delete(np.arange(100), 3))
+
+
+def test_dense_cloud_is_thinned_keeping_outliers():
+    x, y = _cloud(50000)
+    x[10], y[10] = 0.0, 3.0  # far from the diagonal
+
+    keep = thin_scatter(x, y, max_points=2000, random_state=0)
+
+    assert keep.size <= 2000
+    assert np.all(np.diff(keep) > 0)
+    assert 10 in thin_scatter(x, y, max_points=10000)
+    # the range of the cloud is preserved
+    assert x[keep].min() < -3 and x[keep].max() > 3
+
+
+def test_thinning_is_reproducible():
+    x, y = _cloud(50000)
+
+    np.testing.assert_array_equal(thin_scatter(x, y, 500, random_state=1),
+                                  thin_scatter(x, y, 500, random_state=1))
+
+    with pytest.raises(ValueError):
+        thin_scatter(x, y[:-1])
+
+
+def test_plot_pages():
+    assert plot_pages(5, 2) == [[0, 1], [2, 3], [4]]
+    assert plot_pages(0, 8) == []
+
+    with pytest.raises(ValueError):
+        plot_pages(3, 0)
+
+
+def test_draw_page():
+    figure_module = pytest.importorskip('matplotlib.figure')
+    figure = figure_module.Figure()
+    x, y = _cloud(5000)
+    data = np.column_stack((x, y, x))
+
+    draw_parity_page(figure, data, data + 0.1, ['a', 'b', 'c'], [1, 2],
+                     max_points=1000)
+
+    assert [ax.get_title() for ax in figure.axes] == ['b', 'c']
+    assert len(figure.axes[0].lines[0].get_xdata()) <= 1000
+
+
+def main():
+    # time to select the points of 40 outputs with 20000 test points each
+    x, y = _cloud(20000)
+    start = time.perf_counter()
+    for i in range(40):
+        keep = thin_scatter(x, y, random_state=i)
+    elapsed = time.perf_counter() - start
+
+    print("40 outputs x {0} points thinned to {1} in {2:.3f} s".format(
+        x.size, keep.size, elapsed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+import collections
+
+from gui.models.aspen_var_catalogue import BLOCKS_CATALOGUE, STREAMS_CATALOGUE
+from gui.models.sim_connections import AspenConnection
+
+# COM accesses made on every fake node, shared by all of them
+ACCESSES = collections.Counter()
+
+
+class FakeNode:
+    """Stand-in of an Aspen Plus tree node that counts the property reads."""
+
+    def __init__(self, name, children=(), value=None, value_type=2,
+                 record_type=None):
+        self._name = name
+        self._children = list(children)
+        self._value = value
+        self._value_type = value_type
+        self._record_type = record_type
+        self.reads = collections.Counter()
+
+    def _read(self, attr):
+        ACCESSES[attr] += 1
+        self.reads[attr] += 1
+
+    @property
+    def Name(self):
+        self._read('Name')
+        return self._name
+
+    @property
+    def Elements(self):
+        self._read('Elements')
+        return iter(self._children)
+
+    @property
+    def ValueType(self):
+        self._read('ValueType')
+        return self._value_type
+
+    @property
+    def Value(self):
+        self._read('Value')
+        return self._value
+
+    @property
+    def UnitString(self):
+        self._read('UnitString')
+        return 'C'
+
+    def AttributeValue(self, attr):
+        self._read('AttributeValue')
+        if attr == 38:
+            return int(len(self._children) != 0)
+        else:
+            return self._record_type
+
+    def FindNode(self, node_path):
+        self._read('FindNode')
+        node = self
+        for name in node_path.strip('\\').split('\\')[1:]:
+            node = next((c for c in node._children if c._name == name), None)
+            if node is None:
+                return None
+        return node
+
+    def all_nodes(self):
+        yield self
+        for child in self._children:
+            yield from child.all_nodes()
+
+
+def _variables(catalogue, with_values):
+    nodes = []
+    for i, entry in enumerate(catalogue):
+        if entry['Name'] == 'FLOW':
+            nodes.append(FakeNode('FLOW', [FakeNode('A', value=1.0),
+                                           FakeNode('B')]))
+        else:
+            value = float(i) if with_values and i % 2 == 0 else None
+            nodes.append(FakeNode(entry['Name'], value=value))
+    return nodes
+
+
+def _flowsheet(name, record_type, catalogue):
+    return FakeNode(name, [
+        FakeNode('Input', _variables(catalogue['Input'][record_type], True)),
+        FakeNode('Output', _variables(catalogue['Output'][record_type],
+                                      True))],
+        record_type=record_type)
+
+
+class FakeDocument:
+    def __init__(self):
+        self.Tree = FakeNode('Data', [
+            FakeNode('Streams', [
+                _flowsheet('FEED', 'MATERIAL', STREAMS_CATALOGUE),
+                _flowsheet('OUT', 'MATERIAL', STREAMS_CATALOGUE)]),
+            FakeNode('Blocks', [
+                _flowsheet('MIX', 'Mixer', BLOCKS_CATALOGUE),
+                _flowsheet('HEAT', 'Heater', BLOCKS_CATALOGUE)]),
+            FakeNode('Flowsheeting Options', [
+                FakeNode('Design-Spec', [])]),
+            FakeNode('Results Summary', [
+                FakeNode('Run-Status', [
+                    FakeNode('Output', [FakeNode('UOSSTAT2', value=8)])])])])
+
+    def Quit(self):
+        pass
+
+
+def _fake_open(self):
+    self._aspen = FakeDocument()
+
+
+def _leaves(node):
+    if node.get('children'):
+        return [leaf for child in node['children'] for leaf in _leaves(child)]
+    else:
+        return [node]
+
+
+def test_counted_calls_match_com_accesses(monkeypatch):
+    monkeypatch.setattr(AspenConnection, 'open_connection', _fake_open)
+    con = AspenConnection('fake.bkp')
+    con.open_connection()
+    ACCESSES.clear()
+
+    tree = con.get_simulation_partial_io_tree('input')
+
+    assert con.com_calls == ACCESSES
+    assert all('value' in leaf for leaf in _leaves(tree))
+
+    # no attribute of a node is read more than once
+    assert all(count <= 1 for node in con._aspen.Tree.all_nodes()
+               for attr, count in node.reads.items() if attr != 'FindNode')
+
+    # units are only read for the leaves with value
+    n_values = sum('value' in leaf for leaf in _leaves(tree))
+    assert con.com_calls['UnitString'] == n_values
+
+
+def test_lazy_tree_calls():
+    # only the catalogue entries are read when the branches are lazy
+    con = AspenConnection('fake.bkp')
+    con._aspen = FakeDocument()
+
+    con.get_simulation_partial_io_tree('input', max_depth=0)
+
+    # children are only listed for the streams/blocks/design specs folders
+    assert con.com_calls['Elements'] == 3
+    assert con.com_calls['FindNode'] == 3 + \
+        2 * len(STREAMS_CATALOGUE['Input']['MATERIAL']) + \
+        len(BLOCKS_CATALOGUE['Input']['Mixer']) + \
+        len(BLOCKS_CATALOGUE['Input']['Heater'])
+
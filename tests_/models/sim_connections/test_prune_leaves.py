@@ -0,0 +1,104 @@
+import copy
+import pathlib
+import time
+
+import simplejson as json
+
+from gui.models.sim_connections import AspenConnection
+
+TREE_FILE = pathlib.Path(__file__).parents[2] / 'save_open' / \
+    'infill_tree.json'
+
+
+def _load_trees() -> dict:
+    with open(TREE_FILE, 'r') as fp:
+        return json.load(fp)
+
+
+def _set_values(node: dict, every: int = 3, counter: list = None) -> dict:
+    # copy of the tree where one in every `every` leaves has a value
+    counter = [0] if counter is None else counter
+    node = dict(node)
+    if node.get('children'):
+        node['children'] = [_set_values(child, every, counter)
+                            for child in node['children']]
+    else:
+        counter[0] += 1
+        if counter[0] % every == 0:
+            node['value'] = float(counter[0])
+
+    return node
+
+
+def _replicate(root: dict, copies: int) -> dict:
+    # root whose branches are `copies` copies of `root` branches
+    return {'node': root['node'],
+            'children': [dict(copy.deepcopy(child),
+                              node='{0}_{1}'.format(child['node'], i))
+                         for i in range(copies)
+                         for child in root['children']]}
+
+
+def _leaves(node: dict) -> list:
+    if node.get('children'):
+        return [leaf for child in node['children'] for leaf in _leaves(child)]
+    else:
+        return [node]
+
+
+def test_leaves_without_value_are_pruned():
+    tree = {'node': 'Data', 'children': [
+        {'node': 'Streams', 'children': [
+            {'node': 'FEED', 'children': [
+                {'node': 'TEMP', 'value': 300.0},
+                {'node': 'PRES'}]},
+            {'node': 'EMPTY', 'children': [
+                {'node': 'A', 'children': [{'node': 'B'}]}]}]},
+        {'node': 'Blocks', 'children': [
+            {'node': 'TOWER', 'lazy': True}]}]}
+    original = copy.deepcopy(tree)
+
+    pruned = AspenConnection._prune_leaves(tree)
+
+    assert tree == original
+    assert [leaf['node'] for leaf in _leaves(pruned)] == ['TEMP', 'TOWER']
+    assert [n['node'] for n in pruned['children'][0]['children']] == ['FEED']
+
+
+def test_everything_pruned_keeps_root():
+    tree = {'node': 'Data', 'children': [
+        {'node': 'Streams', 'children': [{'node': 'FEED'}]}]}
+
+    assert AspenConnection._prune_leaves(tree) == {'node': 'Data',
+                                                   'children': []}
+
+
+def test_saved_trees():
+    trees = _load_trees()
+    for iotype in ['input', 'output']:
+        tree = _set_values(trees[iotype])
+        pruned = AspenConnection._prune_leaves(tree)
+
+        assert all('value' in leaf for leaf in _leaves(pruned))
+        assert len(_leaves(pruned)) == \
+            sum('value' in leaf for leaf in _leaves(tree))
+
+
+def main():
+    # rough timing of the pruning of the saved trees, replicated to show how
+    # it scales with the number of nodes
+    trees = _load_trees()
+    for iotype in ['input', 'output']:
+        tree = _set_values(trees[iotype])
+        for copies in [1, 10, 100]:
+            big_tree = _replicate(tree, copies)
+            n_leaves = len(_leaves(big_tree))
+
+            start = time.perf_counter()
+            AspenConnection._prune_leaves(big_tree)
+            print("{0:>6} tree, {1:7d} leaves: {2:.3f} ms".format(
+                iotype, n_leaves, (time.perf_counter() - start) * 1e3))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+import os
+import threading
+import time
+
+import pytest
+
+from gui.models.converged_states import ConvergedStates
+from gui.models.sim_connections import (_RUN_STATUS_PATH,
+                                        SimulationSessionCache,
+                                        SimulationSessionPool)
+
+
+class FakeNode:
+    def __init__(self, values: dict, path: str):
+        self._values = values
+        self._path = path
+
+    @property
+    def Value(self):
+        return self._values[self._path]
+
+    @Value.setter
+    def Value(self, value):
+        self._values[self._path] = value
+
+
+class FakeEngine:
+    """Stand-in of the Aspen Plus document: a run converges (status 8) unless
+    the engine is `diverged`, which only a `Reinit` clears. With `broken`,
+    no run converges. With `hung`, a run only returns once the engine is
+    killed. `document` is the archive the document is bound to."""
+
+    def __init__(self, document=None):
+        self.document = document
+        self.values = {'x': 1.0, 'y': 2.0, _RUN_STATUS_PATH: 8}
+        self.Tree = self
+        self.Engine = self
+        self.Visible = 0
+        self.diverged = False
+        self.broken = False
+        self.hung = False
+        self.killed = threading.Event()
+        self.reinits = 0
+
+    def FindNode(self, path):
+        return FakeNode(self.values, path)
+
+    def Run2(self):
+        if self.hung:
+            self.killed.wait()
+            raise RuntimeError("The server was killed.")
+
+        ok = not (self.diverged or self.broken)
+        self.values[_RUN_STATUS_PATH] = 8 if ok else 0
+
+    def Reinit(self):
+        self.reinits += 1
+        self.diverged = False
+
+    def Export(self, kind, path):
+        open(path, 'w').close()
+
+    def InitFromArchive2(self, path):
+        self.document = path
+
+
+class FakeConnection:
+    """Stand-in of `AspenConnection`, opening takes `open_time` s."""
+    open_time = 0.0
+
+    def __init__(self, file_path):
+        time.sleep(self.open_time)
+        self.engine = FakeEngine(file_path)
+        self.closed = False
+
+    def get_connection_object(self):
+        return self.engine
+
+    def close_connection(self):
+        self.closed = True
+
+    def kill_connection(self):
+        self.engine.killed.set()
+
+
+def _set(engine, values: dict = None):
+    engine.values.update(values or {})
+    return engine
+
+
+def test_warm_session_is_reset_and_reused():
+    cache = SimulationSessionCache(connection_factory=FakeConnection)
+    session = cache.lease('a.bkp', timeout=5.0, input_paths=['x'])
+    engine = session.run(_set, {'x': 5.0})
+    engine.Visible = 1
+    cache.release(session, wait=True)
+
+    # inputs back to the archived values, run and GUI hidden
+    assert engine.values == {'x': 1.0, 'y': 2.0, _RUN_STATUS_PATH: 8}
+    assert engine.Visible == 0 and cache.n_idle == 1
+
+    # the same engine, with the timeout of the new lease
+    again = cache.lease('a.bkp', input_paths=['x', 'y'])
+    assert again is session and again.timeout is None
+    assert again.run(_set, {'y': 3.0}) is engine
+    cache.release(again, wait=True)
+    assert engine.values['y'] == 2.0
+
+    # sessions of other files and concurrent leases are new engines
+    other = cache.lease('b.bkp')
+    first, second = cache.lease('a.bkp'), cache.lease('a.bkp')
+    assert first is session and second is not session
+    assert cache.n_opened == 3 and cache.n_leases == 5
+
+    for leased in [other, first, second]:
+        cache.release(leased, wait=True)
+    cache.close()
+    assert engine.values['x'] == 1.0 and cache.n_idle == 0
+
+
+def test_failed_reset():
+    cache = SimulationSessionCache(connection_factory=FakeConnection)
+
+    # not converged from the last state: reinitialized and run again
+    session = cache.lease('a.bkp', input_paths=['x'])
+    engine = session.run(_set, {'x': 50.0})
+    engine.diverged = True
+    cache.release(session, wait=True)
+    assert engine.reinits == 1 and cache.n_idle == 1
+
+    # not converged at all: the session is closed
+    session = cache.lease('a.bkp')
+    connection = session._opened.result()
+    session.run(_set).broken = True
+    cache.release(session, wait=True)
+    assert connection.closed and cache.n_idle == 0
+    assert cache.lease('a.bkp') is not session
+    cache.close()
+
+
+def test_idle_timeout_and_close():
+    cache = SimulationSessionCache(idle_timeout=0.2,
+                                   connection_factory=FakeConnection)
+    session = cache.lease('a.bkp')
+    connection = session._opened.result()
+    cache.release(session, wait=True)
+    assert cache.n_idle == 1
+
+    time.sleep(1.0)
+    assert cache.n_idle == 0 and connection.closed
+
+    # sessions still leased are closed when released after the cache
+    session = cache.lease('a.bkp')
+    connection = session._opened.result()
+    cache.close()
+    assert not connection.closed
+    cache.release(session)
+    assert connection.closed
+
+    with pytest.raises(RuntimeError):
+        cache.lease('a.bkp')
+
+
+def test_session_loaded_from_a_snapshot_is_discarded():
+    cache = SimulationSessionCache(connection_factory=FakeConnection)
+    session = cache.lease('a.bkp', input_paths=['x'])
+    states = ConvergedStates([0.0], [10.0], record_every=1)
+
+    # a converged case recorded, then restored after a failed one
+    engine = session.run(lambda engine: engine)
+    session.run(states.record, [1.0])
+    assert session.run(states.restore, [2.0])
+    assert engine.document != 'a.bkp' and states.loaded
+
+    cache.release(session, wait=True, discard=states.loaded)
+    states.close()
+    assert cache.n_idle == 0
+
+    # the next lease is a new engine, bound to the simulation file
+    again = cache.lease('a.bkp')
+    assert again is not session
+    assert again.run(lambda engine: engine.document) == 'a.bkp'
+    cache.release(again, wait=True)
+    cache.close()
+
+
+def test_close_kills_hung_restores():
+    cache = SimulationSessionCache(close_timeout=0.2,
+                                   connection_factory=FakeConnection)
+    session = cache.lease('a.bkp')
+    session.run(_set).hung = True
+    cache.release(session)
+
+    # the restore never returns, it isn't waited for past the timeout
+    start = time.perf_counter()
+    cache.close()
+    assert time.perf_counter() - start < 2.0
+    assert session._opened.result().engine.killed.is_set()
+    assert cache.n_idle == 0
+
+
+def test_modified_file_is_opened_again(tmp_path):
+    sim_file = str(tmp_path / 'sim.bkp')
+    open(sim_file, 'w').close()
+
+    cache = SimulationSessionCache(connection_factory=FakeConnection)
+    session = cache.lease(sim_file)
+    cache.release(session, wait=True)
+
+    modified = os.path.getmtime(sim_file) + 10
+    os.utime(sim_file, (modified, modified))
+    assert cache.lease(sim_file) is not session
+    cache.close()
+
+
+def test_pool_leases_from_the_cache():
+    cache = SimulationSessionCache(connection_factory=FakeConnection)
+    with SimulationSessionPool('a.bkp', 2, cache=cache,
+                               input_paths=['x']) as pool:
+        engines = pool.map(lambda engine, x: _set(engine, {'x': x}),
+                           [3.0, 4.0])
+        assert pool.n_sessions == 2
+
+    # released (and reset) when the pool is closed
+    cache.close()
+    assert cache.n_opened == 2
+    assert [engine.values['x'] for engine in engines] == [1.0, 1.0]
+
+
+def main():
+    # time for 4 stages to get an engine and run a case, opening a new engine
+    # per stage against leasing warm ones from the cache (each open takes
+    # 2 s, as a fast InitFromArchive2)
+    FakeConnection.open_time = 2.0
+    cache = SimulationSessionCache(connection_factory=FakeConnection)
+    for stage in range(4):
+        start = time.perf_counter()
+        session = cache.lease('a.bkp', input_paths=['x'])
+        session.run(_set, {'x': stage})
+        elapsed = time.perf_counter() - start
+        cache.release(session, wait=True)
+        print("stage {0}: {1:5.2f} s ({2} engines opened)".format(
+            stage, elapsed, cache.n_opened))
+
+    cache.close()
+
+
+if __name__ == "__main__":
+    main()
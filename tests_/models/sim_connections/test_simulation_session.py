@@ -0,0 +1,110 @@
+import threading
+import time
+
+import pytest
+
+from gui.models.sim_connections import (CaseTimeoutError, SimulationSession,
+                                        SimulationSessionPool)
+
+
+class FakeConnection:
+    """Stand-in of `AspenConnection` that records how it was closed. With
+    `attached`, its server process is unknown and it can't be killed."""
+    attached = False
+
+    def __init__(self, file_path):
+        self.thread = threading.get_ident()
+        self.closed = False
+        self.killed = threading.Event()
+
+    def get_connection_object(self):
+        return self
+
+    def close_connection(self):
+        # as `AspenConnection`, nothing to close once killed
+        self.closed = not self.killed.is_set()
+
+    def kill_connection(self):
+        if self.attached:
+            raise RuntimeError("Unknown server process.")
+
+        self.killed.set()
+
+
+def _hang(connection):
+    # engine call that only returns when the engine is killed
+    connection.killed.wait()
+    raise RuntimeError("The engine was killed.")
+
+
+def test_timeout_respawns_the_session():
+    session = SimulationSession('fake.bkp', timeout=0.2,
+                                connection_factory=FakeConnection)
+    first = session.run(lambda con: con)
+
+    start = time.perf_counter()
+    with pytest.raises(CaseTimeoutError):
+        session.run(_hang)
+    assert time.perf_counter() - start < 2.0
+    assert first.killed.is_set()
+
+    # the next job runs in a new engine, in a new thread
+    second = session.run(lambda con: con)
+    assert second is not first and second.thread != first.thread
+    assert session.n_respawns == 1
+
+    session.close()
+    assert second.closed and not first.closed
+
+
+def test_engine_that_cant_be_killed():
+    class AttachedConnection(FakeConnection):
+        attached = True
+
+    session = SimulationSession('fake.bkp', timeout=0.2,
+                                connection_factory=AttachedConnection)
+    first = session.run(lambda con: con)
+
+    # the error is raised instead of going on as if the engine was killed
+    with pytest.raises(RuntimeError, match='Unknown server'):
+        session.run(_hang)
+    assert not first.killed.is_set()
+
+    # and the session is respawned in a new engine all the same
+    assert session.run(lambda con: con) is not first
+    assert session.n_respawns == 1
+    session.close()
+    first.killed.set()
+
+
+def test_no_timeout_and_errors():
+    session = SimulationSession('fake.bkp', connection_factory=FakeConnection)
+    assert session.run(lambda con, x: 2 * x, 4) == 8
+
+    with pytest.raises(ValueError):
+        session.run(lambda con: int('a'))
+    assert session.n_respawns == 0
+    session.close()
+
+    def fail_open(file_path):
+        raise FileNotFoundError(file_path)
+
+    session = SimulationSession('fake.bkp', connection_factory=fail_open)
+    with pytest.raises(FileNotFoundError):
+        session.wait_open()
+
+
+def test_pool_goes_on_after_a_timeout():
+    def job(connection, value):
+        if value == 2:
+            _hang(connection)
+        return value
+
+    with SimulationSessionPool('fake.bkp', 2, timeout=0.2,
+                               connection_factory=FakeConnection) as pool:
+        futures = [pool.submit(job, value) for value in range(4)]
+
+        with pytest.raises(CaseTimeoutError):
+            futures[2].result()
+        assert [futures[k].result() for k in (0, 1, 3)] == [0, 1, 3]
+        assert pool.n_respawns == 1
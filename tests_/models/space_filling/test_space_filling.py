@@ -0,0 +1,163 @@
+import time
+
+import numpy as np
+
+from gui.models.space_filling import (MAX_OPTIMIZED_POINTS, SOBOL_MAX_DIM,
+                                      _level_distances, centered_discrepancy,
+                                      design, ese_lhs, halton, maximin_lhs,
+                                      min_distance, phi_p, random_lhs,
+                                      scale_to_bounds, sobol)
+
+
+def test_sobol_is_stratified():
+    # the first 2^k points have one point in each interval of size 2^-k of
+    # every dimension
+    points = sobol(64, SOBOL_MAX_DIM)
+
+    assert points.shape == (64, SOBOL_MAX_DIM)
+    assert np.all(points[0] == 0.0)
+    for dim in range(SOBOL_MAX_DIM):
+        assert np.unique(np.floor(points[:, dim] * 64)).size == 64
+
+    # first two dimensions: one point in each 1/8 x 1/8 square
+    cells = np.floor(points[:, :2] * 8) @ [8, 1]
+    assert np.unique(cells).size == 64
+
+
+def test_sobol_skip_and_dimension_limit():
+    np.testing.assert_array_equal(sobol(10, 3, skip=6), sobol(16, 3)[6:])
+
+    try:
+        sobol(10, SOBOL_MAX_DIM + 1)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Sobol points beyond the supported dimensions.")
+
+
+def test_random_lhs():
+    points = random_lhs(20, 4, random_state=0)
+
+    for dim in range(4):
+        assert np.unique(np.floor(points[:, dim] * 20)).size == 20
+
+    np.testing.assert_array_equal(points, random_lhs(20, 4, random_state=0))
+
+    scaled = scale_to_bounds(points, [-1, 0, 10, 5], [1, 2, 20, 5])
+    assert np.all(scaled[:, 2] >= 10) and np.all(scaled[:, 2] <= 20)
+    assert np.all(scaled[:, 3] == 5)
+
+
+def _is_lhs(points):
+    n_points = points.shape[0]
+    return all(np.unique(np.floor(points[:, dim] * n_points)).size ==
+               n_points for dim in range(points.shape[1]))
+
+
+def _best_random_lhs(n_points, dim, n_iter, random_state=None):
+    # selection used by pydace: the best maximin of `n_iter` random designs
+    rng = np.random.RandomState(random_state)
+    return max((random_lhs(n_points, dim, rng) for _ in range(n_iter)),
+               key=min_distance)
+
+
+def test_halton():
+    points = halton(9, 2)
+
+    np.testing.assert_allclose(points[:, 0],
+                               [0, .5, .25, .75, .125, .625, .375, .875,
+                                .0625])
+    np.testing.assert_allclose(points[:4, 1], [0, 1 / 3, 2 / 3, 1 / 9])
+    np.testing.assert_array_equal(halton(5, 3, skip=4), halton(9, 3)[4:])
+
+
+def test_optimized_lhs_improve_random_designs():
+    for method in [ese_lhs, maximin_lhs]:
+        points = method(40, 3, n_iter=5, random_state=0)
+
+        assert _is_lhs(points)
+        assert min_distance(points) > \
+            min_distance(_best_random_lhs(40, 3, 5, random_state=0))
+        np.testing.assert_array_equal(
+            points, method(40, 3, n_iter=5, random_state=0))
+
+
+def test_distance_updates():
+    # the swap updates of the optimizers match the distances recomputed
+    from gui.models.space_filling import _apply_swap, _swap_rows
+
+    rng = np.random.RandomState(1)
+    levels = np.column_stack([rng.permutation(30)
+                              for _ in range(4)]).astype(float)
+    dist = _level_distances(levels)
+    a, b = np.array([3, 7, 12]), np.array([20, 1, 29])
+    new_a, new_b = _swap_rows(dist, levels, 2, a, b)
+    _apply_swap(dist, levels, 2, a[1], b[1], new_a[1], new_b[1])
+
+    np.testing.assert_array_equal(dist, _level_distances(levels))
+
+
+def test_metrics():
+    grid = np.array([[0.0, 0.0], [0.0, 1.0], [1.0, 0.0], [1.0, 1.0]])
+
+    assert min_distance(grid) == 1.0
+    # 4 pairs at distance 1 and 2 at sqrt(2)
+    np.testing.assert_allclose(phi_p(grid, p=2), np.sqrt(4 + 2 / 2))
+
+    # the discrepancy of the best design points is lower than a random one
+    rng = np.random.RandomState(0)
+    assert centered_discrepancy(sobol(64, 3)) < \
+        centered_discrepancy(rng.rand(64, 3))
+    np.testing.assert_allclose(
+        centered_discrepancy(np.array([[0.5]])),
+        np.sqrt(13 / 12 - 2 + 1))
+
+
+def test_design():
+    points = design(10, [0, -1], [2, 1], method='halton',
+                    include_vertices=True)
+
+    assert points.shape == (14, 2)
+    np.testing.assert_array_equal(points[-4:],
+                                  [[0, -1], [0, 1], [2, -1], [2, 1]])
+
+    for method, n_points in [('ese', MAX_OPTIMIZED_POINTS + 1),
+                             ('sobol', 10), ('random', 10)]:
+        try:
+            design(n_points, [0] * 30, [1] * 30, method=method)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("Invalid design accepted.")
+
+
+def main():
+    for n_points in [1000, 10000]:
+        start = time.perf_counter()
+        sobol(n_points, 10)
+        print("sobol, {0:6d} points (10 dims): {1:8.2f} ms".format(
+            n_points, (time.perf_counter() - start) * 1e3))
+
+    # generation time and space filling quality of each method: minimum
+    # distance (larger is better), phi_p and centered discrepancy (smaller)
+    methods = [
+        ('best of 5 random LHS', lambda n, d: _best_random_lhs(n, d, 5, 0)),
+        ('ESE LHS', lambda n, d: ese_lhs(n, d, 5, random_state=0)),
+        ('maximin LHS', lambda n, d: maximin_lhs(n, d, 5, random_state=0)),
+        ('sobol', sobol),
+        ('halton', halton)]
+
+    for n_points, dim in [(100, 5), (1000, 15)]:
+        print("\n{0} points, {1} dimensions".format(n_points, dim))
+        for name, method in methods:
+            start = time.perf_counter()
+            points = method(n_points, dim)
+            elapsed = time.perf_counter() - start
+            print("{0:>22}: {1:8.3f} s  min dist {2:6.4f}  phi_p {3:7.4f}  "
+                  "CD2 {4:7.5f}".format(name, elapsed, min_distance(points),
+                                        phi_p(points),
+                                        centered_discrepancy(points)))
+
+
+if __name__ == "__main__":
+    main()
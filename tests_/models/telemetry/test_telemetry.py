@@ -0,0 +1,183 @@
+import time
+
+import numpy as np
+
+from gui.models.batch_infill import BatchCaballero
+from gui.models.telemetry import (TelemetryLog, iteration_table,
+                                  read_telemetry, replay, run_summary)
+
+# seconds taken by each fake simulation in the replay comparison
+CASE_TIME = 0.02
+
+
+class RbfModel:
+    """Gaussian RBF interpolator with the `Dace` fit/predict interface."""
+
+    def __init__(self, regression):
+        self.regression = regression
+
+    def fit(self, S, Y, theta0, lob, upb):
+        self.S = np.asarray(S)
+        self.theta = np.full(self.S.shape[1], 2.0)
+        self.mean = np.mean(Y)
+        K = self._kernel(self.S) + 1e-10 * np.eye(self.S.shape[0])
+        self.w = np.linalg.solve(K, np.asarray(Y) - self.mean)
+
+    def _kernel(self, X):
+        d = X[:, None, :] - self.S[None, :, :]
+        return np.exp(-2.0 * (d ** 2).sum(axis=2))
+
+    def predict(self, X, compute_jacobian=False):
+        k = self._kernel(X)
+        y = self.mean + k @ self.w
+        d = X[:, None, :] - self.S[None, :, :]
+        dy = (-4.0 * d * (k * self.w)[:, :, None]).sum(axis=1)
+        return y, dy
+
+
+def _model_function(case_time=0.0):
+    # minimum of the objective at (0.5, 0.5), constraint active at x0 = 0.75
+    def model_function(points):
+        time.sleep(case_time * len(points))
+        return [{'status': True, 'f': ((p - 0.5) ** 2).sum(),
+                 'g': [0.75 - p[0]], 'extras': []} for p in points]
+
+    return model_function
+
+
+def _logged_run(path, case_time=0.0, **options):
+    x = np.random.RandomState(1).rand(12, 2)
+    g = (0.75 - x[:, 0])[:, None]
+    f = ((x - 0.5) ** 2).sum(axis=1)
+
+    with TelemetryLog(str(path)) as log:
+        opt = BatchCaballero(x, g, f, _model_function(case_time), lb=[0, 0],
+                             ub=[1, 1], max_fun_evals=20, telemetry=log,
+                             surrogate_factory=RbfModel, random_state=0,
+                             **options)
+        opt.optimize()
+
+    return opt
+
+
+def test_log_events(tmp_path):
+    path = tmp_path / 'run.jsonl'
+    opt = _logged_run(path, batch_size=2, n_starts=3)
+    events = read_telemetry(str(path))
+
+    assert [ev['event'] for ev in events[:2]] == ['start', 'iteration']
+    assert events[-1]['event'] == 'end'
+    assert events[0]['options']['n_starts'] == 3
+    assert len(events[0]['x']) == 12
+
+    iterations = [ev for ev in events if ev['event'] == 'iteration']
+    assert sum(len(ev['x']) for ev in iterations) == opt.fun_evals
+    assert all(ev['fit_time'] > 0 and ev['nlp_time'] > 0 for ev in iterations)
+    np.testing.assert_allclose(events[-1]['xopt'], opt.xopt)
+
+    table = iteration_table(events)
+    assert table.shape[0] == len(iterations)
+    assert table['Points'].sum() == opt.fun_evals
+    np.testing.assert_allclose(table['Surrogate (s)'],
+                               table['Fit (s)'] + table['NLP (s)'])
+
+    summary = run_summary(events)
+    assert summary['finished'] and summary['fun_evals'] == opt.fun_evals
+    assert summary['procedure'] == 'batch'
+
+
+def test_truncated_log(tmp_path):
+    path = tmp_path / 'run.jsonl'
+    _logged_run(path)
+    lines = path.read_text().splitlines()
+
+    # a run killed while writing the last event
+    path.write_text('\n'.join(lines[:-1] + [lines[-1][:10]]))
+    events = read_telemetry(str(path))
+    assert len(events) == len(lines) - 1
+    assert not run_summary(events)['finished']
+
+    path.write_text('\n'.join([lines[0], '{"event"', lines[1]]))
+    try:
+        read_telemetry(str(path))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Corrupted log accepted.")
+
+
+def test_replay_reproduces_run(tmp_path):
+    path = tmp_path / 'run.jsonl'
+    _logged_run(path, batch_size=2, n_starts=3)
+    events = read_telemetry(str(path))
+    logged = [ev for ev in events if ev['event'] == 'iteration']
+
+    replayed = replay(events, surrogate_factory=RbfModel)
+
+    assert len(replayed) == len(logged)
+    for ev, rep in zip(logged, replayed):
+        assert rep['distance'] < 1e-8
+        np.testing.assert_allclose(rep['f_pred'], ev['f_pred'])
+        np.testing.assert_allclose(rep['f'], ev['f'])
+
+
+def test_replay_other_options(tmp_path):
+    path = tmp_path / 'run.jsonl'
+    _logged_run(path, batch_size=2)
+    events = read_telemetry(str(path))
+
+    replayed = replay(events, surrogate_factory=RbfModel, n_starts=8,
+                      start_design='sobol')
+    table = iteration_table(replayed)
+    assert table['NLP (s)'].min() > 0
+    assert 'Distance' in table
+
+    # without the hypercube (surropt procedure) only the fits are replayed
+    for ev in events:
+        for key in ['center', 'lb', 'ub', 'nlp_time', 'fit_time']:
+            if ev['event'] == 'iteration':
+                ev.pop(key)
+
+    replayed = replay(events, surrogate_factory=RbfModel)
+    assert all(np.isnan(rep['nlp_time']) for rep in replayed)
+    assert all(rep['distance'] == 0 for rep in replayed)
+
+    try:
+        replay(events, max_fun_evals=3)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Invalid replay option accepted.")
+
+
+def main():
+    # cost of the logging and wall time of a replay against the logged run
+    # (simulations of CASE_TIME seconds)
+    import tempfile
+    from pathlib import Path
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = Path(folder) / 'run.jsonl'
+        event = {'x': np.random.rand(4, 10), 'f_pred': np.random.rand(4),
+                 'g_pred': np.random.rand(4, 5), 'sim_time': 1.0}
+        with TelemetryLog(str(path)) as log:
+            start = time.perf_counter()
+            for i in range(1000):
+                log.write('iteration', iter=i, **event)
+            elapsed = time.perf_counter() - start
+        print("log write: {0:6.1f} us per iteration event, {1:.0f} bytes "
+              "each".format(elapsed * 1e3, path.stat().st_size / 1000))
+
+        start = time.perf_counter()
+        _logged_run(path, case_time=CASE_TIME, batch_size=2, n_starts=4)
+        run_time = time.perf_counter() - start
+
+        events = read_telemetry(str(path))
+        start = time.perf_counter()
+        replay(events, surrogate_factory=RbfModel)
+        print("logged run: {0:6.3f} s, replay: {1:6.3f} s".format(
+            run_time, time.perf_counter() - start))
+
+
+if __name__ == "__main__":
+    main()
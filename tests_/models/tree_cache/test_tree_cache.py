@@ -0,0 +1,61 @@
+from gui.models.tree_cache import (SimulationTreeCache, collapse_fetched,
+                                   leaf_paths, simulation_fingerprint)
+
+ENTRY = {'flowsheet': {'Blocks': {'TOWER': 'RadFrac'}, 'Streams': {},
+                       'Flowsheeting Options\\Design-Spec': {}},
+         'simulation_data': {'blocks': ['TOWER']},
+         'input': {'node': 'Data', 'children': []},
+         'output': {'node': 'Data', 'children': []}}
+
+
+def test_fingerprint_follows_content(tmp_path):
+    sim_file = tmp_path / 'sim.bkp'
+    sim_file.write_text('flowsheet')
+    fp = simulation_fingerprint(str(sim_file))
+
+    assert fp == simulation_fingerprint(str(sim_file))
+
+    sim_file.write_text('changed flowsheet')
+    assert fp != simulation_fingerprint(str(sim_file))
+
+
+def test_outdated_entry_is_replaced(tmp_path):
+    sim_file = tmp_path / 'sim.bkp'
+    sim_file.write_text('flowsheet')
+    cache = SimulationTreeCache(str(tmp_path / 'cache'))
+
+    fp = simulation_fingerprint(str(sim_file))
+    assert cache.get(fp) == {}
+
+    cache.put(str(sim_file), fp, ENTRY)
+    assert cache.get(fp)['flowsheet'] == ENTRY['flowsheet']
+
+    # file saved again: no exact entry, but the latest one is still available
+    sim_file.write_text('flowsheet saved again')
+    new_fp = simulation_fingerprint(str(sim_file))
+    assert cache.get(new_fp) == {}
+    assert cache.get_latest(str(sim_file))['input'] == ENTRY['input']
+
+    cache.put(str(sim_file), new_fp, cache.get_latest(str(sim_file)))
+    assert cache.get(fp) == {}
+    assert cache.get(new_fp)['output'] == ENTRY['output']
+
+
+def test_fetched_branches_are_collapsed():
+    tree = {'node': 'Data', 'children': [
+        {'node': ' B1', 'fetched': True, 'description': 'Block',
+         'children': [{'node': 'STAGES', 'value': 10}]},
+        {'node': 'B2', 'lazy': True},
+        {'node': 'TEMP', 'value': 300.0},
+        {'node': 'EMPTY', 'fetched': True, 'children': []}]}
+
+    # only the variables of the tree, lazy nodes and branches aren't
+    assert leaf_paths(tree) == ['\\Data\\B1\\STAGES', '\\Data\\TEMP']
+    assert leaf_paths({}) == []
+
+    collapsed = collapse_fetched(tree)
+    assert collapsed['children'][0] == {'node': ' B1', 'description': 'Block',
+                                        'lazy': True}
+    assert collapsed['children'][3] == {'node': 'EMPTY', 'lazy': True}
+    assert leaf_paths(collapsed) == ['\\Data\\TEMP']
+    assert 'children' in tree['children'][0]